@@ -1,31 +1,128 @@
 
-from flask import Flask, render_template, request, jsonify
-import openai
+import hashlib
+import json
+import os
+import re
+import threading
+
+from flask import (
+    Flask, Response, abort, render_template, request, jsonify, send_file, stream_with_context
+)
+
+from generation.bulk import DEFAULT_CONCURRENCY, DEFAULT_INTENT, jobs_from_extracted, run_bulk
+from generation.generator import GenerationTimeout, MessageGenerator
+from generation.serve import serve
+from generation.templates import MessageComposer, TemplateSet
 
 app = Flask(__name__)
 
-# Replace 'your_openai_api_key_here' with your actual OpenAI API key
-openai.api_key = 'your_openai_api_key_here'
+# The LLM backend and caches are configured from the environment
+# (OPENAI_API_KEY, LLM_BACKEND, GENERATION_CACHE_*); see generation.generator.
+# Templates come from MESSAGE_TEMPLATES; see generation.templates
+_generator_lock = threading.Lock()
+
+# Bulk runs append to <BULK_OUTPUT_DIR>/<run id>.jsonl
+BULK_OUTPUT_DIR = os.environ.get('BULK_OUTPUT_DIR', 'data/messages')
+BULK_MAX_CONCURRENCY = int(os.environ.get('BULK_MAX_CONCURRENCY', 16))
+
+
+def get_generator():
+    """Return the app's message generator, creating it on first use."""
+    with _generator_lock:
+        if 'generator' not in app.extensions:
+            app.extensions['generator'] = MessageGenerator.from_env()
+        return app.extensions['generator']
+
+
+def get_templates():
+    """Return the app's message templates, loading them on first use."""
+    with _generator_lock:
+        if 'templates' not in app.extensions:
+            app.extensions['templates'] = TemplateSet.from_env()
+        return app.extensions['templates']
+
 
 @app.route('/', methods=['GET', 'POST'])
 def index():
     if request.method == 'POST':
-        name = request.form['name']
-        company = request.form['company']
-        experience = request.form['experience']
-        alumni = request.form['alumni']
-        age = request.form['age']
-        intent = request.form['intent']
-        
-        prompt = f"Create a {intent} message for {name}, a {experience} at {company}. Alumni: {alumni}, Age: {age}."
-        response = openai.Completion.create(
-            engine="text-davinci-004",
-            prompt=prompt,
-            max_tokens=150
-        )
-        message = response.choices[0].text.strip()
-        return render_template('index.html', message=message)
+        name = ' '.join(request.form['name'].split())
+        try:
+            composed = MessageComposer(get_generator(), get_templates()).compose({
+                'name': name,
+                'first_name': name.partition(' ')[0],
+                'company': request.form['company'],
+                'experience': request.form['experience'],
+                'title': request.form['experience'],
+                'alumni': request.form['alumni'],
+                'age': request.form['age'],
+                'intent': request.form['intent'],
+            })
+        except GenerationTimeout:
+            # The upstream call carries on and caches its result for a retry
+            message = 'Generation is taking longer than usual, please try again.'
+            return render_template('index.html', message=message), 504
+        return render_template('index.html', message=composed.text)
     return render_template('index.html', message='')
 
+
+@app.route('/bulk', methods=['POST'])
+def bulk():
+    """
+    Draft messages for every decision maker in a collector output.
+
+    The body (or an uploaded ``file``) is ``companies_with_decision_makers.json``
+    or ``leads.json``. ``intent`` and ``concurrency`` come from the query
+    string or form. Progress streams back as Server-Sent Events; the final
+    ``done`` event reports the template vs. LLM mix. Posting the same file
+    and intent again resumes the same run.
+    """
+    upload = request.files.get('file')
+    raw = upload.read() if upload else request.get_data()
+    try:
+        extracted = json.loads(raw)
+    except ValueError:
+        return jsonify({'error': 'expected companies_with_decision_makers.json'}), 400
+    if not isinstance(extracted, list):
+        return jsonify({'error': 'expected a list of companies'}), 400
+
+    intent = request.values.get('intent', DEFAULT_INTENT)
+    concurrency = min(
+        request.values.get('concurrency', DEFAULT_CONCURRENCY, type=int), BULK_MAX_CONCURRENCY
+    )
+    run_id = hashlib.sha1(raw + intent.encode('utf-8')).hexdigest()[:16]
+    out_path = os.path.join(BULK_OUTPUT_DIR, f"{run_id}.jsonl")
+    jobs = jobs_from_extracted(extracted, intent)
+    generator, templates = get_generator(), get_templates()
+
+    def events():
+        for event in run_bulk(jobs, generator, out_path, max(concurrency, 1), templates):
+            event['run_id'] = run_id
+            yield f"event: {event['event']}\ndata: {json.dumps(event)}\n\n"
+
+    return Response(
+        stream_with_context(events()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
+
+@app.route('/bulk/<run_id>', methods=['GET'])
+def bulk_results(run_id):
+    """Download the messages of a bulk run as JSON Lines."""
+    if not re.fullmatch(r'[0-9a-f]{16}', run_id):
+        abort(404)
+    path = os.path.abspath(os.path.join(BULK_OUTPUT_DIR, f"{run_id}.jsonl"))
+    if not os.path.exists(path):
+        abort(404)
+    return send_file(path, mimetype='application/x-ndjson')
+
 if __name__ == '__main__':
-    app.run(debug=True)
+    # FLASK_DEBUG=1 runs the development server with the debugger
+    if os.environ.get('FLASK_DEBUG'):
+        app.run(debug=True)
+    else:
+        serve(
+            app,
+            port=int(os.environ.get('PORT', 5000)),
+            workers=int(os.environ.get('WORKERS', 32)),
+        )
@@ -1,24 +1,35 @@
-"""Collector CLI entrypoint."""
+"""Collector CLI entrypoint.
+
+Only light modules are imported at startup. The pipeline (pandas,
+requests) and the source modules are imported once a run actually
+starts, so ``--help`` and ``--validate-config`` stay fast.
+"""
 
 import argparse
-import json
 import logging
 import sys
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any
-
-import pandas as pd
+from typing import Dict, Any, Optional
 
-from collector.config import load_config
-from collector.sources import crunchbase, sec
-from collector.storage import save_to_csv, save_to_json, save_to_parquet
-from collector.filters import LocationFilter
-from collector.extractors import DecisionMakerExtractor
+from common.logging import configure_logging
+from collector.config import load_config, validate_config
+from collector.sources import enabled_sources
 
 
 logger = logging.getLogger(__name__)
 
+# Names that used to be importable from this module
+_PIPELINE_EXPORTS = {"extract_decision_makers_from_dfs", "filter_df_by_location"}
+
+
+def __getattr__(name):
+    if name in _PIPELINE_EXPORTS:
+        from collector import pipeline
+        return getattr(pipeline, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 def parse_args():
     """Parse command line arguments."""
@@ -60,159 +71,297 @@ def parse_args():
         default="INFO",
         help="Set the logging level",
     )
+    parser.add_argument(
+        "--log-format",
+        choices=["text", "json"],
+        default=None,
+        help="Log output format (overrides logging.format in the config)",
+    )
+    parser.add_argument(
+        "--validate-config",
+        action="store_true",
+        help="Check the config and list the enabled sources, then exit",
+    )
+    parser.add_argument(
+        "--full-refresh",
+        action="store_true",
+        help="Pass every record downstream, not only the changes since the last run",
+    )
+    parser.add_argument(
+        "--no-memo",
+        action="store_true",
+        help="Recompute every stage even if memo.enabled is set in the config",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Write per-stage CPU and memory profiles to <output-dir>/profiles/",
+    )
+    daemon_group = parser.add_argument_group(
+        "daemon mode",
+        "Run collection cycles on an interval in one long-running process",
+    )
+    daemon_group.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Keep running and collect every --interval seconds",
+    )
+    daemon_group.add_argument(
+        "--interval",
+        type=float,
+        default=None,
+        help="Seconds between cycle starts (default: daemon.interval_seconds or 3600)",
+    )
+    shard_group = parser.add_argument_group(
+        "sharded collection",
+        "Split the date range into work units on a shared queue (SQLite file)",
+    )
+    shard_group.add_argument(
+        "--shard-queue",
+        type=Path,
+        default=None,
+        help="Path to the work queue database; enables sharded mode",
+    )
+    shard_group.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Local worker processes to run before merging; 0 only plans units (default: 4)",
+    )
+    shard_group.add_argument(
+        "--worker",
+        action="store_true",
+        help="Only process units from the queue (for additional nodes)",
+    )
+    shard_group.add_argument(
+        "--merge",
+        action="store_true",
+        help="Only merge completed shard outputs into the normal artifacts",
+    )
+    shard_group.add_argument(
+        "--allow-partial",
+        action="store_true",
+        help="Merge even if some units are unfinished or failed",
+    )
     return parser.parse_args()
 
 
-def setup_logging(level):
-    """Configure logging."""
-    logging.basicConfig(
-        level=getattr(logging, level),
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
+def setup_logging(level, logging_config=None, log_format=None):
+    """
+    Configure logging through common.logging.
+
+    Records are handed to a background thread for I/O, so per-page and
+    per-day logging in the sources never blocks on a slow log mount.
+
+    Args:
+        level: Logging level name from the command line
+        logging_config: The ``logging`` section of the collector config
+        log_format: "text" or "json"; overrides the config when given
+    """
+    logging_config = logging_config or {}
+    log_format = log_format or logging_config.get("format", "text")
+    configure_logging(
+        log_level=level,
+        log_file=logging_config.get("file"),
+        json_format=log_format == "json",
+        rate_limit=logging_config.get("rate_limit"),
+        rate_limit_burst=logging_config.get("rate_limit_burst", 10),
+        sample_every=logging_config.get("sample_every"),
     )
 
 
-def filter_df_by_location(df: pd.DataFrame, location_filter: LocationFilter) -> pd.DataFrame:
+def apply_overrides(args, config: Dict[str, Any]) -> None:
+    """Override config values with command line arguments."""
+    if args.start_date:
+        config["start_date"] = args.start_date
+    if args.end_date:
+        config["end_date"] = args.end_date
+    if args.output_dir:
+        config["output_dir"] = args.output_dir
+    if args.target_locations:
+        config["target_locations"] = args.target_locations
+
+
+def change_capture(args, config: Dict[str, Any]):
     """
-    Filter DataFrame by location
+    Build change data capture from the config.
+    
+    With ``--full-refresh`` every record is passed on; the fingerprint
+    indexes are still updated so the next run compares against this one.
+    """
+    from collector.cdc import ChangeCapture
+    
+    return ChangeCapture.from_config(config, full_refresh=args.full_refresh)
+
+
+def database_sink(config: Dict[str, Any]):
+    """Build the Postgres sink from the config, or None if ``postgres.enabled`` is off."""
+    from collector.storage.postgres import PostgresSink
+    
+    return PostgresSink.from_config(config)
+
+
+def check_config(args) -> int:
+    """
+    Validate the config for ``--validate-config``.
     
-    Args:
-        df: DataFrame to filter
-        location_filter: LocationFilter instance
-        
     Returns:
-        Filtered DataFrame
+        Exit code: 0 if the config is valid, 1 otherwise
     """
-    if df.empty:
-        return df
-        
-    # Determine location column based on DataFrame structure
-    location_col = None
-    potential_cols = ['headquarters', 'hq_location', 'location', 'city', 'address']
-    for col in potential_cols:
-        if col in df.columns:
-            location_col = col
-            break
-    
-    if not location_col:
-        logger.warning("No location column found for location filtering")
-        return df
-        
-    # Apply filter
-    mask = df[location_col].apply(lambda loc: location_filter.is_in_target_location(loc))
-    filtered_df = df[mask]
-    logger.info(f"Filtered {len(df)} companies down to {len(filtered_df)} based on location")
-    return filtered_df
+    try:
+        config = load_config(args.config)
+    except (FileNotFoundError, OSError, ValueError) as e:
+        print(f"Invalid config: {e}", file=sys.stderr)
+        return 1
+    
+    apply_overrides(args, config)
+    problems = validate_config(config)
+    for problem in problems:
+        print(f"Invalid config: {problem}", file=sys.stderr)
+    if problems:
+        return 1
+    
+    print(f"Config OK; enabled sources: {', '.join(enabled_sources(config))}")
+    return 0
 
 
-def extract_decision_makers_from_dfs(dfs: List[pd.DataFrame]) -> List[Dict[str, Any]]:
+def run_sharded(args, config: Dict[str, Any], profiler=None) -> Optional[Dict[str, Any]]:
     """
-    Extract decision makers from a list of DataFrames
+    Plan, work and merge a sharded collection run.
+    
+    Without ``--worker`` or ``--merge`` this plans the units (idempotently),
+    runs ``--workers`` local worker processes and merges the results. With
+    ``--workers 0`` it only plans the units.
     
     Args:
-        dfs: List of company DataFrames
+        args: Parsed command line arguments
+        config: Collector configuration
+        profiler: Optional profiler for the merge stages
         
     Returns:
-        List of companies with decision makers
+        Timing summary of the merge stages, or None if nothing was merged
     """
-    extractor = DecisionMakerExtractor()
-    companies_with_decision_makers = []
+    from collector import sharding
+    from collector.pipeline import process_and_save
+    from collector.sources import load_source
     
-    for df in dfs:
-        if df.empty:
-            continue
-            
-        for _, company in df.iterrows():
-            company_dict = company.to_dict()
-            decision_makers = extractor.extract_decision_makers(company_dict)
-            
-            if decision_makers:
-                companies_with_decision_makers.append({
-                    'company': company_dict,
-                    'decision_makers': decision_makers
-                })
+    sharding_config = config.get("sharding", {})
+    queue = sharding.WorkQueue(
+        args.shard_queue,
+        lease_seconds=sharding_config.get("lease_seconds", 600),
+        max_attempts=sharding_config.get("max_attempts", 3),
+    )
+    source_names = enabled_sources(config)
+    
+    if args.worker:
+        sharding.run_worker(config, queue, {name: load_source(name) for name in source_names})
+        return None
     
-    logger.info(f"Found {len(companies_with_decision_makers)} companies with decision makers")
-    return companies_with_decision_makers
+    if not args.merge:
+        added = queue.add_units(sharding.plan_units(config, source_names))
+        logger.info(f"Planned {added} new work units; queue status: {queue.counts()}")
+        if args.workers <= 0:
+            # Plan only: workers on other nodes pick the units up
+            return None
+        sharding.run_local_workers(
+            config, queue, source_names, args.workers, args.log_level
+        )
+    
+    failures = queue.failures()
+    for failure in failures:
+        logger.error(f"Unit {failure['id']} failed after {failure['attempts']} attempts: "
+                     f"{failure['error']}")
+    
+    merged = sharding.merge(queue, source_names, allow_partial=args.allow_partial)
+    sink = database_sink(config)
+    try:
+        return process_and_save(
+            config, merged, profiler, cdc=change_capture(args, config), sink=sink
+        )
+    finally:
+        if sink is not None:
+            sink.close()
 
 
 def main():
     """Execute the collector pipeline."""
     args = parse_args()
-    setup_logging(args.log_level)
+    setup_logging(args.log_level, log_format=args.log_format)
+    
+    if args.validate_config:
+        return check_config(args)
     
     logger.info("Starting data collection")
+    started = time.time()
+    config: Dict[str, Any] = {}
+    profiler = None
+    success = False
+    timings: Dict[str, Any] = {}
     
     try:
         config = load_config(args.config)
         
-        # Override config with command line arguments
-        if args.start_date:
-            config["start_date"] = args.start_date
-        if args.end_date:
-            config["end_date"] = args.end_date
-        if args.output_dir:
-            config["output_dir"] = args.output_dir
-        if args.target_locations:
-            config["target_locations"] = args.target_locations
-            
-        # Initialize location filter from config
-        target_locations = config.get("target_locations", [])
-        if target_locations:
-            logger.info(f"Filtering companies by locations: {', '.join(target_locations)}")
-            location_filter = LocationFilter(target_locations)
-        else:
-            logger.info("No target locations specified, skipping location filtering")
-            location_filter = None
-            
-        # Collect data from sources
-        logger.info("Collecting data from Crunchbase")
-        crunchbase_data = crunchbase.collect(config)
+        # Re-apply logging now that the config's log file and format are known
+        if config.get("logging") or args.log_format:
+            setup_logging(args.log_level, config.get("logging"), args.log_format)
         
-        logger.info("Collecting data from SEC")
-        sec_data = sec.collect(config)
+        apply_overrides(args, config)
+        problems = validate_config(config)
+        if problems:
+            for problem in problems:
+                logger.error(f"Invalid config: {problem}")
+            return 1
         
-        # Filter by location if target locations are specified
-        if location_filter and not target_locations:
-            filtered_crunchbase = crunchbase_data
-            filtered_sec = sec_data
-        else:
-            filtered_crunchbase = filter_df_by_location(crunchbase_data, location_filter)
-            filtered_sec = filter_df_by_location(sec_data, location_filter)
+        # Imported here so --help and --validate-config never load pandas
+        from collector.pipeline import run_pipeline
         
-        # Extract decision makers
-        companies_with_decision_makers = extract_decision_makers_from_dfs(
-            [filtered_crunchbase, filtered_sec]
-        )
-        
-        # Save collected data
-        output_dir = Path(config.get("output_dir", "../../data/raw"))
-        output_dir.mkdir(parents=True, exist_ok=True)
-        
-        interim_dir = Path(config.get("interim_dir", "../../data/interim"))
-        interim_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Save raw data
-        save_to_csv(crunchbase_data, output_dir / "crunchbase_data.csv")
-        save_to_csv(sec_data, output_dir / "sec_data.csv")
-        
-        # Save filtered data
-        save_to_csv(filtered_crunchbase, interim_dir / "filtered_crunchbase_data.csv")
-        save_to_csv(filtered_sec, interim_dir / "filtered_sec_data.csv")
+        if args.profile:
+            from collector.profiling import Profiler
+            profiler = Profiler(Path(config.get("output_dir", "../../data/raw")))
+            
+        if args.daemon:
+            from collector.daemon import CollectorDaemon
+            interval = args.interval or config.get("daemon", {}).get("interval_seconds", 3600)
+            daemon = CollectorDaemon(config, interval)
+            daemon.install_signal_handlers()
+            daemon.run()
+            success = True
+            return 0
         
-        # Save companies with decision makers
-        save_to_json(
-            companies_with_decision_makers, 
-            interim_dir / "companies_with_decision_makers.json"
-        )
+        if args.shard_queue:
+            timings = run_sharded(args, config, profiler) or {}
+        else:
+            memo = None
+            if not args.no_memo:
+                from collector.memo import StageCache
+                memo = StageCache.from_config(config)
+            sink = database_sink(config)
+            try:
+                timings = run_pipeline(
+                    config, profiler, memo=memo, cdc=change_capture(args, config), sink=sink
+                )
+            finally:
+                if sink is not None:
+                    sink.close()
         
         logger.info("Data collection completed successfully")
+        success = True
         return 0
     
     except Exception as e:
         logger.error(f"Error during data collection: {e}", exc_info=True)
         return 1
+    
+    finally:
+        if profiler is not None:
+            profiler.finish()
+        # Workers on other nodes share the output directory; only the
+        # coordinating process reports on the run. The daemon reports
+        # after every cycle.
+        if config and not args.worker and not args.daemon:
+            from collector.pipeline import write_run_report
+            write_run_report(config, started, success, stage_timings=timings)
 
 
 if __name__ == "__main__":
-    sys.exit(main()) 
\ No newline at end of file
+    sys.exit(main())
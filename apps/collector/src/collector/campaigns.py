@@ -0,0 +1,156 @@
+"""Evaluate many campaigns' filters over one collection run.
+
+Each campaign in the ``campaigns`` config section has its own target
+locations, filters, funding threshold and role list. Instead of one
+collector run per campaign, sources are fetched and parsed once, every
+campaign's filter is evaluated over the same records in one pass (see
+``predicates.evaluate_many``), and titles are classified once for all
+records any campaign kept. Records are tagged with the campaigns they
+match, and outputs are then split per campaign.
+"""
+
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from common.metrics import registry
+from collector import predicates
+from collector.config import campaign_configs
+from collector.filters import LocationFilter
+
+
+logger = logging.getLogger(__name__)
+
+CAMPAIGNS_COLUMN = "campaigns"
+
+
+class CampaignSet:
+    """The campaigns of one run, with a filter and a role list per campaign."""
+
+    def __init__(
+        self,
+        configs: Dict[str, Dict[str, Any]],
+        location_filter: Optional[Callable[[List[str]], LocationFilter]] = None,
+    ):
+        """
+        Initialize the campaigns.
+
+        Args:
+            configs: Campaign name to resolved config, see ``config.campaign_configs``
+            location_filter: Factory returning a (possibly warm) location
+                filter for a list of targets
+        """
+        make_filter = location_filter or LocationFilter
+        self.configs = configs
+        self.names = list(configs)
+        self.filters = {}
+        self.roles: Dict[str, Optional[set]] = {}
+        self.min_roles: Dict[str, int] = {}
+        for name, config in configs.items():
+            targets = config.get("target_locations") or []
+            self.filters[name] = predicates.from_config(
+                config, make_filter(targets) if targets else None
+            )
+            decision_makers = config.get("decision_makers") or {}
+            roles = decision_makers.get("target_roles")
+            self.roles[name] = {r.lower() for r in roles} if roles else None
+            self.min_roles[name] = decision_makers.get("min_roles_per_company", 1)
+
+    @classmethod
+    def from_config(
+        cls,
+        config: Dict[str, Any],
+        location_filter: Optional[Callable[[List[str]], LocationFilter]] = None,
+    ) -> Optional["CampaignSet"]:
+        """Build the campaigns from the ``campaigns`` config section, or None if there are none."""
+        configs = campaign_configs(config)
+        if not configs:
+            return None
+        return cls(configs, location_filter)
+
+    def tag(self, df: pd.DataFrame, source: str = "") -> pd.DataFrame:
+        """
+        Keep the records at least one campaign accepts, tagged with those campaigns.
+
+        Args:
+            df: Records of one source
+            source: Source name, used in logs and metrics
+
+        Returns:
+            The kept records with a ``campaigns`` column listing the
+            campaign names each one matches
+        """
+        if df.empty:
+            return df.assign(**{CAMPAIGNS_COLUMN: pd.Series(dtype=object)})
+        masks = predicates.evaluate_many(df, self.filters)
+        matrix = np.column_stack([masks[name] for name in self.names])
+        keep = matrix.any(axis=1)
+
+        records_total = registry.counter(
+            "collector_campaign_records_total", "Records matching each campaign"
+        )
+        for name, count in zip(self.names, matrix.sum(axis=0)):
+            records_total.inc(int(count), campaign=name, source=source)
+
+        names = np.array(self.names, dtype=object)
+        tagged = df[keep].copy()
+        tagged[CAMPAIGNS_COLUMN] = [list(names[row]) for row in matrix[keep]]
+        logger.info(
+            f"{len(tagged)} of {len(df)} {source} records match at least one of "
+            f"{len(self.names)} campaigns"
+        )
+        return tagged
+
+    @staticmethod
+    def select(df: pd.DataFrame, name: str) -> pd.DataFrame:
+        """Return the tagged records of one campaign."""
+        if df.empty:
+            return df
+        return df[df[CAMPAIGNS_COLUMN].map(lambda tags: name in tags)]
+
+    def companies(
+        self, extracted: List[Dict[str, Any]], name: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Return one campaign's companies, keeping only decision makers in its roles.
+
+        Args:
+            extracted: Output of ``extract_decision_makers_from_dfs`` over tagged records
+            name: Campaign name
+
+        Returns:
+            Companies with at least ``min_roles_per_company`` decision makers
+            in the campaign's ``target_roles``
+        """
+        selected = []
+        for entry in extracted:
+            decision_makers = self.decision_makers(entry, name)
+            if decision_makers is not None:
+                selected.append({**entry, "decision_makers": decision_makers})
+        return selected
+
+    def decision_makers(
+        self, entry: Dict[str, Any], name: str
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Return an extracted company's decision makers in one campaign's roles.
+
+        Args:
+            entry: One item of ``extract_decision_makers_from_dfs`` output
+            name: Campaign name
+
+        Returns:
+            The decision makers, or None if the company is not in the
+            campaign or has fewer than ``min_roles_per_company`` of them
+        """
+        if name not in (entry["company"].get(CAMPAIGNS_COLUMN) or []):
+            return None
+        roles = self.roles[name]
+        decision_makers = entry["decision_makers"]
+        if roles is not None:
+            decision_makers = [dm for dm in decision_makers if dm.get("role") in roles]
+        if len(decision_makers) < self.min_roles[name]:
+            return None
+        return decision_makers
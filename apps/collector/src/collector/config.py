@@ -2,11 +2,14 @@
 
 import logging
 import os
+import re
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 import yaml
 
+from collector.sources import enabled_sources
+
 
 logger = logging.getLogger(__name__)
 
@@ -49,4 +52,126 @@ def load_config(config_path: str = None) -> Dict[str, Any]:
     # If we get here, no config file was found
     raise FileNotFoundError(
         "No config file found. Please specify a config file with --config."
-    ) 
\ No newline at end of file
+    ) 
+
+
+def campaign_configs(config: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    Resolve the ``campaigns`` section into one full config per campaign.
+    
+    A campaign overrides ``target_locations``, ``min_funding_amount``
+    (``collection.min_funding_amount``), ``target_roles`` and
+    ``min_roles_per_company`` (``decision_makers``), and extends
+    ``filters``; everything else is inherited from the top level.
+    
+    Args:
+        config: Configuration as returned by load_config
+        
+    Returns:
+        Campaign name to resolved config, in config order (empty without campaigns)
+    """
+    resolved = {}
+    base = {k: v for k, v in config.items() if k != "campaigns"}
+    for name, campaign in (config.get("campaigns") or {}).items():
+        campaign = campaign or {}
+        merged = dict(base)
+        if "target_locations" in campaign:
+            merged["target_locations"] = campaign["target_locations"]
+        if "filters" in campaign:
+            merged["filters"] = {**(base.get("filters") or {}), **(campaign["filters"] or {})}
+        if "min_funding_amount" in campaign:
+            merged["collection"] = {
+                **(base.get("collection") or {}),
+                "min_funding_amount": campaign["min_funding_amount"],
+            }
+        for key in ("target_roles", "min_roles_per_company"):
+            if key in campaign:
+                merged["decision_makers"] = {
+                    **(merged.get("decision_makers") or {}), key: campaign[key]
+                }
+        resolved[str(name)] = merged
+    return resolved
+
+
+def validate_config(config: Dict[str, Any]) -> List[str]:
+    """
+    Check a loaded configuration for mistakes that would fail a run.
+    
+    Only the config itself is inspected; no source module is imported and
+    no network request is made, so this is cheap enough to run before
+    every deployment.
+    
+    Args:
+        config: Configuration as returned by load_config
+        
+    Returns:
+        A list of problems; empty if the config is valid.
+    """
+    if not isinstance(config, dict):
+        return ["Config must be a mapping"]
+    
+    problems = []
+    try:
+        sources = enabled_sources(config)
+    except ValueError as e:
+        problems.append(str(e))
+        sources = []
+    else:
+        if not sources:
+            problems.append("No sources are enabled")
+    
+    crunchbase_config = (config.get("sources") or {}).get("crunchbase")
+    crunchbase_config = crunchbase_config if isinstance(crunchbase_config, dict) else {}
+    crunchbase_mode = crunchbase_config.get("mode", "api")
+    if crunchbase_mode not in ("api", "bulk"):
+        problems.append("sources.crunchbase.mode must be 'api' or 'bulk'")
+    elif "crunchbase" in sources and crunchbase_mode == "bulk":
+        if not crunchbase_config.get("bulk_path"):
+            problems.append("sources.crunchbase.bulk_path is required in bulk mode")
+    elif "crunchbase" in sources and not config.get("crunchbase_api_key"):
+        problems.append("crunchbase_api_key is required when the crunchbase source is enabled")
+    
+    sec_config = (config.get("sources") or {}).get("sec")
+    target_forms = sec_config.get("target_forms") if isinstance(sec_config, dict) else None
+    if target_forms is not None and (
+        not isinstance(target_forms, list)
+        or not all(isinstance(form, str) for form in target_forms)
+    ):
+        problems.append("sources.sec.target_forms must be a list of form types")
+    
+    target_locations = config.get("target_locations")
+    if target_locations is not None and not isinstance(target_locations, list):
+        problems.append("target_locations must be a list")
+    
+    campaigns = config.get("campaigns")
+    if campaigns is not None:
+        if not isinstance(campaigns, dict):
+            problems.append("campaigns must be a mapping of campaign names to settings")
+            campaigns = {}
+        for name, campaign in campaigns.items():
+            # Campaign names become output directory names; a leading
+            # character other than '.' rules out "." and ".."
+            if not re.fullmatch(r"\w[\w.-]*", str(name)):
+                problems.append(
+                    f"Campaign name '{name}' must start with a letter, digit or '_' "
+                    f"and only use letters, digits, '.', '-' and '_'"
+                )
+            if campaign is not None and not isinstance(campaign, dict):
+                problems.append(f"Campaign '{name}' must be a mapping")
+            elif campaign and not isinstance(campaign.get("target_locations", []), list):
+                problems.append(f"campaigns.{name}.target_locations must be a list")
+    
+    postgres = config.get("postgres") or {}
+    batch_rows = postgres.get("batch_rows")
+    if batch_rows is not None and (not isinstance(batch_rows, int) or batch_rows <= 0):
+        problems.append("postgres.batch_rows must be a positive integer")
+    
+    top_k = (config.get("scoring") or {}).get("top_k")
+    if top_k is not None and (not isinstance(top_k, int) or top_k <= 0):
+        problems.append("scoring.top_k must be a positive integer")
+    
+    start_date, end_date = config.get("start_date"), config.get("end_date")
+    if start_date and end_date and start_date > end_date:
+        problems.append("start_date is after end_date")
+    
+    return problems
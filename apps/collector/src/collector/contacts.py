@@ -0,0 +1,224 @@
+"""Contact name normalization and deduplication.
+
+The same executive shows up in a company's ``people`` and ``team`` lists,
+in its description, and again under the SEC filer and the Crunchbase
+record of the same company, each spelled a little differently. Names are
+reduced to a canonical form:
+
+- Unicode is folded ("José" and "Jose" match) and case is ignored
+- Honorifics ("Dr.", "Ms.") and suffixes ("Jr.", "PhD") are dropped
+- "Last, First" is reordered to "First Last"
+- Middle names and initials are ignored, so the key is first and last name
+
+A contact's ID hashes its company's normalized name (``normalize_name``,
+also used by the store's name index) with its name key. Equal people get equal IDs
+within and across sources, and across runs, so the IDs serve as
+``Contact.id`` and the ``contacts.id`` primary key. Deduplication is a
+dict lookup per contact (``ContactIndex``); nothing is compared pairwise.
+"""
+
+import hashlib
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+
+from common.metrics import registry
+
+
+HONORIFICS = frozenset({
+    "mr", "mrs", "ms", "miss", "mx", "dr", "prof", "professor", "sir", "dame", "rev", "hon",
+})
+SUFFIXES = frozenset({
+    "jr", "sr", "ii", "iii", "iv", "phd", "md", "mba", "esq", "cpa", "cfa",
+})
+
+COMPANY_NAME_FIELDS = ("name", "company_name", "properties.identifier.value")
+
+_NOT_ALNUM = re.compile(r"[\W_]+")
+
+# Company names: runs of anything but letters and digits, and trailing
+# legal suffixes ("Acme, Inc." and "ACME INC" are both "acme")
+PUNCTUATION = re.compile(r"[^0-9a-z]+")
+LEGAL_SUFFIXES = re.compile(
+    r"(?:\s(?:inc|incorporated|corp|corporation|co|company|llc|ltd|limited|plc|lp|llp|"
+    r"gmbh|ag|sa|nv|bv|oy|ab)\b)+$"
+)
+
+
+class Name(NamedTuple):
+    """A canonical person name."""
+
+    first: str
+    last: str
+    full: str
+    key: str
+
+
+def fold(text: str) -> str:
+    """Strip accents, case and punctuation: "O'Brién" becomes "obrien"."""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return _NOT_ALNUM.sub("", text.casefold())
+
+
+def _is(token: str, words: frozenset) -> bool:
+    return fold(token) in words
+
+
+def _reorder(text: str) -> str:
+    """Turn "Last, First" into "First Last", leaving "First Last, Jr." alone."""
+    parts = [p.strip() for p in text.split(",")]
+    head, rest = parts[0].split(), [p for p in parts[1:] if p]
+    given = [p for p in rest if not all(_is(t, SUFFIXES) for t in p.split())]
+    suffixes = [p for p in rest if p not in given]
+    if len(given) == 1 and head:
+        while len(head) > 1 and _is(head[0], HONORIFICS):
+            head = head[1:]
+        return " ".join([given[0], *head, *suffixes])
+    return " ".join([*head, *rest])
+
+
+def _strip_titles(tokens: List[str]) -> List[str]:
+    """Drop leading honorifics and trailing suffixes, keeping at least one token."""
+    while len(tokens) > 1 and _is(tokens[0], HONORIFICS):
+        tokens = tokens[1:]
+    while len(tokens) > 1 and _is(tokens[-1], SUFFIXES):
+        tokens = tokens[:-1]
+    return tokens
+
+
+def _make(first: List[str], last: List[str]) -> Optional[Name]:
+    tokens = first + last
+    if not tokens:
+        return None
+    # Fix all-caps or all-lowercase names; keep mixed case ("McKay") as given
+    if all(t.isupper() for t in tokens) or all(t.islower() for t in tokens):
+        first = [t.title() for t in first]
+        last = [t.title() for t in last]
+    first_key = fold(first[0]) if first else ""
+    last_key = fold(last[-1]) if last else ""
+    if not first_key and not last_key:
+        return None
+    return Name(
+        first=" ".join(first),
+        last=" ".join(last),
+        full=" ".join(first + last),
+        key=f"{first_key}|{last_key}",
+    )
+
+
+@lru_cache(maxsize=65536)
+def canonical_name(name: Optional[str]) -> Optional[Name]:
+    """
+    Canonicalize a full name.
+
+    Args:
+        name: Name as written, e.g. "Dr. Smith, Jane A."
+
+    Returns:
+        The canonical name ("Jane A. Smith", key "jane|smith"), or None if
+        nothing is left of it
+    """
+    if not isinstance(name, str):
+        return None
+    text = " ".join(name.split())
+    if "," in text:
+        text = _reorder(text)
+    tokens = _strip_titles(text.split())
+    return _make(tokens[:1], tokens[1:])
+
+
+@lru_cache(maxsize=65536)
+def canonical_parts(first: Optional[str], last: Optional[str]) -> Optional[Name]:
+    """
+    Canonicalize a name given as first and last name fields.
+
+    Either part may be missing or blank; the full name never carries a
+    stray space for it.
+    """
+    first_tokens = first.split() if isinstance(first, str) else []
+    last_tokens = last.split() if isinstance(last, str) else []
+    while first_tokens and _is(first_tokens[0], HONORIFICS):
+        first_tokens = first_tokens[1:]
+    while last_tokens and _is(last_tokens[-1], SUFFIXES):
+        last_tokens = last_tokens[:-1]
+    if not first_tokens:
+        return canonical_name(" ".join(last_tokens))
+    return _make(first_tokens, last_tokens)
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a company name: lowercase, no punctuation, no trailing legal suffixes."""
+    name = PUNCTUATION.sub(" ", str(name).lower()).strip()
+    return LEGAL_SUFFIXES.sub("", name).strip()
+
+
+def company_key(company: Dict[str, Any]) -> str:
+    """
+    Return the key a company's contacts are grouped under.
+
+    This is the normalized company name, so the Crunchbase and SEC records
+    of one company share it. Records without a name fall back to their ID.
+    """
+    for field in COMPANY_NAME_FIELDS:
+        value = company.get(field)
+        if isinstance(value, str) and value.strip():
+            key = normalize_name(value)
+            if key:
+                return key
+    for field in ("id", "uuid", "cik"):
+        value = company.get(field)
+        if value is not None and value == value and str(value):
+            return f"{field}:{value}"
+    return ""
+
+
+def contact_id(company: str, name: Name) -> str:
+    """Return the stable ID of a person at a company (``company_key``)."""
+    return hashlib.sha1(f"{company}|{name.key}".encode("utf-8")).hexdigest()
+
+
+class ContactIndex:
+    """
+    Contacts seen so far, keyed by ID.
+
+    A repeated contact is merged into the first one: fields the first left
+    empty are filled in from the repeat.
+    """
+
+    def __init__(self, scope: str = "company"):
+        """
+        Initialize an empty index.
+
+        Args:
+            scope: Label for ``collector_contacts_duplicates_total``
+                (``company`` within one company, ``run`` across companies)
+        """
+        self.scope = scope
+        self.contacts: Dict[str, Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self.contacts)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.contacts.values())
+
+    def add(self, contact: Dict[str, Any]) -> bool:
+        """
+        Add a contact carrying an ``id``.
+
+        Returns:
+            True if it is new, False if it was merged into an earlier one
+        """
+        existing = self.contacts.get(contact["id"])
+        if existing is None:
+            self.contacts[contact["id"]] = contact
+            return True
+        for field, value in contact.items():
+            if value and not existing.get(field):
+                existing[field] = value
+        registry.counter(
+            "collector_contacts_duplicates_total", "Repeated contacts merged by deduplication"
+        ).inc(scope=self.scope)
+        return False
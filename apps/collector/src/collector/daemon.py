@@ -0,0 +1,164 @@
+"""Long-running collector that runs collection cycles on an interval."""
+
+import logging
+import signal
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from common.metrics import registry
+from collector.cdc import ChangeCapture
+from collector.storage.postgres import PostgresSink
+from collector.pipeline import (
+    CollectorState,
+    run_pipeline,
+    write_run_report,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+class CollectorDaemon:
+    """
+    Run collection cycles in one process, keeping sessions and caches warm.
+
+    Cycles start on a fixed schedule every ``interval`` seconds. A cycle
+    that runs past one or more ticks causes those ticks to be skipped
+    rather than queued, so cycles never overlap or pile up. SIGTERM and
+    SIGINT let the current cycle finish and then stop the loop.
+    """
+
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        interval: float,
+        state: Optional[CollectorState] = None,
+    ):
+        """
+        Initialize the daemon.
+
+        Args:
+            config: Collector configuration; each cycle works on a copy
+            interval: Seconds between cycle starts
+            state: Warm state to reuse; created from the ``daemon`` config if not given
+        """
+        self.config = config
+        self.interval = interval
+        daemon_config = config.get("daemon", {})
+        self.state = state or CollectorState(
+            index_cache_size=daemon_config.get("index_cache_size", 512)
+        )
+        self.max_days = config.get("collection", {}).get("max_days_per_run", 7)
+        self.cdc = ChangeCapture.from_config(config)
+        self.sink = PostgresSink.from_config(config)
+        self.stop_event = threading.Event()
+        self.cycles = 0
+        self.last_end: Optional[datetime] = None
+        self._cycle_lock = threading.Lock()
+
+    def window(self, now: datetime) -> Tuple[datetime, datetime]:
+        """
+        Return the date window for a cycle starting at ``now``.
+
+        The window starts where the last successful cycle ended, but never
+        covers more than ``collection.max_days_per_run`` days.
+
+        Args:
+            now: Start time of the cycle
+
+        Returns:
+            Tuple of (start_date, end_date)
+        """
+        earliest = now - timedelta(days=self.max_days)
+        start = max(self.last_end, earliest) if self.last_end else earliest
+        return start, now
+
+    def run_cycle(self, now: Optional[datetime] = None) -> bool:
+        """
+        Run one collection cycle unless another one is still running.
+
+        Args:
+            now: Cycle start time (defaults to the current time)
+
+        Returns:
+            True if the cycle ran and succeeded
+        """
+        if not self._cycle_lock.acquire(blocking=False):
+            logger.warning("Previous collection cycle still running, skipping")
+            registry.counter(
+                "collector_daemon_cycles_skipped_total", "Daemon cycles skipped due to overlap"
+            ).inc()
+            return False
+
+        started = time.time()
+        success = False
+        config = dict(self.config)
+        timings: Dict[str, Any] = {}
+        try:
+            now = now or datetime.now()
+            config["start_date"], config["end_date"] = self.window(now)
+            self.cycles += 1
+            logger.info(
+                f"Starting collection cycle {self.cycles} "
+                f"({config['start_date']:%Y-%m-%d} to {config['end_date']:%Y-%m-%d})"
+            )
+            timings = run_pipeline(config, state=self.state, cdc=self.cdc, sink=self.sink)
+            self.last_end = config["end_date"]
+            success = True
+            logger.info(f"Collection cycle {self.cycles} finished in {time.time() - started:.1f}s")
+        except Exception as e:
+            logger.error(f"Collection cycle {self.cycles} failed: {e}", exc_info=True)
+        finally:
+            registry.counter(
+                "collector_daemon_cycles_total", "Daemon collection cycles run"
+            ).inc(status="success" if success else "error")
+            write_run_report(config, started, success, stage_timings=timings)
+            self._cycle_lock.release()
+        return success
+
+    def run(self, max_cycles: Optional[int] = None) -> None:
+        """
+        Run cycles until stopped.
+
+        Args:
+            max_cycles: Stop after this many scheduled ticks (for tests)
+        """
+        logger.info(f"Collector daemon started, running every {self.interval:.0f}s")
+        next_tick = time.monotonic()
+        ticks = 0
+        try:
+            while not self.stop_event.is_set():
+                self.run_cycle()
+                ticks += 1
+                if max_cycles is not None and ticks >= max_cycles:
+                    break
+
+                next_tick += self.interval
+                now = time.monotonic()
+                if now > next_tick and self.interval > 0:
+                    missed = int((now - next_tick) // self.interval) + 1
+                    logger.warning(f"Cycle overran the interval, skipping {missed} tick(s)")
+                    registry.counter(
+                        "collector_daemon_cycles_skipped_total",
+                        "Daemon cycles skipped due to overlap",
+                    ).inc(missed)
+                    next_tick += missed * self.interval
+                self.stop_event.wait(max(0.0, next_tick - now))
+        finally:
+            self.state.close()
+            if self.sink is not None:
+                self.sink.close()
+            logger.info(f"Collector daemon stopped after {self.cycles} cycle(s)")
+
+    def stop(self, *_args) -> None:
+        """Ask the loop to exit once the current cycle finishes."""
+        if not self.stop_event.is_set():
+            logger.info("Shutdown requested, finishing current cycle")
+        self.stop_event.set()
+
+    def install_signal_handlers(self) -> None:
+        """Stop gracefully on SIGTERM (docker stop) and SIGINT."""
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
@@ -0,0 +1,215 @@
+"""Run pipeline stages as a dependency graph, overlapping independent stages."""
+
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Stage:
+    """
+    One node of the pipeline graph.
+
+    ``func`` receives a dictionary of its dependencies' results, keyed by
+    stage name, and returns this stage's result.
+    """
+
+    name: str
+    func: Callable[[Dict[str, Any]], Any]
+    deps: Sequence[str] = field(default_factory=tuple)
+
+
+@dataclass
+class StageTiming:
+    """When a stage ran, in seconds relative to the start of the graph."""
+
+    start: float
+    end: float
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+def topological_order(stages: Sequence[Stage], done: Sequence[str] = ()) -> List[str]:
+    """
+    Return stage names in dependency order.
+
+    Args:
+        stages: Stages of the graph
+        done: Names of results supplied up front, which satisfy dependencies
+
+    Raises:
+        ValueError: On duplicate names, unknown dependencies or cycles
+    """
+    by_name: Dict[str, Stage] = {}
+    for s in stages:
+        if s.name in by_name or s.name in done:
+            raise ValueError(f"Duplicate stage '{s.name}'")
+        by_name[s.name] = s
+
+    for s in stages:
+        for dep in s.deps:
+            if dep not in by_name and dep not in done:
+                raise ValueError(f"Stage '{s.name}' depends on unknown stage '{dep}'")
+
+    order: List[str] = []
+    visiting, visited = set(), set(done)
+
+    def visit(name: str, path: Tuple[str, ...]) -> None:
+        if name in visited:
+            return
+        if name in visiting:
+            raise ValueError(f"Dependency cycle: {' -> '.join(path + (name,))}")
+        visiting.add(name)
+        for dep in by_name[name].deps:
+            visit(dep, path + (name,))
+        visiting.discard(name)
+        visited.add(name)
+        order.append(name)
+
+    for s in stages:
+        visit(s.name, ())
+    return order
+
+
+class DagExecutor:
+    """
+    Run a graph of stages on a thread pool.
+
+    A stage starts as soon as all of its dependencies have finished, so
+    independent stages (fetches from different sources, raw writes next to
+    filtering) overlap. The collector's stages are dominated by network and
+    file I/O or by pandas calls that release the GIL, which is why threads
+    are enough.
+
+    If a stage fails, no new stages are started; stages already running
+    are allowed to finish and the first error is raised.
+    """
+
+    def __init__(self, stages: Sequence[Stage], max_workers: int = 4):
+        """
+        Initialize the executor.
+
+        Args:
+            stages: Stages of the graph
+            max_workers: Maximum number of stages running at once
+        """
+        self.stages = {s.name: s for s in stages}
+        self.max_workers = max(1, max_workers)
+        self.timings: Dict[str, StageTiming] = {}
+        self.wall_seconds = 0.0
+
+    def run(self, results: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Run every stage.
+
+        Args:
+            results: Results known up front (e.g. already fetched data),
+                keyed by the stage name that would otherwise produce them
+
+        Returns:
+            All results keyed by stage name, including the supplied ones
+        """
+        results = dict(results or {})
+        topological_order(list(self.stages.values()), done=list(results))
+        pending = dict(self.stages)
+        running: Dict[Future, str] = {}
+        error: Optional[BaseException] = None
+        origin = time.perf_counter()
+
+        def run_stage(stage: Stage, inputs: Dict[str, Any]) -> Any:
+            start = time.perf_counter() - origin
+            try:
+                return stage.func(inputs)
+            finally:
+                self.timings[stage.name] = StageTiming(start, time.perf_counter() - origin)
+
+        with ThreadPoolExecutor(self.max_workers, thread_name_prefix="stage") as pool:
+            while pending or running:
+                if error is None:
+                    ready = [
+                        s for s in pending.values() if all(dep in results for dep in s.deps)
+                    ]
+                    for s in ready:
+                        del pending[s.name]
+                        inputs = {dep: results[dep] for dep in s.deps}
+                        running[pool.submit(run_stage, s, inputs)] = s.name
+                if not running:
+                    break
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    try:
+                        results[name] = future.result()
+                    except Exception as e:
+                        logger.error(f"Stage {name} failed: {e}")
+                        error = error or e
+
+        self.wall_seconds = time.perf_counter() - origin
+        if error is not None:
+            raise error
+        return results
+
+    def critical_path(self) -> List[str]:
+        """
+        Return the chain of stages that determined the total wall time.
+
+        Starting from the stage that finished last, each step goes back to
+        the dependency that finished last, since that one gated the start.
+        """
+        if not self.timings:
+            return []
+        name = max(self.timings, key=lambda n: self.timings[n].end)
+        path = [name]
+        while True:
+            deps = [d for d in self.stages[name].deps if d in self.timings]
+            if not deps:
+                break
+            name = max(deps, key=lambda d: self.timings[d].end)
+            path.append(name)
+        return list(reversed(path))
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Summarize stage timings.
+
+        Returns:
+            Dictionary with wall seconds, the summed stage seconds, the
+            critical path and per-stage start/duration
+        """
+        path = self.critical_path()
+        return {
+            "wall_seconds": self.wall_seconds,
+            "stage_seconds_total": sum(t.duration for t in self.timings.values()),
+            "critical_path": path,
+            "critical_path_seconds": sum(self.timings[n].duration for n in path),
+            "stages": {
+                name: {
+                    "start": round(t.start, 6),
+                    "seconds": round(t.duration, 6),
+                    "critical": name in path,
+                }
+                for name, t in sorted(self.timings.items(), key=lambda kv: kv[1].start)
+            },
+        }
+
+    def format_summary(self) -> str:
+        """Return the timing summary as a table for logs."""
+        summary = self.summary()
+        lines = [f"{'stage':<32}{'start':>9}{'seconds':>10}  critical"]
+        for name, row in summary["stages"].items():
+            marker = "*" if row["critical"] else ""
+            lines.append(f"{name:<32}{row['start']:>9.2f}{row['seconds']:>10.2f}  {marker}")
+        lines.append(
+            f"wall {summary['wall_seconds']:.2f}s, critical path "
+            f"{summary['critical_path_seconds']:.2f}s, stages total "
+            f"{summary['stage_seconds_total']:.2f}s"
+        )
+        return "\n".join(lines)
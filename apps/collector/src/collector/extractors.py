@@ -4,6 +4,10 @@ import logging
 import re
 from typing import List, Dict, Any, Optional
 
+from collector.contacts import (
+    ContactIndex, Name, canonical_name, canonical_parts, company_key, contact_id
+)
+
 logger = logging.getLogger(__name__)
 
 class DecisionMakerExtractor:
@@ -31,38 +35,38 @@ class DecisionMakerExtractor:
         Returns:
             List of dictionaries with decision maker information
         """
-        decision_makers = []
+        contacts = ContactIndex()
+        key = company_key(company_data)
         
         # Try to extract from people/employees field if available
         if 'people' in company_data:
             people = company_data.get('people', [])
+            # DataFrame rows carry NaN where a company has no people list
+            if not isinstance(people, list):
+                people = []
             for person in people:
                 if self._is_decision_maker(person.get('title', '')):
-                    decision_makers.append({
-                        'name': f"{person.get('first_name', '')} {person.get('last_name', '')}",
-                        'title': person.get('title', ''),
-                        'role': self._categorize_role(person.get('title', '')),
-                        'source': 'company_api'
-                    })
+                    name = canonical_parts(person.get('first_name'), person.get('last_name'))
+                    self._add(contacts, key, name, person.get('title', ''), 'company_api')
         
         # Try to extract from team/leadership field if available
         if 'team' in company_data:
             team = company_data.get('team', [])
+            if not isinstance(team, list):
+                team = []
             for member in team:
                 if self._is_decision_maker(member.get('title', '')):
-                    decision_makers.append({
-                        'name': member.get('name', ''),
-                        'title': member.get('title', ''),
-                        'role': self._categorize_role(member.get('title', '')),
-                        'source': 'company_api'
-                    })
+                    name = canonical_name(member.get('name'))
+                    self._add(contacts, key, name, member.get('title', ''), 'company_api')
         
         # Extract from description as fallback
-        if len(decision_makers) == 0 and 'description' in company_data:
-            description_execs = self._extract_from_description(company_data.get('description', ''))
-            decision_makers.extend(description_execs)
+        if len(contacts) == 0 and 'description' in company_data:
+            for executive in self._extract_from_description(company_data.get('description', '')):
+                name = canonical_name(executive['name'])
+                self._add(contacts, key, name, executive['title'], executive['source'])
         
         # Add company info to each decision maker
+        decision_makers = list(contacts)
         company_name = company_data.get('name', '')
         for dm in decision_makers:
             dm['company_name'] = company_name
@@ -70,6 +74,31 @@ class DecisionMakerExtractor:
         
         return decision_makers
     
+    def _add(
+        self, contacts: ContactIndex, company: str, name: Optional[Name], title: str, source: str
+    ) -> None:
+        """
+        Add a decision maker, merging repeats of the same person
+        
+        Args:
+            contacts: Decision makers found so far for the company
+            company: The company's key (see ``contacts.company_key``)
+            name: Canonical name; people without one are skipped
+            title: Job title
+            source: Where the person was found
+        """
+        if name is None:
+            return
+        contacts.add({
+            'id': contact_id(company, name),
+            'name': name.full,
+            'first_name': name.first,
+            'last_name': name.last,
+            'title': title,
+            'role': self._categorize_role(title),
+            'source': source
+        })
+    
     def _is_decision_maker(self, title: Optional[str]) -> bool:
         """
         Check if title indicates a decision maker
@@ -135,7 +164,7 @@ class DecisionMakerExtractor:
         Returns:
             List of extracted decision makers
         """
-        if not description:
+        if not description or not isinstance(description, str):
             return []
         
         executives = []
@@ -17,6 +17,8 @@ class LocationFilter:
         """
         self.target_locations = [loc.lower() for loc in target_locations]
         self.location_cache = {}  # Cache to avoid repeated lookups
+        self.cache_hits = 0
+        self.cache_misses = 0
     
     def is_in_target_location(self, company_location: Optional[str]) -> bool:
         """
@@ -35,8 +37,11 @@ class LocationFilter:
         
         # Check cache first
         if company_location in self.location_cache:
+            self.cache_hits += 1
             return self.location_cache[company_location]
         
+        self.cache_misses += 1
+        
         # Direct string match check
         for target in self.target_locations:
             if target in company_location or company_location in target:
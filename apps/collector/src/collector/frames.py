@@ -0,0 +1,140 @@
+"""Memory accounting for the DataFrames the collector holds.
+
+Each fetched frame's deep size is exported as
+``collector_frame_bytes{source}``. With ``pipeline.memory_budget_mb`` set,
+a warning names the largest columns whenever the frames held by a run
+exceed the budget. The same per-column report is available offline for
+CSV or Parquet outputs:
+
+    python -m collector.frames ../../data/raw/sec_data.csv --budget-mb 256
+"""
+
+import argparse
+import logging
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from common.metrics import registry
+
+
+logger = logging.getLogger(__name__)
+
+
+def frame_memory(df: pd.DataFrame) -> Dict[str, int]:
+    """
+    Measure the deep memory use of a DataFrame.
+
+    Args:
+        df: Frame to measure
+
+    Returns:
+        Column name to bytes, with the index under ``"Index"``
+    """
+    return {str(k): int(v) for k, v in df.memory_usage(deep=True, index=True).items()}
+
+
+def format_memory(df: pd.DataFrame, name: str = "frame") -> str:
+    """Return a per-column table of dtypes and bytes, largest first."""
+    usage = frame_memory(df)
+    total = sum(usage.values())
+    rows = max(len(df), 1)
+    lines = [f"{name}: {len(df)} rows, {total / 2**20:.1f} MiB"]
+    lines.append(f"  {'column':<40}{'dtype':<18}{'MiB':>9}{'bytes/row':>11}")
+    for column, size in sorted(usage.items(), key=lambda kv: kv[1], reverse=True):
+        dtype = str(df[column].dtype) if column in df.columns else "index"
+        lines.append(f"  {column[:39]:<40}{dtype[:17]:<18}{size / 2**20:>9.2f}{size / rows:>11.1f}")
+    return "\n".join(lines)
+
+
+class MemoryBudget:
+    """
+    Track the frames held by one run against an optional budget.
+
+    Stages may run concurrently, so recording is thread-safe.
+    """
+
+    def __init__(self, budget_mb: Optional[float] = None):
+        """
+        Initialize the budget.
+
+        Args:
+            budget_mb: Warn once the recorded frames exceed this many MiB
+                (None only records sizes)
+        """
+        self.budget_bytes = int(budget_mb * 2**20) if budget_mb else None
+        self.frames: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, df: pd.DataFrame) -> int:
+        """
+        Record the size of a frame.
+
+        Args:
+            name: Frame name (the source, for fetched frames)
+            df: The frame
+
+        Returns:
+            Its deep size in bytes
+        """
+        size = sum(frame_memory(df).values())
+        with self._lock:
+            self.frames[name] = size
+            total = sum(self.frames.values())
+        registry.gauge("collector_frame_bytes", "Deep memory size of fetched frames").set(
+            size, source=name
+        )
+        if self.budget_bytes is not None and total > self.budget_bytes:
+            logger.warning(
+                f"Frames use {total / 2**20:.1f} MiB, over the "
+                f"{self.budget_bytes / 2**20:.0f} MiB budget\n{format_memory(df, name)}"
+            )
+        return size
+
+
+def concat_frames(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Concatenate frames, keeping categorical columns categorical.
+
+    ``pd.concat`` falls back to object dtype when the frames' categories
+    differ, which would undo a compact schema.
+    """
+    frames = [f for f in frames if len(f.columns)]
+    if not frames:
+        return pd.DataFrame()
+    merged = pd.concat(frames, ignore_index=True)
+    for column in frames[0].columns:
+        parts = [f[column] for f in frames if column in f.columns]
+        if len(parts) == len(frames) and all(
+            isinstance(p.dtype, pd.CategoricalDtype) for p in parts
+        ):
+            merged[column] = union_categoricals(parts, ignore_order=True)
+    return merged
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entrypoint: ``python -m collector.frames FILE... [--budget-mb N]``."""
+    parser = argparse.ArgumentParser(description="Report the in-memory size of output files")
+    parser.add_argument("paths", nargs="+", type=Path, help="CSV or Parquet files")
+    parser.add_argument("--budget-mb", type=float, help="Exit non-zero if the total exceeds this")
+    args = parser.parse_args(argv)
+
+    total = 0
+    for path in args.paths:
+        df = pd.read_parquet(path) if path.suffix == ".parquet" else pd.read_csv(path)
+        total += sum(frame_memory(df).values())
+        print(format_memory(df, str(path)))
+        print(f"  on disk: {path.stat().st_size / 2**20:.2f} MiB")
+    print(f"total in memory: {total / 2**20:.1f} MiB")
+    if args.budget_mb is not None and total > args.budget_mb * 2**20:
+        print(f"over the {args.budget_mb:.0f} MiB budget")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
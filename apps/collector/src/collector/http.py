@@ -0,0 +1,122 @@
+"""Instrumented HTTP helpers shared by the collector sources and enricher providers."""
+
+import logging
+import time
+from typing import Any, Callable, Optional
+
+import requests
+
+from common.metrics import registry
+
+
+logger = logging.getLogger(__name__)
+
+# Status codes worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Upper bound on any single backoff, including server-provided Retry-After
+MAX_BACKOFF_SECONDS = 60.0
+
+
+def _retry_after(response: Optional[requests.Response], attempt: int) -> float:
+    """Seconds to wait before the next attempt."""
+    if response is not None:
+        header = response.headers.get("Retry-After")
+        if header:
+            try:
+                return min(float(header), MAX_BACKOFF_SECONDS)
+            except ValueError:
+                pass  # HTTP-date form; fall back to exponential backoff
+    return min(2.0 ** attempt, MAX_BACKOFF_SECONDS)
+
+
+def get(
+    url: str,
+    source: str,
+    session: Optional[requests.Session] = None,
+    max_retries: int = 2,
+    **kwargs: Any,
+) -> requests.Response:
+    """
+    Perform a GET request, recording request metrics for ``source``.
+
+    429 and 5xx responses and connection errors are retried up to
+    ``max_retries`` times, honoring ``Retry-After`` when the server sends it.
+
+    Args:
+        url: URL to fetch
+        source: Source name used as the metrics label (e.g. "sec")
+        session: Optional session to reuse connections
+        max_retries: Number of retries after the first attempt
+        **kwargs: Passed through to ``requests.get``
+
+    Returns:
+        The final response (which may still be an error status).
+
+    Raises:
+        requests.exceptions.RequestException: If the last attempt failed
+            without a response.
+    """
+    fetch = session.get if session is not None else requests.get
+    return _send(fetch, url, source, max_retries, **kwargs)
+
+
+def post(
+    url: str,
+    source: str,
+    session: Optional[requests.Session] = None,
+    max_retries: int = 2,
+    **kwargs: Any,
+) -> requests.Response:
+    """
+    Perform a POST request with the metrics and retries of ``get``.
+
+    Only use it for requests that are safe to repeat, such as batch lookups.
+    """
+    fetch = session.post if session is not None else requests.post
+    return _send(fetch, url, source, max_retries, **kwargs)
+
+
+def _send(
+    fetch: Callable[..., requests.Response],
+    url: str,
+    source: str,
+    max_retries: int,
+    **kwargs: Any,
+) -> requests.Response:
+    requests_total = registry.counter(
+        "collector_source_requests_total", "HTTP requests made by sources"
+    )
+    bytes_total = registry.counter(
+        "collector_source_bytes_total", "Response body bytes received by sources"
+    )
+    retries_total = registry.counter(
+        "collector_source_retries_total", "HTTP requests retried by sources"
+    )
+    latency = registry.histogram(
+        "collector_source_request_seconds", "HTTP request latency by source"
+    )
+
+    attempt = 0
+    while True:
+        start = time.perf_counter()
+        response = None
+        try:
+            response = fetch(url, **kwargs)
+        except requests.exceptions.RequestException:
+            latency.observe(time.perf_counter() - start, source=source)
+            requests_total.inc(source=source, status="error")
+            if attempt >= max_retries:
+                raise
+        else:
+            latency.observe(time.perf_counter() - start, source=source)
+            requests_total.inc(source=source, status=response.status_code)
+            bytes_total.inc(len(response.content), source=source)
+            if response.status_code not in RETRY_STATUSES or attempt >= max_retries:
+                return response
+
+        delay = _retry_after(response, attempt)
+        attempt += 1
+        retries_total.inc(source=source)
+        logger.debug("Retrying %s in %.1fs (attempt %d)", url, delay, attempt)
+        time.sleep(delay)
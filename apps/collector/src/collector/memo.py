@@ -0,0 +1,329 @@
+"""On-disk memoization of pipeline stage outputs, keyed by content hashes.
+
+A stage's cache key hashes its name, the config values it reads, the
+source code it runs and the content hashes of its inputs. A rerun after
+changing ``target_locations`` therefore reuses the fetched data and only
+recomputes the filter stages and what depends on them, much like a
+build system.
+
+Entries live under ``<cache_dir>/<key[:2]>/<key>.pkl`` with a JSON
+sidecar describing them. Inspect and prune the cache with::
+
+    python -m collector.memo list
+    python -m collector.memo gc --max-age-days 14 --max-size-mb 2048
+"""
+
+import argparse
+import hashlib
+import inspect
+import json
+import logging
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from common.metrics import registry
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path("../../data/cache/stages")
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def code_version(*objects: Any) -> str:
+    """
+    Hash the source code of modules or functions.
+
+    Args:
+        *objects: Modules, classes or functions a stage runs
+
+    Returns:
+        Hex digest that changes whenever any of their source changes
+    """
+    digest = hashlib.sha256()
+    for obj in objects:
+        try:
+            digest.update(inspect.getsource(obj).encode())
+        except (OSError, TypeError):
+            digest.update(repr(obj).encode())
+    return digest.hexdigest()
+
+
+class StageCache:
+    """
+    Content-addressed store of stage outputs.
+
+    Outputs are pickled. The content hash of every value produced or
+    loaded during a run is remembered, so downstream keys are built from
+    input hashes without re-serializing the inputs.
+    """
+
+    def __init__(self, cache_dir: Path, fetch_ttl: Optional[float] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding cache entries
+            fetch_ttl: Seconds a fetch stage's output stays valid; source
+                data changes upstream, unlike the derived stages (None keeps
+                it until garbage collection)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.fetch_ttl = fetch_ttl
+        self._hashes: Dict[int, Tuple[Any, str]] = {}
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> Optional["StageCache"]:
+        """Build the cache from the ``memo`` config section, or None if disabled."""
+        memo_config = config.get("memo", {})
+        if not memo_config.get("enabled", False):
+            return None
+        return cls(
+            Path(memo_config.get("cache_dir", DEFAULT_CACHE_DIR)),
+            fetch_ttl=memo_config.get("fetch_ttl_seconds", 86400),
+        )
+
+    def _paths(self, key: str) -> Tuple[Path, Path]:
+        base = self.cache_dir / key[:2] / key
+        return base.with_suffix(".pkl"), base.with_suffix(".json")
+
+    def content_hash(self, value: Any) -> str:
+        """Return the content hash of a value, computing it if unknown."""
+        known = self._hashes.get(id(value))
+        if known is not None and known[0] is value:
+            return known[1]
+        content = _sha256(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        self._hashes[id(value)] = (value, content)
+        return content
+
+    def key(self, stage: str, config_part: Any, code: str, inputs: Dict[str, Any]) -> str:
+        """
+        Compute a stage's cache key.
+
+        Args:
+            stage: Stage name
+            config_part: The config values the stage reads (JSON-serializable)
+            code: Code version of the stage, see ``code_version``
+            inputs: The stage's input values by dependency name
+        """
+        payload = {
+            "stage": stage,
+            "config": config_part,
+            "code": code,
+            "inputs": {name: self.content_hash(value) for name, value in sorted(inputs.items())},
+        }
+        return _sha256(json.dumps(payload, sort_keys=True, default=str).encode())
+
+    def get(self, key: str, max_age: Optional[float] = None) -> Tuple[bool, Any]:
+        """
+        Load an entry.
+
+        Args:
+            key: Cache key
+            max_age: Treat entries older than this many seconds as missing
+
+        Returns:
+            Tuple of (hit, value)
+        """
+        data_path, meta_path = self._paths(key)
+        try:
+            meta = json.loads(meta_path.read_text())
+            if max_age is not None and time.time() - meta["created_at"] > max_age:
+                return False, None
+            with open(data_path, "rb") as f:
+                value = pickle.load(f)
+        except (OSError, ValueError, KeyError, pickle.UnpicklingError, EOFError):
+            return False, None
+        os.utime(data_path)  # last access, used by gc
+        self._hashes[id(value)] = (value, meta["content_hash"])
+        return True, value
+
+    def put(self, key: str, stage: str, value: Any) -> None:
+        """Store an entry atomically."""
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        content = _sha256(data)
+        self._hashes[id(value)] = (value, content)
+        data_path, meta_path = self._paths(key)
+        data_path.parent.mkdir(parents=True, exist_ok=True)
+        meta = {
+            "stage": stage,
+            "created_at": time.time(),
+            "size_bytes": len(data),
+            "content_hash": content,
+        }
+        for path, payload in ((data_path, data), (meta_path, json.dumps(meta).encode())):
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(payload)
+                os.replace(tmp_name, path)
+            except BaseException:
+                os.unlink(tmp_name)
+                raise
+
+    def memoize(
+        self,
+        stage: str,
+        func: Callable[[Dict[str, Any]], Any],
+        config_part: Any,
+        code: str,
+        max_age: Optional[float] = None,
+    ) -> Callable[[Dict[str, Any]], Any]:
+        """
+        Wrap a stage function so its output is served from the cache when possible.
+
+        Args:
+            stage: Stage name
+            func: Stage function taking its inputs by dependency name
+            config_part: The config values the stage reads
+            code: Code version of the stage
+            max_age: Maximum entry age in seconds
+
+        Returns:
+            The wrapped stage function
+        """
+        hits = registry.counter("collector_memo_hits_total", "Stage outputs served from cache")
+        misses = registry.counter("collector_memo_misses_total", "Stage outputs recomputed")
+
+        def run(inputs: Dict[str, Any]) -> Any:
+            key = self.key(stage, config_part, code, inputs)
+            hit, value = self.get(key, max_age)
+            if hit:
+                hits.inc(stage=stage)
+                logger.info(f"Stage {stage}: reusing cached output {key[:12]}")
+                return value
+            misses.inc(stage=stage)
+            value = func(inputs)
+            try:
+                self.put(key, stage, value)
+            except (OSError, pickle.PicklingError) as e:
+                logger.warning(f"Stage {stage}: could not cache output: {e}")
+            return value
+
+        return run
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Return metadata of every entry, newest first."""
+        entries = []
+        for meta_path in self.cache_dir.glob("*/*.json"):
+            data_path = meta_path.with_suffix(".pkl")
+            try:
+                meta = json.loads(meta_path.read_text())
+                last_used = data_path.stat().st_mtime
+            except (OSError, ValueError):
+                continue
+            meta.update(key=meta_path.stem, last_used=last_used)
+            entries.append(meta)
+        return sorted(entries, key=lambda e: e["created_at"], reverse=True)
+
+    def remove(self, keys: Iterable[str]) -> int:
+        """Delete entries by key and return how many were removed."""
+        removed = 0
+        for key in keys:
+            for path in self._paths(key):
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    continue
+            removed += 1
+        return removed
+
+    def gc(self, max_age: Optional[float] = None, max_bytes: Optional[int] = None) -> int:
+        """
+        Remove stale entries.
+
+        Args:
+            max_age: Remove entries not used for this many seconds
+            max_bytes: Then remove least recently used entries until the
+                cache fits in this many bytes
+
+        Returns:
+            Number of entries removed
+        """
+        entries = sorted(self.entries(), key=lambda e: e["last_used"])
+        now = time.time()
+        doomed = []
+        if max_age is not None:
+            doomed = [e for e in entries if now - e["last_used"] > max_age]
+            entries = [e for e in entries if now - e["last_used"] <= max_age]
+        if max_bytes is not None:
+            total = sum(e["size_bytes"] for e in entries)
+            for entry in entries:
+                if total <= max_bytes:
+                    break
+                doomed.append(entry)
+                total -= entry["size_bytes"]
+        return self.remove(e["key"] for e in doomed)
+
+    def clear(self) -> None:
+        """Delete the whole cache directory."""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entrypoint: ``python -m collector.memo {list,stats,gc,clear}``."""
+    parser = argparse.ArgumentParser(description="Inspect and prune the stage cache")
+    parser.add_argument("--config", help="Collector config (for memo.cache_dir)")
+    parser.add_argument("--cache-dir", type=Path, help="Cache directory (overrides the config)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("list", help="List cache entries")
+    subparsers.add_parser("stats", help="Show entry counts and sizes per stage")
+    gc = subparsers.add_parser("gc", help="Remove old or least recently used entries")
+    gc.add_argument("--max-age-days", type=float, help="Remove entries unused for this long")
+    gc.add_argument("--max-size-mb", type=float, help="Shrink the cache below this size")
+    subparsers.add_parser("clear", help="Remove every entry")
+    args = parser.parse_args(argv)
+
+    cache_dir = args.cache_dir
+    if cache_dir is None:
+        config: Dict[str, Any] = {}
+        if args.config:
+            from collector.config import load_config
+            config = load_config(args.config)
+        cache_dir = Path(config.get("memo", {}).get("cache_dir", DEFAULT_CACHE_DIR))
+    cache = StageCache(cache_dir)
+
+    if args.command == "list":
+        print(f"{'key':<14}{'stage':<28}{'size KiB':>10}  {'created':<20}{'last used':<20}")
+        for e in cache.entries():
+            print(
+                f"{e['key'][:12]:<14}{e['stage']:<28}{e['size_bytes'] / 1024:>10.1f}  "
+                f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(e['created_at'])):<20}"
+                f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(e['last_used'])):<20}"
+            )
+    elif args.command == "stats":
+        per_stage: Dict[str, List[int]] = {}
+        for e in cache.entries():
+            count_size = per_stage.setdefault(e["stage"], [0, 0])
+            count_size[0] += 1
+            count_size[1] += e["size_bytes"]
+        print(f"{'stage':<28}{'entries':>8}{'MiB':>10}")
+        for stage, (count, size) in sorted(per_stage.items()):
+            print(f"{stage:<28}{count:>8}{size / 2**20:>10.1f}")
+        total = sum(size for _, size in per_stage.values())
+        print(f"{'total':<28}{sum(c for c, _ in per_stage.values()):>8}{total / 2**20:>10.1f}")
+    elif args.command == "gc":
+        if args.max_age_days is None and args.max_size_mb is None:
+            parser.error("gc needs --max-age-days and/or --max-size-mb")
+        removed = cache.gc(
+            max_age=args.max_age_days * 86400 if args.max_age_days is not None else None,
+            max_bytes=int(args.max_size_mb * 2**20) if args.max_size_mb is not None else None,
+        )
+        print(f"Removed {removed} entries from {cache.cache_dir}")
+    elif args.command == "clear":
+        cache.clear()
+        print(f"Cleared {cache.cache_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
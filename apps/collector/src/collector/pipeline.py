@@ -0,0 +1,639 @@
+"""Collector pipeline stages shared by the CLI, sharded runs and the daemon."""
+
+import logging
+import sys
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+import pandas as pd
+import requests
+
+from common.metrics import registry
+from collector import campaigns, contacts, extractors, filters, http, predicates, scoring
+from collector.campaigns import CampaignSet
+from collector.cdc import ChangeCapture
+from collector.contacts import ContactIndex
+from collector.dag import DagExecutor, Stage
+from collector.frames import MemoryBudget
+from collector.memo import StageCache, code_version
+from collector.sources import enabled_sources, load_source
+from collector.store import ColumnarStore
+from collector.suppression import SuppressionSet
+from collector.storage import save_to_csv, save_to_json
+from collector.storage.postgres import PostgresSink
+from collector.filters import LocationFilter
+from collector.extractors import DecisionMakerExtractor
+from collector.profiling import Profiler
+
+
+logger = logging.getLogger(__name__)
+
+class LRUCache(OrderedDict):
+    """A dictionary that evicts its least recently used entries past ``maxsize``."""
+    
+    def __init__(self, maxsize: int = 1024):
+        super().__init__()
+        self.maxsize = maxsize
+    
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+    
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while len(self) > self.maxsize:
+            self.popitem(last=False)
+
+
+class CollectorState:
+    """
+    Objects that stay warm across collection cycles in one process.
+    
+    A one-shot run builds everything from scratch. The daemon keeps one
+    instance for its lifetime, so HTTP connections, the location filter's
+    lookup cache, the decision maker extractor and each source's cache
+    (parsed SEC daily indexes, for instance) are reused by every cycle.
+    """
+    
+    def __init__(self, index_cache_size: int = 512):
+        """
+        Initialize empty state.
+        
+        Args:
+            index_cache_size: Number of entries kept in each source's cache
+        """
+        self.sessions: Dict[str, requests.Session] = {}
+        self.caches: Dict[str, LRUCache] = {}
+        self.index_cache_size = index_cache_size
+        self.extractor = DecisionMakerExtractor()
+        self._location_filters = LRUCache(maxsize=64)
+    
+    def session(self, source: str) -> requests.Session:
+        """Return the pooled HTTP session for ``source``."""
+        if source not in self.sessions:
+            self.sessions[source] = requests.Session()
+        return self.sessions[source]
+    
+    def cache(self, source: str) -> LRUCache:
+        """Return the cache handed to ``source``'s collect function."""
+        if source not in self.caches:
+            self.caches[source] = LRUCache(self.index_cache_size)
+        return self.caches[source]
+    
+    def location_filter(self, target_locations: List[str]) -> LocationFilter:
+        """Return a location filter, reusing a cached one with the same targets."""
+        key = tuple(loc.lower() for loc in target_locations)
+        if key not in self._location_filters:
+            self._location_filters[key] = LocationFilter(target_locations)
+        return self._location_filters[key]
+    
+    def close(self) -> None:
+        """Close pooled HTTP sessions."""
+        for session in self.sessions.values():
+            session.close()
+        self.sessions.clear()
+
+
+@contextmanager
+def stage(name: str, profiler: Optional[Profiler] = None):
+    """
+    Time a pipeline stage into ``collector_stage_seconds``.
+    
+    Args:
+        name: Stage name used as the metrics label and profile file name
+        profiler: If given, also capture a CPU and memory profile of the stage
+    """
+    with registry.timer(
+        "collector_stage_seconds", "Wall-clock time per pipeline stage", stage=name
+    ):
+        if profiler is None:
+            yield
+        else:
+            with profiler.stage(name):
+                yield
+
+
+def write_run_report(
+    config: Dict[str, Any], started: float, success: bool, **extra: Any
+) -> None:
+    """
+    Write the run's metrics as a JSON report and a Prometheus textfile.
+
+    Paths come from the ``metrics`` config section and default to files in
+    the output directory.
+    
+    Args:
+        config: Collector configuration
+        started: ``time.time()`` at the start of the run
+        success: Whether the run completed without error
+        **extra: Additional top-level report fields (e.g. stage timings)
+    """
+    metrics_config = config.get("metrics", {})
+    if metrics_config.get("enabled", True) is False:
+        return
+    
+    finished = time.time()
+    duration = finished - started
+    registry.gauge(
+        "collector_last_run_timestamp_seconds", "Unix time the last run finished"
+    ).set(finished)
+    registry.gauge(
+        "collector_last_run_success", "1 if the last run completed without error"
+    ).set(1 if success else 0)
+    registry.gauge(
+        "collector_last_run_duration_seconds", "Wall-clock duration of the last run"
+    ).set(duration)
+    
+    output_dir = Path(config.get("output_dir", "../../data/raw"))
+    report_path = Path(metrics_config.get("report_path", output_dir / "run_report.json"))
+    textfile_path = Path(metrics_config.get("textfile_path", output_dir / "collector.prom"))
+    
+    try:
+        registry.write_json_report(
+            report_path,
+            started_at=datetime.fromtimestamp(started).isoformat(),
+            finished_at=datetime.fromtimestamp(finished).isoformat(),
+            duration_seconds=duration,
+            success=success,
+            start_date=config.get("start_date"),
+            end_date=config.get("end_date"),
+            **extra,
+        )
+        registry.write_prometheus_textfile(textfile_path)
+        logger.info(f"Wrote run report to {report_path} and metrics to {textfile_path}")
+    except OSError as e:
+        logger.error(f"Failed to write run report: {e}")
+
+
+def filter_df_by_location(df: pd.DataFrame, location_filter: LocationFilter) -> pd.DataFrame:
+    """
+    Filter DataFrame by location
+    
+    Args:
+        df: DataFrame to filter
+        location_filter: LocationFilter instance
+        
+    Returns:
+        Filtered DataFrame
+    """
+    if df.empty:
+        return df
+        
+    # Determine location column based on DataFrame structure
+    location_col = None
+    potential_cols = ['headquarters', 'hq_location', 'location', 'city', 'address']
+    for col in potential_cols:
+        if col in df.columns:
+            location_col = col
+            break
+    
+    if not location_col:
+        logger.warning("No location column found for location filtering")
+        return df
+        
+    # Apply filter (one lookup per distinct location)
+    mask = predicates.location_mask(df[location_col], location_filter)
+    filtered_df = df[mask]
+    
+    registry.counter(
+        "collector_filter_rows_in_total", "Rows entering a filter"
+    ).inc(len(df), filter="location")
+    registry.counter(
+        "collector_filter_rows_out_total", "Rows passing a filter"
+    ).inc(len(filtered_df), filter="location")
+    logger.info(f"Filtered {len(df)} companies down to {len(filtered_df)} based on location")
+    return filtered_df
+
+
+def extract_decision_makers_from_dfs(
+    dfs: List[pd.DataFrame], extractor: Optional[DecisionMakerExtractor] = None
+) -> List[Dict[str, Any]]:
+    """
+    Extract decision makers from a list of DataFrames
+    
+    Args:
+        dfs: List of company DataFrames
+        extractor: Extractor to reuse; a new one is created if not given
+        
+    Returns:
+        List of companies with decision makers
+    """
+    extractor = extractor or DecisionMakerExtractor()
+    companies_with_decision_makers = []
+    # The same person under the Crunchbase and SEC records of one company
+    # gets the same contact ID; only the first record keeps them
+    seen = ContactIndex(scope="run")
+    
+    for df in dfs:
+        if df.empty:
+            continue
+            
+        for _, company in df.iterrows():
+            company_dict = company.to_dict()
+            decision_makers = [
+                dm for dm in extractor.extract_decision_makers(company_dict) if seen.add(dm)
+            ]
+            
+            if decision_makers:
+                companies_with_decision_makers.append({
+                    'company': company_dict,
+                    'decision_makers': decision_makers
+                })
+    
+    registry.counter(
+        "collector_extract_companies_in_total", "Companies scanned for decision makers"
+    ).inc(sum(len(df) for df in dfs))
+    registry.counter(
+        "collector_extract_companies_out_total", "Companies with at least one decision maker"
+    ).inc(len(companies_with_decision_makers))
+    registry.counter(
+        "collector_extract_decision_makers_total", "Decision makers extracted"
+    ).inc(sum(len(c['decision_makers']) for c in companies_with_decision_makers))
+    
+    logger.info(f"Found {len(companies_with_decision_makers)} companies with decision makers")
+    return companies_with_decision_makers
+
+
+def _fetch_stage(
+    name: str,
+    config: Dict[str, Any],
+    profiler: Optional[Profiler],
+    state: Optional[CollectorState],
+    memo: Optional[StageCache] = None,
+    budget: Optional[MemoryBudget] = None,
+) -> Stage:
+    """Build the stage that collects one source."""
+    collect = load_source(name)
+    budget = budget or MemoryBudget()
+    
+    def fetch(inputs: Dict[str, Any]) -> pd.DataFrame:
+        logger.info(f"Collecting data from {name}")
+        with stage(f"fetch_{name}", profiler):
+            if state is None:
+                df = collect(config)
+            else:
+                df = collect(config, session=state.session(name), cache=state.cache(name))
+        registry.counter(
+            "collector_source_records_total", "Records returned by each source"
+        ).inc(len(df), source=name)
+        budget.record(name, df)
+        return df
+    
+    if memo is not None:
+        config_part = {
+            "source": (config.get("sources") or {}).get(name),
+            "start_date": config.get("start_date"),
+            "end_date": config.get("end_date"),
+            "sec_target_forms": config.get("sec_target_forms"),
+            # Filters are pushed down into source queries
+            "filters": config.get("filters"),
+            "min_funding_amount": (config.get("collection") or {}).get("min_funding_amount"),
+            "campaigns": config.get("campaigns"),
+        }
+        code = code_version(sys.modules[collect.__module__], http)
+        fetch = memo.memoize(f"fetch_{name}", fetch, config_part, code, memo.fetch_ttl)
+    return Stage(f"fetch_{name}", fetch)
+
+
+def _processing_stages(
+    config: Dict[str, Any],
+    source_names: List[str],
+    profiler: Optional[Profiler],
+    state: Optional[CollectorState],
+    memo: Optional[StageCache] = None,
+    cdc: Optional[ChangeCapture] = None,
+    sink: Optional[PostgresSink] = None,
+) -> List[Stage]:
+    """
+    Build the filter, extract and write stages for fetched sources.
+    
+    Each source gets its own raw-write, filter and filtered-write stages,
+    so a source's raw CSV is written while it (or another source) is still
+    being filtered. Extraction waits for every filter stage. With ``memo``,
+    filter and extract outputs are served from the stage cache when their
+    inputs, config and code are unchanged; writes always run.
+    
+    With ``cdc``, a ``cdc_<source>`` stage between fetch and filter drops
+    records unchanged since the last run, so only the delta reaches the
+    interim outputs. Raw outputs stay full snapshots. The fingerprint
+    indexes are committed by a final stage after every write succeeded.
+    
+    With ``suppression.enabled``, a ``suppress_<source>`` stage right
+    after the fetch drops companies and people that were already
+    contacted, before change detection, filtering and extraction.
+    
+    With ``store.enabled``, a ``write_store_<source>`` stage merges each
+    fetched frame into the local columnar store for indexed lookups.
+    
+    With ``scoring.enabled``, a ``score`` stage keeps the ``top_k``
+    highest-priority companies (per campaign, with campaigns) and
+    ``write_leads`` writes them ranked to ``leads.json``.
+    
+    With ``sink``, a ``write_postgres`` stage upserts the extracted
+    companies and decision makers into PostgreSQL. Under CDC that is the
+    delta only, and a failed load leaves the indexes uncommitted so the
+    next run retries it.
+    
+    With ``campaigns`` configured, each filter stage evaluates every
+    campaign in one pass and tags records with the campaigns they match;
+    extraction runs once over the tagged records and the write stages
+    also write each campaign's slice under ``<interim_dir>/campaigns/``.
+    """
+    campaign_set = CampaignSet.from_config(config, state.location_filter if state else None)
+    
+    # Initialize location filter from config
+    target_locations = config.get("target_locations", [])
+    location_filter = None
+    if campaign_set is not None:
+        logger.info(
+            f"Evaluating {len(campaign_set.names)} campaigns: {', '.join(campaign_set.names)}"
+        )
+    elif target_locations:
+        logger.info(f"Filtering companies by locations: {', '.join(target_locations)}")
+        if state is None:
+            location_filter = LocationFilter(target_locations)
+        else:
+            location_filter = state.location_filter(target_locations)
+    else:
+        logger.info("No target locations specified, skipping location filtering")
+    
+    # Location plus the configured funding, round, date, industry and size filters
+    row_filter = predicates.from_config(config, location_filter)
+    filter_config = {
+        "target_locations": target_locations,
+        "filters": config.get("filters"),
+        "min_funding_amount": (config.get("collection") or {}).get("min_funding_amount"),
+        "end_date": config.get("end_date"),  # anchors filters.funded_within_days
+        "campaigns": config.get("campaigns"),
+    }
+    
+    output_dir = Path(config.get("output_dir", "../../data/raw"))
+    output_dir.mkdir(parents=True, exist_ok=True)
+    
+    interim_dir = Path(config.get("interim_dir", "../../data/interim"))
+    interim_dir.mkdir(parents=True, exist_ok=True)
+    
+    store = ColumnarStore.from_config(config)
+    suppression = SuppressionSet.from_config(config)
+    
+    stages = []
+    for name in source_names:
+        fetched = f"fetch_{name}"
+        upstream = fetched
+        
+        def write_raw(inputs, name=name, fetched=fetched):
+            with stage(f"write_raw_{name}", profiler):
+                save_to_csv(inputs[fetched], output_dir / f"{name}_data.csv")
+        
+        if store is not None:
+            def write_store(inputs, name=name, fetched=fetched):
+                with stage(f"write_store_{name}", profiler):
+                    store.write(name, inputs[fetched])
+            
+            stages.append(Stage(f"write_store_{name}", write_store, (fetched,)))
+        
+        if suppression is not None:
+            def suppress(inputs, name=name, fetched=fetched):
+                with stage(f"suppress_{name}", profiler):
+                    return suppression.apply(inputs[fetched], name)
+            
+            upstream = f"suppress_{name}"
+            stages.append(Stage(upstream, suppress, (fetched,)))
+        
+        if cdc is not None:
+            def capture(inputs, name=name, source_stage=upstream):
+                with stage(f"cdc_{name}", profiler):
+                    return cdc.delta(name, inputs[source_stage])
+            
+            stages.append(Stage(f"cdc_{name}", capture, (upstream,)))
+            upstream = f"cdc_{name}"
+        
+        def filter_source(inputs, name=name, upstream=upstream):
+            with stage(f"filter_{name}", profiler):
+                if campaign_set is not None:
+                    return campaign_set.tag(inputs[upstream], name)
+                return predicates.apply_filter(inputs[upstream], row_filter, name)
+        
+        def write_filtered(inputs, name=name):
+            with stage(f"write_filtered_{name}", profiler):
+                filtered = inputs[f"filter_{name}"]
+                save_to_csv(filtered, interim_dir / f"filtered_{name}_data.csv")
+                for campaign in campaign_set.names if campaign_set else []:
+                    save_to_csv(
+                        campaign_set.select(filtered, campaign),
+                        interim_dir / "campaigns" / campaign / f"filtered_{name}_data.csv",
+                    )
+        
+        if memo is not None:
+            filter_source = memo.memoize(
+                f"filter_{name}",
+                filter_source,
+                filter_config,
+                code_version(filters, predicates, campaigns),
+            )
+        
+        stages.extend([
+            Stage(f"write_raw_{name}", write_raw, (fetched,)),
+            Stage(f"filter_{name}", filter_source, (upstream,)),
+            Stage(f"write_filtered_{name}", write_filtered, (f"filter_{name}",)),
+        ])
+    
+    filter_stages = tuple(f"filter_{name}" for name in source_names)
+    
+    def extract(inputs):
+        if location_filter is not None:
+            lookups = location_filter.cache_hits + location_filter.cache_misses
+            registry.gauge(
+                "collector_location_cache_hit_ratio",
+                "Share of location lookups served from the filter cache",
+            ).set(location_filter.cache_hits / lookups if lookups else 0.0)
+        with stage("extract", profiler):
+            return extract_decision_makers_from_dfs(
+                [inputs[name] for name in filter_stages], state.extractor if state else None
+            )
+    
+    def write_decision_makers(inputs):
+        with stage("write_decision_makers", profiler):
+            save_to_json(inputs["extract"], interim_dir / "companies_with_decision_makers.json")
+            for campaign in campaign_set.names if campaign_set else []:
+                save_to_json(
+                    campaign_set.companies(inputs["extract"], campaign),
+                    interim_dir / "campaigns" / campaign / "companies_with_decision_makers.json",
+                )
+    
+    if memo is not None:
+        extract = memo.memoize(
+            "extract",
+            extract,
+            {"decision_makers": config.get("decision_makers")},
+            code_version(extractors, contacts, extract_decision_makers_from_dfs),
+        )
+    
+    stages.extend([
+        Stage("extract", extract, filter_stages),
+        Stage("write_decision_makers", write_decision_makers, ("extract",)),
+    ])
+    
+    scoring_config = config.get("scoring") or {}
+    if scoring_config.get("enabled", False):
+        scorer = scoring.LeadScorer.from_config(config)
+        
+        def score(inputs):
+            with stage("score", profiler):
+                return scoring.prioritize(
+                    inputs["extract"],
+                    scorer,
+                    scoring_config.get("top_k", scoring.DEFAULT_TOP_K),
+                    campaign_set,
+                )
+        
+        def write_leads(inputs):
+            with stage("write_leads", profiler):
+                for campaign, leads in inputs["score"].items():
+                    directory = interim_dir if campaign is None else interim_dir / "campaigns" / campaign
+                    save_to_json(leads, directory / "leads.json")
+        
+        stages.extend([
+            Stage("score", score, ("extract",)),
+            Stage("write_leads", write_leads, ("score",)),
+        ])
+    
+    if sink is not None:
+        def write_postgres(inputs):
+            with stage("write_postgres", profiler):
+                sink.write(inputs["extract"])
+        
+        stages.append(Stage("write_postgres", write_postgres, ("extract",)))
+    
+    if cdc is not None:
+        def commit_cdc(inputs):
+            with stage("commit_cdc", profiler):
+                cdc.commit()
+        
+        writes = tuple(s.name for s in stages if s.name.startswith("write_"))
+        stages.append(Stage("commit_cdc", commit_cdc, writes))
+    return stages
+
+
+def _max_workers(config: Dict[str, Any], profiler: Optional[Profiler]) -> int:
+    """Stage concurrency; profiled runs are serial so profiles stay per-stage."""
+    if profiler is not None:
+        return 1
+    return config.get("pipeline", {}).get("max_workers", 4)
+
+
+def _memory_budget(config: Dict[str, Any]) -> MemoryBudget:
+    """Track fetched frames against ``pipeline.memory_budget_mb``."""
+    return MemoryBudget(config.get("pipeline", {}).get("memory_budget_mb"))
+
+
+def _run(
+    stages: List[Stage],
+    config: Dict[str, Any],
+    profiler: Optional[Profiler],
+    results: Optional[Dict[str, Any]] = None,
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Execute stages and log the critical-path summary."""
+    executor = DagExecutor(stages, _max_workers(config, profiler))
+    results = executor.run(results)
+    summary = executor.summary()
+    registry.gauge(
+        "collector_critical_path_seconds", "Duration of the slowest chain of stages"
+    ).set(summary["critical_path_seconds"])
+    logger.info(
+        f"Critical path: {' -> '.join(summary['critical_path'])}\n"
+        f"{executor.format_summary()}"
+    )
+    return results, summary
+
+
+def run_pipeline(
+    config: Dict[str, Any],
+    profiler: Optional[Profiler] = None,
+    state: Optional[CollectorState] = None,
+    memo: Optional[StageCache] = None,
+    cdc: Optional[ChangeCapture] = None,
+    sink: Optional[PostgresSink] = None,
+) -> Dict[str, Any]:
+    """
+    Fetch every enabled source, then filter, extract and write outputs.
+    
+    All stages run as one graph, so sources are fetched concurrently and
+    each source is filtered and written as soon as its own fetch is done.
+    
+    Args:
+        config: Collector configuration
+        profiler: Optional profiler for per-stage profiles
+        state: Optional warm state whose sessions, caches, filter and
+            extractor are reused
+        memo: Optional stage cache; unchanged stages are not recomputed
+        cdc: Optional change capture; only new and changed records are
+            filtered, extracted and written to the interim outputs
+        sink: Optional Postgres sink the extracted companies are upserted into
+        
+    Returns:
+        Timing summary with the critical path
+    """
+    source_names = enabled_sources(config)
+    budget = _memory_budget(config)
+    stages = [_fetch_stage(name, config, profiler, state, memo, budget) for name in source_names]
+    stages += _processing_stages(config, source_names, profiler, state, memo, cdc, sink)
+    _, summary = _run(stages, config, profiler)
+    return summary
+
+
+def collect_sources(
+    config: Dict[str, Any],
+    profiler: Optional[Profiler] = None,
+    state: Optional[CollectorState] = None,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Fetch raw data from every enabled source, concurrently.
+    
+    Args:
+        config: Collector configuration
+        profiler: Optional profiler for per-stage profiles
+        state: Optional warm state whose sessions and caches are reused
+        
+    Returns:
+        Source name to collected DataFrame
+    """
+    source_names = enabled_sources(config)
+    budget = _memory_budget(config)
+    stages = [_fetch_stage(name, config, profiler, state, budget=budget) for name in source_names]
+    results, _ = _run(stages, config, profiler)
+    return {name: results[f"fetch_{name}"] for name in source_names}
+
+
+def process_and_save(
+    config: Dict[str, Any],
+    source_data: Dict[str, pd.DataFrame],
+    profiler: Optional[Profiler] = None,
+    state: Optional[CollectorState] = None,
+    cdc: Optional[ChangeCapture] = None,
+    sink: Optional[PostgresSink] = None,
+) -> Dict[str, Any]:
+    """
+    Filter, extract decision makers and write the raw and interim outputs.
+    
+    Args:
+        config: Collector configuration
+        source_data: Source name to raw records, as returned by collect_sources
+        profiler: Optional profiler for per-stage profiles
+        state: Optional warm state whose filter and extractor are reused
+        cdc: Optional change capture limiting interim outputs to the delta
+        sink: Optional Postgres sink the extracted companies are upserted into
+        
+    Returns:
+        Timing summary with the critical path
+    """
+    stages = _processing_stages(config, list(source_data), profiler, state, cdc=cdc, sink=sink)
+    fetched = {f"fetch_{name}": df for name, df in source_data.items()}
+    _, summary = _run(stages, config, profiler, fetched)
+    return summary
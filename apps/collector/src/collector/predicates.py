@@ -0,0 +1,630 @@
+"""Composable row filters evaluated as vectorized column predicates.
+
+A filter is a tree of predicates over logical fields (``funding_amount``,
+``round_type``, ``location``, ...). Each field maps to the columns that
+carry it in the different source schemas. A predicate evaluates to one
+boolean mask over a whole DataFrame or Arrow batch, never row by row:
+
+    expr = (
+        at_least("funding_amount", 500_000)
+        & one_of("round_type", ["seed", "series_a"])
+        & ~one_of("industry", ["gambling"])
+    )
+    filtered = apply_filter(df, expr)
+
+Predicates on fields a source does not have (SEC filings carry no funding
+data) are not applicable to it and keep every row.
+
+Sources also ask the filter for ``pushdown(source)`` query parameters, so
+rows the filter rejects are not fetched in the first place. Pushdown is
+only an optimization: the complete filter still runs on whatever the
+source returns, so a source that ignores a parameter gives the same result.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from common.metrics import registry
+from collector.config import campaign_configs
+from collector.filters import LocationFilter
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+
+logger = logging.getLogger(__name__)
+
+# Columns holding each logical field, in order of preference
+FIELDS: Dict[str, Tuple[str, ...]] = {
+    "funding_amount": ("funding_total_usd", "properties.funding_total.value_usd"),
+    "round_type": ("properties.last_funding_type", "last_funding_type"),
+    "funding_date": ("properties.last_funding_at", "last_funding_at"),
+    "industry": ("properties.categories", "categories", "category_list", "industry"),
+    "employee_count": ("properties.num_employees_enum", "num_employees", "employee_count"),
+    "location": ("headquarters", "hq_location", "location", "city", "address"),
+    "form_type": ("form_type",),
+    "filing_date": ("filing_date",),
+}
+
+# Crunchbase employee count buckets, as used by ``num_employees_enum``
+EMPLOYEE_BUCKETS = [
+    "c_00001_00010", "c_00011_00050", "c_00051_00100", "c_00101_00250",
+    "c_00251_00500", "c_00501_01000", "c_01001_05000", "c_05001_10000",
+    "c_10001_max",
+]
+
+Batch = Union[pd.DataFrame, "pa.Table", "pa.RecordBatch"]
+
+
+class Predicate:
+    """
+    Base class of filter expressions.
+
+    Predicates combine with ``&``, ``|`` and ``~``.
+    """
+
+    @property
+    def name(self) -> str:
+        """Label of the predicate in metrics and logs."""
+        return "predicate"
+
+    def mask(self, df: pd.DataFrame) -> Optional[np.ndarray]:
+        """
+        Evaluate the predicate over every row.
+
+        Args:
+            df: Records
+
+        Returns:
+            Boolean array, one entry per row, or None if the predicate does
+            not apply to ``df`` (none of its fields' columns are present)
+        """
+        raise NotImplementedError
+
+    def columns(self) -> List[str]:
+        """Return every column the predicate may read."""
+        raise NotImplementedError
+
+    def pushdown(self, source: str) -> Dict[str, Any]:
+        """
+        Translate the predicate into query parameters for a source.
+
+        Args:
+            source: Source name
+
+        Returns:
+            Parameters whose results are a superset of the rows the
+            predicate accepts; empty if nothing can be pushed down
+        """
+        return {}
+
+    def terms(self) -> List["Predicate"]:
+        """Return the top-level conjuncts (just this predicate unless it is an And)."""
+        return [self]
+
+    def cache_key(self) -> str:
+        """Return a key equal for predicates that always produce the same mask."""
+        return repr(self)
+
+    def __and__(self, other: "Predicate") -> "Predicate":
+        return And(self.terms() + other.terms())
+
+    def __or__(self, other: "Predicate") -> "Predicate":
+        return Or([self, other])
+
+    def __invert__(self) -> "Predicate":
+        return Not(self)
+
+
+@dataclass
+class FieldPredicate(Predicate):
+    """A predicate on one logical field, see ``FIELDS``."""
+
+    field: str
+
+    @property
+    def name(self) -> str:
+        return self.field
+
+    def columns(self) -> List[str]:
+        return list(FIELDS.get(self.field, (self.field,)))
+
+    def mask(self, df: pd.DataFrame) -> Optional[np.ndarray]:
+        for column in self.columns():
+            if column in df.columns:
+                values = df[column].reset_index(drop=True)
+                return np.asarray(self.test(values), dtype=bool)
+        return None
+
+    def test(self, values: pd.Series) -> np.ndarray:
+        """Evaluate the predicate over one column."""
+        raise NotImplementedError
+
+
+@dataclass
+class Between(FieldPredicate):
+    """Numeric field within ``[low, high]``; either bound may be None."""
+
+    low: Optional[float] = None
+    high: Optional[float] = None
+
+    def test(self, values: pd.Series) -> np.ndarray:
+        numbers = np.asarray(pd.to_numeric(values, errors="coerce"), dtype=float)
+        result = ~np.isnan(numbers)
+        if self.low is not None:
+            result &= numbers >= self.low
+        if self.high is not None:
+            result &= numbers <= self.high
+        return np.asarray(result, dtype=bool)
+
+    def pushdown(self, source: str) -> Dict[str, Any]:
+        if source != "crunchbase" or self.field != "funding_amount":
+            return {}
+        params = {}
+        if self.low is not None:
+            params["funding_total_min"] = self.low
+        if self.high is not None:
+            params["funding_total_max"] = self.high
+        return params
+
+
+@dataclass
+class DateBetween(FieldPredicate):
+    """Date field within ``[start, end]``; either bound may be None."""
+
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+
+    def test(self, values: pd.Series) -> np.ndarray:
+        dates = pd.to_datetime(values, errors="coerce", format="mixed", utc=True)
+        dates = dates.dt.tz_localize(None)
+        result = dates.notna()
+        if self.start is not None:
+            result &= dates >= pd.Timestamp(self.start)
+        if self.end is not None:
+            result &= dates <= pd.Timestamp(self.end)
+        return np.asarray(result, dtype=bool)
+
+    def pushdown(self, source: str) -> Dict[str, Any]:
+        if source != "crunchbase" or self.field != "funding_date":
+            return {}
+        params = {}
+        if self.start is not None:
+            params["last_funding_after"] = self.start.strftime("%Y-%m-%d")
+        if self.end is not None:
+            params["last_funding_before"] = self.end.strftime("%Y-%m-%d")
+        return params
+
+
+@dataclass
+class OneOf(FieldPredicate):
+    """
+    Field equal to one of ``values``, ignoring case.
+
+    Cells may also hold lists (of strings or of ``{"value": ...}``
+    dictionaries, as in Crunchbase categories) or comma-separated strings;
+    such a cell matches if any of its items does.
+    """
+
+    values: Sequence[str] = ()
+
+    def __post_init__(self) -> None:
+        self._wanted = {str(v).strip().lower() for v in self.values}
+
+    def test(self, values: pd.Series) -> np.ndarray:
+        present = values.dropna()
+        if present.empty:
+            return np.zeros(len(values), dtype=bool)
+        first = present.iloc[0]
+        if isinstance(first, (list, tuple, np.ndarray)):
+            items = values.explode()
+            items = items.map(lambda v: v.get("value") if isinstance(v, dict) else v)
+        elif isinstance(first, str) and present.str.contains(",", regex=False).any():
+            items = values.str.split(",").explode().str.strip()
+        else:
+            mask: np.ndarray = values.astype("string").str.strip().str.lower().isin(
+                self._wanted
+            ).to_numpy(dtype=bool, na_value=False)
+            return mask
+        hits = items.astype("string").str.strip().str.lower().isin(self._wanted)
+        hits = hits.fillna(False).astype(bool)
+        return np.asarray(
+            hits.groupby(level=0).any().reindex(values.index, fill_value=False), dtype=bool
+        )
+
+    def pushdown(self, source: str) -> Dict[str, Any]:
+        values = sorted(self._wanted)
+        if source == "crunchbase" and self.field == "round_type":
+            return {"last_funding_types": ",".join(values)}
+        if source == "crunchbase" and self.field == "industry":
+            return {"categories": ",".join(values)}
+        if source == "sec" and self.field == "form_type":
+            # Form types are case sensitive in EDGAR indexes
+            return {"target_forms": sorted(str(v).strip() for v in self.values)}
+        return {}
+
+
+def _employee_bounds(values: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """Parse employee counts ("c_00011_00050", "11-50", "10001+", "42") into ranges."""
+    text = values.astype("string").str.strip().str.lower()
+    parts = text.str.extract(r"^\D*(\d+)(?:\D+(\d+))?")
+    low = pd.to_numeric(parts[0], errors="coerce").to_numpy(dtype=float)
+    high = pd.to_numeric(parts[1], errors="coerce").to_numpy(dtype=float)
+    open_ended = text.str.contains(r"max|\+", regex=True).to_numpy(dtype=bool, na_value=False)
+    high = np.where(np.isnan(high), np.where(open_ended, np.inf, low), high)
+    return low, high
+
+
+@dataclass
+class EmployeeRange(FieldPredicate):
+    """Employee count range overlapping ``[low, high]``; either bound may be None."""
+
+    field: str = "employee_count"
+    low: Optional[int] = None
+    high: Optional[int] = None
+
+    def test(self, values: pd.Series) -> np.ndarray:
+        low, high = _employee_bounds(values)
+        result = ~np.isnan(low)
+        if self.low is not None:
+            result &= high >= self.low
+        if self.high is not None:
+            result &= low <= self.high
+        return np.asarray(result, dtype=bool)
+
+    def pushdown(self, source: str) -> Dict[str, Any]:
+        if source != "crunchbase":
+            return {}
+        buckets = pd.Series(EMPLOYEE_BUCKETS)
+        keep = self.test(buckets)
+        return {"num_employees_enum": ",".join(buckets[keep])}
+
+
+@dataclass
+class InLocation(FieldPredicate):
+    """
+    Location matching the targets of a ``LocationFilter``.
+
+    Each distinct location is looked up once, so the filter's substring
+    matching runs per unique value and its cache stays warm across runs.
+    """
+
+    field: str = "location"
+    location_filter: Optional[LocationFilter] = None
+
+    @property
+    def targets(self) -> LocationFilter:
+        """The location filter, which is required despite the dataclass default."""
+        if self.location_filter is None:
+            raise ValueError("InLocation needs a location_filter")
+        return self.location_filter
+
+    def cache_key(self) -> str:
+        return f"location:{sorted(self.targets.target_locations)}"
+
+    def test(self, values: pd.Series) -> np.ndarray:
+        return location_mask(values, self.targets)
+
+
+def location_mask(values: pd.Series, location_filter: LocationFilter) -> np.ndarray:
+    """
+    Match a column of locations against a location filter.
+
+    Args:
+        values: Location strings
+        location_filter: Filter holding the target locations
+
+    Returns:
+        Boolean array, True where the location is a target
+    """
+    codes, uniques = pd.factorize(values)
+    return _lookup_locations(codes, uniques, location_filter)
+
+
+def _lookup_locations(
+    codes: np.ndarray, uniques: Sequence[Any], location_filter: LocationFilter
+) -> np.ndarray:
+    hits = np.fromiter(
+        (
+            isinstance(u, str) and location_filter.is_in_target_location(u)
+            for u in uniques
+        ),
+        dtype=bool,
+        count=len(uniques),
+    )
+    # Missing values get code -1; the appended False covers them
+    return np.asarray(np.append(hits, False)[codes], dtype=bool)
+
+
+@dataclass
+class And(Predicate):
+    """All of ``children`` hold; children that do not apply are ignored."""
+
+    children: List[Predicate]
+
+    @property
+    def name(self) -> str:
+        return "+".join(c.name for c in self.children)
+
+    def columns(self) -> List[str]:
+        return [col for c in self.children for col in c.columns()]
+
+    def terms(self) -> List[Predicate]:
+        return list(self.children)
+
+    def mask(self, df: pd.DataFrame) -> Optional[np.ndarray]:
+        result = None
+        for child in self.children:
+            mask = child.mask(df)
+            if mask is not None:
+                result = mask if result is None else result & mask
+        return result
+
+    def pushdown(self, source: str) -> Dict[str, Any]:
+        params: Dict[str, Any] = {}
+        conflicting = set()
+        for child in self.children:
+            for key, value in child.pushdown(source).items():
+                if key in params and params[key] != value:
+                    conflicting.add(key)
+                params[key] = value
+        # Leave conflicting parameters to the residual filter
+        return {k: v for k, v in params.items() if k not in conflicting}
+
+
+@dataclass
+class Or(Predicate):
+    """Any of ``children`` holds; children that do not apply are ignored."""
+
+    children: List[Predicate]
+
+    @property
+    def name(self) -> str:
+        return "|".join(c.name for c in self.children)
+
+    def columns(self) -> List[str]:
+        return [col for c in self.children for col in c.columns()]
+
+    def mask(self, df: pd.DataFrame) -> Optional[np.ndarray]:
+        result = None
+        for child in self.children:
+            mask = child.mask(df)
+            if mask is not None:
+                result = mask if result is None else result | mask
+        return result
+
+    def pushdown(self, source: str) -> Dict[str, Any]:
+        # Only parameters every alternative pushes, with the same value,
+        # keep the union of their results
+        pushed = [child.pushdown(source) for child in self.children]
+        if not pushed:
+            return {}
+        return {
+            k: v for k, v in pushed[0].items() if all(p.get(k, object()) == v for p in pushed[1:])
+        }
+
+
+@dataclass
+class Not(Predicate):
+    """``child`` does not hold."""
+
+    child: Predicate
+
+    @property
+    def name(self) -> str:
+        return f"not_{self.child.name}"
+
+    def columns(self) -> List[str]:
+        return self.child.columns()
+
+    def mask(self, df: pd.DataFrame) -> Optional[np.ndarray]:
+        mask = self.child.mask(df)
+        return None if mask is None else ~mask
+
+
+def between(field_name: str, low: Optional[float] = None, high: Optional[float] = None) -> Between:
+    """Numeric ``field_name`` within ``[low, high]``."""
+    return Between(field_name, low, high)
+
+
+def at_least(field_name: str, low: float) -> Between:
+    """Numeric ``field_name`` of at least ``low``."""
+    return Between(field_name, low=low)
+
+
+def one_of(field_name: str, values: Sequence[str]) -> OneOf:
+    """``field_name`` equal to one of ``values``."""
+    return OneOf(field_name, tuple(values))
+
+
+def dated(
+    field_name: str, start: Optional[datetime] = None, end: Optional[datetime] = None
+) -> DateBetween:
+    """Date ``field_name`` within ``[start, end]``."""
+    return DateBetween(field_name, start, end)
+
+
+def from_config(
+    config: Dict[str, Any], location_filter: Optional[LocationFilter] = None
+) -> Optional[Predicate]:
+    """
+    Build the collector's row filter from the config.
+
+    Reads ``target_locations``, ``collection.min_funding_amount`` and the
+    ``filters`` section (``round_types``, ``funded_within_days``,
+    ``industries``, ``exclude_industries``, ``employee_count.min``/``max``
+    and ``form_types``).
+
+    Args:
+        config: Collector configuration
+        location_filter: Warm location filter to reuse for ``target_locations``
+
+    Returns:
+        The conjunction of every configured filter, or None if there are none
+    """
+    filters_config = config.get("filters") or {}
+    terms: List[Predicate] = []
+
+    min_funding = (config.get("collection") or {}).get("min_funding_amount")
+    if min_funding:
+        terms.append(at_least("funding_amount", min_funding))
+    if filters_config.get("round_types"):
+        terms.append(one_of("round_type", filters_config["round_types"]))
+    if filters_config.get("funded_within_days"):
+        end = config.get("end_date") or datetime.now()
+        start = end - timedelta(days=filters_config["funded_within_days"])
+        terms.append(dated("funding_date", start))
+    if filters_config.get("industries"):
+        terms.append(one_of("industry", filters_config["industries"]))
+    if filters_config.get("exclude_industries"):
+        terms.append(~one_of("industry", filters_config["exclude_industries"]))
+    employees = filters_config.get("employee_count") or {}
+    if employees.get("min") is not None or employees.get("max") is not None:
+        terms.append(EmployeeRange(low=employees.get("min"), high=employees.get("max")))
+    if filters_config.get("form_types"):
+        terms.append(one_of("form_type", filters_config["form_types"]))
+
+    target_locations = config.get("target_locations") or []
+    if target_locations:
+        # Last, so the per-value lookups only see rows the cheaper terms kept
+        location_filter = location_filter or LocationFilter(target_locations)
+        terms.append(InLocation(location_filter=location_filter))
+
+    if not terms:
+        return None
+    return terms[0] if len(terms) == 1 else And(terms)
+
+
+def fetch_filter(config: Dict[str, Any]) -> Optional[Predicate]:
+    """
+    Return the part of the configured filter that sources may apply while fetching.
+
+    That is every term but the location match, whose substring semantics
+    no source query can reproduce. With ``campaigns`` configured, a record
+    is needed if any campaign may accept it, so the campaigns' filters are
+    combined with ``|``.
+    """
+    campaigns = campaign_configs(config)
+    if not campaigns:
+        return from_config({**config, "target_locations": []})
+    alternatives = []
+    for campaign in campaigns.values():
+        alternative = fetch_filter(campaign)
+        if alternative is None:
+            return None
+        alternatives.append(alternative)
+    return alternatives[0] if len(alternatives) == 1 else Or(alternatives)
+
+
+def pushdown(config: Dict[str, Any], source: str) -> Dict[str, Any]:
+    """
+    Return the query parameters the configured filter pushes down to ``source``.
+
+    Args:
+        config: Collector configuration
+        source: Source name
+
+    Returns:
+        Parameters for the source's query (empty if none apply)
+    """
+    predicate = fetch_filter(config)
+    if predicate is None:
+        return {}
+    params = predicate.pushdown(source)
+    if params:
+        logger.info(f"Pushing filters down to {source}: {sorted(params)}")
+    return params
+
+
+def evaluate_many(
+    df: pd.DataFrame, filters: Dict[str, Optional[Predicate]]
+) -> Dict[str, np.ndarray]:
+    """
+    Evaluate several filters over the same records in one pass.
+
+    Terms that several filters have in common (the same funding threshold,
+    say) are evaluated once, and every location term shares one
+    factorization of the location column, so each distinct location is
+    hashed once however many target lists there are.
+
+    Args:
+        df: Records
+        filters: Filter name to predicate (None keeps every row)
+
+    Returns:
+        Filter name to boolean mask
+    """
+    term_masks: Dict[str, Optional[np.ndarray]] = {}
+    locations = {
+        term.cache_key(): term
+        for predicate in filters.values() if predicate is not None
+        for term in predicate.terms() if isinstance(term, InLocation)
+    }
+    if locations:
+        column = next((c for c in FIELDS["location"] if c in df.columns), None)
+        if column is None:
+            term_masks.update(dict.fromkeys(locations))
+        else:
+            codes, uniques = pd.factorize(df[column])
+            for key, location in locations.items():
+                term_masks[key] = _lookup_locations(codes, uniques, location.targets)
+
+    masks = {}
+    for name, predicate in filters.items():
+        keep = np.ones(len(df), dtype=bool)
+        for term in predicate.terms() if predicate is not None else []:
+            key = term.cache_key()
+            if key not in term_masks:
+                term_masks[key] = term.mask(df)
+            if term_masks[key] is not None:
+                keep &= term_masks[key]
+        masks[name] = keep
+    return masks
+
+
+def apply_filter(data: Batch, predicate: Optional[Predicate], source: str = "") -> Batch:
+    """
+    Keep the rows of a DataFrame or Arrow batch that pass ``predicate``.
+
+    Arrow input is filtered in Arrow; only the columns the predicate reads
+    are converted to pandas.
+
+    Args:
+        data: DataFrame, ``pyarrow.Table`` or ``pyarrow.RecordBatch``
+        predicate: Filter expression (None keeps every row)
+        source: Source name, used in logs
+
+    Returns:
+        The rows that passed, of the same type as ``data``
+    """
+    if predicate is None or len(data) == 0:
+        return data
+    if isinstance(data, pd.DataFrame):
+        df = data
+    else:
+        wanted = [c for c in dict.fromkeys(predicate.columns()) if c in data.schema.names]
+        df = data.select(wanted).to_pandas()
+
+    rows_in = registry.counter("collector_filter_rows_in_total", "Rows entering a filter")
+    rows_out = registry.counter("collector_filter_rows_out_total", "Rows passing a filter")
+    keep = np.ones(len(df), dtype=bool)
+    for term in predicate.terms():
+        mask = term.mask(df)
+        if mask is None:
+            logger.debug(f"Filter {term.name} does not apply to {source or 'records'}")
+            continue
+        rows_in.inc(int(keep.sum()), filter=term.name)
+        keep &= mask
+        rows_out.inc(int(keep.sum()), filter=term.name)
+
+    label = f"{source} records" if source else "records"
+    logger.info(f"Filtered {len(df)} {label} down to {int(keep.sum())}")
+    if isinstance(data, pd.DataFrame):
+        return data[keep]
+    import pyarrow as pa
+    return data.filter(pa.array(keep))
@@ -0,0 +1,239 @@
+"""Per-stage CPU and memory profiling for collector runs."""
+
+import argparse
+import cProfile
+import json
+import logging
+import os
+import platform
+import pstats
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from collector import __version__
+
+
+logger = logging.getLogger(__name__)
+
+# Number of allocation sites listed per stage in the tracemalloc reports
+TOP_ALLOCATIONS = 25
+
+# Stacks deeper than this are truncated in the collapsed output
+MAX_STACK_DEPTH = 64
+
+FuncKey = Tuple[str, int, str]
+
+
+def _frame_name(func: FuncKey) -> str:
+    """Render a pstats function key as ``module.py:function:line``."""
+    filename, lineno, name = func
+    if filename == "~":  # built-in functions
+        return name.strip("<>")
+    return f"{os.path.basename(filename)}:{name}:{lineno}"
+
+
+def collapsed_stacks(stats: pstats.Stats) -> List[str]:
+    """
+    Convert profile statistics into flamegraph "collapsed stack" lines.
+
+    cProfile only records caller/callee pairs, not full stacks, so stacks
+    are rebuilt by walking down from the root functions and splitting each
+    function's time across its callers in proportion to the time spent on
+    each call edge. Values are integer microseconds, as expected by
+    ``flamegraph.pl`` and speedscope.
+
+    Args:
+        stats: Loaded profile statistics
+
+    Returns:
+        Lines of the form ``root;caller;callee <microseconds>``
+    """
+    raw: Dict[FuncKey, Any] = stats.stats  # type: ignore[attr-defined]
+    callees: Dict[FuncKey, List[Tuple[FuncKey, float]]] = {}
+    for func, (_, _, _, _, callers) in raw.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))
+
+    totals: Dict[str, float] = {}
+
+    def walk(func: FuncKey, budget: float, path: List[FuncKey]) -> None:
+        _, _, self_time, cumulative, _ = raw[func]
+        if cumulative <= 0 or budget <= 0:
+            return
+        scale = min(1.0, budget / cumulative)
+        path = path + [func]
+        key = ";".join(_frame_name(f) for f in path)
+        totals[key] = totals.get(key, 0.0) + self_time * scale
+        if len(path) >= MAX_STACK_DEPTH:
+            return
+        for callee, edge_time in callees.get(func, []):
+            if callee not in path and callee in raw:
+                walk(callee, edge_time * scale, path)
+
+    roots = [func for func, entry in raw.items() if not entry[4]]
+    for root in roots:
+        walk(root, raw[root][3], [])
+
+    return [
+        f"{stack} {int(seconds * 1e6)}"
+        for stack, seconds in sorted(totals.items())
+        if int(seconds * 1e6) > 0
+    ]
+
+
+class Profiler:
+    """
+    Capture a profile bundle for one collector run.
+
+    Each stage gets a cProfile dump (``<stage>.pstats``), flamegraph-ready
+    collapsed stacks (``<stage>.collapsed``) and a tracemalloc report of the
+    allocations made during the stage (``<stage>.memory.txt``).
+    ``manifest.json`` summarizes wall time, CPU time and memory per stage so
+    bundles from two releases can be compared with ``python -m
+    collector.profiling diff``.
+    """
+
+    def __init__(self, output_dir: Path, run_id: Optional[str] = None):
+        """
+        Initialize the profiler and start tracing allocations.
+
+        Args:
+            output_dir: Directory under which the bundle is created
+            run_id: Bundle name; defaults to the current timestamp
+        """
+        self.run_id = run_id or datetime.now().strftime("%Y%m%dT%H%M%S")
+        self.bundle_dir = Path(output_dir) / "profiles" / self.run_id
+        self.bundle_dir.mkdir(parents=True, exist_ok=True)
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self._started_tracing = not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Profile the ``with`` block as stage ``name``."""
+        profile = cProfile.Profile()
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            current, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot()
+            self._write_stage(name, profile, before, after)
+            self.stages[name] = {
+                "wall_seconds": wall,
+                "cpu_seconds": cpu,
+                "memory_current_bytes": current,
+                "memory_peak_bytes": peak,
+            }
+            logger.debug(
+                "Profiled stage %s: %.3fs wall, %.1f MiB peak", name, wall, peak / 2**20
+            )
+
+    def _write_stage(
+        self,
+        name: str,
+        profile: cProfile.Profile,
+        before: tracemalloc.Snapshot,
+        after: tracemalloc.Snapshot,
+    ) -> None:
+        profile.dump_stats(str(self.bundle_dir / f"{name}.pstats"))
+        stats = pstats.Stats(profile)
+        (self.bundle_dir / f"{name}.collapsed").write_text(
+            "\n".join(collapsed_stacks(stats)) + "\n"
+        )
+
+        diff = after.compare_to(before, "lineno")[:TOP_ALLOCATIONS]
+        (self.bundle_dir / f"{name}.memory.txt").write_text(
+            "\n".join(str(stat) for stat in diff) + "\n"
+        )
+
+    def finish(self) -> Path:
+        """
+        Stop tracing and write the bundle manifest.
+
+        Returns:
+            Path to the bundle directory
+        """
+        if self._started_tracing:
+            tracemalloc.stop()
+        manifest = {
+            "run_id": self.run_id,
+            "collector_version": __version__,
+            "python_version": platform.python_version(),
+            "platform": platform.platform(),
+            "argv": sys.argv,
+            "stages": self.stages,
+        }
+        (self.bundle_dir / "manifest.json").write_text(json.dumps(manifest, indent=2))
+        logger.info(f"Wrote profile bundle to {self.bundle_dir}")
+        return self.bundle_dir
+
+
+def compare_bundles(baseline: Path, candidate: Path) -> List[Dict[str, Any]]:
+    """
+    Compare the per-stage summaries of two profile bundles.
+
+    Args:
+        baseline: Bundle directory from the reference run
+        candidate: Bundle directory to compare against it
+
+    Returns:
+        One row per stage with baseline, candidate and relative change for
+        wall time, CPU time and peak memory
+    """
+    old = json.loads((Path(baseline) / "manifest.json").read_text())["stages"]
+    new = json.loads((Path(candidate) / "manifest.json").read_text())["stages"]
+    rows = []
+    for stage in sorted(set(old) | set(new)):
+        row: Dict[str, Any] = {"stage": stage}
+        for metric in ("wall_seconds", "cpu_seconds", "memory_peak_bytes"):
+            a = old.get(stage, {}).get(metric)
+            b = new.get(stage, {}).get(metric)
+            change = (b - a) / a if a and b is not None else None
+            row[metric] = {"baseline": a, "candidate": b, "change": change}
+        rows.append(row)
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entrypoint: ``python -m collector.profiling diff A B``."""
+    parser = argparse.ArgumentParser(description="Inspect collector profile bundles")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    diff = subparsers.add_parser("diff", help="Compare two profile bundles")
+    diff.add_argument("baseline", type=Path)
+    diff.add_argument("candidate", type=Path)
+    args = parser.parse_args(argv)
+
+    def fmt(value: Optional[float], change: Optional[float]) -> str:
+        if value is None:
+            return "-"
+        return f"{value:.3f}" + (f" ({change:+.0%})" if change is not None else "")
+
+    print(f"{'stage':<24}{'wall s':>22}{'cpu s':>22}{'peak MiB':>22}")
+    for row in compare_bundles(args.baseline, args.candidate):
+        peak = row["memory_peak_bytes"]
+        peak_mib = peak["candidate"] / 2**20 if peak["candidate"] is not None else None
+        print(
+            f"{row['stage']:<24}"
+            f"{fmt(row['wall_seconds']['candidate'], row['wall_seconds']['change']):>22}"
+            f"{fmt(row['cpu_seconds']['candidate'], row['cpu_seconds']['change']):>22}"
+            f"{fmt(peak_mib, peak['change']):>22}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
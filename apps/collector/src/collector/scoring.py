@@ -0,0 +1,267 @@
+"""Lead scoring and top-K selection.
+
+Each extracted company gets a priority in ``[0, 1]`` from four components,
+combined with the weights in ``scoring.weights``:
+
+- ``funding``: total funding on a log scale ($1k = 0, $1B and up = 1)
+- ``recency``: halves every ``recency_half_life_days`` since the last round
+- ``round_type``: ``scoring.round_types`` value of the last round type
+- ``roles``: sum of ``scoring.roles`` values of the distinct roles among
+  the decision makers, capped at 1
+
+Companies stream through a ``TopK`` per campaign (or one for the whole
+run), a min-heap of at most ``top_k`` entries. A company only costs a heap
+operation if it beats the current K-th best, so selection is O(n log K)
+and the full candidate set is never sorted or kept.
+"""
+
+import heapq
+import itertools
+import logging
+import math
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from common.metrics import registry
+from collector.predicates import FIELDS
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOP_K = 300
+
+DEFAULT_WEIGHTS = {"funding": 0.35, "recency": 0.25, "round_type": 0.2, "roles": 0.2}
+
+DEFAULT_ROUND_TYPES = {
+    "pre_seed": 0.4, "seed": 0.7, "angel": 0.5, "series_a": 1.0, "series_b": 0.9,
+    "series_c": 0.7, "series_d": 0.5, "series_unknown": 0.5, "venture": 0.5,
+    "corporate_round": 0.4, "convertible_note": 0.4, "debt_financing": 0.2,
+    "private_equity": 0.3, "post_ipo_equity": 0.1, "grant": 0.2,
+}
+
+DEFAULT_ROLES = {
+    "ceo": 0.4, "cto": 0.4, "vp_engineering": 0.3, "vp_product": 0.2,
+    "cfo": 0.1, "coo": 0.1, "vp_sales": 0.1, "vp_marketing": 0.1,
+}
+
+DEFAULT_HALF_LIFE_DAYS = 90
+
+
+def _field(company: Dict[str, Any], field: str) -> Any:
+    """Return the first non-missing column of a logical field (see ``predicates.FIELDS``)."""
+    for column in FIELDS[field]:
+        value = company.get(column)
+        if value is not None and value == value:  # skip NaN
+            return value
+    return None
+
+
+def _date(value: Any) -> Optional[datetime]:
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=None)
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value[:10])
+        except ValueError:
+            return None
+    return None
+
+
+class LeadScorer:
+    """Score extracted companies by funding, recency, round type and role mix."""
+
+    def __init__(
+        self,
+        weights: Optional[Dict[str, float]] = None,
+        round_types: Optional[Dict[str, float]] = None,
+        roles: Optional[Dict[str, float]] = None,
+        half_life_days: float = DEFAULT_HALF_LIFE_DAYS,
+        reference_date: Optional[datetime] = None,
+    ):
+        """
+        Initialize the scorer.
+
+        Args:
+            weights: Weight per component; missing components use the defaults
+            round_types: Value per last funding round type
+            roles: Value per decision maker role
+            half_life_days: Days after which the recency component halves
+            reference_date: "Now" for recency (defaults to the current time)
+        """
+        self.weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        self.round_types = {
+            k.lower(): v for k, v in (round_types or DEFAULT_ROUND_TYPES).items()
+        }
+        self.roles = roles or DEFAULT_ROLES
+        self.half_life_days = half_life_days
+        self.reference_date = reference_date or datetime.now()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "LeadScorer":
+        """Build a scorer from the ``scoring`` config section."""
+        scoring = config.get("scoring") or {}
+        return cls(
+            weights=scoring.get("weights"),
+            round_types=scoring.get("round_types"),
+            roles=scoring.get("roles"),
+            half_life_days=scoring.get("recency_half_life_days", DEFAULT_HALF_LIFE_DAYS),
+            reference_date=config.get("end_date"),
+        )
+
+    def components(
+        self, company: Dict[str, Any], decision_makers: List[Dict[str, Any]]
+    ) -> Dict[str, float]:
+        """Return each component of a company's score, in ``[0, 1]``."""
+        funding = _field(company, "funding_amount")
+        try:
+            funding = float(funding)
+        except (TypeError, ValueError):
+            funding = 0.0
+        funding_score = min(max(math.log10(funding) - 3, 0) / 6, 1.0) if funding > 0 else 0.0
+
+        funded_on = _date(_field(company, "funding_date"))
+        recency = 0.0
+        if funded_on is not None:
+            days = max((self.reference_date - funded_on).days, 0)
+            recency = 0.5 ** (days / self.half_life_days)
+
+        round_type = _field(company, "round_type")
+        round_score = 0.0
+        if isinstance(round_type, str):
+            key = round_type.strip().lower().replace(" ", "_").replace("-", "_")
+            round_score = self.round_types.get(key, 0.0)
+
+        roles = {dm.get("role") for dm in decision_makers}
+        role_score = min(sum(self.roles.get(role, 0.0) for role in roles), 1.0)
+
+        return {
+            "funding": funding_score,
+            "recency": recency,
+            "round_type": round_score,
+            "roles": role_score,
+        }
+
+    def score(
+        self, company: Dict[str, Any], decision_makers: List[Dict[str, Any]]
+    ) -> Tuple[float, Dict[str, float]]:
+        """
+        Score a company.
+
+        Args:
+            company: Company record
+            decision_makers: Its decision makers (for the role mix)
+
+        Returns:
+            The weighted score and its components
+        """
+        components = self.components(company, decision_makers)
+        total = sum(self.weights.get(name, 0.0) * value for name, value in components.items())
+        return total, components
+
+
+class TopK:
+    """The K highest-scoring items seen so far, kept in a bounded min-heap."""
+
+    def __init__(self, k: int):
+        """
+        Initialize an empty selection.
+
+        Args:
+            k: Number of items to keep
+
+        Raises:
+            ValueError: If ``k`` is less than 1
+        """
+        if k < 1:
+            raise ValueError(f"top_k must be at least 1, got {k}")
+        self.k = k
+        self.seen = 0
+        self._heap: List[Tuple[float, int, Any]] = []
+        # Earlier items win ties, so equal scores keep their arrival order
+        self._order = itertools.count()
+
+    def push(self, score: float, item: Any) -> bool:
+        """
+        Offer an item.
+
+        Returns:
+            True if it is among the top K so far
+        """
+        self.seen += 1
+        entry = (score, -next(self._order), item)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+            return True
+        if entry[:2] <= self._heap[0][:2]:
+            return False
+        heapq.heapreplace(self._heap, entry)
+        return True
+
+    def threshold(self) -> Optional[float]:
+        """Score an item must beat to enter a full selection."""
+        return self._heap[0][0] if len(self._heap) >= self.k else None
+
+    def items(self) -> List[Tuple[float, Any]]:
+        """Return the kept items, best first."""
+        return [(score, item) for score, _, item in sorted(self._heap, reverse=True)]
+
+
+def prioritize(
+    extracted: Iterable[Dict[str, Any]],
+    scorer: LeadScorer,
+    k: int = DEFAULT_TOP_K,
+    campaign_set: Optional[Any] = None,
+) -> Dict[Optional[str], List[Dict[str, Any]]]:
+    """
+    Select the top K leads overall and per campaign in one pass.
+
+    Args:
+        extracted: Companies with decision makers, as produced by
+            ``extract_decision_makers_from_dfs`` (any iterable, e.g. batches)
+        scorer: Lead scorer
+        k: Leads kept per selection
+        campaign_set: Optional campaigns; each gets its own top K, scored on
+            its own decision makers (see ``CampaignSet.decision_makers``)
+
+    Returns:
+        ``None`` (the whole run) and each campaign name mapped to its
+        ranked leads, each with ``rank``, ``score`` and ``score_components``
+    """
+    names = list(campaign_set.names) if campaign_set is not None else []
+    selections: Dict[Optional[str], TopK] = {None: TopK(k), **{n: TopK(k) for n in names}}
+
+    for entry in extracted:
+        score, components = scorer.score(entry["company"], entry["decision_makers"])
+        selections[None].push(score, (components, entry))
+        for name in names:
+            decision_makers = campaign_set.decision_makers(entry, name)
+            if decision_makers is None:
+                continue
+            score, components = scorer.score(entry["company"], decision_makers)
+            selections[name].push(
+                score, (components, {**entry, "decision_makers": decision_makers})
+            )
+
+    leads_total = registry.counter(
+        "collector_scoring_leads_total", "Companies scored and kept as top-K leads"
+    )
+    ranked: Dict[Optional[str], List[Dict[str, Any]]] = {}
+    for name, selection in selections.items():
+        label = name or "all"
+        leads_total.inc(selection.seen, campaign=label, result="scored")
+        ranked[name] = [
+            {
+                "rank": rank,
+                "score": round(score, 6),
+                "score_components": {c: round(v, 6) for c, v in components.items()},
+                **entry,
+            }
+            for rank, (score, (components, entry)) in enumerate(selection.items(), start=1)
+        ]
+        leads_total.inc(len(ranked[name]), campaign=label, result="kept")
+        if selection.seen:
+            logger.info(
+                f"Kept the top {len(ranked[name])} of {selection.seen} leads for {label} "
+                f"(scores {ranked[name][-1]['score']:.3f} to {ranked[name][0]['score']:.3f})"
+            )
+    return ranked
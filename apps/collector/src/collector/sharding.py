@@ -0,0 +1,450 @@
+"""Sharded collection over a durable, lease-based work queue.
+
+A collection run is split into work units (a source plus a date window).
+Units live in a SQLite database that any number of worker processes, on
+this host or on other hosts sharing the filesystem, claim with time-limited
+leases. A unit whose worker crashes is re-leased once its lease expires, and
+a unit whose collection raises is retried up to ``max_attempts`` times.
+When every unit is done, :func:`merge` combines the shard outputs and runs
+the usual filtering, extraction and writes.
+"""
+
+import logging
+import multiprocessing
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import pandas as pd
+
+from collector.cdc import DEFAULT_KEYS
+from collector.frames import concat_frames
+
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS units (
+    id TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    output TEXT,
+    error TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_units_status ON units(status);
+"""
+
+
+@dataclass(frozen=True)
+class WorkUnit:
+    """One source's collection over an inclusive date window."""
+
+    source: str
+    start_date: datetime
+    end_date: datetime
+
+    @property
+    def id(self) -> str:
+        return f"{self.source}:{self.start_date:%Y%m%d}:{self.end_date:%Y%m%d}"
+
+
+class WorkQueue:
+    """
+    Durable work queue with leases, backed by a SQLite file.
+
+    Every state change runs in a ``BEGIN IMMEDIATE`` transaction, so two
+    workers can never claim the same unit. SQLite's rollback journal (not
+    WAL) is used because WAL requires shared memory that network
+    filesystems do not provide.
+    """
+
+    def __init__(self, path: Path, lease_seconds: float = 600, max_attempts: int = 3):
+        """
+        Open (and create if needed) the queue database.
+
+        Args:
+            path: SQLite file, on storage shared by all workers
+            lease_seconds: How long a claim lasts without renewal
+            max_attempts: Failed attempts before a unit is marked failed
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        conn = sqlite3.connect(self.path, timeout=60)
+        try:
+            conn.executescript(_SCHEMA)
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    def add_units(self, units: List[WorkUnit]) -> int:
+        """
+        Enqueue units, skipping any that already exist.
+
+        Planning is therefore idempotent: re-running it on a partly processed
+        queue adds nothing and keeps progress.
+
+        Returns:
+            Number of newly added units
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO units (id, source, start_date, end_date, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (u.id, u.source, u.start_date.isoformat(), u.end_date.isoformat(), now)
+                    for u in units
+                ],
+            )
+            return conn.total_changes - before
+
+    def claim(self, owner: str) -> Optional[WorkUnit]:
+        """
+        Lease the next available unit.
+
+        Pending units and units whose lease has expired are eligible. An
+        expired unit that already used all its attempts (its workers keep
+        dying) is marked failed instead of being handed out again.
+
+        Args:
+            owner: Identifier of the claiming worker
+
+        Returns:
+            The claimed unit, or None if nothing is available
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE units SET status = ?, error = 'lease expired', updated_at = ? "
+                "WHERE status = ? AND lease_expires < ? AND attempts >= ?",
+                (FAILED, now, LEASED, now, self.max_attempts),
+            )
+            row = conn.execute(
+                "SELECT id, source, start_date, end_date FROM units "
+                "WHERE status = ? OR (status = ? AND lease_expires < ?) "
+                "ORDER BY start_date, source LIMIT 1",
+                (PENDING, LEASED, now),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE units SET status = ?, lease_owner = ?, lease_expires = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                (LEASED, owner, now + self.lease_seconds, now, row[0]),
+            )
+        return WorkUnit(row[1], datetime.fromisoformat(row[2]), datetime.fromisoformat(row[3]))
+
+    def renew(self, unit_id: str, owner: str) -> bool:
+        """Extend a lease; returns False if the lease was lost to another worker."""
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE units SET lease_expires = ?, updated_at = ? "
+                "WHERE id = ? AND lease_owner = ? AND status = ?",
+                (now + self.lease_seconds, now, unit_id, owner, LEASED),
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, unit_id: str, owner: str, output: Optional[str]) -> bool:
+        """Mark a unit done with its output path; False if the lease was lost."""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE units SET status = ?, output = ?, error = NULL, updated_at = ? "
+                "WHERE id = ? AND lease_owner = ? AND status = ?",
+                (DONE, output, time.time(), unit_id, owner, LEASED),
+            )
+            return cursor.rowcount == 1
+
+    def fail(self, unit_id: str, owner: str, error: str) -> None:
+        """Release a unit after an error, re-queueing it if attempts remain."""
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE units SET status = CASE WHEN attempts < ? THEN ? ELSE ? END, "
+                "lease_owner = NULL, lease_expires = NULL, error = ?, updated_at = ? "
+                "WHERE id = ? AND lease_owner = ?",
+                (self.max_attempts, PENDING, FAILED, error, time.time(), unit_id, owner),
+            )
+
+    def counts(self) -> Dict[str, int]:
+        """Return the number of units in each status."""
+        with self._transaction() as conn:
+            rows = conn.execute("SELECT status, COUNT(*) FROM units GROUP BY status")
+            return {status: count for status, count in rows}
+
+    def outputs(self, source: str) -> List[str]:
+        """Return output paths of completed units for a source, in date order."""
+        with self._transaction() as conn:
+            rows = conn.execute(
+                "SELECT output FROM units WHERE source = ? AND status = ? "
+                "AND output IS NOT NULL ORDER BY start_date",
+                (source, DONE),
+            )
+            return [row[0] for row in rows]
+
+    def failures(self) -> List[Dict[str, Any]]:
+        """Return units that exhausted their attempts."""
+        with self._transaction() as conn:
+            rows = conn.execute(
+                "SELECT id, attempts, error FROM units WHERE status = ?", (FAILED,)
+            )
+            return [{"id": r[0], "attempts": r[1], "error": r[2]} for r in rows]
+
+
+def _windows(start: datetime, end: datetime, days: int) -> Iterator[tuple]:
+    current = start
+    while current <= end:
+        window_end = min(current + timedelta(days=days - 1), end)
+        yield current, window_end
+        current = window_end + timedelta(days=1)
+
+
+def _quarters(start: datetime, end: datetime) -> Iterator[tuple]:
+    current = start
+    while current <= end:
+        quarter_start_month = 3 * ((current.month - 1) // 3) + 1
+        next_quarter = (
+            datetime(current.year + 1, 1, 1)
+            if quarter_start_month == 10
+            else datetime(current.year, quarter_start_month + 3, 1)
+        )
+        window_end = min(next_quarter - timedelta(days=1), end)
+        yield current, window_end
+        current = next_quarter
+
+
+def _unwindowed_bulk(config: Dict[str, Any]) -> bool:
+    """Whether Crunchbase reads a bulk export without filtering it by date."""
+    crunchbase = (config.get("sources") or {}).get("crunchbase") or {}
+    return (
+        crunchbase.get("mode") == "bulk"
+        and not (crunchbase.get("bulk") or {}).get("filter_updated")
+    )
+
+
+def plan_units(config: Dict[str, Any], sources: List[str]) -> List[WorkUnit]:
+    """
+    Split the configured date range into work units.
+
+    SEC units cover one day or one calendar quarter (``sharding.sec_unit``);
+    other sources use windows of ``sharding.window_days`` days. A Crunchbase
+    bulk export is not split by date unless ``bulk.filter_updated`` is set:
+    each unit would read, and return, the whole export.
+
+    Args:
+        config: Collector configuration with start_date/end_date
+        sources: Names of the sources to plan
+
+    Returns:
+        Work units covering the whole range for every source
+    """
+    sharding = config.get("sharding", {})
+    end = config.get("end_date", datetime.now())
+    start = config.get("start_date", end.replace(day=1))
+    start = datetime(start.year, start.month, start.day)
+    end = datetime(end.year, end.month, end.day)
+
+    units = []
+    for source in sources:
+        if source == "sec" and sharding.get("sec_unit", "day") == "quarter":
+            windows = _quarters(start, end)
+        elif source == "sec":
+            windows = _windows(start, end, 1)
+        elif source == "crunchbase" and _unwindowed_bulk(config):
+            windows = iter([(start, end)])
+        else:
+            windows = _windows(start, end, sharding.get("window_days", 7))
+        units.extend(WorkUnit(source, s, e) for s, e in windows)
+    return units
+
+
+def shard_dir(config: Dict[str, Any]) -> Path:
+    """Directory holding shard outputs; must be shared by all workers."""
+    default = Path(config.get("output_dir", "../../data/raw")) / "shards"
+    return Path(config.get("sharding", {}).get("shard_dir", default))
+
+
+def run_worker(
+    config: Dict[str, Any],
+    queue: WorkQueue,
+    collectors: Dict[str, Callable[[Dict[str, Any]], pd.DataFrame]],
+    owner: Optional[str] = None,
+) -> int:
+    """
+    Claim and process units until the queue has nothing left to lease.
+
+    A background thread renews the lease while a unit is being collected,
+    so long units are not stolen by other workers.
+
+    Args:
+        config: Collector configuration
+        queue: Work queue to pull from
+        collectors: Source name to collect function
+        owner: Worker identifier (defaults to host:pid:random)
+
+    Returns:
+        Number of units completed by this worker
+    """
+    owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+    out_dir = shard_dir(config)
+    completed = 0
+
+    while True:
+        unit = queue.claim(owner)
+        if unit is None:
+            break
+
+        stop_renewing = threading.Event()
+
+        def renew_lease(unit_id: str = unit.id) -> None:
+            while not stop_renewing.wait(queue.lease_seconds / 3):
+                if not queue.renew(unit_id, owner):
+                    logger.warning(f"Lost lease on {unit_id}")
+                    return
+
+        renewer = threading.Thread(target=renew_lease, daemon=True)
+        renewer.start()
+        try:
+            logger.info(f"Worker {owner} collecting {unit.id}")
+            unit_config = dict(config, start_date=unit.start_date, end_date=unit.end_date)
+            df = collectors[unit.source](unit_config)
+
+            output = None
+            if not df.empty:
+                path = out_dir / unit.source / f"{unit.id.replace(':', '_')}.pkl"
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = path.with_suffix(f".{owner.replace(':', '_')}.tmp")
+                df.to_pickle(tmp_path)
+                os.replace(tmp_path, path)
+                output = str(path)
+        except Exception as e:
+            logger.error(f"Unit {unit.id} failed: {e}", exc_info=True)
+            queue.fail(unit.id, owner, repr(e))
+        else:
+            if queue.complete(unit.id, owner, output):
+                completed += 1
+            else:
+                logger.warning(f"Lease on {unit.id} expired before completion; discarded")
+        finally:
+            stop_renewing.set()
+            renewer.join()
+
+    logger.info(f"Worker {owner} finished after {completed} units")
+    return completed
+
+
+def _worker_process(
+    config: Dict[str, Any],
+    queue_path: str,
+    lease_seconds: float,
+    max_attempts: int,
+    source_names: List[str],
+    log_level: str,
+) -> None:
+    """Entry point of a locally spawned worker process."""
+    from common.logging import configure_logging
+    from collector.sources import load_source
+
+    logging_config = config.get("logging", {})
+    configure_logging(log_level, log_file=logging_config.get("file"))
+    queue = WorkQueue(Path(queue_path), lease_seconds, max_attempts)
+    run_worker(config, queue, {name: load_source(name) for name in source_names})
+
+
+def run_local_workers(
+    config: Dict[str, Any],
+    queue: WorkQueue,
+    source_names: List[str],
+    workers: int,
+    log_level: str = "INFO",
+) -> None:
+    """
+    Run ``workers`` worker processes on this host and wait for them.
+
+    Processes are started with the "spawn" method so each one gets a clean
+    interpreter and its own logging thread.
+    """
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(
+            target=_worker_process,
+            args=(config, str(queue.path), queue.lease_seconds, queue.max_attempts,
+                  source_names, log_level),
+            name=f"collector-worker-{i}",
+        )
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+        if process.exitcode:
+            logger.error(f"{process.name} exited with code {process.exitcode}")
+
+
+def merge(queue: WorkQueue, source_names: List[str], allow_partial: bool = False) -> Dict[str, pd.DataFrame]:
+    """
+    Combine shard outputs into one DataFrame per source.
+
+    Args:
+        queue: Work queue holding completed units
+        source_names: Sources to merge
+        allow_partial: Merge even if units are still pending, leased or failed
+
+    Returns:
+        Source name to merged DataFrame
+
+    Raises:
+        RuntimeError: If units are unfinished and allow_partial is False
+    """
+    counts = queue.counts()
+    unfinished = {status: n for status, n in counts.items() if status != DONE}
+    if unfinished and not allow_partial:
+        raise RuntimeError(f"Cannot merge, units not done: {unfinished}")
+
+    merged = {}
+    for name in source_names:
+        frames = [pd.read_pickle(path) for path in queue.outputs(name)]
+        df = concat_frames(frames)
+        # A record seen by several units (an organization updated in two
+        # windows) is kept once, from the latest unit
+        key_cols = [c for c in DEFAULT_KEYS.get(name, []) if c in df.columns]
+        if key_cols and len(df):
+            df = df.drop_duplicates(subset=key_cols, keep="last", ignore_index=True)
+        merged[name] = df
+        logger.info(f"Merged {len(frames)} {name} shards into {len(df)} records")
+    return merged
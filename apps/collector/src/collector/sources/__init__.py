@@ -1 +1,135 @@
-"""Data collection sources package.""" 
\ No newline at end of file
+"""Data collection sources package.
+
+Sources are plugins. Each one is a ``collect(config, session=None,
+cache=None)`` function that returns a DataFrame, registered under the
+``collector.sources`` entry point group::
+
+    [project.entry-points."collector.sources"]
+    crunchbase = "collector.sources.crunchbase:collect"
+
+The registry only stores ``module:function`` references. A source's
+module (and with it pandas, requests and any client library it needs) is
+imported the first time the source is loaded, so disabled sources cost
+nothing and ``--help`` or config validation never pay for them.
+"""
+
+import importlib
+import logging
+from typing import Any, Callable, Dict, List, Optional, Union
+
+
+logger = logging.getLogger(__name__)
+
+ENTRY_POINT_GROUP = "collector.sources"
+
+# Shipped sources, available even when the package metadata (and so its
+# entry points) is not installed, e.g. when running from PYTHONPATH
+BUILTIN_SOURCES = {
+    "crunchbase": "collector.sources.crunchbase:collect",
+    "sec": "collector.sources.sec:collect",
+}
+
+_registered: Dict[str, Union[str, Callable[..., Any]]] = {}
+_discovered: Optional[Dict[str, str]] = None
+_loaded: Dict[str, Callable[..., Any]] = {}
+
+
+def _entry_point_sources() -> Dict[str, str]:
+    """Return ``name -> module:function`` for installed source entry points."""
+    global _discovered
+    if _discovered is None:
+        from importlib import metadata
+
+        entry_points = metadata.entry_points()
+        if hasattr(entry_points, "select"):
+            group = entry_points.select(group=ENTRY_POINT_GROUP)
+        else:  # Python 3.9
+            group = entry_points.get(ENTRY_POINT_GROUP, [])
+        _discovered = {ep.name: ep.value for ep in group}
+    return _discovered
+
+
+def register_source(name: str, target: Union[str, Callable[..., Any]]) -> None:
+    """
+    Register a source without an entry point.
+
+    Args:
+        name: Source name as used under ``sources:`` in the config
+        target: A ``module:function`` reference or the collect function itself
+    """
+    _registered[name] = target
+    _loaded.pop(name, None)
+
+
+def available_sources() -> List[str]:
+    """Return the names of all known sources."""
+    names = dict.fromkeys(BUILTIN_SOURCES)
+    names.update(dict.fromkeys(_entry_point_sources()))
+    names.update(dict.fromkeys(_registered))
+    return list(names)
+
+
+def load_source(name: str) -> Callable[..., Any]:
+    """
+    Import and return the collect function of a source.
+
+    Args:
+        name: Source name
+
+    Returns:
+        The source's collect function
+
+    Raises:
+        ValueError: If no source of that name is registered
+    """
+    if name in _loaded:
+        return _loaded[name]
+
+    target = _registered.get(name) or _entry_point_sources().get(name) or BUILTIN_SOURCES.get(name)
+    if target is None:
+        raise ValueError(
+            f"Unknown source '{name}' (available: {', '.join(available_sources())})"
+        )
+
+    if callable(target):
+        collect = target
+    else:
+        module_name, _, attr = target.partition(":")
+        collect = getattr(importlib.import_module(module_name), attr or "collect")
+    _loaded[name] = collect
+    return collect
+
+
+def enabled_sources(config: Dict[str, Any]) -> List[str]:
+    """
+    Return the names of the sources enabled in the config, in config order.
+
+    A source is enabled unless its section sets ``enabled: false``. Configs
+    without a ``sources`` section enable every built-in source.
+
+    Args:
+        config: Collector configuration
+
+    Returns:
+        Enabled source names
+
+    Raises:
+        ValueError: If the config names a source that is not registered or
+            a source section is not a mapping
+    """
+    sources_config = config.get("sources")
+    if not sources_config:
+        return list(BUILTIN_SOURCES)
+
+    known = set(available_sources())
+    enabled = []
+    for name, options in sources_config.items():
+        if name not in known:
+            raise ValueError(
+                f"Unknown source '{name}' in config (available: {', '.join(sorted(known))})"
+            )
+        if options is not None and not isinstance(options, dict):
+            raise ValueError(f"sources.{name} must be a mapping")
+        if (options or {}).get("enabled", True):
+            enabled.append(name)
+    return enabled
@@ -3,26 +3,47 @@
 import logging
 import time
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, MutableMapping, Optional
 
 import pandas as pd
 import requests
 from tqdm import tqdm
 
+from collector import http, predicates
+
 
 logger = logging.getLogger(__name__)
 
+# Crunchbase API root; override with sources.crunchbase.base_url
+CRUNCHBASE_API_URL = "https://api.crunchbase.com/api/v4"
+
 
-def collect(config: Dict[str, Any]) -> pd.DataFrame:
+def collect(
+    config: Dict[str, Any],
+    session: Optional[requests.Session] = None,
+    cache: Optional[MutableMapping[str, Any]] = None,
+) -> pd.DataFrame:
     """
     Collect company and funding data from Crunchbase.
     
+    Pages through the REST API by default. With ``sources.crunchbase.mode:
+    bulk`` the local bulk CSV export at ``bulk_path`` is ingested instead
+    (see ``crunchbase_bulk``), producing records of the same shape.
+    
     Args:
         config: Configuration containing API keys and parameters.
+        session: Optional session to reuse connections across requests.
+        cache: Unused; search results change between runs, so nothing is cached.
         
     Returns:
         DataFrame containing the collected data.
     """
+    source_config = (config.get("sources") or {}).get("crunchbase") or {}
+    if source_config.get("mode", "api") == "bulk":
+        # Imported here so API-mode runs never load pyarrow
+        from collector.sources import crunchbase_bulk
+        return crunchbase_bulk.collect(config)
+    
     api_key = config.get("crunchbase_api_key")
     if not api_key:
         logger.error("No Crunchbase API key provided in config")
@@ -34,7 +55,8 @@ def collect(config: Dict[str, Any]) -> pd.DataFrame:
     logger.info(f"Collecting Crunchbase data from {start_date} to {end_date}")
     
     # Construct API endpoint URL
-    base_url = "https://api.crunchbase.com/api/v4/organizations/search"
+    api_url = source_config.get("base_url", CRUNCHBASE_API_URL)
+    base_url = f"{api_url.rstrip('/')}/organizations/search"
     
     # Prepare search parameters
     params = {
@@ -43,17 +65,25 @@ def collect(config: Dict[str, Any]) -> pd.DataFrame:
         "updated_before": end_date.strftime("%Y-%m-%d"),
         "limit": 100,  # Maximum allowed by Crunchbase API
     }
+    # Configured filters (funding, round type, industry, ...) narrow the search
+    params.update(predicates.pushdown(config, "crunchbase"))
+    
+    max_retries = config.get("collection", {}).get("max_retries", 2)
+    rate_limit_delay = config.get("collection", {}).get("rate_limit_delay", 1.0)
     
     all_results = []
     page = 1
     
     # Paginate through results
     while True:
-        logger.debug(f"Fetching page {page} from Crunchbase API")
+        logger.debug("Fetching page %d from Crunchbase API", page)
         params["page"] = page
         
         try:
-            response = requests.get(base_url, params=params)
+            response = http.get(
+                base_url, "crunchbase", session=session, params=params,
+                max_retries=max_retries,
+            )
             response.raise_for_status()
             
             data = response.json()
@@ -63,7 +93,7 @@ def collect(config: Dict[str, Any]) -> pd.DataFrame:
                 break
                 
             all_results.extend(items)
-            logger.debug(f"Fetched {len(items)} items from page {page}")
+            logger.debug("Fetched %d items from page %d", len(items), page)
             
             if len(items) < params["limit"]:
                 break
@@ -71,7 +101,7 @@ def collect(config: Dict[str, Any]) -> pd.DataFrame:
             page += 1
             
             # Respect API rate limits
-            time.sleep(1)
+            time.sleep(rate_limit_delay)
             
         except requests.exceptions.RequestException as e:
             logger.error(f"Error fetching Crunchbase data: {e}")
@@ -3,27 +3,54 @@
 import logging
 import re
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, MutableMapping, Optional
 from pathlib import Path
 
 import pandas as pd
 import requests
 from tqdm import tqdm
 
+from collector import http, predicates
+
 
 logger = logging.getLogger(__name__)
 
-# SEC API endpoints
-SEC_ARCHIVES_URL = "https://www.sec.gov/Archives/edgar/daily-index"
-SEC_FILINGS_URL = "https://www.sec.gov/Archives/edgar/data"
+# SEC API endpoints; override the EDGAR root with sources.sec.base_url
+SEC_ROOT_URL = "https://www.sec.gov/Archives"
+SEC_EDGAR_URL = f"{SEC_ROOT_URL}/edgar"
+SEC_ARCHIVES_URL = f"{SEC_EDGAR_URL}/daily-index"
+SEC_FILINGS_URL = f"{SEC_EDGAR_URL}/data"
+
+DEFAULT_TARGET_FORMS = ["S-1", "S-1/A", "10-K", "10-Q"]
+
+# Index file names look like edgar/data/<cik>/<accession>.txt, with
+# accession numbers of the form 0000950170-23-000123
+ACCESSION_SUFFIX_LENGTH = len("0000950170-23-000123.txt")
+
+# Columns of the frame returned by collect(); "accession" is replaced by
+# a "file_name" string column if any file name does not follow the pattern
+COLUMNS = ["cik", "company_name", "form_type", "filing_date", "accession"]
 
 
-def collect(config: Dict[str, Any]) -> pd.DataFrame:
+def collect(
+    config: Dict[str, Any],
+    session: Optional[requests.Session] = None,
+    cache: Optional[MutableMapping[str, List[Dict[str, Any]]]] = None,
+) -> pd.DataFrame:
     """
     Collect company and funding data from SEC EDGAR database.
     
+    Daily index files never change once published, so a caller that runs
+    repeatedly over overlapping windows can pass ``cache`` to keep the
+    parsed filings of days it has already fetched.
+    
+    The frame uses a compact schema (see ``to_frame``); filing URLs are
+    derived on demand with ``file_urls``.
+    
     Args:
         config: Configuration containing parameters.
+        session: Optional session to reuse connections across requests.
+        cache: Optional mapping of index URL and forms to parsed filings.
         
     Returns:
         DataFrame containing the collected data.
@@ -39,8 +66,22 @@ def collect(config: Dict[str, Any]) -> pd.DataFrame:
         "User-Agent": user_agent
     }
     
-    # Target specific filing types (e.g., S-1, 10-K, etc.)
-    target_forms = config.get("sec_target_forms", ["S-1", "S-1/A", "10-K", "10-Q"])
+    sec_config = (config.get("sources") or {}).get("sec") or {}
+    
+    # Target specific filing types (e.g., S-1, 10-K, etc.); sec_target_forms
+    # is the older top-level spelling of sources.sec.target_forms
+    target_forms = sec_config.get(
+        "target_forms", config.get("sec_target_forms", DEFAULT_TARGET_FORMS)
+    )
+    # filters.form_types narrows the forms further, so other filings are never parsed
+    pushed_forms = predicates.pushdown(config, "sec").get("target_forms")
+    if pushed_forms is not None:
+        target_forms = [form for form in target_forms if form in pushed_forms]
+    
+    max_retries = config.get("collection", {}).get("max_retries", 2)
+    
+    edgar_url = sec_config.get("base_url", SEC_EDGAR_URL)
+    archives_url = f"{edgar_url.rstrip('/')}/daily-index"
     
     all_filings = []
     current_date = start_date
@@ -52,18 +93,31 @@ def collect(config: Dict[str, Any]) -> pd.DataFrame:
         date_str = current_date.strftime("%Y%m%d")
         
         # Construct URL for the daily index
-        daily_index_url = f"{SEC_ARCHIVES_URL}/{year}/{quarter}/master.{date_str}.idx"
+        daily_index_url = f"{archives_url}/{year}/{quarter}/master.{date_str}.idx"
+        
+        cache_key = f"{daily_index_url}|{','.join(target_forms)}"
+        if cache is not None and cache_key in cache:
+            all_filings.extend(cache[cache_key])
+            current_date = datetime.fromordinal(current_date.toordinal() + 1)
+            continue
         
         try:
-            response = requests.get(daily_index_url, headers=headers)
+            response = http.get(
+                daily_index_url, "sec", session=session, headers=headers,
+                max_retries=max_retries,
+            )
             
             if response.status_code == 200:
                 # Process the index file
                 filings = _parse_idx_file(response.text, target_forms)
                 all_filings.extend(filings)
-                logger.debug(f"Found {len(filings)} relevant filings on {date_str}")
+                if cache is not None:
+                    cache[cache_key] = filings
+                logger.debug("Found %d relevant filings on %s", len(filings), date_str)
             elif response.status_code != 404:  # 404 is expected for weekends/holidays
-                logger.warning(f"Failed to fetch SEC index for {date_str}: {response.status_code}")
+                logger.warning(
+                    "Failed to fetch SEC index for %s: %s", date_str, response.status_code
+                )
         
         except requests.exceptions.RequestException as e:
             logger.error(f"Error fetching SEC data for {date_str}: {e}")
@@ -75,12 +129,80 @@ def collect(config: Dict[str, Any]) -> pd.DataFrame:
     
     # Convert to DataFrame
     if all_filings:
-        df = pd.DataFrame(all_filings)
-        return df
+        return to_frame(all_filings)
     else:
         return pd.DataFrame()
 
 
+def to_frame(filings: List[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Build the typed filings frame from parsed index records.
+    
+    Form types and company names repeat across filings and are stored as
+    categoricals, filing dates as datetime64 and CIKs as integers. File
+    names only differ by CIK and accession number, so the accession is
+    kept as one int64 and the URL is rebuilt by ``file_urls`` when needed.
+    Together this takes several times less memory than object strings.
+    
+    Args:
+        filings: Records as returned by ``_parse_idx_file``
+        
+    Returns:
+        DataFrame with the columns in ``COLUMNS``
+    """
+    raw = pd.DataFrame(
+        filings, columns=["cik", "company_name", "form_type", "filing_date", "file_name"]
+    )
+    try:
+        cik = raw["cik"].astype("int64")
+    except (TypeError, ValueError):
+        cik = pd.to_numeric(raw["cik"], errors="coerce").astype("Int64")
+    df = pd.DataFrame({
+        "cik": cik,
+        "company_name": raw["company_name"].astype("category"),
+        "form_type": raw["form_type"].astype("category"),
+        "filing_date": pd.to_datetime(raw["filing_date"], format="%Y%m%d", errors="coerce"),
+    })
+    
+    # Sliced rather than matched with a regex, which is several times slower
+    names = raw["file_name"].astype(str)
+    tail = names.str[-ACCESSION_SUFFIX_LENGTH:]
+    digits = tail.str[:10] + tail.str[11:13] + tail.str[14:20]
+    standard = (
+        (names.str[:-ACCESSION_SUFFIX_LENGTH] == "edgar/data/" + raw["cik"].astype(str) + "/")
+        & (tail.str[10] == "-") & (tail.str[13] == "-") & tail.str.endswith(".txt")
+        & digits.str.isdigit()
+    )
+    if standard.all():
+        df["accession"] = digits.astype("int64")
+    else:
+        logger.debug("Non-standard SEC file names; keeping them as strings")
+        df["file_name"] = raw["file_name"].astype("string")
+    return df
+
+
+def file_urls(df: pd.DataFrame, root_url: str = SEC_ROOT_URL) -> pd.Series:
+    """
+    Derive the URL of every filing in a frame built by ``to_frame``.
+    
+    Args:
+        df: SEC filings
+        root_url: Archive root the index file names are relative to
+        
+    Returns:
+        Series of filing URLs aligned with ``df``
+    """
+    if "file_name" in df.columns:
+        names = df["file_name"].astype(str)
+    else:
+        digits = df["accession"].astype(str).str.zfill(18)
+        names = (
+            "edgar/data/" + df["cik"].astype(str) + "/" + digits.str[:10] + "-"
+            + digits.str[10:12] + "-" + digits.str[12:] + ".txt"
+        )
+    return root_url.rstrip("/") + "/" + names
+
+
 def _parse_idx_file(content: str, target_forms: List[str]) -> List[Dict[str, Any]]:
     """Parse the SEC daily index file and extract relevant filings."""
     filings = []
@@ -111,9 +233,9 @@ def _parse_idx_file(content: str, target_forms: List[str]) -> List[Dict[str, Any
                     "company_name": company_name,
                     "form_type": form_type,
                     "filing_date": filing_date,
-                    "file_url": f"{SEC_FILINGS_URL}/{cik}/{file_name}",
+                    "file_name": file_name,
                 })
         except Exception as e:
-            logger.warning(f"Error parsing SEC index line: {e}")
+            logger.warning("Error parsing SEC index line: %s", e)
     
     return filings 
\ No newline at end of file
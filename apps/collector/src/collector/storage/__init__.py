@@ -2,16 +2,32 @@
 
 import json
 import logging
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Any, Union
 
 import pandas as pd
 
+from common.metrics import registry
+
 
 logger = logging.getLogger(__name__)
 
 
+def _record_write(fmt: str, output_path: Path, record_count: int, started: float) -> None:
+    """Record row, byte and latency metrics for a completed write."""
+    registry.counter(
+        "collector_storage_rows_written_total", "Records written by storage writers"
+    ).inc(record_count, format=fmt)
+    registry.counter(
+        "collector_storage_bytes_written_total", "Bytes written by storage writers"
+    ).inc(output_path.stat().st_size, format=fmt)
+    registry.histogram(
+        "collector_storage_write_seconds", "Storage write latency by format"
+    ).observe(time.perf_counter() - started, format=fmt)
+
+
 def save_to_csv(df: pd.DataFrame, output_path: Path) -> None:
     """
     Save a DataFrame to CSV.
@@ -24,8 +40,10 @@ def save_to_csv(df: pd.DataFrame, output_path: Path) -> None:
         logger.warning(f"No data to save to {output_path}")
         return
         
+    started = time.perf_counter()
     output_path.parent.mkdir(parents=True, exist_ok=True)
     df.to_csv(output_path, index=False)
+    _record_write("csv", output_path, len(df), started)
     logger.info(f"Saved {len(df)} records to {output_path}")
 
 
@@ -41,6 +59,7 @@ def save_to_json(data: Union[List, Dict], output_path: Path) -> None:
         logger.warning(f"No data to save to {output_path}")
         return
     
+    started = time.perf_counter()
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
     # Custom JSON serializer to handle datetime objects
@@ -57,7 +76,8 @@ def save_to_json(data: Union[List, Dict], output_path: Path) -> None:
         record_count = len(data)
     else:
         record_count = 1
-        
+    
+    _record_write("json", output_path, record_count, started)
     logger.info(f"Saved {record_count} records to {output_path}")
 
 
@@ -73,6 +93,8 @@ def save_to_parquet(df: pd.DataFrame, output_path: Path) -> None:
         logger.warning(f"No data to save to {output_path}")
         return
         
+    started = time.perf_counter()
     output_path.parent.mkdir(parents=True, exist_ok=True)
     df.to_parquet(output_path, index=False)
+    _record_write("parquet", output_path, len(df), started)
     logger.info(f"Saved {len(df)} records to {output_path}") 
\ No newline at end of file
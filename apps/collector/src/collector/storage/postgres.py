@@ -0,0 +1,356 @@
+"""Bulk upserts of companies and contacts into PostgreSQL.
+
+Rows go into the ``companies`` and ``contacts`` tables created by
+``scripts/bootstrap_db.sh``. Each batch is loaded with ``COPY`` into a
+temporary staging table, then merged in one set-based statement:
+
+    INSERT INTO companies (...) SELECT DISTINCT ON (id) ... FROM staging
+    ON CONFLICT (id) DO UPDATE SET ... WHERE <any column differs>
+
+Rows that did not change are left alone (``updated_at`` keeps its value),
+so rerunning a load is a no-op. Connections come from a
+``psycopg_pool.ConnectionPool`` that stays open across daemon cycles.
+Requires the ``postgres`` extra: ``pip install -e ".[postgres]"``.
+"""
+
+import json
+import logging
+import operator
+import os
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from common.metrics import registry
+from collector.contacts import canonical_name, company_key, contact_id
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_ROWS = 50_000
+
+COMPANY_COLUMNS = [
+    "id", "name", "description", "website", "founded_date", "headquarters",
+    "industries", "funding_rounds", "total_funding", "employee_count",
+    "crunchbase_id", "sec_cik", "source",
+]
+CONTACT_COLUMNS = [
+    "id", "first_name", "last_name", "full_name", "email", "title",
+    "company_id", "company_name", "linkedin_url", "source",
+]
+# Columns filled in by the enricher, kept when a later load has no value
+ENRICHED_COLUMNS = ["email", "linkedin_url"]
+
+# VARCHAR widths from bootstrap_db.sh; longer values are truncated
+NAME_WIDTH = 100
+TEXT_WIDTH = 255
+ID_WIDTH = 64
+
+
+def _text(value: Any, width: Optional[int] = None) -> Optional[str]:
+    """Return a stripped string cut to ``width``, or None for missing values."""
+    if value is None or value != value:  # NaN
+        return None
+    value = str(value).strip()[:width]
+    return value or None
+
+
+def _number(value: Any) -> Optional[float]:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if number != number else number
+
+
+def _employee_count(value: Any) -> Optional[int]:
+    """Parse a head count or the lower bound of a Crunchbase enum like ``c_00011_00050``."""
+    if isinstance(value, str) and value.startswith("c_"):
+        value = value.split("_")[1]
+    number = _number(value)
+    return int(number) if number is not None else None
+
+
+def company_id(company: Dict[str, Any]) -> Optional[str]:
+    """
+    Return the stable ``companies.id`` of a collected record.
+
+    Args:
+        company: Company record from a source
+
+    Returns:
+        ``crunchbase:<uuid>`` or ``sec:<cik>``, or None if the record has neither
+    """
+    uuid = _text(company.get("uuid") or company.get("properties.identifier.uuid"))
+    if uuid:
+        return f"crunchbase:{uuid}"[:ID_WIDTH]
+    cik = _text(company.get("cik"))
+    if cik:
+        return f"sec:{cik}"[:ID_WIDTH]
+    return None
+
+
+def company_row(company: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Map a collected record onto the ``companies`` columns.
+
+    Args:
+        company: Company record from a source (Crunchbase or SEC)
+
+    Returns:
+        Row keyed by column name, or None if the record has no stable ID
+    """
+    row_id = company_id(company)
+    if row_id is None:
+        return None
+    if row_id.startswith("crunchbase:"):
+        categories = company.get("properties.categories")
+        industries = [
+            c.get("value") for c in categories if isinstance(c, dict)
+        ] if isinstance(categories, list) else None
+        last_round = {
+            "type": _text(company.get("properties.last_funding_type")),
+            "announced_on": _text(company.get("properties.last_funding_at")),
+        }
+        return {
+            "id": row_id,
+            "name": _text(
+                company.get("properties.identifier.value") or company.get("name"), TEXT_WIDTH
+            ) or "",
+            "description": _text(company.get("description")),
+            "website": _text(company.get("properties.website_url"), TEXT_WIDTH),
+            "founded_date": None,
+            "headquarters": _text(company.get("headquarters"), TEXT_WIDTH),
+            "industries": json.dumps(industries) if industries is not None else None,
+            "funding_rounds": json.dumps([last_round]) if any(last_round.values()) else None,
+            "total_funding": _number(company.get("funding_total_usd")),
+            "employee_count": _employee_count(company.get("properties.num_employees_enum")),
+            "crunchbase_id": row_id.split(":", 1)[1],
+            "sec_cik": None,
+            "source": "crunchbase",
+        }
+    return {
+        "id": row_id,
+        "name": _text(company.get("company_name"), TEXT_WIDTH) or "",
+        "description": None,
+        "website": None,
+        "founded_date": None,
+        "headquarters": None,
+        "industries": None,
+        "funding_rounds": None,
+        "total_funding": None,
+        "employee_count": None,
+        "crunchbase_id": None,
+        "sec_cik": row_id.split(":", 1)[1],
+        "source": "sec",
+    }
+
+
+def contact_rows(
+    company: Dict[str, Any], decision_makers: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    Map a company's decision makers onto the ``contacts`` columns.
+
+    Args:
+        company: The company's row, as returned by ``company_row``
+        decision_makers: Output of ``DecisionMakerExtractor.extract_decision_makers``
+
+    Returns:
+        Rows keyed by column name; people without a name are skipped.
+        Decision makers keep the ID the extractor gave them (see
+        ``collector.contacts``), so one person is one row across sources.
+    """
+    rows = []
+    key = None
+    for dm in decision_makers:
+        name = canonical_name(dm.get("name"))
+        if name is None:
+            continue
+        if not dm.get("id") and key is None:
+            key = company_key(company)
+        rows.append({
+            "id": dm.get("id") or contact_id(key, name),
+            "first_name": (dm.get("first_name") or name.first)[:NAME_WIDTH],
+            "last_name": (dm.get("last_name") or name.last)[:NAME_WIDTH],
+            "full_name": name.full[:TEXT_WIDTH],
+            "email": _text(dm.get("email"), TEXT_WIDTH),
+            "title": _text(dm.get("title"), TEXT_WIDTH),
+            "company_id": company["id"],
+            "company_name": company["name"],
+            "linkedin_url": _text(dm.get("linkedin_url"), TEXT_WIDTH),
+            "source": _text(dm.get("source"), ID_WIDTH) or "collector",
+        })
+    return rows
+
+
+def connection_string(config: Dict[str, Any]) -> str:
+    """
+    Return ``postgres.dsn``, or a DSN built from the environment.
+
+    Without ``postgres.dsn`` the settings come from the ``DB_HOST``,
+    ``DB_PORT``, ``DB_NAME``, ``DB_USER`` and ``DB_PASSWORD`` environment
+    variables, with the same defaults as ``bootstrap_db.sh``.
+    """
+    dsn = (config.get("postgres") or {}).get("dsn")
+    if dsn:
+        return dsn
+    return (
+        f"host={os.environ.get('DB_HOST', 'localhost')} "
+        f"port={os.environ.get('DB_PORT', '5432')} "
+        f"dbname={os.environ.get('DB_NAME', 'autooutreach')} "
+        f"user={os.environ.get('DB_USER', 'postgres')} "
+        f"password={os.environ.get('DB_PASSWORD', 'password')}"
+    )
+
+
+def _batches(rows: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def upsert_sql(
+    table: str, columns: Sequence[str], staging: str, keep: Sequence[str] = ()
+) -> str:
+    """
+    Build the statement merging a staging table into ``table``.
+
+    The last staged row wins when a batch repeats an ID. Existing rows are
+    only rewritten, and ``updated_at`` only bumped, if a column changed.
+    A NULL staged value in a ``keep`` column leaves the stored value alone,
+    so a collector rerun never erases an email the enricher found.
+    """
+    names = ", ".join(columns)
+    updates = [c for c in columns if c != "id"]
+    assignments = ", ".join(
+        f"{c} = COALESCE(EXCLUDED.{c}, {table}.{c})" if c in keep else f"{c} = EXCLUDED.{c}"
+        for c in updates
+    )
+    changed = " OR ".join(
+        f"(EXCLUDED.{c} IS NOT NULL AND {table}.{c} IS DISTINCT FROM EXCLUDED.{c})"
+        if c in keep else f"{table}.{c} IS DISTINCT FROM EXCLUDED.{c}"
+        for c in updates
+    )
+    return (
+        f"INSERT INTO {table} ({names}) "
+        f"SELECT DISTINCT ON (id) {names} FROM {staging} ORDER BY id, seq DESC "
+        f"ON CONFLICT (id) DO UPDATE SET {assignments}, updated_at = now() "
+        f"WHERE {changed}"
+    )
+
+
+class PostgresSink:
+    """Upsert extracted companies and their decision makers into PostgreSQL."""
+
+    def __init__(self, pool: Any, batch_rows: int = DEFAULT_BATCH_ROWS):
+        """
+        Initialize the sink.
+
+        Args:
+            pool: Connection pool whose ``connection()`` context manager yields
+                a psycopg connection
+            batch_rows: Rows per COPY and upsert transaction
+        """
+        self.pool = pool
+        self.batch_rows = batch_rows
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> Optional["PostgresSink"]:
+        """Build the sink from the ``postgres`` config section, or None if disabled."""
+        pg_config = config.get("postgres") or {}
+        if not pg_config.get("enabled", False):
+            return None
+        try:
+            from psycopg_pool import ConnectionPool
+        except ImportError as e:
+            raise RuntimeError(
+                'postgres.enabled requires psycopg; pip install -e ".[postgres]"'
+            ) from e
+
+        pool = ConnectionPool(
+            connection_string(config),
+            min_size=1,
+            max_size=pg_config.get("pool_size", 4),
+            open=True,
+        )
+        return cls(pool, pg_config.get("batch_rows", DEFAULT_BATCH_ROWS))
+
+    def _load(
+        self,
+        table: str,
+        columns: Sequence[str],
+        rows: Iterable[Dict[str, Any]],
+        keep: Sequence[str] = (),
+    ) -> int:
+        """COPY rows into a staging table batch by batch and upsert each batch."""
+        staging = f"{table}_staging"
+        statement = upsert_sql(table, columns, staging, keep)
+        copy_columns = ", ".join(["seq", *columns])
+        values = operator.itemgetter(*columns)
+        loaded = 0
+        with self.pool.connection() as conn:
+            for batch in _batches(rows, self.batch_rows):
+                started = time.perf_counter()
+                with conn.transaction():
+                    with conn.cursor() as cur:
+                        cur.execute(
+                            f"CREATE TEMP TABLE IF NOT EXISTS {staging} "
+                            f"(seq bigint, LIKE {table} INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+                        )
+                        with cur.copy(f"COPY {staging} ({copy_columns}) FROM STDIN") as copy:
+                            for seq, row in enumerate(batch):
+                                copy.write_row((seq, *values(row)))
+                        cur.execute(statement)
+                        changed = cur.rowcount
+                loaded += len(batch)
+                registry.counter(
+                    "collector_storage_rows_written_total", "Records written by storage writers"
+                ).inc(len(batch), format="postgres")
+                registry.counter(
+                    "collector_postgres_rows_upserted_total",
+                    "Rows inserted or changed by Postgres upserts",
+                ).inc(max(changed, 0), table=table)
+                registry.histogram(
+                    "collector_storage_write_seconds", "Storage write latency by format"
+                ).observe(time.perf_counter() - started, format="postgres")
+        return loaded
+
+    def write(self, extracted: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Upsert companies, then their decision makers.
+
+        Args:
+            extracted: Output of ``extract_decision_makers_from_dfs``
+
+        Returns:
+            Rows loaded per table
+        """
+        started = time.perf_counter()
+        companies = [company_row(entry["company"]) for entry in extracted]
+        contacts = (
+            row
+            for entry, company in zip(extracted, companies)
+            if company is not None
+            for row in contact_rows(company, entry["decision_makers"])
+        )
+        counts = {
+            "companies": self._load("companies", COMPANY_COLUMNS, (c for c in companies if c)),
+            # Companies are committed first so contacts' foreign keys resolve
+            "contacts": self._load("contacts", CONTACT_COLUMNS, contacts, ENRICHED_COLUMNS),
+        }
+        elapsed = time.perf_counter() - started
+        total = sum(counts.values())
+        logger.info(
+            f"Upserted {counts['companies']} companies and {counts['contacts']} contacts "
+            f"into Postgres in {elapsed:.2f}s ({total / elapsed if elapsed else 0:,.0f} rows/s)"
+        )
+        return counts
+
+    def close(self) -> None:
+        """Close the connection pool."""
+        self.pool.close()
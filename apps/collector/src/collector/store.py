@@ -0,0 +1,395 @@
+"""Local columnar store for point lookups and date-range scans.
+
+Each source's records are kept under ``<store_dir>/<source>/``:
+
+- ``data.parquet``: the records, sorted by the source's date column and
+  split into row groups of ``row_group_rows`` rows. Parquet keeps min/max
+  statistics for every column of every row group in the file footer.
+- ``index.parquet``: a sidecar mapping each value of the indexed keys
+  (CIK, Crunchbase ID, normalized company name, location) to the row
+  groups that contain it, sorted by key and value.
+
+A lookup binary-searches the sidecar, a date-range scan compares the
+range against the footer's min/max statistics, and only the matching row
+groups are read. Query the store from Python::
+
+    store = ColumnarStore("../../data/store")
+    store.lookup("sec", cik=320193)
+    store.lookup("sec", start="2023-01-02", end="2023-01-08")
+    store.lookup("crunchbase", name="Acme, Inc.", location="Boston")
+
+or from the command line::
+
+    python -m collector.store ../../data/store sec --cik 320193
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from common.metrics import registry
+from collector.cdc import DEFAULT_KEYS
+from collector.contacts import LEGAL_SUFFIXES, PUNCTUATION, normalize_name  # noqa: F401
+from collector.frames import concat_frames
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_DIR = Path("../../data/store")
+DEFAULT_ROW_GROUP_ROWS = 8192
+
+# Date column each source is sorted and range-scanned by
+DATE_COLUMNS = {
+    "sec": "filing_date",
+    "crunchbase": "properties.last_funding_at",
+}
+
+# Lookup key to the column it indexes, per source
+INDEXES = {
+    "sec": {"cik": "cik", "name": "company_name"},
+    "crunchbase": {
+        "company_id": "uuid",
+        "name": "properties.identifier.value",
+        "location": "headquarters",
+    },
+}
+
+def normalize_names(names: pd.Series) -> pd.Series:
+    """
+    Normalize company names for lookup.
+
+    Lowercases, drops punctuation and trailing legal suffixes, so
+    "Acme, Inc." and "ACME INC" both become "acme". This is
+    ``contacts.normalize_name`` applied to a whole column.
+    """
+    return (
+        names.astype("string").str.lower()
+        .str.replace(PUNCTUATION.pattern, " ", regex=True)
+        .str.strip()
+        .str.replace(LEGAL_SUFFIXES.pattern, "", regex=True)
+        .str.strip()
+    )
+
+
+def _index_values(key: str, values: pd.Series) -> pd.Series:
+    """Turn a column into the strings it is indexed (and looked up) by."""
+    if isinstance(values.dtype, pd.CategoricalDtype) and key != "location":
+        # Transform each category once rather than every row
+        categories = _index_values(key, pd.Series(values.cat.categories)).to_numpy(object)
+        codes = values.cat.codes.to_numpy()
+        out = np.where(codes >= 0, categories[codes], None)
+        return pd.Series(out, index=values.index, dtype="string")
+    if key == "name":
+        return normalize_names(values)
+    if key == "location":
+        # Every comma-separated part, so "boston" finds "Boston, MA, US"
+        parts = values.astype("string").str.lower().str.split(",").explode()
+        return parts.str.strip()
+    return values.astype("string")
+
+
+def _json_cells(df: pd.DataFrame) -> pd.DataFrame:
+    """Serialize list/dict cells to JSON so every source fits a flat Parquet schema."""
+    out = df
+    for col in df.columns:
+        if df[col].dtype != object:
+            continue
+        if df[col].map(lambda v: isinstance(v, (list, dict))).any():
+            if out is df:
+                out = df.copy()
+            out[col] = df[col].map(
+                lambda v: json.dumps(v, default=str) if isinstance(v, (list, dict)) else v
+            )
+    return out
+
+
+class ColumnarStore:
+    """Sorted, indexed Parquet files per source with a lookup API."""
+
+    def __init__(self, root: Path, row_group_rows: int = DEFAULT_ROW_GROUP_ROWS):
+        """
+        Initialize the store.
+
+        Args:
+            root: Directory holding one subdirectory per source
+            row_group_rows: Rows per Parquet row group; the unit a lookup reads
+        """
+        self.root = Path(root)
+        self.row_group_rows = row_group_rows
+        self._indexes: Dict[str, Tuple[float, Dict[str, Tuple[np.ndarray, np.ndarray]]]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> Optional["ColumnarStore"]:
+        """Build the store from the ``store`` config section, or None if disabled."""
+        store_config = config.get("store") or {}
+        if not store_config.get("enabled", False):
+            return None
+        return cls(
+            Path(store_config.get("dir", DEFAULT_STORE_DIR)),
+            store_config.get("row_group_rows", DEFAULT_ROW_GROUP_ROWS),
+        )
+
+    def _paths(self, source: str) -> Tuple[Path, Path]:
+        directory = self.root / source
+        return directory / "data.parquet", directory / "index.parquet"
+
+    def read(self, source: str) -> pd.DataFrame:
+        """Read every stored record of a source."""
+        data_path, _ = self._paths(source)
+        if not data_path.exists():
+            return pd.DataFrame()
+        return pq.read_table(data_path).to_pandas()
+
+    def write(self, source: str, df: pd.DataFrame) -> int:
+        """
+        Merge records into the store and rewrite the source's files.
+
+        Records replace stored ones with the same ID (``cdc.DEFAULT_KEYS``,
+        or all columns for other sources).
+
+        Args:
+            source: Source name
+            df: Records from the source
+
+        Returns:
+            Number of records stored for the source
+        """
+        if df.empty:
+            return len(self.read(source))
+        started = time.perf_counter()
+        data_path, index_path = self._paths(source)
+        data_path.parent.mkdir(parents=True, exist_ok=True)
+
+        df = _json_cells(df)
+        date_column = DATE_COLUMNS.get(source)
+        if date_column in df.columns and not pd.api.types.is_datetime64_any_dtype(df[date_column]):
+            df = df.assign(**{date_column: pd.to_datetime(df[date_column], errors="coerce")})
+
+        stored = self.read(source)
+        if not stored.empty:
+            df = concat_frames([stored, df])
+        keys = [k for k in DEFAULT_KEYS.get(source, []) if k in df.columns] or None
+        df = df.drop_duplicates(subset=keys, keep="last")
+
+        # Sorted by date so range scans touch few row groups, then by the first index key
+        sort_columns = [
+            c for c in (date_column, *INDEXES.get(source, {}).values()) if c in df.columns
+        ][:2]
+        if sort_columns:
+            df = df.sort_values(sort_columns, na_position="first", kind="stable")
+        df = df.reset_index(drop=True)
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        self._replace(data_path, lambda tmp: pq.write_table(
+            table, tmp, row_group_size=self.row_group_rows, write_statistics=True
+        ))
+
+        # Row group of every row, from the row counts actually written
+        metadata = pq.ParquetFile(data_path).metadata
+        counts = [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)]
+        row_groups = np.repeat(np.arange(len(counts), dtype=np.int32), counts)
+
+        parts = []
+        for key, column in INDEXES.get(source, {}).items():
+            if column not in df.columns:
+                continue
+            values = _index_values(key, df[column].set_axis(row_groups))
+            entries = pd.DataFrame({"key": key, "value": values, "row_group": values.index})
+            parts.append(entries.dropna().drop_duplicates())
+        index = (
+            pd.concat(parts, ignore_index=True).sort_values(["key", "value"])
+            if parts else pd.DataFrame({"key": [], "value": [], "row_group": []})
+        )
+        index = index.astype({"key": "string", "value": "string", "row_group": "int32"})
+        self._replace(index_path, lambda tmp: index.to_parquet(tmp, index=False))
+
+        registry.histogram(
+            "collector_store_write_seconds", "Time to merge and rewrite a source in the store"
+        ).observe(time.perf_counter() - started, source=source)
+        logger.info(
+            f"Stored {len(df)} {source} records in {len(counts)} row groups under {data_path.parent}"
+        )
+        return len(df)
+
+    @staticmethod
+    def _replace(path: Path, write) -> None:
+        """Write through a temporary file so readers never see a partial file."""
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        os.close(fd)
+        try:
+            write(tmp)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def _index(self, source: str) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """Load a source's sidecar index, reloading it when the file changed."""
+        _, index_path = self._paths(source)
+        mtime = index_path.stat().st_mtime
+        with self._lock:
+            cached = self._indexes.get(source)
+            if cached is None or cached[0] != mtime:
+                index = pq.read_table(index_path).to_pandas()
+                by_key = {
+                    key: (
+                        group["value"].to_numpy(dtype=object),
+                        group["row_group"].to_numpy(),
+                    )
+                    for key, group in index.groupby("key", sort=False)
+                }
+                self._indexes[source] = cached = (mtime, by_key)
+        return cached[1]
+
+    def _row_groups_for(self, source: str, key: str, value: Any) -> np.ndarray:
+        if key not in INDEXES.get(source, {}):
+            raise ValueError(
+                f"No '{key}' index for {source}; indexed keys: {', '.join(INDEXES.get(source, {}))}"
+            )
+        wanted = _index_values(key, pd.Series([value])).dropna()
+        values, row_groups = self._index(source).get(key, (np.array([], dtype=object), None))
+        matches = []
+        for v in wanted:
+            lo, hi = np.searchsorted(values, v, side="left"), np.searchsorted(values, v, side="right")
+            matches.append(row_groups[lo:hi])
+        return np.unique(np.concatenate(matches)) if matches else np.array([], dtype=np.int32)
+
+    def lookup(
+        self,
+        source: str,
+        start: Any = None,
+        end: Any = None,
+        columns: Optional[Sequence[str]] = None,
+        **keys: Any,
+    ) -> pd.DataFrame:
+        """
+        Return the records matching every given key and the date range.
+
+        Args:
+            source: Source name
+            start: Earliest date (inclusive) of the source's date column
+            end: Latest date (inclusive)
+            columns: Columns to read (default: all)
+            **keys: Indexed keys to match, e.g. ``cik=320193``,
+                ``company_id="..."``, ``name="Acme Inc"``, ``location="Boston"``
+
+        Returns:
+            Matching records; only the row groups that can contain them are read
+        """
+        started = time.perf_counter()
+        data_path, _ = self._paths(source)
+        if not data_path.exists():
+            return pd.DataFrame(columns=list(columns or []))
+        parquet = pq.ParquetFile(data_path)
+        metadata = parquet.metadata
+        candidates = np.arange(metadata.num_row_groups)
+
+        for key, value in keys.items():
+            candidates = np.intersect1d(candidates, self._row_groups_for(source, key, value))
+
+        date_column = DATE_COLUMNS.get(source)
+        if start is not None or end is not None:
+            if date_column is None or date_column not in parquet.schema_arrow.names:
+                raise ValueError(f"{source} has no date column to scan")
+            start = pd.Timestamp(start) if start is not None else None
+            end = pd.Timestamp(end) if end is not None else None
+            position = parquet.schema_arrow.get_field_index(date_column)
+            kept = []
+            for i in candidates:
+                stats = metadata.row_group(int(i)).column(position).statistics
+                if stats is None or not stats.has_min_max:
+                    kept.append(i)
+                    continue
+                low, high = pd.Timestamp(stats.min), pd.Timestamp(stats.max)
+                if (start is None or high >= start) and (end is None or low <= end):
+                    kept.append(i)
+            candidates = np.array(kept, dtype=int)
+
+        scanned = start is not None or end is not None
+        read_columns = None
+        if columns is not None:
+            needed = [INDEXES[source][k] for k in keys] + ([date_column] if scanned else [])
+            read_columns = list(dict.fromkeys([*columns, *needed]))
+        if len(candidates):
+            df = parquet.read_row_groups([int(i) for i in candidates], columns=read_columns).to_pandas()
+        else:
+            df = parquet.schema_arrow.empty_table().to_pandas()
+            if read_columns is not None:
+                df = df[read_columns]
+
+        # Row groups can hold other values too; filter the rows exactly
+        mask = np.ones(len(df), dtype=bool)
+        for key, value in keys.items():
+            column = df[INDEXES[source][key]]
+            wanted = set(_index_values(key, pd.Series([value])).dropna())
+            if key == "location":
+                exploded = _index_values(key, column.reset_index(drop=True))
+                hits = exploded.isin(wanted).groupby(level=0).any()
+                mask &= hits.reindex(range(len(df)), fill_value=False).to_numpy()
+            else:
+                mask &= _index_values(key, column).isin(wanted).fillna(False).to_numpy(dtype=bool)
+        if start is not None:
+            mask &= (df[date_column] >= start).fillna(False).to_numpy(dtype=bool)
+        if end is not None:
+            mask &= (df[date_column] <= end).fillna(False).to_numpy(dtype=bool)
+        result = df[mask].reset_index(drop=True)
+        if columns is not None:
+            result = result[list(columns)]
+
+        row_groups = registry.counter(
+            "collector_store_row_groups_total", "Row groups read or skipped by store lookups"
+        )
+        row_groups.inc(len(candidates), source=source, result="read")
+        row_groups.inc(metadata.num_row_groups - len(candidates), source=source, result="skipped")
+        registry.histogram(
+            "collector_store_lookup_seconds", "Store lookup latency"
+        ).observe(time.perf_counter() - started, source=source)
+        return result
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entrypoint: ``python -m collector.store DIR SOURCE [--cik ...]``."""
+    parser = argparse.ArgumentParser(description="Look up records in the local columnar store")
+    parser.add_argument("store_dir", type=Path, help="Store directory (store.dir in the config)")
+    parser.add_argument("source", help="Source name, e.g. sec or crunchbase")
+    parser.add_argument("--cik", help="SEC central index key")
+    parser.add_argument("--company-id", help="Crunchbase organization UUID")
+    parser.add_argument("--name", help="Company name (normalized before matching)")
+    parser.add_argument("--location", help="City, region or country")
+    parser.add_argument("--start", help="Earliest date (YYYY-MM-DD)")
+    parser.add_argument("--end", help="Latest date (YYYY-MM-DD)")
+    parser.add_argument("--columns", nargs="+", help="Columns to print")
+    args = parser.parse_args(argv)
+
+    keys = {
+        key: getattr(args, key)
+        for key in ("cik", "company_id", "name", "location")
+        if getattr(args, key) is not None
+    }
+    store = ColumnarStore(args.store_dir)
+    started = time.perf_counter()
+    try:
+        df = store.lookup(args.source, args.start, args.end, args.columns, **keys)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    df.to_csv(sys.stdout, index=False)
+    print(f"{len(df)} rows in {(time.perf_counter() - started) * 1000:.1f} ms", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
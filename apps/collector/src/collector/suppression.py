@@ -0,0 +1,397 @@
+"""Suppression of companies and contacts that were already reached out to.
+
+A suppression set is built from the ``outreach`` table (joined to
+``companies`` and ``contacts``) or from an exported CSV, and holds three
+kinds of keys:
+
+- ``d:<domain>``: normalized company website domain
+- ``n:<name>``: normalized company name (see ``store.normalize_names``)
+- ``c:<name>|<person>``: normalized company name and person name key
+  (see ``contacts.canonical_name``)
+
+It is stored as a Bloom filter (about 1.2 bytes per key at a 1% false
+positive rate) plus a sorted array of 64-bit key fingerprints. Fetched
+records are screened against the Bloom filter in a vectorized pass, and
+only its positives are confirmed against the memory-mapped fingerprint
+array, so Bloom false positives never drop a record. The pipeline applies
+the set right after each fetch: suppressed companies are dropped and
+suppressed people are removed from ``people`` lists before extraction.
+
+    python -m collector.suppression build --config ../../configs/dev/collector.yaml --from-db
+    python -m collector.suppression build --from-file contacted.csv --out ../../data/suppression
+    python -m collector.suppression check ../../data/suppression --name "Acme Inc"
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from common.metrics import registry
+from collector.contacts import canonical_name, canonical_parts
+from collector.store import normalize_names
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = Path("../../data/suppression")
+DEFAULT_ERROR_RATE = 0.01
+
+# Candidate columns per key, in the shape sources produce
+NAME_COLUMNS = ("properties.identifier.value", "name", "company_name")
+DOMAIN_COLUMNS = ("properties.website_url", "website", "homepage_url", "domain")
+PEOPLE_COLUMN = "people"
+
+# Second hash seed for double hashing; must stay fixed for stored filters
+_SEED = "suppression-h2.."
+
+
+def normalize_domains(urls: pd.Series) -> pd.Series:
+    """Reduce URLs or domains to a bare lowercase host without ``www.``."""
+    return (
+        urls.astype("string").str.strip().str.lower()
+        .str.replace(r"^[a-z][a-z0-9+.-]*://", "", regex=True)
+        .str.replace(r"^www\d*\.", "", regex=True)
+        .str.replace(r"[/:?#].*$", "", regex=True)
+        .replace("", pd.NA)
+    )
+
+
+def normalize_people(names: pd.Series) -> pd.Series:
+    """Map person names to their canonical name keys, so "Dr. Jane Doe" matches "Doe, Jane"."""
+    keys = [getattr(canonical_name(n), "key", None) for n in names.astype(object)]
+    return pd.Series(keys, index=names.index, dtype="string")
+
+
+def _prefixed(prefix: str, values: pd.Series) -> pd.Series:
+    return (prefix + values).dropna()
+
+
+def _hashes(keys: np.ndarray) -> tuple:
+    h1 = pd.util.hash_array(keys, categorize=False)
+    h2 = pd.util.hash_array(keys, hash_key=_SEED, categorize=False) | np.uint64(1)
+    return h1, h2
+
+
+class BloomFilter:
+    """A bit array probed at ``k`` positions per key (double hashing)."""
+
+    def __init__(self, bits: np.ndarray, num_hashes: int):
+        """
+        Initialize the filter.
+
+        Args:
+            bits: Packed bit array (uint8)
+            num_hashes: Positions probed per key
+        """
+        self.bits = bits
+        self.num_bits = len(bits) * 8
+        self.num_hashes = num_hashes
+
+    @classmethod
+    def sized(cls, capacity: int, error_rate: float = DEFAULT_ERROR_RATE) -> "BloomFilter":
+        """Create an empty filter for ``capacity`` keys at the given false positive rate."""
+        capacity = max(capacity, 1)
+        num_bits = max(64, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        num_hashes = max(1, round(num_bits / capacity * math.log(2)))
+        return cls(np.zeros((num_bits + 7) // 8, dtype=np.uint8), num_hashes)
+
+    def _positions(self, h1: np.ndarray, h2: np.ndarray) -> np.ndarray:
+        steps = np.arange(self.num_hashes, dtype=np.uint64)
+        return (h1[:, None] + steps * h2[:, None]) % np.uint64(self.num_bits)
+
+    def add(self, h1: np.ndarray, h2: np.ndarray) -> None:
+        """Set the bits of the hashed keys."""
+        unpacked = np.unpackbits(self.bits, bitorder="little").astype(bool)
+        unpacked[self._positions(h1, h2).ravel()] = True
+        self.bits = np.packbits(unpacked, bitorder="little")
+
+    def contains(self, h1: np.ndarray, h2: np.ndarray) -> np.ndarray:
+        """Return a mask of the hashed keys that may be in the filter."""
+        positions = self._positions(h1, h2)
+        set_bits = self.bits[positions >> np.uint64(3)] >> (positions & np.uint64(7)).astype(np.uint8)
+        return (set_bits & 1).all(axis=1).astype(bool)
+
+
+class SuppressionSet:
+    """Keys of companies and contacts to skip, with an exact check behind a Bloom filter."""
+
+    def __init__(self, bloom: BloomFilter, fingerprints: np.ndarray):
+        """
+        Initialize the set.
+
+        Args:
+            bloom: Filter screening every key
+            fingerprints: Sorted unique 64-bit fingerprints confirming its positives
+        """
+        self.bloom = bloom
+        self.fingerprints = fingerprints
+
+    def __len__(self) -> int:
+        return len(self.fingerprints)
+
+    @classmethod
+    def build(cls, keys: Iterable[str], error_rate: float = DEFAULT_ERROR_RATE) -> "SuppressionSet":
+        """Build a set from prefixed keys (see the module docstring)."""
+        keys = pd.unique(np.asarray(list(keys), dtype=object))
+        h1, h2 = _hashes(keys)
+        bloom = BloomFilter.sized(len(keys), error_rate)
+        bloom.add(h1, h2)
+        fingerprints = np.sort(h1)
+        if len(fingerprints):
+            fingerprints = fingerprints[np.r_[True, fingerprints[1:] != fingerprints[:-1]]]
+        return cls(bloom, fingerprints)
+
+    @classmethod
+    def from_frame(
+        cls, df: pd.DataFrame, error_rate: float = DEFAULT_ERROR_RATE
+    ) -> "SuppressionSet":
+        """
+        Build a set from contacted companies and people.
+
+        Args:
+            df: Rows with any of ``company_name``, ``website`` (or
+                ``domain``) and ``full_name``; a row with a ``full_name``
+                suppresses that contact, a row without one the whole company
+            error_rate: Bloom filter false positive rate
+        """
+        def column(*names):
+            for name in names:
+                if name in df.columns:
+                    return df[name]
+            return pd.Series(pd.NA, index=df.index, dtype="string")
+
+        company = normalize_names(column("company_name", "name"))
+        person = normalize_people(column("full_name", "contact_name"))
+        is_company = person.isna()
+        keys = pd.concat([
+            _prefixed("d:", normalize_domains(column("website", "domain"))[is_company]),
+            _prefixed("n:", company[is_company]),
+            _prefixed("c:", company + "|" + person),
+        ])
+        return cls.build(keys.tolist(), error_rate)
+
+    def contains(self, keys: Sequence[str]) -> np.ndarray:
+        """Return a boolean mask of the keys in the set."""
+        keys = np.asarray(keys, dtype=object)
+        if not len(keys) or not len(self.fingerprints):
+            return np.zeros(len(keys), dtype=bool)
+        h1, h2 = _hashes(keys)
+        candidates = self.bloom.contains(h1, h2)
+        found = candidates.copy()
+        if candidates.any():
+            probe = h1[candidates]
+            at = np.searchsorted(self.fingerprints, probe).clip(max=len(self.fingerprints) - 1)
+            found[candidates] = self.fingerprints[at] == probe
+            registry.counter(
+                "collector_suppression_bloom_false_positives_total",
+                "Bloom filter positives the exact check rejected",
+            ).inc(int(candidates.sum() - found.sum()))
+        return found
+
+    def save(self, path: Path) -> None:
+        """Write the set to a directory."""
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        np.save(path / "bloom.npy", self.bloom.bits)
+        np.save(path / "fingerprints.npy", self.fingerprints)
+        meta = {"num_hashes": self.bloom.num_hashes, "keys": len(self.fingerprints)}
+        tmp = path / "meta.json.tmp"
+        tmp.write_text(json.dumps(meta))
+        os.replace(tmp, path / "meta.json")
+
+    @classmethod
+    def load(cls, path: Path) -> "SuppressionSet":
+        """Load a set; the fingerprints are memory-mapped and only paged in for Bloom positives."""
+        path = Path(path)
+        meta = json.loads((path / "meta.json").read_text())
+        bloom = BloomFilter(np.load(path / "bloom.npy"), meta["num_hashes"])
+        return cls(bloom, np.load(path / "fingerprints.npy", mmap_mode="r"))
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> Optional["SuppressionSet"]:
+        """Load the set at ``suppression.path``, or None if disabled or not built yet."""
+        suppression_config = config.get("suppression") or {}
+        if not suppression_config.get("enabled", False):
+            return None
+        path = Path(suppression_config.get("path", DEFAULT_PATH))
+        if not (path / "meta.json").exists():
+            logger.warning(
+                f"Suppression is enabled but no set exists at {path}; "
+                "build one with python -m collector.suppression build"
+            )
+            return None
+        suppression = cls.load(path)
+        logger.info(f"Loaded suppression set of {len(suppression)} keys from {path}")
+        return suppression
+
+    def apply(self, df: pd.DataFrame, source: str = "") -> pd.DataFrame:
+        """
+        Drop suppressed companies and remove suppressed people from ``people``.
+
+        Args:
+            df: Records fetched from a source
+            source: Source name, used in logs and metrics
+
+        Returns:
+            The records that were not suppressed
+        """
+        if df.empty:
+            return df
+        suppressed_total = registry.counter(
+            "collector_suppressed_total", "Fetched records dropped by the suppression set"
+        )
+        name_column = next((c for c in NAME_COLUMNS if c in df.columns), None)
+        domain_column = next((c for c in DOMAIN_COLUMNS if c in df.columns), None)
+        names = normalize_names(df[name_column]) if name_column else None
+
+        drop = np.zeros(len(df), dtype=bool)
+        if names is not None:
+            keys = "n:" + names
+            valid = keys.notna().to_numpy()
+            drop[valid] |= self.contains(keys[valid].tolist())
+        if domain_column:
+            keys = "d:" + normalize_domains(df[domain_column])
+            valid = keys.notna().to_numpy()
+            drop[valid] |= self.contains(keys[valid].tolist())
+        kept = df[~drop]
+        suppressed_total.inc(int(drop.sum()), source=source, kind="company")
+
+        if PEOPLE_COLUMN in kept.columns and names is not None:
+            kept = self._drop_people(kept, names[~drop], source, suppressed_total)
+        if drop.any():
+            logger.info(f"Suppressed {int(drop.sum())} of {len(df)} {source} companies")
+        return kept
+
+    def _drop_people(
+        self, df: pd.DataFrame, names: pd.Series, source: str, suppressed_total: Any
+    ) -> pd.DataFrame:
+        """Remove suppressed people from each row's ``people`` list."""
+        rows, members, people = [], [], []
+        for row, (company, listed) in enumerate(zip(names, df[PEOPLE_COLUMN])):
+            if company is pd.NA or not isinstance(listed, list):
+                continue
+            for member, person in enumerate(listed):
+                if isinstance(person, dict):
+                    rows.append(row)
+                    members.append(member)
+                    name = canonical_parts(person.get("first_name"), person.get("last_name"))
+                    people.append(name.key if name is not None else None)
+        if not people:
+            return df
+        keys = (
+            "c:" + names.iloc[rows].reset_index(drop=True) + "|"
+            + pd.Series(people, dtype="string")
+        )
+        valid = keys.notna().to_numpy()
+        hit = np.zeros(len(keys), dtype=bool)
+        hit[valid] = self.contains(keys[valid].tolist())
+        if not hit.any():
+            return df
+
+        # Rebuild only the lists that lose someone
+        dropped: Dict[int, set] = {}
+        for row, member in zip(np.asarray(rows)[hit], np.asarray(members)[hit]):
+            dropped.setdefault(int(row), set()).add(int(member))
+        df = df.copy()
+        column = df.columns.get_loc(PEOPLE_COLUMN)
+        for row, members_out in dropped.items():
+            listed = df.iat[row, column]
+            df.iat[row, column] = [p for j, p in enumerate(listed) if j not in members_out]
+        suppressed_total.inc(int(hit.sum()), source=source, kind="contact")
+        return df
+
+
+def read_database(config: Dict[str, Any], company_level: bool = True) -> pd.DataFrame:
+    """
+    Read contacted companies and people from the ``outreach`` table.
+
+    Args:
+        config: Collector configuration (for the Postgres connection)
+        company_level: Suppress every company that has any outreach row,
+            not only the contacts that were reached
+
+    Returns:
+        Rows with ``company_name``, ``website`` and ``full_name``
+    """
+    try:
+        import psycopg
+    except ImportError as e:
+        raise RuntimeError('--from-db requires psycopg; pip install -e ".[postgres]"') from e
+    from collector.storage.postgres import connection_string
+
+    queries = [
+        "SELECT ct.company_name, NULL AS website, ct.full_name FROM outreach o "
+        "JOIN contacts ct ON ct.id = o.contact_id"
+    ]
+    if company_level:
+        queries.append(
+            "SELECT c.name, c.website, NULL FROM outreach o JOIN companies c ON c.id = o.company_id"
+        )
+    with psycopg.connect(connection_string(config)) as conn:
+        rows = conn.execute(" UNION ".join(queries)).fetchall()
+    return pd.DataFrame(rows, columns=["company_name", "website", "full_name"])
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entrypoint: ``python -m collector.suppression {build,check}``."""
+    parser = argparse.ArgumentParser(description="Build or query the suppression set")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build = subparsers.add_parser("build", help="Build the set from the database or a CSV export")
+    build.add_argument("--config", help="Collector config (Postgres settings, suppression.path)")
+    source = build.add_mutually_exclusive_group(required=True)
+    source.add_argument("--from-db", action="store_true", help="Read the outreach table")
+    source.add_argument("--from-file", type=Path, help="CSV with company_name/website/full_name")
+    build.add_argument("--out", type=Path, help="Output directory (default: suppression.path)")
+    build.add_argument("--error-rate", type=float, default=None)
+    check = subparsers.add_parser("check", help="Check whether a company or contact is suppressed")
+    check.add_argument("path", type=Path)
+    check.add_argument("--name", help="Company name")
+    check.add_argument("--domain", help="Company website or domain")
+    check.add_argument("--person", help="Contact name (with --name)")
+    args = parser.parse_args(argv)
+
+    if args.command == "check":
+        suppression = SuppressionSet.load(args.path)
+        keys = []
+        name = normalize_names(pd.Series([args.name]))[0] if args.name else None
+        if name:
+            keys.append(f"n:{name}")
+        if args.domain:
+            keys.append(f"d:{normalize_domains(pd.Series([args.domain]))[0]}")
+        if name and args.person:
+            keys.append(f"c:{name}|{normalize_people(pd.Series([args.person]))[0]}")
+        hits = [key for key, hit in zip(keys, suppression.contains(keys)) if hit]
+        print("suppressed: " + ", ".join(hits) if hits else "not suppressed")
+        return 1 if hits else 0
+
+    config: Dict[str, Any] = {}
+    if args.config:
+        from collector.config import load_config
+        config = load_config(args.config)
+    suppression_config = config.get("suppression") or {}
+    if args.from_db:
+        df = read_database(config, suppression_config.get("company_level", True))
+    else:
+        df = pd.read_csv(args.from_file)
+    error_rate = args.error_rate or suppression_config.get("error_rate", DEFAULT_ERROR_RATE)
+    suppression = SuppressionSet.from_frame(df, error_rate)
+    out = args.out or Path(suppression_config.get("path", DEFAULT_PATH))
+    suppression.save(out)
+    print(
+        f"Wrote {len(suppression)} keys to {out} "
+        f"({suppression.bloom.bits.nbytes / 2**20:.2f} MiB Bloom filter, "
+        f"{suppression.bloom.num_hashes} hashes)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
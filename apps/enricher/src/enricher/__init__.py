@@ -0,0 +1,3 @@
+"""Enricher module for looking up decision makers' emails and LinkedIn profiles."""
+
+__version__ = "0.1.0"
@@ -0,0 +1,149 @@
+"""Enricher CLI entrypoint."""
+
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from common.logging import configure_logging
+from enricher.budget import RateBudget
+from enricher.cache import DAY, LookupCache
+from enricher.config import enabled_providers, load_config, validate_config
+from enricher.enrich import Enricher, contacts_from_extracted
+from enricher.providers import provider_from_config
+
+
+logger = logging.getLogger(__name__)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Look up decision makers' contact details")
+    parser.add_argument("--config", type=str, default=None, help="Path to config file")
+    parser.add_argument(
+        "--input",
+        type=Path,
+        default=None,
+        help="companies_with_decision_makers.json from the collector (default: input)",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Where to write the enriched Contact rows (default: output)",
+    )
+    parser.add_argument(
+        "--stub",
+        action="store_true",
+        help="Use local stand-ins for every provider (no keys, no network)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ask the providers even for people already in the lookup cache",
+    )
+    parser.add_argument(
+        "--log-level",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
+        default="INFO",
+        help="Set the logging level",
+    )
+    return parser.parse_args(argv)
+
+
+def build_enricher(
+    config: Dict[str, Any], stub: bool = False, use_cache: bool = True
+) -> Enricher:
+    """
+    Build the enricher from the config.
+
+    Args:
+        config: Enricher configuration
+        stub: Replace every provider with a ``StubProvider``
+        use_cache: Open the lookup cache under ``cache.path``
+
+    Returns:
+        The enricher; close its ``cache`` when done
+    """
+    entries = enabled_providers(config)
+    cache_config = config.get("cache") or {}
+    cache = None
+    if use_cache and cache_config.get("enabled", True):
+        cache = LookupCache(
+            Path(cache_config.get("path", "../../data/enricher/lookups.sqlite")),
+            positive_ttl=cache_config.get("positive_ttl_days", 180) * DAY,
+            negative_ttl=cache_config.get("negative_ttl_days", 30) * DAY,
+        )
+    return Enricher(
+        [provider_from_config(entry, stub=stub) for entry in entries],
+        budgets={entry["name"]: RateBudget.from_config(entry) for entry in entries},
+        cache=cache,
+        concurrency=config.get("concurrency", 2),
+    )
+
+
+def write_contacts(contacts: List[Any], path: Path) -> None:
+    """Write ``Contact`` rows to a JSON file."""
+    from collector.storage import save_to_json
+
+    # pydantic 2 renamed dict() to model_dump()
+    save_to_json([
+        contact.model_dump() if hasattr(contact, "model_dump") else contact.dict()
+        for contact in contacts
+    ], path)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the enrichment stage."""
+    args = parse_args(argv)
+    configure_logging(log_level=args.log_level)
+
+    try:
+        config = load_config(args.config)
+        problems = validate_config(config)
+        if problems:
+            for problem in problems:
+                logger.error(f"Invalid config: {problem}")
+            return 1
+
+        input_path = args.input or Path(
+            config.get("input", "../../data/interim/companies_with_decision_makers.json")
+        )
+        output_path = args.output or Path(
+            config.get("output", "../../data/interim/enriched_contacts.json")
+        )
+        with open(input_path) as f:
+            extracted = json.load(f)
+
+        enricher = build_enricher(config, stub=args.stub, use_cache=not args.no_cache)
+        try:
+            enriched = enricher.enrich(extracted)
+        finally:
+            if enricher.cache is not None:
+                enricher.cache.close()
+
+        write_contacts(contacts_from_extracted(enriched), output_path)
+
+        from collector.storage.postgres import PostgresSink
+
+        sink = PostgresSink.from_config(config)
+        if sink is not None:
+            try:
+                sink.write(enriched)
+            finally:
+                sink.close()
+
+        for provider in enricher.providers:
+            budget = enricher.budgets[provider.name]
+            logger.info(f"{provider.name}: {budget.used} requests sent")
+        return 0
+
+    except Exception as e:
+        logger.error(f"Error during enrichment: {e}", exc_info=True)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""Per-provider request budgets.
+
+Enrichment providers bill per request or per match and throttle clients
+that exceed their rate limits. Each provider gets a ``RateBudget``: a
+token bucket that paces requests to ``rate`` per second (with bursts of
+up to ``burst``), and an optional cap on requests per run, so one run can
+never spend more than its share of the monthly quota.
+"""
+
+import threading
+from typing import Any, Dict, Optional
+
+from common.ratelimit import TokenBucket
+
+
+class RateBudget:
+    """Request pacing (a ``TokenBucket``) with an optional total request cap. Thread-safe."""
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: int = 1,
+        max_requests: Optional[int] = None,
+    ):
+        """
+        Initialize the budget.
+
+        Args:
+            rate: Requests per second (None: unpaced)
+            burst: Requests that may be sent back to back
+            max_requests: Requests allowed in total (None: no cap)
+        """
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.max_requests = max_requests
+        self.used = 0
+        self._bucket = TokenBucket(rate, self.burst) if rate else None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "RateBudget":
+        """Build a budget from ``requests_per_second``, ``burst`` and ``max_requests``."""
+        return cls(
+            rate=config.get("requests_per_second"),
+            burst=config.get("burst", 1),
+            max_requests=config.get("max_requests"),
+        )
+
+    @property
+    def exhausted(self) -> bool:
+        """Whether the request cap has been reached."""
+        return self.max_requests is not None and self.used >= self.max_requests
+
+    def acquire(self) -> bool:
+        """
+        Take one request from the budget, waiting for the rate if needed.
+
+        Returns:
+            False if the request cap is used up, True otherwise
+        """
+        with self._lock:
+            if self.exhausted:
+                return False
+            self.used += 1
+        if self._bucket is not None:
+            self._bucket.acquire()
+        return True
@@ -0,0 +1,134 @@
+"""Persistent cache of provider lookups.
+
+Every answer a provider gives is stored, matches and misses alike, keyed
+by provider and lookup key (company domain plus canonical name, see
+``enricher.enrich.lookup_key``). A person is therefore never paid for
+twice: a match is reused by every later run, and a miss keeps the
+provider from being asked again until ``negative_ttl`` has passed. Misses
+expire sooner than matches because people join companies and providers
+add records. Failed requests are not stored.
+
+The cache is a single SQLite file, read and written in bulk (one query per
+chunk of keys, one transaction per batch of answers).
+"""
+
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from enricher.providers import Match
+
+
+DAY = 86400.0
+
+# SQLite's default limit on bound parameters is 999
+_CHUNK = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS lookups (
+    provider TEXT NOT NULL,
+    key TEXT NOT NULL,
+    found INTEGER NOT NULL,
+    email TEXT,
+    linkedin_url TEXT,
+    title TEXT,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (provider, key)
+);
+"""
+
+
+class LookupCache:
+    """Positive and negative lookup results in a SQLite file. Not thread-safe."""
+
+    def __init__(
+        self,
+        path: Path,
+        positive_ttl: float = 180 * DAY,
+        negative_ttl: float = 30 * DAY,
+    ):
+        """
+        Open (and create if needed) the cache.
+
+        Args:
+            path: SQLite file
+            positive_ttl: Seconds a match is reused
+            negative_ttl: Seconds a miss keeps a provider from being asked again
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self._conn = sqlite3.connect(self.path, timeout=60)
+        self._conn.executescript(_SCHEMA)
+
+    def get_many(
+        self, keys: Iterable[str], providers: List[str]
+    ) -> Dict[str, Dict[str, Optional[Match]]]:
+        """
+        Return the fresh cached answers for ``keys``.
+
+        Args:
+            keys: Lookup keys
+            providers: Providers whose answers to return
+
+        Returns:
+            Lookup key to ``{provider: Match, or None for a cached miss}``;
+            keys without a fresh answer are left out
+        """
+        now = time.time()
+        keys = list(keys)
+        wanted = set(providers)
+        answers: Dict[str, Dict[str, Optional[Match]]] = {}
+        for start in range(0, len(keys), _CHUNK):
+            chunk = keys[start:start + _CHUNK]
+            placeholders = ", ".join("?" * len(chunk))
+            rows = self._conn.execute(
+                "SELECT key, provider, found, email, linkedin_url, title, fetched_at "
+                f"FROM lookups WHERE key IN ({placeholders})",
+                chunk,
+            )
+            for key, provider, found, email, linkedin_url, title, fetched_at in rows:
+                ttl = self.positive_ttl if found else self.negative_ttl
+                if provider not in wanted or now - fetched_at > ttl:
+                    continue
+                answers.setdefault(key, {})[provider] = (
+                    Match(email=email, linkedin_url=linkedin_url, title=title) if found else None
+                )
+        return answers
+
+    def put_many(self, provider: str, answers: Dict[str, Optional[Match]]) -> None:
+        """Store a provider's answers (None for a miss) in one transaction."""
+        now = time.time()
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO lookups "
+                "(provider, key, found, email, linkedin_url, title, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        provider, key, match is not None,
+                        match.email if match else None,
+                        match.linkedin_url if match else None,
+                        match.title if match else None,
+                        now,
+                    )
+                    for key, match in answers.items()
+                ],
+            )
+
+    def prune(self) -> int:
+        """Delete expired answers; returns how many were removed."""
+        now = time.time()
+        with self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM lookups WHERE (found AND fetched_at < ?) OR "
+                "(NOT found AND fetched_at < ?)",
+                (now - self.positive_ttl, now - self.negative_ttl),
+            )
+        return cursor.rowcount
+
+    def close(self) -> None:
+        """Close the database."""
+        self._conn.close()
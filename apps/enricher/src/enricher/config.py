@@ -0,0 +1,97 @@
+"""Configuration loading utilities."""
+
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import yaml
+
+from enricher.providers import PROVIDERS
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIG_PATHS = [
+    Path("../../configs/dev/enricher.yaml"),
+    Path("/etc/autooutreach/enricher.yaml"),
+    Path(os.path.expanduser("~/.config/autooutreach/enricher.yaml")),
+]
+
+
+def load_config(config_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Load configuration from a YAML file.
+
+    Args:
+        config_path: Path to the config file. If None, default locations will be checked.
+
+    Returns:
+        Dictionary containing configuration settings.
+
+    Raises:
+        FileNotFoundError: If no config file could be found.
+    """
+    paths = [Path(config_path)] if config_path else DEFAULT_CONFIG_PATHS
+    for path in paths:
+        if path.exists():
+            logger.info(f"Loading config from {path}")
+            with open(path, "r") as f:
+                return yaml.safe_load(f) or {}
+    if config_path:
+        raise FileNotFoundError(f"Config file not found: {config_path}")
+    raise FileNotFoundError(
+        "No config file found. Please specify a config file with --config."
+    )
+
+
+def enabled_providers(config: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Return the enabled entries of the ``providers`` list, in priority order."""
+    return [
+        provider for provider in config.get("providers") or []
+        if isinstance(provider, dict) and provider.get("enabled", True)
+    ]
+
+
+def validate_config(config: Dict[str, Any]) -> List[str]:
+    """
+    Check a loaded configuration for mistakes that would fail a run.
+
+    Args:
+        config: Configuration as returned by load_config
+
+    Returns:
+        A list of problems; empty if the config is valid.
+    """
+    if not isinstance(config, dict):
+        return ["Config must be a mapping"]
+
+    problems: List[str] = []
+    providers = config.get("providers")
+    if not isinstance(providers, list):
+        return problems + ["providers must be a list"]
+    names = set()
+    for provider in providers:
+        if not isinstance(provider, dict) or not provider.get("name"):
+            problems.append("Every provider needs a name")
+            continue
+        name = provider["name"]
+        if name not in PROVIDERS:
+            problems.append(f"Unknown provider '{name}'; expected one of {', '.join(PROVIDERS)}")
+        if name in names:
+            problems.append(f"Provider '{name}' is listed twice")
+        names.add(name)
+        for key in ("batch_size", "max_pages", "burst", "max_requests"):
+            value = provider.get(key)
+            if value is not None and (not isinstance(value, int) or value <= 0):
+                problems.append(f"providers.{name}.{key} must be a positive integer")
+        rate = provider.get("requests_per_second")
+        if rate is not None and (not isinstance(rate, (int, float)) or rate <= 0):
+            problems.append(f"providers.{name}.requests_per_second must be a positive number")
+    if not enabled_providers(config):
+        problems.append("No providers are enabled")
+
+    concurrency = config.get("concurrency")
+    if concurrency is not None and (not isinstance(concurrency, int) or concurrency <= 0):
+        problems.append("concurrency must be a positive integer")
+    return problems
@@ -0,0 +1,258 @@
+"""Contact enrichment stage.
+
+Reads the collector's ``companies_with_decision_makers.json`` and fills in
+each decision maker's ``email`` and ``linkedin_url``:
+
+1. Every decision maker becomes a ``Lookup`` keyed by their company's
+   domain and canonical name (``lookup_key``), so the same person met
+   twice in a run is looked up once.
+2. The lookup cache answers whatever it can (see ``enricher.cache``).
+3. The rest goes to the providers in priority order, in the batches each
+   provider prefers, under its ``RateBudget``. A person only reaches the
+   next provider if the ones before had no match.
+
+Every answer is cached as its batch completes, so an interrupted run keeps
+what it paid for. Lookups left over when a provider's request cap runs out
+are not cached and are tried again next run.
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Tuple
+
+from common.metrics import registry
+from common.types import Contact
+from collector.contacts import Name, canonical_name, canonical_parts
+from collector.storage.postgres import company_row, contact_rows
+from enricher.budget import RateBudget
+from enricher.cache import LookupCache
+from enricher.providers import Lookup, Match, Provider
+
+
+logger = logging.getLogger(__name__)
+
+DOMAIN_FIELDS = ("properties.website_url", "website_url", "website", "homepage_url", "domain")
+
+
+def normalize_domain(url: Any) -> Optional[str]:
+    """
+    Reduce a website URL to its host: "https://www.Acme.io/about" becomes "acme.io".
+
+    Returns:
+        The domain, or None if the value does not look like one
+    """
+    if not isinstance(url, str):
+        return None
+    host = url.strip().lower().split("://", 1)[-1]
+    host = host.split("/", 1)[0].split("?", 1)[0].split(":", 1)[0].rstrip(".")
+    if host.startswith("www."):
+        host = host[4:]
+    return host if "." in host and " " not in host else None
+
+
+def company_domain(company: Dict[str, Any]) -> Optional[str]:
+    """Return the domain of a collected company record, or None if it has no website."""
+    for field in DOMAIN_FIELDS:
+        domain = normalize_domain(company.get(field))
+        if domain:
+            return domain
+    return None
+
+
+def lookup_key(domain: str, name: Name) -> str:
+    """Return the cache key of a person: ``<domain>|<first>|<last>``."""
+    return f"{domain}|{name.key}"
+
+
+def _name(dm: Dict[str, Any]) -> Optional[Name]:
+    return canonical_parts(dm.get("first_name"), dm.get("last_name")) or canonical_name(
+        dm.get("name")
+    )
+
+
+class Enricher:
+    """Look up decision makers' contact details through cached, batched providers."""
+
+    def __init__(
+        self,
+        providers: List[Provider],
+        budgets: Optional[Dict[str, RateBudget]] = None,
+        cache: Optional[LookupCache] = None,
+        concurrency: int = 2,
+    ):
+        """
+        Initialize the enricher.
+
+        Args:
+            providers: Providers in priority order
+            budgets: Request budget per provider name (default: unlimited)
+            cache: Lookup cache (None: every run asks the providers again)
+            concurrency: Requests in flight per provider
+        """
+        self.providers = providers
+        self.budgets = budgets or {}
+        self.cache = cache
+        self.concurrency = max(concurrency, 1)
+
+    def enrich(self, extracted: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Enrich extracted companies' decision makers.
+
+        Args:
+            extracted: Output of ``extract_decision_makers_from_dfs``
+
+        Returns:
+            A copy of ``extracted`` whose decision makers carry ``email``,
+            ``linkedin_url`` and ``enriched_by`` where a provider found them
+        """
+        contacts_total = registry.counter(
+            "enricher_contacts_total", "Decision makers by enrichment outcome"
+        )
+        enriched = []
+        lookups: Dict[str, Lookup] = {}
+        targets: List[Tuple[str, Dict[str, Any]]] = []
+        for entry in extracted:
+            company = entry["company"]
+            domain = company_domain(company)
+            people = [dict(dm) for dm in entry["decision_makers"]]
+            enriched.append({**entry, "decision_makers": people})
+            for dm in people:
+                if dm.get("email") and dm.get("linkedin_url"):
+                    contacts_total.inc(result="complete")
+                    continue
+                name = _name(dm)
+                if domain is None or name is None:
+                    contacts_total.inc(result="no_domain" if name else "no_name")
+                    continue
+                key = lookup_key(domain, name)
+                lookups.setdefault(key, Lookup(
+                    key=key, first_name=name.first, last_name=name.last, full_name=name.full,
+                    domain=domain, company_name=str(dm.get("company_name") or ""),
+                ))
+                targets.append((key, dm))
+
+        matches = self._resolve(lookups)
+
+        for key, dm in targets:
+            found = matches.get(key)
+            if found is None:
+                contacts_total.inc(result="not_found")
+                continue
+            provider, match = found
+            dm["email"] = dm.get("email") or match.email
+            dm["linkedin_url"] = dm.get("linkedin_url") or match.linkedin_url
+            dm["title"] = dm.get("title") or match.title
+            dm["enriched_by"] = provider
+            contacts_total.inc(result="enriched")
+
+        logger.info(
+            f"Enriched {sum(1 for key, _ in targets if key in matches)} of {len(targets)} "
+            f"decision makers ({len(lookups)} distinct lookups)"
+        )
+        return enriched
+
+    def _resolve(self, lookups: Dict[str, Lookup]) -> Dict[str, Tuple[str, Match]]:
+        """Answer lookups from the cache, then from each provider in turn."""
+        lookups_total = registry.counter(
+            "enricher_lookups_total", "Lookups by provider and result"
+        )
+        names = [provider.name for provider in self.providers]
+        cached = self.cache.get_many(lookups, names) if self.cache else {}
+        matches: Dict[str, Tuple[str, Match]] = {}
+        for key, answers in cached.items():
+            for name in names:
+                match = answers.get(name)
+                if match is not None:
+                    matches[key] = (name, match)
+                    lookups_total.inc(provider=name, result="cached_match")
+                    break
+
+        pending = [key for key in lookups if key not in matches]
+        for provider in self.providers:
+            todo = []
+            for key in pending:
+                if provider.name in cached.get(key, {}):
+                    lookups_total.inc(provider=provider.name, result="cached_miss")
+                else:
+                    todo.append(lookups[key])
+            for key, match in self._lookup(provider, todo).items():
+                if match is not None:
+                    matches[key] = (provider.name, match)
+            pending = [key for key in pending if key not in matches]
+        return matches
+
+    def _lookup(self, provider: Provider, todo: List[Lookup]) -> Dict[str, Optional[Match]]:
+        """Send a provider's batches under its budget, caching answers as they arrive."""
+        if not todo:
+            return {}
+        budget = self.budgets.get(provider.name) or RateBudget()
+        lookups_total = registry.counter(
+            "enricher_lookups_total", "Lookups by provider and result"
+        )
+        requests_total = registry.counter(
+            "enricher_requests_total", "Provider requests by outcome"
+        )
+        latency = registry.histogram(
+            "enricher_request_seconds", "Provider request latency"
+        )
+
+        def send(batch: List[Lookup]) -> Optional[Dict[str, Optional[Match]]]:
+            if not budget.acquire():
+                return None
+            started = time.perf_counter()
+            try:
+                return provider.lookup(batch, budget)
+            finally:
+                latency.observe(time.perf_counter() - started, provider=provider.name)
+
+        answers: Dict[str, Optional[Match]] = {}
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            futures = {pool.submit(send, batch): batch for batch in provider.batches(todo)}
+            for future in as_completed(futures):
+                batch = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.warning(f"{provider.name} lookup of {len(batch)} people failed: {e}")
+                    requests_total.inc(provider=provider.name, result="error")
+                    lookups_total.inc(len(batch), provider=provider.name, result="error")
+                    continue
+                if result is None:
+                    requests_total.inc(provider=provider.name, result="over_budget")
+                    lookups_total.inc(len(batch), provider=provider.name, result="over_budget")
+                    continue
+                requests_total.inc(provider=provider.name, result="ok")
+                # Keys the provider left unanswered are retried next run
+                result = {item.key: result[item.key] for item in batch if item.key in result}
+                if self.cache is not None:
+                    self.cache.put_many(provider.name, result)
+                hits = sum(1 for match in result.values() if match is not None)
+                lookups_total.inc(hits, provider=provider.name, result="match")
+                lookups_total.inc(len(result) - hits, provider=provider.name, result="miss")
+                answers.update(result)
+
+        if budget.exhausted:
+            logger.warning(
+                f"{provider.name} request budget ({budget.max_requests}) used up; "
+                f"remaining lookups wait for the next run"
+            )
+        return answers
+
+
+def contacts_from_extracted(extracted: List[Dict[str, Any]]) -> List[Contact]:
+    """
+    Build ``Contact`` rows from enriched decision makers.
+
+    IDs, names and column widths are those of the collector's Postgres
+    sink, so these rows and the sink's ``contacts`` rows agree.
+    """
+    contacts: List[Contact] = []
+    for entry in extracted:
+        company = entry["company"]
+        row = company_row(company) or {
+            "id": None,
+            "name": str(company.get("name") or company.get("company_name") or ""),
+        }
+        contacts.extend(Contact(**fields) for fields in contact_rows(row, entry["decision_makers"]))
+    return contacts
@@ -0,0 +1,354 @@
+"""Contact lookup providers.
+
+A provider answers a batch of ``Lookup``s (a person's name and their
+company's domain) with a ``Match`` or None per lookup. Batching is the
+provider's choice: People Data Labs takes up to 100 people per bulk
+request, while Clearbit is searched once per company domain, page by
+page, and the people it returns are matched by name. ``StubProvider``
+answers locally and deterministically, so the enricher runs offline;
+``ENRICHER_BACKEND=stub`` (or ``--stub``) swaps every configured provider
+for one.
+
+API keys come from ``api_key`` in the provider's config or from
+``PDL_API_KEY`` / ``CLEARBIT_API_KEY``.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from itertools import groupby
+from typing import Any, Dict, Iterator, List, Optional, Type
+
+import requests
+
+from collector import http
+from collector.contacts import canonical_name
+from enricher.budget import RateBudget
+
+
+@dataclass(frozen=True)
+class Lookup:
+    """One person to look up."""
+
+    key: str
+    first_name: str
+    last_name: str
+    full_name: str
+    domain: str
+    company_name: str = ""
+
+
+@dataclass(frozen=True)
+class Match:
+    """What a provider found about a person."""
+
+    email: Optional[str] = None
+    linkedin_url: Optional[str] = None
+    title: Optional[str] = None
+
+
+def linkedin_url(value: Optional[str]) -> Optional[str]:
+    """Normalize "linkedin.com/in/x" or "in/x" to "https://www.linkedin.com/in/x"."""
+    if not value:
+        return None
+    path = value.strip().split("linkedin.com/", 1)[-1].strip("/")
+    return f"https://www.linkedin.com/{path}" if path else None
+
+
+class Provider(ABC):
+    """Interface of a contact lookup provider."""
+
+    #: Name used in the cache, metrics and ``Contact.source``
+    name: str = "provider"
+    #: Most lookups sent in one request
+    batch_size: int = 1
+
+    def batches(self, lookups: List[Lookup]) -> Iterator[List[Lookup]]:
+        """Split lookups into the batches sent as one request each."""
+        for start in range(0, len(lookups), self.batch_size):
+            yield lookups[start:start + self.batch_size]
+
+    @abstractmethod
+    def lookup(
+        self, batch: List[Lookup], budget: Optional[RateBudget] = None
+    ) -> Dict[str, Optional[Match]]:
+        """
+        Look up one batch.
+
+        The caller takes the budget token of the first request. A provider
+        that needs more requests for a batch takes one from ``budget`` for
+        each and, if it runs out, stops and leaves the rest unanswered.
+
+        Args:
+            batch: Lookups, as produced by ``batches``
+            budget: Budget of the requests after the first (None: unlimited)
+
+        Returns:
+            Lookup key to its match, or None if the provider has no match;
+            keys left out are unanswered, so they are neither cached nor
+            counted as misses
+
+        Raises:
+            requests.exceptions.RequestException: If the request failed;
+                nothing is cached and the lookups are retried next run
+        """
+
+
+class PeopleDataLabsProvider(Provider):
+    """People Data Labs bulk person enrichment (``POST /v5/person/bulk``)."""
+
+    name = "pdl"
+    url = "https://api.peopledatalabs.com/v5/person/bulk"
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        batch_size: int = 100,
+        timeout: float = 30.0,
+        session: Optional[requests.Session] = None,
+    ):
+        """
+        Initialize the provider.
+
+        Args:
+            api_key: API key (defaults to ``PDL_API_KEY``)
+            batch_size: People per bulk request (at most 100)
+            timeout: Seconds per request
+            session: Session to reuse connections
+        """
+        self.api_key = api_key or os.environ.get("PDL_API_KEY")
+        self.batch_size = min(batch_size, 100)
+        self.timeout = timeout
+        self.session = session or requests.Session()
+
+    def lookup(
+        self, batch: List[Lookup], budget: Optional[RateBudget] = None
+    ) -> Dict[str, Optional[Match]]:
+        body = {
+            "requests": [
+                {
+                    "metadata": {"key": item.key},
+                    "params": {
+                        "first_name": item.first_name,
+                        "last_name": item.last_name,
+                        "company": item.domain,
+                    },
+                }
+                for item in batch
+            ]
+        }
+        response = http.post(
+            self.url, self.name, session=self.session, json=body,
+            headers={"X-Api-Key": self.api_key or ""}, timeout=self.timeout,
+        )
+        response.raise_for_status()
+        keys = {item.key for item in batch}
+        results: Dict[str, Optional[Match]] = {}
+        for answer in response.json():
+            # Answers carry back the metadata of their request
+            key = (answer.get("metadata") or {}).get("key")
+            if key not in keys:
+                continue
+            status = answer.get("status")
+            data = answer.get("data") if status == 200 else None
+            if not data:
+                # Only "not found" is a miss; rate limits, billing and server
+                # errors leave the person unanswered, to be retried
+                if status in (200, 404):
+                    results[key] = None
+                continue
+            emails = [e.get("address") for e in data.get("emails") or [] if e.get("address")]
+            email = data.get("work_email") or (emails[0] if emails else None)
+            results[key] = Match(
+                email=email,
+                linkedin_url=linkedin_url(data.get("linkedin_url")),
+                title=data.get("job_title"),
+            )
+        return results
+
+
+class ClearbitProvider(Provider):
+    """
+    Clearbit Prospector people search.
+
+    Prospector searches one company domain at a time, so every domain is
+    one batch, whatever its number of people. The search is paged through
+    (``batch_size`` results per page, at most ``max_pages`` pages) and the
+    returned people are matched to the lookups by canonical name. A lookup
+    is only answered as a miss once every page has been read; if the page
+    cap cut the search short, the people not found yet are left
+    unanswered, so they are not cached and the next provider gets them.
+    Each page takes its own token from the provider's budget.
+    """
+
+    name = "clearbit"
+    url = "https://prospector.clearbit.com/v1/people/search"
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        batch_size: int = 20,
+        max_pages: int = 5,
+        timeout: float = 30.0,
+        session: Optional[requests.Session] = None,
+    ):
+        """
+        Initialize the provider.
+
+        Args:
+            api_key: API key (defaults to ``CLEARBIT_API_KEY``)
+            batch_size: Results per page of a domain search
+            max_pages: Most pages read per domain search
+            timeout: Seconds per request
+            session: Session to reuse connections
+        """
+        self.api_key = api_key or os.environ.get("CLEARBIT_API_KEY")
+        self.batch_size = batch_size
+        self.max_pages = max(max_pages, 1)
+        self.timeout = timeout
+        self.session = session or requests.Session()
+
+    def batches(self, lookups: List[Lookup]) -> Iterator[List[Lookup]]:
+        ordered = sorted(lookups, key=lambda item: item.domain)
+        for _, group in groupby(ordered, key=lambda item: item.domain):
+            yield list(group)
+
+    def lookup(
+        self, batch: List[Lookup], budget: Optional[RateBudget] = None
+    ) -> Dict[str, Optional[Match]]:
+        # Lookup keys are "<domain>|<name key>"
+        wanted = {item.key.split("|", 1)[1] for item in batch}
+        found: Dict[str, Match] = {}
+        complete = False
+        for page in range(1, self.max_pages + 1):
+            # Every page is a billed request; the caller paid for the first
+            if page > 1 and budget is not None and not budget.acquire():
+                break
+            response = http.get(
+                self.url, self.name, session=self.session,
+                params={"domain": batch[0].domain, "page": page, "page_size": self.batch_size},
+                auth=(self.api_key or "", ""), timeout=self.timeout,
+            )
+            response.raise_for_status()
+            payload = response.json()
+            people = payload.get("results", []) if isinstance(payload, dict) else payload
+            for person in people:
+                person_name = person.get("name") or {}
+                name = canonical_name(person_name.get("fullName") or " ".join(
+                    filter(None, [person_name.get("givenName"), person_name.get("familyName")])
+                ))
+                if name is not None:
+                    found.setdefault(name.key, Match(
+                        email=person.get("email"),
+                        linkedin_url=linkedin_url(person.get("linkedin")),
+                        title=person.get("title"),
+                    ))
+            # A short page is the last one
+            complete = len(people) < self.batch_size
+            if complete or wanted <= found.keys():
+                break
+        answers: Dict[str, Optional[Match]] = {}
+        for item in batch:
+            match = found.get(item.key.split("|", 1)[1])
+            # Not found in a search cut short (page cap or budget) is not a miss
+            if match is not None or complete:
+                answers[item.key] = match
+        return answers
+
+
+class StubProvider(Provider):
+    """
+    A local stand-in that derives a fixed answer from each lookup.
+
+    The same lookup always gets the same answer: a match for roughly
+    ``hit_rate`` of people, with an email at their company's domain.
+    ``latency`` simulates the round trip of each request, and ``requests``
+    and ``lookups`` count what a real provider would have billed.
+    """
+
+    def __init__(
+        self,
+        name: str = "stub",
+        batch_size: int = 100,
+        hit_rate: float = 0.6,
+        latency: float = 0.0,
+    ):
+        """
+        Initialize the stub.
+
+        Args:
+            name: Provider name it stands in for
+            batch_size: Lookups per request
+            hit_rate: Share of lookups that find a match
+            latency: Seconds each request sleeps
+        """
+        self.name = name
+        self.batch_size = batch_size
+        self.hit_rate = hit_rate
+        self.latency = latency
+        self.requests = 0
+        self.lookups = 0
+        self._lock = threading.Lock()
+
+    def lookup(
+        self, batch: List[Lookup], budget: Optional[RateBudget] = None
+    ) -> Dict[str, Optional[Match]]:
+        with self._lock:
+            self.requests += 1
+            self.lookups += len(batch)
+        if self.latency:
+            time.sleep(self.latency)
+        results: Dict[str, Optional[Match]] = {}
+        for item in batch:
+            digest = hashlib.sha1(f"{self.name}|{item.key}".encode("utf-8")).hexdigest()
+            if int(digest[:8], 16) / 0xFFFFFFFF >= self.hit_rate:
+                results[item.key] = None
+                continue
+            local = ".".join(p for p in item.key.split("|", 1)[1].split("|") if p)
+            results[item.key] = Match(
+                email=f"{local}@{item.domain}",
+                linkedin_url=f"https://www.linkedin.com/in/{local.replace('.', '-')}-{digest[:6]}",
+            )
+        return results
+
+
+PROVIDERS: Dict[str, Type[Provider]] = {
+    "pdl": PeopleDataLabsProvider,
+    "clearbit": ClearbitProvider,
+    "stub": StubProvider,
+}
+
+
+def provider_from_config(config: Dict[str, Any], stub: bool = False) -> Provider:
+    """
+    Build a provider from one entry of the ``providers`` config list.
+
+    Args:
+        config: Provider settings; ``name`` picks the implementation
+            (``pdl``, ``clearbit`` or ``stub``)
+        stub: Replace it with a ``StubProvider`` of the same name, as does
+            ``ENRICHER_BACKEND=stub``
+
+    Returns:
+        The provider
+    """
+    name = config["name"]
+    stub = stub or os.environ.get("ENRICHER_BACKEND", "").lower() == "stub"
+    if stub or name == "stub":
+        return StubProvider(
+            name=name,
+            batch_size=config.get("batch_size", 100),
+            hit_rate=config.get("stub_hit_rate", 0.6),
+            latency=config.get("stub_latency", 0.0),
+        )
+    if name not in PROVIDERS:
+        raise ValueError(f"Unknown provider: {name}")
+    options: Dict[str, Any] = {
+        k: config[k] for k in ("api_key", "batch_size", "timeout") if k in config
+    }
+    if name == "clearbit" and "max_pages" in config:
+        options["max_pages"] = config["max_pages"]
+    return PROVIDERS[name](**options)
@@ -0,0 +1,179 @@
+"""Run the collector benchmark suite and compare against stored baselines.
+
+Usage:
+    python -m benchmarks                      # quick scale, compare to baseline
+    python -m benchmarks --scale full         # production-sized inputs
+    python -m benchmarks --update-baseline    # record new baselines
+    python -m benchmarks -k sec_parse_idx     # run matching benchmarks only
+"""
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from benchmarks.suite import BENCHMARKS, SCALES, Benchmark, quiet_collector_logging
+
+
+BASELINE_PATH = Path(__file__).parent / "baselines.json"
+# Peak-memory growth below this is noise, whatever its relative size
+DEFAULT_MEMORY_FLOOR = 2**20
+
+
+def measure(bench: Benchmark, sizes: Dict[str, int], repeats: int) -> Dict[str, Any]:
+    """
+    Measure throughput and peak memory of one benchmark.
+
+    Throughput uses the best of ``repeats`` timed runs. Peak memory is the
+    tracemalloc peak of one extra run above what the input already holds;
+    tracemalloc only sees Python allocations, so native buffers (pyarrow's
+    Parquet writer, for instance) are not counted.
+
+    Args:
+        bench: Benchmark to run
+        sizes: Input sizes for the selected scale
+        repeats: Number of timed runs
+
+    Returns:
+        Dictionary with items, best seconds, items per second and peak bytes
+    """
+    state = bench.setup(sizes)
+    try:
+        items = bench.items(state)
+        timings = []
+        for _ in range(repeats):
+            gc.collect()
+            start = time.perf_counter()
+            bench.run(state)
+            timings.append(time.perf_counter() - start)
+
+        gc.collect()
+        tracemalloc.start()
+        baseline_bytes = tracemalloc.get_traced_memory()[0]
+        bench.run(state)
+        peak = tracemalloc.get_traced_memory()[1] - baseline_bytes
+        tracemalloc.stop()
+    finally:
+        if bench.teardown:
+            bench.teardown(state)
+
+    best = min(timings)
+    return {
+        "items": items,
+        "unit": bench.unit,
+        "seconds": best,
+        "items_per_second": items / best if best > 0 else float("inf"),
+        "peak_bytes": peak,
+    }
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    threshold: float,
+    memory_threshold: float,
+    memory_floor: int = DEFAULT_MEMORY_FLOOR,
+) -> List[str]:
+    """
+    Return a description of every regression beyond the thresholds.
+
+    Args:
+        results: Fresh measurements by benchmark name
+        baseline: Stored measurements by benchmark name
+        threshold: Allowed relative throughput drop (0.25 = 25% slower)
+        memory_threshold: Allowed relative peak-memory growth
+        memory_floor: Peak-memory growth in bytes that is never a
+            regression, so allocator noise on small peaks is ignored
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        slowdown = 1 - result["items_per_second"] / base["items_per_second"]
+        if slowdown > threshold:
+            regressions.append(
+                f"{name}: throughput {result['items_per_second']:,.0f} {result['unit']}/s "
+                f"is {slowdown:.0%} below baseline {base['items_per_second']:,.0f}"
+            )
+        if base["peak_bytes"] > 0:
+            extra = result["peak_bytes"] - base["peak_bytes"]
+            growth = extra / base["peak_bytes"]
+            if growth > memory_threshold and extra > memory_floor:
+                regressions.append(
+                    f"{name}: peak memory {result['peak_bytes'] / 2**20:.1f} MiB "
+                    f"is {growth:.0%} (+{extra / 2**20:.1f} MiB) above baseline "
+                    f"{base['peak_bytes'] / 2**20:.1f} MiB"
+                )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entrypoint."""
+    parser = argparse.ArgumentParser(description="Collector benchmark suite")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="quick")
+    parser.add_argument("-k", dest="pattern", help="Only run benchmarks whose name contains this")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed runs per benchmark")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Store these results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed throughput drop before failing (fraction)")
+    parser.add_argument("--memory-threshold", type=float, default=0.10,
+                        help="Allowed peak-memory growth before failing (fraction)")
+    parser.add_argument("--memory-floor-mib", type=float, default=DEFAULT_MEMORY_FLOOR / 2**20,
+                        help="Peak-memory growth always allowed, however large relatively")
+    parser.add_argument("--json", type=Path, help="Also write results to this file")
+    args = parser.parse_args(argv)
+
+    quiet_collector_logging()
+    sizes = SCALES[args.scale]
+    selected = [b for b in BENCHMARKS if not args.pattern or args.pattern in b.name]
+
+    results: Dict[str, Dict[str, Any]] = {}
+    print(f"{'benchmark':<36}{'items':>12}{'throughput':>22}{'peak MiB':>12}")
+    for bench in selected:
+        result = measure(bench, sizes, args.repeats)
+        results[bench.name] = result
+        print(
+            f"{bench.name:<36}{result['items']:>12,}"
+            f"{result['items_per_second']:>14,.0f} {bench.unit + '/s':<7}"
+            f"{result['peak_bytes'] / 2**20:>12.1f}"
+        )
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+
+    baselines = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    if args.update_baseline:
+        stored = baselines.setdefault(args.scale, {})
+        stored.update(results)
+        baselines["_machine"] = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+        }
+        args.baseline.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+        print(f"Updated {args.scale} baselines in {args.baseline}")
+        return 0
+
+    regressions = compare(
+        results, baselines.get(args.scale, {}), args.threshold, args.memory_threshold,
+        int(args.memory_floor_mib * 2**20),
+    )
+    if regressions:
+        print("\nRegressions:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    print("\nNo regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
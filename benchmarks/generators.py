@@ -0,0 +1,363 @@
+"""Seeded synthetic data generators for collector benchmarks and load tests.
+
+Every generator takes a ``seed`` so the same arguments always produce the
+same data, which keeps benchmark baselines comparable between runs.
+"""
+
+import csv
+import random
+import tarfile
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, TextIO
+
+
+FIRST_NAMES = [
+    "Sarah", "Michael", "David", "Jennifer", "Robert", "Lisa", "James", "Emily",
+    "Daniel", "Amanda", "Kevin", "Priya", "Wei", "Fatima", "Carlos", "Yuki",
+    "Olivia", "Noah", "Ava", "Liam", "Mateo", "Zoe", "Hiroshi", "Aisha",
+]
+LAST_NAMES = [
+    "Chen", "Johnson", "Singh", "Adams", "Garcia", "Brown", "Wilson", "Taylor",
+    "Green", "Peters", "Martin", "Patel", "Zhang", "Khan", "Lopez", "Tanaka",
+    "Smith", "Nguyen", "Kim", "Müller", "O'Brien", "Rossi", "Cohen", "Dubois",
+]
+DECISION_MAKER_TITLES = [
+    "CEO", "Chief Executive Officer", "Founder & CEO", "Co-founder & CTO", "CTO",
+    "CFO", "COO", "VP of Engineering", "Head of Product", "VP Sales",
+    "Director of Engineering", "Chief Marketing Officer", "President",
+]
+OTHER_TITLES = [
+    "Software Engineer", "Product Manager", "Account Executive", "Data Scientist",
+    "Designer", "Customer Success Manager", "Recruiter", "Marketing Specialist",
+]
+CITIES = [
+    "San Francisco, CA", "New York, NY", "Boston, MA", "Austin, TX", "Seattle, WA",
+    "London, UK", "Berlin, Germany", "Tel Aviv, Israel", "Chicago, IL",
+    "Los Angeles, CA", "Denver, CO", "Paris, France", "Toronto, Canada",
+    "Singapore", "Portland, OR", "Miami, FL",
+]
+NAME_WORDS = [
+    "Tech", "Data", "Cloud", "Quantum", "Green", "Med", "Fin", "Bio", "Secure",
+    "Flow", "Logic", "Sense", "Grid", "Labs", "Works", "Systems", "AI", "Health",
+]
+FORM_TYPES = ["10-K", "10-Q", "8-K", "S-1", "S-1/A", "4", "SC 13G", "D", "424B2", "6-K"]
+FORM_WEIGHTS = [4, 8, 30, 1, 1, 30, 6, 10, 8, 2]
+ROUND_TYPES = ["seed", "angel", "series_a", "series_b", "series_c", "growth", "debt"]
+INDUSTRIES = [
+    "Software", "FinTech", "Health Care", "Artificial Intelligence", "E-Commerce",
+    "Cyber Security", "Biotechnology", "Logistics", "Gaming", "Real Estate",
+]
+EMPLOYEE_BUCKETS = [
+    (10, "c_00001_00010"), (50, "c_00011_00050"), (100, "c_00051_00100"),
+    (250, "c_00101_00250"), (500, "c_00251_00500"), (1000, "c_00501_01000"),
+    (5000, "c_01001_05000"), (10000, "c_05001_10000"),
+]
+
+
+def _company_name(rng: random.Random) -> str:
+    return "".join(rng.sample(NAME_WORDS, 2)) + rng.choice([" Inc", " Corp", " AI", ""])
+
+
+def _uuid(rng: random.Random) -> str:
+    hex_digits = "".join(rng.choices("0123456789abcdef", k=32))
+    return "-".join(
+        (hex_digits[:8], hex_digits[8:12], hex_digits[12:16], hex_digits[16:20], hex_digits[20:])
+    )
+
+
+def idx_header(index_date: date) -> str:
+    """Return the preamble of an EDGAR index file, up to the dashed separator."""
+    return (
+        f"Description:           Master Index of EDGAR Dissemination Feed\n"
+        f"Last Data Received:    {index_date:%B %d, %Y}\n"
+        f"Comments:              webmaster@sec.gov\n"
+        f"Anonymous FTP:         ftp://ftp.sec.gov/edgar/\n"
+        f"\n"
+        f"{'CIK':<12}{'Company Name':<62}{'Form Type':<12}{'Date Filed':<12}File Name\n"
+        f"{'-' * 120}\n"
+    )
+
+
+def iter_idx_lines(
+    num_lines: int,
+    seed: int = 0,
+    index_date: Optional[date] = None,
+    num_companies: Optional[int] = None,
+) -> Iterator[str]:
+    """
+    Yield data lines of a synthetic EDGAR index file.
+
+    Lines use the fixed-width layout read by ``sec._parse_idx_file``. Form
+    types follow a rough real-world mix, so only a small share of lines
+    match the collector's default target forms.
+
+    Args:
+        num_lines: Number of filing lines to generate
+        seed: Random seed
+        index_date: Filing date written on every line
+        num_companies: Size of the pool of filers (defaults to num_lines / 4)
+
+    Yields:
+        One newline-terminated line per filing
+    """
+    rng = random.Random(seed)
+    index_date = index_date or date(2023, 1, 3)
+    num_companies = num_companies or max(1, num_lines // 4)
+    date_str = index_date.strftime("%Y%m%d")
+    companies = {}
+    for i in range(num_lines):
+        cik = rng.randrange(1000, 1000 + num_companies)
+        name = companies.get(cik)
+        if name is None:
+            name = companies[cik] = _company_name(rng).upper()
+        form_type = rng.choices(FORM_TYPES, FORM_WEIGHTS)[0]
+        accession = f"{rng.randrange(10**10):010d}-{index_date:%y}-{i % 10**6:06d}"
+        file_name = f"edgar/data/{cik}/{accession}.txt"
+        yield f"{cik:<12}{name[:61]:<62}{form_type:<12}{date_str:<12}{file_name}\n"
+
+
+def generate_master_idx(
+    num_lines: int,
+    seed: int = 0,
+    index_date: Optional[date] = None,
+) -> str:
+    """
+    Generate a complete synthetic EDGAR daily index file.
+
+    Args:
+        num_lines: Number of filing lines
+        seed: Random seed
+        index_date: Date of the index
+
+    Returns:
+        The index file content
+    """
+    index_date = index_date or date(2023, 1, 3)
+    return idx_header(index_date) + "".join(iter_idx_lines(num_lines, seed, index_date))
+
+
+def write_master_idx(
+    out: TextIO,
+    num_lines: int,
+    seed: int = 0,
+    index_date: Optional[date] = None,
+) -> None:
+    """Stream a synthetic index file to ``out`` without holding it in memory."""
+    index_date = index_date or date(2023, 1, 3)
+    out.write(idx_header(index_date))
+    for line in iter_idx_lines(num_lines, seed, index_date):
+        out.write(line)
+
+
+def generate_person(rng: random.Random, decision_maker_share: float = 0.4) -> Dict[str, str]:
+    """Generate one Crunchbase-style person record."""
+    titles = DECISION_MAKER_TITLES if rng.random() < decision_maker_share else OTHER_TITLES
+    return {
+        "first_name": rng.choice(FIRST_NAMES),
+        "last_name": rng.choice(LAST_NAMES),
+        "title": rng.choice(titles),
+    }
+
+
+def generate_company(rng: random.Random, index: int) -> Dict[str, Any]:
+    """
+    Generate one company record in the shape the extractor and filters read.
+
+    Records mix ``people`` lists, ``team`` lists and description-only
+    companies, mirroring the variety of source data.
+    """
+    name = _company_name(rng)
+    company: Dict[str, Any] = {
+        "id": f"company{index}",
+        "uuid": _uuid(rng),
+        "name": name,
+        "headquarters": rng.choice(CITIES),
+        "funding_total_usd": rng.choice([None, rng.randrange(100_000, 200_000_000)]),
+        "last_funding_type": rng.choice(ROUND_TYPES),
+        "last_funding_at": (date(2022, 1, 1) + timedelta(days=rng.randrange(730))).isoformat(),
+        "num_employees": rng.choice([None, rng.randrange(2, 5000)]),
+    }
+    kind = rng.random()
+    if kind < 0.45:
+        company["people"] = [generate_person(rng) for _ in range(rng.randrange(1, 12))]
+    elif kind < 0.8:
+        company["team"] = [
+            {"name": f"{p['first_name']} {p['last_name']}", "title": p["title"]}
+            for p in (generate_person(rng) for _ in range(rng.randrange(1, 8)))
+        ]
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    title = rng.choice(["Founder & CEO", "CEO", "CTO", "Chief Operating Officer"])
+    company["description"] = (
+        f"{name} builds {rng.choice(['analytics', 'payments', 'security', 'logistics'])} "
+        f"software for {rng.choice(['enterprises', 'clinics', 'retailers', 'banks'])}. "
+        + (f"Founded by {first} {last} ({title})." if rng.random() < 0.5 else "")
+    )
+    return company
+
+
+def generate_companies(num_companies: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Generate a list of synthetic company records.
+
+    Args:
+        num_companies: Number of companies
+        seed: Random seed
+
+    Returns:
+        Company dictionaries with ``people``/``team`` lists and descriptions
+    """
+    rng = random.Random(seed)
+    return [generate_company(rng, i) for i in range(num_companies)]
+
+
+def _industries(index: int) -> List[str]:
+    # Derived from the index, not the rng, so the other seeded fields are unchanged
+    first = INDUSTRIES[index % len(INDUSTRIES)]
+    second = INDUSTRIES[(index * 7 + 3) % len(INDUSTRIES)]
+    return [first] if index % 2 or second == first else [first, second]
+
+
+def _employee_enum(num_employees: Optional[int]) -> str:
+    for limit, bucket in EMPLOYEE_BUCKETS:
+        if num_employees is not None and num_employees <= limit:
+            return bucket
+    return "c_10001_max" if num_employees is not None else "c_00011_00050"
+
+
+def generate_crunchbase_item(rng: random.Random, index: int) -> Dict[str, Any]:
+    """Generate one item of a Crunchbase v4 ``organizations/search`` response."""
+    company = generate_company(rng, index)
+    permalink = company["name"].lower().replace(" ", "-")
+    funding = company["funding_total_usd"]
+    return {
+        "uuid": company["uuid"],
+        "properties": {
+            "identifier": {
+                "uuid": company["uuid"],
+                "value": company["name"],
+                "permalink": permalink,
+                "entity_def_id": "organization",
+            },
+            "short_description": company["description"],
+            "location_identifiers": [
+                {"value": part.strip(), "location_type": kind}
+                for part, kind in zip(company["headquarters"].split(","), ("city", "region"))
+            ],
+            "funding_total": (
+                {"value": funding, "currency": "USD", "value_usd": funding}
+                if funding is not None
+                else None
+            ),
+            "last_funding_type": company["last_funding_type"],
+            "last_funding_at": company["last_funding_at"],
+            "num_employees_enum": _employee_enum(company["num_employees"]),
+            "categories": [{"value": industry} for industry in _industries(index)],
+            "website_url": f"https://{permalink}.example.com",
+        },
+        "headquarters": company["headquarters"],
+        "people": company.get("people", []),
+    }
+
+
+def generate_crunchbase_page(
+    page: int,
+    total_items: int,
+    page_size: int = 100,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """
+    Generate one page of a Crunchbase ``organizations/search`` response.
+
+    Pages are generated independently (seeded by ``seed`` and ``page``), so
+    a server can answer any page without materializing the others.
+
+    Args:
+        page: 1-based page number
+        total_items: Total number of items across all pages
+        page_size: Items per page
+        seed: Random seed
+
+    Returns:
+        Response body with ``count`` and ``data.items``
+    """
+    start = (page - 1) * page_size
+    count = max(0, min(page_size, total_items - start))
+    rng = random.Random(f"{seed}:{page}")
+    items = [generate_crunchbase_item(rng, start + i) for i in range(count)]
+    return {"count": total_items, "data": {"items": items}}
+
+
+def write_crunchbase_bulk_export(
+    out_dir: Path,
+    num_orgs: int,
+    seed: int = 0,
+    archive: bool = False,
+) -> Path:
+    """
+    Write a synthetic Crunchbase bulk export.
+
+    Rows are streamed to ``organizations.csv``, ``people.csv`` and
+    ``funding_rounds.csv`` so exports larger than memory can be generated.
+    People and rounds reference organizations by UUID, as in the real
+    export.
+
+    Args:
+        out_dir: Directory to write to
+        num_orgs: Number of organizations
+        seed: Random seed
+        archive: Also pack the files into ``crunchbase_export.tar.gz``
+
+    Returns:
+        The export directory, or the archive if ``archive`` is set
+    """
+    rng = random.Random(seed)
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths = {name: out_dir / f"{name}.csv" for name in ("organizations", "people", "funding_rounds")}
+    with open(paths["organizations"], "w", newline="") as orgs_file, \
+            open(paths["people"], "w", newline="") as people_file, \
+            open(paths["funding_rounds"], "w", newline="") as rounds_file:
+        orgs = csv.writer(orgs_file)
+        people = csv.writer(people_file)
+        rounds = csv.writer(rounds_file)
+        orgs.writerow([
+            "uuid", "name", "permalink", "short_description", "homepage_url", "city",
+            "region", "country_code", "total_funding_usd", "employee_count", "category_list",
+            "updated_at",
+        ])
+        people.writerow([
+            "uuid", "first_name", "last_name", "featured_job_organization_uuid",
+            "featured_job_title",
+        ])
+        rounds.writerow(["uuid", "org_uuid", "investment_type", "announced_on", "raised_amount_usd"])
+        for i in range(num_orgs):
+            company = generate_company(rng, i)
+            city, _, region = company["headquarters"].partition(", ")
+            permalink = company["name"].lower().replace(" ", "-")
+            orgs.writerow([
+                company["uuid"], company["name"], permalink, company["description"],
+                f"https://{permalink}.example.com", city, region, "",
+                company["funding_total_usd"] or "", _employee_enum(company["num_employees"]),
+                ",".join(_industries(i)), f"{company['last_funding_at']} 00:00:00",
+            ])
+            for _ in range(rng.randrange(0, 5)):
+                person = generate_person(rng)
+                people.writerow([
+                    _uuid(rng), person["first_name"], person["last_name"], company["uuid"],
+                    person["title"],
+                ])
+            for _ in range(rng.randrange(0, 3)):
+                announced = date(2015, 1, 1) + timedelta(days=rng.randrange(3000))
+                rounds.writerow([
+                    _uuid(rng), company["uuid"], rng.choice(ROUND_TYPES), announced.isoformat(),
+                    rng.randrange(100_000, 50_000_000),
+                ])
+
+    if not archive:
+        return out_dir
+    archive_path = out_dir / "crunchbase_export.tar.gz"
+    with tarfile.open(archive_path, "w:gz") as tar:
+        for path in paths.values():
+            tar.add(path, arcname=f"export/{path.name}")
+    return archive_path
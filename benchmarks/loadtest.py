@@ -0,0 +1,227 @@
+"""Load test for the message web app against a stub LLM.
+
+Starts ``app.py`` in-process on the pooled production server, backed by a
+``StubClient`` with the given latency distribution, and drives ``POST /``
+from ``--concurrency`` client threads. Reports throughput, latency
+percentiles and status codes. Nothing leaves the machine.
+
+    python -m benchmarks.loadtest --requests 2000 --concurrency 64 \\
+        --latency lognormal:-1.6,0.4 --distinct 500 --llm-concurrency 16 --timeout 5
+
+``--distinct`` controls how many different forms are sent, and so the
+cache hit rate. Templates are off unless ``--templates`` is given, so
+every miss reaches the stub LLM. ``--url`` targets an already running
+server instead.
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from benchmarks.mock_server import parse_latency
+from common.metrics import registry
+from generation.clients import StubClient
+from generation.generator import MessageGenerator
+from generation.serve import PooledWSGIServer
+from generation.templates import DEFAULT_TEMPLATES, TemplateSet
+
+
+INTENTS = ["asking for advice", "asking for opportunities", "asking for referral"]
+ROLES = ["CEO", "CTO", "VP Engineering", "Head of Product", "CFO"]
+
+
+@dataclass
+class LoadResult:
+    """Latencies and statuses of a load test."""
+
+    latencies: List[float] = field(default_factory=list)
+    statuses: Counter = field(default_factory=Counter)
+    seconds: float = 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        """Return throughput, latency percentiles (ms) and status counts."""
+        ordered = sorted(self.latencies)
+
+        def percentile(q: float) -> float:
+            if not ordered:
+                return 0.0
+            return round(ordered[min(int(q * len(ordered)), len(ordered) - 1)] * 1000, 2)
+
+        return {
+            "requests": len(ordered),
+            "seconds": round(self.seconds, 3),
+            "throughput": round(len(ordered) / self.seconds, 1) if self.seconds else 0.0,
+            "p50_ms": percentile(0.50),
+            "p95_ms": percentile(0.95),
+            "p99_ms": percentile(0.99),
+            "max_ms": round(ordered[-1] * 1000, 2) if ordered else 0.0,
+            "statuses": {
+                str(k): v for k, v in sorted(self.statuses.items(), key=lambda kv: str(kv[0]))
+            },
+        }
+
+
+def forms(n: int, distinct: int, seed: int = 0) -> List[Dict[str, str]]:
+    """Generate ``n`` form submissions drawn from ``distinct`` different ones."""
+    rng = random.Random(seed)
+    pool = [
+        {
+            "name": f"Person {i}",
+            "company": f"Company {i % 97}",
+            "experience": rng.choice(ROLES),
+            "alumni": rng.choice(["", "MIT", "Stanford"]),
+            "age": "",
+            "intent": rng.choice(INTENTS),
+        }
+        for i in range(max(distinct, 1))
+    ]
+    return [rng.choice(pool) for _ in range(n)]
+
+
+def drive(url: str, submissions: List[Dict[str, str]], concurrency: int,
+          timeout: float = 30.0) -> LoadResult:
+    """
+    Post every submission to ``url`` from ``concurrency`` threads.
+
+    Connection errors and client-side timeouts count under status ``error``.
+    """
+    result = LoadResult()
+    lock = threading.Lock()
+    local = threading.local()
+
+    def post(form: Dict[str, str]) -> None:
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = requests.Session()
+        started = time.perf_counter()
+        try:
+            status = str(session.post(url, data=form, timeout=timeout).status_code)
+        except requests.RequestException:
+            status = "error"
+        elapsed = time.perf_counter() - started
+        with lock:
+            result.latencies.append(elapsed)
+            result.statuses[status] += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(post, submissions))
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+def run_local(
+    submissions: List[Dict[str, str]],
+    concurrency: int,
+    latency: str = "fixed:0.2",
+    workers: int = 32,
+    llm_concurrency: Optional[int] = None,
+    timeout: Optional[float] = None,
+    templates: bool = False,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """
+    Load test ``app.py`` in-process against a stub LLM.
+
+    Args:
+        submissions: Forms to post
+        concurrency: Client threads
+        latency: Stub latency distribution (see ``mock_server.parse_latency``)
+        workers: Server worker threads
+        llm_concurrency: Upstream LLM calls in flight (None: unbounded)
+        timeout: Seconds a request waits for its message (None: no limit)
+        templates: Render from ``configs/dev/templates.yaml`` where possible
+        seed: Seed of the latency draws
+
+    Returns:
+        The load summary plus upstream call counts
+    """
+    from app import app
+
+    sampler, rng = parse_latency(latency), random.Random(seed)
+    client = StubClient(lambda: sampler(rng))
+    generator = MessageGenerator(client, max_concurrency=llm_concurrency, timeout=timeout)
+    app.extensions["generator"] = generator
+    app.extensions["templates"] = (
+        TemplateSet.load(DEFAULT_TEMPLATES) if templates else TemplateSet()
+    )
+    registry.reset()
+    server = PooledWSGIServer(("127.0.0.1", 0), app, workers=workers)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        result = drive(f"{server.url}/", submissions, concurrency)
+    finally:
+        server.shutdown()
+        server.server_close()
+        generator.close()
+        app.extensions.pop("generator")
+        app.extensions.pop("templates")
+
+    sources = registry.counter("generation_requests_total")
+    return {
+        **result.summary(),
+        "upstream_calls": client.calls,
+        "peak_upstream_concurrency": client.peak,
+        "timeouts": int(sources.value(result="timeout")),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entrypoint."""
+    parser = argparse.ArgumentParser(description="Load test the message web app")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=32, help="Client threads")
+    parser.add_argument("--distinct", type=int, default=200,
+                        help="Different forms sent (sets the cache hit rate)")
+    parser.add_argument("--latency", default="fixed:0.2",
+                        help="Stub LLM latency: fixed:S | uniform:A,B | exponential:MEAN | "
+                             "lognormal:MU,SIGMA")
+    parser.add_argument("--workers", type=int, default=32, help="Server worker threads")
+    parser.add_argument("--llm-concurrency", type=int, help="Upstream LLM calls in flight")
+    parser.add_argument("--timeout", type=float, help="Seconds a request waits for its message")
+    parser.add_argument("--templates", action="store_true",
+                        help="Render from configs/dev/templates.yaml where possible")
+    parser.add_argument("--url", help="Load an already running server instead")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", type=Path, help="Also write the summary to this file")
+    args = parser.parse_args(argv)
+
+    submissions = forms(args.requests, args.distinct, args.seed)
+    if args.url:
+        summary = drive(args.url, submissions, args.concurrency).summary()
+    else:
+        summary = run_local(
+            submissions, args.concurrency, args.latency, args.workers,
+            args.llm_concurrency, args.timeout, args.templates, args.seed,
+        )
+
+    print(
+        f"{summary['requests']} requests in {summary['seconds']}s: "
+        f"{summary['throughput']} req/s, p50 {summary['p50_ms']} ms, "
+        f"p95 {summary['p95_ms']} ms, p99 {summary['p99_ms']} ms"
+    )
+    print(f"statuses: {summary['statuses']}")
+    if "upstream_calls" in summary:
+        print(
+            f"upstream LLM calls: {summary['upstream_calls']} "
+            f"(peak {summary['peak_upstream_concurrency']} in flight), "
+            f"timeouts: {summary['timeouts']}"
+        )
+    if args.json:
+        args.json.write_text(json.dumps(summary, indent=2) + "\n")
+    return 0 if set(summary["statuses"]) <= {"200"} else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
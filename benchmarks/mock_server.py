@@ -0,0 +1,427 @@
+"""Local stand-in for the Crunchbase and EDGAR endpoints the collector calls.
+
+Serves generated data with configurable latency and fault injection so
+collector throughput and retry behavior can be measured without API quota
+or traffic to sec.gov.
+
+Usage:
+    python -m benchmarks.mock_server --port 8765 \\
+        --latency lognormal:-3.0,0.6 --rate-limit-rate 0.05 --retry-after 1
+
+Then point the collector at it:
+
+    sources:
+      crunchbase:
+        base_url: "http://127.0.0.1:8765/api/v4"
+      sec:
+        base_url: "http://127.0.0.1:8765/Archives/edgar"
+"""
+
+import argparse
+import json
+import logging
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks import generators
+
+
+logger = logging.getLogger(__name__)
+
+DAILY_INDEX_RE = re.compile(
+    r"^/Archives/edgar/daily-index/(\d{4})/QTR([1-4])/master\.(\d{8})\.idx$"
+)
+FULL_INDEX_RE = re.compile(r"^/Archives/edgar/full-index/(\d{4})/QTR([1-4])/master\.idx$")
+CRUNCHBASE_SEARCH_PATH = "/api/v4/organizations/search"
+# Search parameters the collector pushes down from its filters
+CRUNCHBASE_FILTER_PARAMS = (
+    "funding_total_min", "funding_total_max", "last_funding_types", "categories",
+    "num_employees_enum", "last_funding_after", "last_funding_before",
+)
+
+
+def matches_search(item: Dict[str, Any], filters: Dict[str, str]) -> bool:
+    """Return whether a Crunchbase item passes the pushed-down search parameters."""
+    props = item["properties"]
+    funding = (props.get("funding_total") or {}).get("value_usd")
+    if "funding_total_min" in filters and (
+        funding is None or funding < float(filters["funding_total_min"])
+    ):
+        return False
+    if "funding_total_max" in filters and (
+        funding is None or funding > float(filters["funding_total_max"])
+    ):
+        return False
+    for param, value in (
+        ("last_funding_types", props.get("last_funding_type")),
+        ("num_employees_enum", props.get("num_employees_enum")),
+    ):
+        if param in filters and str(value).lower() not in filters[param].lower().split(","):
+            return False
+    if "categories" in filters:
+        wanted = set(filters["categories"].lower().split(","))
+        if not any(c["value"].lower() in wanted for c in props.get("categories", [])):
+            return False
+    funded_at = props.get("last_funding_at") or ""
+    if "last_funding_after" in filters and funded_at < filters["last_funding_after"]:
+        return False
+    if "last_funding_before" in filters and funded_at > filters["last_funding_before"]:
+        return False
+    return True
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """
+    Build a latency sampler from a ``kind:params`` spec.
+
+    Supported specs (seconds):
+        ``fixed:0.05``, ``uniform:0.01,0.2``, ``exponential:0.05`` (mean),
+        ``lognormal:-3.0,0.6`` (mu, sigma of the underlying normal)
+
+    Args:
+        spec: Distribution spec; "none" or "" disables latency
+
+    Returns:
+        Function mapping a random generator to a delay in seconds
+    """
+    if not spec or spec == "none":
+        return lambda rng: 0.0
+    kind, _, raw = spec.partition(":")
+    params = [float(p) for p in raw.split(",") if p]
+    if kind == "fixed":
+        return lambda rng: params[0]
+    if kind == "uniform":
+        return lambda rng: rng.uniform(params[0], params[1])
+    if kind == "exponential":
+        return lambda rng: rng.expovariate(1.0 / params[0])
+    if kind == "lognormal":
+        return lambda rng: rng.lognormvariate(params[0], params[1])
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+@dataclass
+class FaultConfig:
+    """Latency and failure behavior of the mock server."""
+
+    latency: str = "none"
+    rate_limit_rate: float = 0.0    # share of requests answered with 429
+    server_error_rate: float = 0.0  # share answered with a random 5xx
+    retry_after: Optional[float] = None  # Retry-After seconds on 429/503
+    slow_body_rate: float = 0.0     # share of bodies trickled out slowly
+    slow_body_seconds: float = 2.0  # total time spent sending a slow body
+    truncate_rate: float = 0.0      # share of bodies cut off mid-stream
+    seed: int = 0
+
+
+@dataclass
+class DataConfig:
+    """Size and shape of the generated data."""
+
+    crunchbase_items: int = 1_000
+    daily_index_lines: int = 2_000
+    full_index_lines: int = 100_000
+    seed: int = 0
+
+
+@dataclass
+class ServerStats:
+    """Request and fault counters, served at ``/__stats``."""
+
+    requests: Counter = field(default_factory=Counter)
+    faults: Counter = field(default_factory=Counter)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def record(self, route: str, fault: Optional[str] = None) -> None:
+        with self.lock:
+            self.requests[route] += 1
+            if fault:
+                self.faults[fault] += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self.lock:
+            return {"requests": dict(self.requests), "faults": dict(self.faults)}
+
+
+class MockServer:
+    """
+    Threaded HTTP server serving generated Crunchbase and EDGAR responses.
+
+    Can be used as a context manager in tests; ``port=0`` picks a free port.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        faults: Optional[FaultConfig] = None,
+        data: Optional[DataConfig] = None,
+    ):
+        self.faults = faults or FaultConfig()
+        self.data = data or DataConfig()
+        self.stats = ServerStats()
+        self._latency = parse_latency(self.faults.latency)
+        self._rng = random.Random(self.faults.seed)
+        self._rng_lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def collector_config(self) -> Dict[str, Any]:
+        """Config overrides that point the collector at this server."""
+        return {
+            "sources": {
+                "crunchbase": {"enabled": True, "base_url": f"{self.url}/api/v4"},
+                "sec": {"enabled": True, "base_url": f"{self.url}/Archives/edgar"},
+            }
+        }
+
+    def start(self) -> "MockServer":
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Serve requests on the current thread until interrupted."""
+        self._httpd.serve_forever()
+
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "MockServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def _roll(self) -> Tuple[float, float, float]:
+        with self._rng_lock:
+            return self._latency(self._rng), self._rng.random(), self._rng.random()
+
+    # Generated bodies are cached so the server is never the bottleneck.
+    @lru_cache(maxsize=256)
+    def _daily_index(self, index_date: date) -> bytes:
+        seed = self.data.seed * 100_000 + index_date.toordinal()
+        return generators.generate_master_idx(
+            self.data.daily_index_lines, seed=seed, index_date=index_date
+        ).encode()
+
+    @lru_cache(maxsize=16)
+    def _full_index(self, year: int, quarter: int) -> bytes:
+        quarter_start = date(year, 3 * (quarter - 1) + 1, 1)
+        return generators.generate_master_idx(
+            self.data.full_index_lines, seed=self.data.seed + year * 10 + quarter,
+            index_date=quarter_start,
+        ).encode()
+
+    @lru_cache(maxsize=1024)
+    def _crunchbase_page(self, page: int, limit: int) -> bytes:
+        body = generators.generate_crunchbase_page(
+            page, self.data.crunchbase_items, page_size=limit, seed=self.data.seed
+        )
+        return json.dumps(body).encode()
+
+    @lru_cache(maxsize=16)
+    def _crunchbase_matches(self, filters: Tuple[Tuple[str, str], ...], limit: int) -> list:
+        # Items are seeded per page, so the universe is generated at the client's page size
+        items = []
+        for page in range(1, self.data.crunchbase_items // limit + 2):
+            body = generators.generate_crunchbase_page(
+                page, self.data.crunchbase_items, page_size=limit, seed=self.data.seed
+            )
+            items.extend(i for i in body["data"]["items"] if matches_search(i, dict(filters)))
+        return items
+
+    def _crunchbase_search(
+        self, page: int, limit: int, filters: Tuple[Tuple[str, str], ...]
+    ) -> bytes:
+        if not filters:
+            return self._crunchbase_page(page, limit)
+        items = self._crunchbase_matches(filters, limit)
+        body = {"count": len(items), "data": {"items": items[(page - 1) * limit:page * limit]}}
+        return json.dumps(body).encode()
+
+    def route(self, path: str, query: Dict[str, Any]) -> Tuple[int, str, bytes, str]:
+        """
+        Resolve a request to ``(status, content_type, body, route_name)``.
+        """
+        if path == CRUNCHBASE_SEARCH_PATH:
+            page = int(query.get("page", ["1"])[0])
+            limit = min(int(query.get("limit", ["100"])[0]), 1000)
+            filters = tuple(sorted(
+                (param, query[param][0]) for param in CRUNCHBASE_FILTER_PARAMS if param in query
+            ))
+            body = self._crunchbase_search(page, limit, filters)
+            return 200, "application/json", body, "crunchbase"
+
+        match = DAILY_INDEX_RE.match(path)
+        if match:
+            index_date = datetime.strptime(match.group(3), "%Y%m%d").date()
+            if index_date.weekday() >= 5:
+                return 404, "text/plain", b"Not Found", "sec_daily"
+            return 200, "text/plain", self._daily_index(index_date), "sec_daily"
+
+        match = FULL_INDEX_RE.match(path)
+        if match:
+            body = self._full_index(int(match.group(1)), int(match.group(2)))
+            return 200, "text/plain", body, "sec_full"
+
+        if path == "/__stats":
+            return 200, "application/json", json.dumps(self.stats.to_dict()).encode(), "stats"
+
+        return 404, "text/plain", b"Not Found", "unknown"
+
+    def _handler_class(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like the real APIs
+
+            def log_message(self, format: str, *args: Any) -> None:
+                logger.debug("%s - %s", self.address_string(), format % args)
+
+            def do_GET(self) -> None:
+                parsed = urlparse(self.path)
+                status, content_type, body, route = server.route(
+                    parsed.path, parse_qs(parsed.query)
+                )
+                if route == "stats":
+                    self._send(status, content_type, body)
+                    return
+
+                delay, fault_roll, body_roll = server._roll()
+                if delay > 0:
+                    time.sleep(delay)
+
+                faults = server.faults
+                if fault_roll < faults.rate_limit_rate:
+                    server.stats.record(route, "429")
+                    self._send(429, "application/json", b'{"error": "rate limited"}',
+                               retry_after=faults.retry_after)
+                    return
+                if fault_roll < faults.rate_limit_rate + faults.server_error_rate:
+                    code = (500, 502, 503, 504)[int(body_roll * 4)]
+                    server.stats.record(route, str(code))
+                    self._send(code, "text/plain", b"Server Error",
+                               retry_after=faults.retry_after if code == 503 else None)
+                    return
+
+                if status == 200 and body_roll < faults.truncate_rate:
+                    server.stats.record(route, "truncated")
+                    self._send(status, content_type, body, truncate=True)
+                    return
+                if status == 200 and body_roll < faults.truncate_rate + faults.slow_body_rate:
+                    server.stats.record(route, "slow_body")
+                    self._send(status, content_type, body, slow=faults.slow_body_seconds)
+                    return
+
+                server.stats.record(route)
+                self._send(status, content_type, body)
+
+            def _send(
+                self,
+                status: int,
+                content_type: str,
+                body: bytes,
+                retry_after: Optional[float] = None,
+                truncate: bool = False,
+                slow: float = 0.0,
+            ) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                if retry_after is not None:
+                    self.send_header("Retry-After", f"{retry_after:g}")
+                if truncate:
+                    self.send_header("Connection", "close")
+                self.end_headers()
+
+                if truncate:
+                    # Promise the full length, send half, then hang up.
+                    self.wfile.write(body[: len(body) // 2])
+                    self.wfile.flush()
+                    self.close_connection = True
+                    return
+                if slow > 0:
+                    chunks = 20
+                    size = max(1, len(body) // chunks)
+                    for start in range(0, len(body), size):
+                        self.wfile.write(body[start:start + size])
+                        self.wfile.flush()
+                        time.sleep(slow / chunks)
+                    return
+                self.wfile.write(body)
+
+        return Handler
+
+
+def main(argv: Optional[list] = None) -> int:
+    """Command line entrypoint."""
+    parser = argparse.ArgumentParser(description="Mock Crunchbase/EDGAR server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", default="none",
+                        help="fixed:S | uniform:A,B | exponential:MEAN | lognormal:MU,SIGMA")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0,
+                        help="Share of requests answered with 429")
+    parser.add_argument("--server-error-rate", type=float, default=0.0,
+                        help="Share of requests answered with a 5xx")
+    parser.add_argument("--retry-after", type=float, default=None,
+                        help="Retry-After seconds sent with 429/503")
+    parser.add_argument("--slow-body-rate", type=float, default=0.0)
+    parser.add_argument("--slow-body-seconds", type=float, default=2.0)
+    parser.add_argument("--truncate-rate", type=float, default=0.0)
+    parser.add_argument("--crunchbase-items", type=int, default=1_000)
+    parser.add_argument("--daily-index-lines", type=int, default=2_000)
+    parser.add_argument("--full-index-lines", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(message)s")
+    faults = FaultConfig(
+        latency=args.latency,
+        rate_limit_rate=args.rate_limit_rate,
+        server_error_rate=args.server_error_rate,
+        retry_after=args.retry_after,
+        slow_body_rate=args.slow_body_rate,
+        slow_body_seconds=args.slow_body_seconds,
+        truncate_rate=args.truncate_rate,
+        seed=args.seed,
+    )
+    data = DataConfig(
+        crunchbase_items=args.crunchbase_items,
+        daily_index_lines=args.daily_index_lines,
+        full_index_lines=args.full_index_lines,
+        seed=args.seed,
+    )
+    server = MockServer(args.host, args.port, faults, data)
+    logger.info("Serving mock Crunchbase/EDGAR on %s (stats at /__stats)", server.url)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
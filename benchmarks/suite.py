@@ -0,0 +1,254 @@
+"""Benchmark definitions for the collector stages.
+
+Each benchmark has an untimed ``setup`` that builds its input from the
+seeded generators and a timed ``run`` that exercises one collector entry
+point. Nothing touches the network.
+"""
+
+import logging
+import shutil
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+
+from benchmarks import generators
+from collector.campaigns import CampaignSet
+from collector.pipeline import extract_decision_makers_from_dfs, filter_df_by_location
+from collector.extractors import DecisionMakerExtractor
+from collector.filters import LocationFilter
+from collector.scoring import LeadScorer, prioritize
+from collector.sources.sec import _parse_idx_file, to_frame
+from collector.storage import save_to_csv, save_to_json, save_to_parquet
+from enricher.cache import LookupCache
+from enricher.enrich import Enricher
+from enricher.providers import StubProvider
+from generation.clients import StubClient
+from generation.bulk import jobs_from_extracted
+from generation.generator import MessageGenerator, build_prompt
+from generation.templates import DEFAULT_TEMPLATES, MessageComposer, TemplateSet
+
+
+TARGET_FORMS = ["S-1", "S-1/A", "10-K", "10-Q"]
+TARGET_LOCATIONS = ["San Francisco", "New York", "Boston", "Austin", "Seattle", "London"]
+
+# Input sizes per scale. "quick" suits CI; "full" approaches production
+# volumes (a busy quarter's worth of index lines).
+SCALES: Dict[str, Dict[str, int]] = {
+    "quick": {"idx_lines": 200_000, "locations": 200_000, "companies": 5_000},
+    "full": {"idx_lines": 2_000_000, "locations": 1_000_000, "companies": 50_000},
+}
+
+
+@dataclass
+class Benchmark:
+    """A named benchmark over one collector entry point."""
+
+    name: str
+    setup: Callable[[Dict[str, int]], Dict[str, Any]]
+    run: Callable[[Dict[str, Any]], None]
+    items: Callable[[Dict[str, Any]], int]
+    unit: str = "records"
+    teardown: Optional[Callable[[Dict[str, Any]], None]] = None
+
+
+def _companies_df(sizes: Dict[str, int]) -> pd.DataFrame:
+    return pd.DataFrame(generators.generate_companies(sizes["companies"], seed=2))
+
+
+def _setup_parse_idx(sizes):
+    lines = sizes["idx_lines"]
+    return {"content": generators.generate_master_idx(lines, seed=1), "lines": lines}
+
+
+def _run_parse_idx(state):
+    _parse_idx_file(state["content"], TARGET_FORMS)
+
+
+def _setup_sec_frame(sizes):
+    content = generators.generate_master_idx(sizes["idx_lines"], seed=1)
+    return {"filings": _parse_idx_file(content, generators.FORM_TYPES)}
+
+
+def _run_sec_frame(state):
+    to_frame(state["filings"])
+
+
+def _setup_location_filter(sizes):
+    companies = generators.generate_companies(sizes["locations"] // 10, seed=3)
+    # Repeat the pool so the cache sees realistic hit rates
+    return {"locations": [c["headquarters"] for c in companies] * 10}
+
+
+def _run_location_filter(state):
+    location_filter = LocationFilter(TARGET_LOCATIONS)
+    for location in state["locations"]:
+        location_filter.is_in_target_location(location)
+
+
+def _setup_extractor(sizes):
+    return {"companies": generators.generate_companies(sizes["companies"], seed=4)}
+
+
+def _run_extractor(state):
+    extractor = DecisionMakerExtractor()
+    for company in state["companies"]:
+        extractor.extract_decision_makers(company)
+
+
+def _setup_companies_df(sizes):
+    return {"df": _companies_df(sizes)}
+
+
+def _run_filter_df(state):
+    filter_df_by_location(state["df"], LocationFilter(TARGET_LOCATIONS))
+
+
+def _setup_campaigns(sizes):
+    # A dozen campaigns over different city pairs and funding thresholds
+    campaigns = {
+        f"campaign{i}": {
+            "target_locations": [generators.CITIES[i % 16].split(",")[0],
+                                 generators.CITIES[(i + 5) % 16].split(",")[0]],
+            "min_funding_amount": (i % 3) * 1_000_000,
+        }
+        for i in range(12)
+    }
+    return {"df": _companies_df(sizes), "config": {"campaigns": campaigns}}
+
+
+def _run_campaigns(state):
+    CampaignSet.from_config(state["config"]).tag(state["df"])
+
+
+def _run_extract_dfs(state):
+    extract_decision_makers_from_dfs([state["df"]])
+
+
+def _setup_scoring(sizes):
+    # Extracted once, then scored repeatedly as if streamed in batches
+    extracted = extract_decision_makers_from_dfs([_companies_df(sizes)])
+    return {"extracted": extracted * 10, "scorer": LeadScorer()}
+
+
+def _run_scoring(state):
+    prioritize(iter(state["extracted"]), state["scorer"], k=300)
+
+
+def _setup_generation(sizes):
+    # Each prompt is requested four times, as when a user regenerates a draft
+    prompts = [
+        build_prompt({
+            "name": f"Person {i}", "company": f"Company {i}", "experience": "CTO",
+            "intent": "asking for advice",
+        })
+        for i in range(sizes["companies"])
+    ]
+    return {"prompts": prompts * 4}
+
+
+def _run_generation(state):
+    generator = MessageGenerator(StubClient(), cache_size=len(state["prompts"]))
+    for prompt in state["prompts"]:
+        generator.generate(prompt)
+
+
+def _setup_templates(sizes):
+    extracted = extract_decision_makers_from_dfs([_companies_df(sizes)])
+    jobs = jobs_from_extracted(extracted, "asking for advice")
+    return {
+        "values": [job.values for job in jobs],
+        "templates": TemplateSet.load(DEFAULT_TEMPLATES),
+    }
+
+
+def _run_templates(state):
+    # Segments without a template fall back to the (stubbed) LLM
+    composer = MessageComposer(MessageGenerator(StubClient()), state["templates"])
+    for values in state["values"]:
+        composer.compose(values)
+
+
+def _setup_enrichment(sizes):
+    extracted = extract_decision_makers_from_dfs([_companies_df(sizes)])
+    for entry in extracted:
+        entry["company"]["website_url"] = f"https://{entry['company']['uuid']}.example.com"
+    return {
+        "extracted": extracted,
+        "people": sum(len(entry["decision_makers"]) for entry in extracted),
+        "dir": Path(tempfile.mkdtemp(prefix="enricher-bench-")),
+        "runs": 0,
+    }
+
+
+def _run_enrichment(state):
+    # A cold cache each run: every person is looked up, then cached
+    state["runs"] += 1
+    cache = LookupCache(state["dir"] / f"lookups{state['runs']}.sqlite")
+    providers = [StubProvider("pdl", hit_rate=0.5), StubProvider("clearbit", hit_rate=0.5)]
+    try:
+        Enricher(providers, cache=cache).enrich(state["extracted"])
+    finally:
+        cache.close()
+
+
+def _setup_writer(sizes):
+    df = _companies_df(sizes)
+    return {
+        # The raw outputs hold flat company columns; nested people/team
+        # lists only travel in the JSON output.
+        "df": df.drop(columns=["people", "team"], errors="ignore"),
+        "records": df.to_dict(orient="records"),
+        "dir": Path(tempfile.mkdtemp(prefix="collector-bench-")),
+    }
+
+
+def _teardown_writer(state):
+    shutil.rmtree(state["dir"], ignore_errors=True)
+
+
+def _writer(save: Callable[[Any, Path], None], key: str, suffix: str):
+    def run(state):
+        save(state[key], state["dir"] / f"out.{suffix}")
+    return run
+
+
+BENCHMARKS: List[Benchmark] = [
+    Benchmark("sec_parse_idx", _setup_parse_idx, _run_parse_idx,
+              lambda s: s["lines"], "lines"),
+    Benchmark("sec_to_frame", _setup_sec_frame, _run_sec_frame,
+              lambda s: len(s["filings"]), "filings"),
+    Benchmark("location_filter", _setup_location_filter, _run_location_filter,
+              lambda s: len(s["locations"]), "lookups"),
+    Benchmark("decision_maker_extractor", _setup_extractor, _run_extractor,
+              lambda s: len(s["companies"]), "companies"),
+    Benchmark("filter_df_by_location", _setup_companies_df, _run_filter_df,
+              lambda s: len(s["df"]), "rows"),
+    Benchmark("campaign_tagging", _setup_campaigns, _run_campaigns,
+              lambda s: len(s["df"]), "rows"),
+    Benchmark("extract_decision_makers_from_dfs", _setup_companies_df, _run_extract_dfs,
+              lambda s: len(s["df"]), "rows"),
+    Benchmark("lead_scoring_top_k", _setup_scoring, _run_scoring,
+              lambda s: len(s["extracted"]), "companies"),
+    Benchmark("message_generation_cached", _setup_generation, _run_generation,
+              lambda s: len(s["prompts"]), "requests"),
+    Benchmark("message_templates", _setup_templates, _run_templates,
+              lambda s: len(s["values"]), "messages"),
+    Benchmark("contact_enrichment", _setup_enrichment, _run_enrichment,
+              lambda s: s["people"], "contacts", _teardown_writer),
+    Benchmark("save_to_csv", _setup_writer, _writer(save_to_csv, "df", "csv"),
+              lambda s: len(s["df"]), "rows", _teardown_writer),
+    Benchmark("save_to_parquet", _setup_writer, _writer(save_to_parquet, "df", "parquet"),
+              lambda s: len(s["df"]), "rows", _teardown_writer),
+    Benchmark("save_to_json", _setup_writer, _writer(save_to_json, "records", "json"),
+              lambda s: len(s["records"]), "records", _teardown_writer),
+]
+
+
+def quiet_collector_logging() -> None:
+    """Keep per-call INFO logs from the collector out of timings and output."""
+    logging.getLogger("collector").setLevel(logging.WARNING)
+    logging.getLogger("enricher").setLevel(logging.WARNING)
+    logging.getLogger("__main__").setLevel(logging.WARNING)
@@ -0,0 +1,5 @@
+"""Pytest root configuration.
+
+Its presence puts the repository root on ``sys.path`` so tests can import
+top-level packages such as ``benchmarks``.
+"""
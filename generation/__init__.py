@@ -0,0 +1 @@
+"""Networking message generation for the web app."""
@@ -0,0 +1,293 @@
+"""Bulk message generation over the collector's decision makers.
+
+Reads ``companies_with_decision_makers.json`` (or ``leads.json``) and
+drafts one message per decision maker. Messages come from the templates
+of their segment where possible (see ``generation.templates``) and from
+the web app's LLM prompt otherwise. A thread pool of ``concurrency``
+workers generates through a ``MessageGenerator``, so the cache, request
+coalescing and rate limit all apply. Each finished
+message is appended to a JSON Lines file and flushed to disk right away.
+Rerunning with the same output skips the decision makers already in it,
+so a crashed run resumes where it stopped.
+
+    python -m generation.bulk ../data/interim/companies_with_decision_makers.json \\
+        --out messages.jsonl --intent "asking for advice" --concurrency 8 --rate 5
+
+Progress is reported as a stream of events (``start``, ``message``,
+``error``, ``done``), printed by the CLI and sent as Server-Sent Events by
+the web app's ``/bulk`` endpoint. ``done`` carries the run's template vs.
+LLM mix.
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Union
+
+from common.metrics import registry
+from generation.clients import client_from_env
+from generation.generator import MessageGenerator, RateLimiter, build_prompt
+from generation.templates import MessageComposer, MixReport, TemplateSet, segment_values
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTENT = "asking for advice"
+DEFAULT_CONCURRENCY = 4
+
+
+class Job(NamedTuple):
+    """One message to draft."""
+
+    id: str
+    name: str
+    title: str
+    company: str
+    values: Dict[str, str]
+
+    @property
+    def prompt(self) -> str:
+        """The LLM prompt, as the web form builds it."""
+        return build_prompt(self.values)
+
+
+def jobs_from_extracted(extracted: Iterable[Dict[str, Any]], intent: str) -> List[Job]:
+    """
+    Build one job per decision maker.
+
+    Args:
+        extracted: Entries with ``company`` and ``decision_makers``, as in
+            ``companies_with_decision_makers.json``
+        intent: Message intent, as in the web form
+
+    Returns:
+        Jobs in input order; a person listed twice gets one job
+    """
+    jobs: Dict[str, Job] = {}
+    for entry in extracted:
+        company = entry.get("company") or {}
+        for dm in entry.get("decision_makers") or []:
+            values = segment_values(company, dm, intent)
+            if not values["name"]:
+                continue
+            values["experience"] = values["experience"] or "leader"
+            # Contact IDs from the collector are stable; older files lack them
+            job_id = dm.get("id") or hashlib.sha1(
+                f"{values['company']}|{values['name'].lower()}".encode("utf-8")
+            ).hexdigest()
+            jobs.setdefault(job_id, Job(
+                id=job_id,
+                name=values["name"],
+                title=values["title"],
+                company=values["company"],
+                values=values,
+            ))
+    return list(jobs.values())
+
+
+def completed_ids(path: Union[str, Path]) -> Set[str]:
+    """
+    Return the job IDs already written to an output file.
+
+    A line cut short by a crash is ignored, so its job runs again.
+    """
+    done: Set[str] = set()
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    done.add(json.loads(line)["id"])
+                except (ValueError, KeyError, TypeError):
+                    continue
+    except FileNotFoundError:
+        pass
+    return done
+
+
+class ResultWriter:
+    """Append results to a JSON Lines file, durably and one line at a time."""
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Open the output for appending.
+
+        Args:
+            path: Output file (created with its directory if missing)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # A crash mid-write can leave a partial last line; start on a fresh one
+        partial = False
+        if self.path.exists() and self.path.stat().st_size:
+            with open(self.path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                partial = f.read(1) != b"\n"
+        self._file = open(self.path, "a", encoding="utf-8")
+        if partial:
+            self._file.write("\n")
+        self._lock = threading.Lock()
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """Append a record and flush it to disk."""
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        """Close the file."""
+        self._file.close()
+
+
+def run_bulk(
+    jobs: List[Job],
+    generator: MessageGenerator,
+    out_path: Union[str, Path],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    templates: Optional[TemplateSet] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Generate messages for jobs not yet in the output, streaming progress.
+
+    Workers write each message before it is reported. If the consumer
+    stops early (e.g. the client disconnects), queued jobs are dropped and
+    messages already in flight are still written.
+
+    Args:
+        jobs: Messages to draft
+        generator: Message generator
+        out_path: JSON Lines output, appended to
+        concurrency: Generations in flight at once
+        templates: Message templates (None sends every job to the LLM)
+
+    Yields:
+        Progress events, each a dict with an ``event`` name
+    """
+    started = time.perf_counter()
+    done = completed_ids(out_path)
+    pending = [job for job in jobs if job.id not in done]
+    counts = {"total": len(jobs), "skipped": len(jobs) - len(pending), "done": 0, "failed": 0}
+    messages_total = registry.counter(
+        "generation_bulk_messages_total", "Bulk generation jobs by result"
+    )
+    messages_total.inc(counts["skipped"], result="skipped")
+    yield {"event": "start", **counts, "out": str(out_path)}
+
+    writer = ResultWriter(out_path)
+    composer = MessageComposer(generator, templates)
+    mix = MixReport()
+
+    def generate(job: Job) -> Dict[str, Any]:
+        composed = composer.compose(job.values)
+        mix.add(composed)
+        record = {
+            "id": job.id,
+            "name": job.name,
+            "title": job.title,
+            "company": job.company,
+            "message": composed.text,
+            "source": composed.source,
+            "template": composed.template,
+            "generated_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        writer.write(record)
+        return record
+
+    pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="bulk")
+    queue = iter(pending)
+    inflight: Dict[Future, Job] = {}
+
+    def submit() -> None:
+        # Keep a bounded window of futures instead of one per job
+        for job in queue:
+            inflight[pool.submit(generate, job)] = job
+            if len(inflight) >= concurrency * 2:
+                return
+
+    try:
+        submit()
+        while inflight:
+            finished, _ = wait(inflight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                job = inflight.pop(future)
+                try:
+                    record = future.result()
+                except Exception as e:
+                    counts["failed"] += 1
+                    messages_total.inc(result="failed")
+                    logger.warning(f"Generation failed for {job.name} at {job.company}: {e}")
+                    yield {
+                        "event": "error", "id": job.id, "name": job.name, "error": str(e), **counts
+                    }
+                    continue
+                counts["done"] += 1
+                messages_total.inc(result="generated")
+                yield {"event": "message", **record, **counts}
+            submit()
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+        writer.close()
+
+    elapsed = time.perf_counter() - started
+    report = mix.as_dict()
+    logger.info(
+        f"Generated {counts['done']} messages ({counts['failed']} failed, "
+        f"{counts['skipped']} already done) in {elapsed:.1f}s; "
+        f"{report['template']} from templates, {report['llm']} from the LLM"
+    )
+    yield {"event": "done", **counts, "seconds": round(elapsed, 3), "mix": report}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entrypoint: ``python -m generation.bulk INPUT --out FILE``."""
+    parser = argparse.ArgumentParser(description="Draft messages for extracted decision makers")
+    parser.add_argument("input", type=Path,
+                        help="companies_with_decision_makers.json or leads.json")
+    parser.add_argument("--out", type=Path, required=True,
+                        help="JSON Lines output (resumed if present)")
+    parser.add_argument("--intent", default=DEFAULT_INTENT, help="Message intent")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="Generations in flight at once")
+    parser.add_argument("--rate", type=float, help="Upstream LLM calls per second")
+    parser.add_argument("--templates", type=Path,
+                        help="Template file (default: MESSAGE_TEMPLATES)")
+    parser.add_argument("--no-templates", action="store_true",
+                        help="Send every message to the LLM")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    jobs = jobs_from_extracted(json.loads(args.input.read_text(encoding="utf-8")), args.intent)
+    generator = MessageGenerator(
+        client_from_env(), limiter=RateLimiter(args.rate) if args.rate else None
+    )
+    if args.no_templates:
+        templates = None
+    else:
+        templates = TemplateSet.load(args.templates) if args.templates else TemplateSet.from_env()
+    failed = 0
+    for event in run_bulk(jobs, generator, args.out, args.concurrency, templates):
+        if event["event"] == "message":
+            progress = event["done"] + event["skipped"]
+            print(f"[{progress}/{event['total']}] {event['name']}", file=sys.stderr)
+        elif event["event"] == "done":
+            failed = event["failed"]
+            print(
+                f"{event['done']} generated ({event['mix']['template']} from templates, "
+                f"{event['mix']['llm']} from the LLM), {event['skipped']} already done, "
+                f"{failed} failed in {event['seconds']}s -> {args.out}",
+                file=sys.stderr,
+            )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""Caches for generated messages, keyed by prompt hash.
+
+``LRUCache`` is the in-process tier; ``DiskCache`` is an optional second
+tier that survives restarts and is shared by worker processes. Disk
+entries expire ``ttl`` seconds after they were written.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Union
+
+
+class LRUCache:
+    """A bounded, thread-safe map that evicts the least recently used key."""
+
+    def __init__(self, maxsize: int = 1024):
+        """
+        Initialize an empty cache.
+
+        Args:
+            maxsize: Entries kept; 0 disables the cache
+        """
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str) -> Optional[str]:
+        """Return a cached value and mark it recently used, or None."""
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        """Store a value, evicting the least recently used one if full."""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+class DiskCache:
+    """One JSON file per key under ``root``, expiring after ``ttl`` seconds."""
+
+    def __init__(self, root: Union[str, Path], ttl: float = 7 * 24 * 3600):
+        """
+        Initialize the cache.
+
+        Args:
+            root: Cache directory (created if missing)
+            ttl: Seconds an entry stays valid
+        """
+        self.root = Path(root)
+        self.ttl = ttl
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[str]:
+        """Return an unexpired value, or None; expired entries are removed."""
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry.get("created", 0) > self.ttl:
+            path.unlink(missing_ok=True)
+            return None
+        return entry.get("value")
+
+    def set(self, key: str, value: str) -> None:
+        """Store a value; concurrent writers of one key never leave a partial file."""
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"created": time.time(), "value": value}, f)
+        os.replace(tmp, path)
@@ -0,0 +1,133 @@
+"""LLM backends for message generation.
+
+Every backend implements ``LLMClient.complete``. ``OpenAIClient`` calls the
+OpenAI completions API; ``StubClient`` answers locally and deterministically,
+so tests and benchmarks run without an API key or network access. The
+backend is picked with the ``LLM_BACKEND`` environment variable (see
+``client_from_env``).
+"""
+
+import hashlib
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Optional, Union
+
+
+DEFAULT_MODEL = "gpt-3.5-turbo-instruct"
+
+
+class LLMClient(ABC):
+    """Interface of a text completion backend."""
+
+    #: Model name, part of the cache key so switching models never serves stale text
+    model: str = "unknown"
+
+    @abstractmethod
+    def complete(self, prompt: str, max_tokens: int) -> str:
+        """
+        Complete a prompt.
+
+        Args:
+            prompt: Prompt text
+            max_tokens: Upper bound on generated tokens
+
+        Returns:
+            The generated text, stripped
+        """
+
+
+class OpenAIClient(LLMClient):
+    """Completions from the OpenAI API."""
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = DEFAULT_MODEL,
+        timeout: Optional[float] = None,
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            api_key: API key (defaults to ``OPENAI_API_KEY``)
+            model: Completion model
+            timeout: Seconds before an API call is abandoned (None keeps
+                the library default)
+        """
+        try:
+            import openai
+        except ImportError as e:
+            raise RuntimeError("LLM_BACKEND=openai requires the openai package") from e
+        self.model = model
+        options = {"timeout": timeout} if timeout else {}
+        self._client = openai.OpenAI(api_key=api_key or os.environ.get("OPENAI_API_KEY"), **options)
+
+    def complete(self, prompt: str, max_tokens: int) -> str:
+        response = self._client.completions.create(
+            model=self.model, prompt=prompt, max_tokens=max_tokens
+        )
+        return response.choices[0].text.strip()
+
+
+class StubClient(LLMClient):
+    """
+    A local stand-in that derives a fixed message from the prompt.
+
+    The same prompt always yields the same text. ``latency`` simulates the
+    upstream round trip, and ``calls`` counts completions, so tests can tell
+    cache hits and coalesced requests from upstream calls. ``peak`` is the
+    most completions that were ever in flight at once.
+    """
+
+    model = "stub"
+
+    def __init__(self, latency: Union[float, Callable[[], float]] = 0.0):
+        """
+        Initialize the stub.
+
+        Args:
+            latency: Seconds each completion sleeps, or a function drawing them
+        """
+        self.latency = latency
+        self.calls = 0
+        self.peak = 0
+        self._active = 0
+        self._lock = threading.Lock()
+
+    def complete(self, prompt: str, max_tokens: int) -> str:
+        with self._lock:
+            self.calls += 1
+            self._active += 1
+            self.peak = max(self.peak, self._active)
+        try:
+            delay = self.latency() if callable(self.latency) else self.latency
+            if delay:
+                time.sleep(delay)
+        finally:
+            with self._lock:
+                self._active -= 1
+        digest = hashlib.sha1(prompt.encode("utf-8")).hexdigest()[:8]
+        words = f"[stub {digest}] {prompt}".split()
+        return " ".join(words[:max_tokens])
+
+
+def client_from_env() -> LLMClient:
+    """
+    Build the backend named by ``LLM_BACKEND`` (``openai`` or ``stub``).
+
+    ``OPENAI_MODEL`` overrides the OpenAI model and ``OPENAI_TIMEOUT`` its
+    per-call timeout; ``STUB_LATENCY`` sets the stub's simulated latency in
+    seconds.
+    """
+    backend = os.environ.get("LLM_BACKEND", "openai").lower()
+    if backend == "stub":
+        return StubClient(float(os.environ.get("STUB_LATENCY", "0")))
+    if backend == "openai":
+        timeout = os.environ.get("OPENAI_TIMEOUT")
+        return OpenAIClient(
+            model=os.environ.get("OPENAI_MODEL", DEFAULT_MODEL),
+            timeout=float(timeout) if timeout else None,
+        )
+    raise ValueError(f"Unknown LLM_BACKEND: {backend}")
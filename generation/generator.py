@@ -0,0 +1,225 @@
+"""Cached, coalesced message generation.
+
+``MessageGenerator.generate`` looks a prompt up in the in-process LRU,
+then in the optional disk tier, and only then calls the LLM backend.
+Concurrent requests for the same prompt share one upstream call: the
+first caller makes it and the others wait for its result. Failures are
+passed to every waiter and are not cached.
+
+Keys hash the model, ``max_tokens`` and prompt, so changing either
+setting never serves text generated under the old one. An optional
+``RateLimiter`` caps upstream calls per second; cache hits are never
+throttled. With ``max_concurrency`` set, upstream calls run on a bounded
+worker pool and callers wait at most ``timeout`` seconds for them.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeout
+from typing import Any, Dict, Mapping, Optional
+
+from common.metrics import registry
+from common.ratelimit import TokenBucket
+from generation.cache import DiskCache, LRUCache
+from generation.clients import LLMClient, client_from_env
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_TOKENS = 150
+# ``from_env`` defaults, so a served app never waits on the backend unbounded
+DEFAULT_MAX_CONCURRENCY = 16
+DEFAULT_TIMEOUT = 30.0
+
+
+def build_prompt(fields: Mapping[str, Any]) -> str:
+    """
+    Build the generation prompt from the form fields.
+
+    Args:
+        fields: ``name``, ``company``, ``experience``, ``intent`` and the
+            optional ``alumni`` and ``age``
+
+    Returns:
+        Prompt text
+    """
+    return (
+        f"Create a {fields['intent']} message for {fields['name']}, a {fields['experience']} "
+        f"at {fields['company']}. Alumni: {fields.get('alumni', '')}, Age: {fields.get('age', '')}."
+    )
+
+
+class RateLimiter(TokenBucket):
+    """Caps upstream LLM calls per second; ``acquire`` blocks until a call may go."""
+
+
+class GenerationTimeout(TimeoutError):
+    """A message was not generated within the request timeout."""
+
+
+class MessageGenerator:
+    """Generate messages through a two-tier cache with request coalescing."""
+
+    def __init__(
+        self,
+        client: LLMClient,
+        cache_size: int = 1024,
+        disk: Optional[DiskCache] = None,
+        max_tokens: int = DEFAULT_MAX_TOKENS,
+        limiter: Optional[RateLimiter] = None,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ):
+        """
+        Initialize the generator.
+
+        Args:
+            client: LLM backend
+            cache_size: Entries in the in-process LRU (0 disables it)
+            disk: Optional disk tier
+            max_tokens: Upper bound on generated tokens
+            limiter: Optional cap on upstream calls per second
+            max_concurrency: Upstream calls in flight at once; further
+                misses queue (None calls the backend on the caller's thread)
+            timeout: Seconds a caller waits, queueing included, before
+                ``GenerationTimeout`` (None waits indefinitely)
+        """
+        self.client = client
+        self.memory = LRUCache(cache_size)
+        self.disk = disk
+        self.max_tokens = max_tokens
+        self.limiter = limiter
+        self.timeout = timeout
+        self._pool = (
+            ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="llm")
+            if max_concurrency else None
+        )
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "MessageGenerator":
+        """
+        Build a generator from the environment.
+
+        The backend comes from ``client_from_env``. ``GENERATION_CACHE_SIZE``
+        sizes the LRU; ``GENERATION_CACHE_DIR`` enables the disk tier, with
+        entries kept for ``GENERATION_CACHE_TTL`` seconds.
+        ``GENERATION_RATE_LIMIT`` caps upstream calls per second,
+        ``GENERATION_MAX_CONCURRENCY`` upstream calls in flight (default
+        ``DEFAULT_MAX_CONCURRENCY``), and ``GENERATION_TIMEOUT`` the seconds
+        a request waits for its message (default ``DEFAULT_TIMEOUT``). Set
+        either of the last two to 0 to lift the limit.
+        """
+        cache_dir = os.environ.get("GENERATION_CACHE_DIR")
+        disk = None
+        if cache_dir:
+            ttl = float(os.environ.get("GENERATION_CACHE_TTL", 7 * 24 * 3600))
+            disk = DiskCache(cache_dir, ttl)
+        rate = os.environ.get("GENERATION_RATE_LIMIT")
+        max_concurrency = int(
+            os.environ.get("GENERATION_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY)
+        )
+        timeout = float(os.environ.get("GENERATION_TIMEOUT", DEFAULT_TIMEOUT))
+        return cls(
+            client_from_env(),
+            cache_size=int(os.environ.get("GENERATION_CACHE_SIZE", 1024)),
+            disk=disk,
+            limiter=RateLimiter(float(rate)) if rate else None,
+            max_concurrency=max_concurrency or None,
+            timeout=timeout or None,
+        )
+
+    def key(self, prompt: str) -> str:
+        """Return the cache key of a prompt."""
+        raw = f"{self.client.model}\0{self.max_tokens}\0{prompt}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def generate(self, prompt: str, timeout: Optional[float] = None) -> str:
+        """
+        Generate a message, from cache when possible.
+
+        Args:
+            prompt: Prompt text
+            timeout: Seconds to wait, overriding the generator's timeout
+
+        Returns:
+            The generated message
+
+        Raises:
+            GenerationTimeout: If the message is not ready in time. The
+                upstream call carries on and caches its result.
+        """
+        requests_total = registry.counter(
+            "generation_requests_total", "Message generation requests by where the text came from"
+        )
+        key = self.key(prompt)
+        text = self.memory.get(key)
+        if text is not None:
+            requests_total.inc(result="memory")
+            return text
+
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                # A leader may have finished since the lookup above
+                text = self.memory.get(key)
+                if text is None:
+                    future = self._inflight[key] = Future()
+        if text is not None:
+            requests_total.inc(result="memory")
+            return text
+        if not leader:
+            requests_total.inc(result="coalesced")
+        elif self._pool is None:
+            self._resolve(key, prompt, future)
+        else:
+            self._pool.submit(self._resolve, key, prompt, future)
+
+        try:
+            return future.result(timeout if timeout is not None else self.timeout)
+        except FuturesTimeout:
+            requests_total.inc(result="timeout")
+            raise GenerationTimeout(f"No message after {timeout or self.timeout}s") from None
+
+    def _resolve(self, key: str, prompt: str, future: Future) -> None:
+        """Fetch a missed prompt from disk or upstream and publish it to its waiters."""
+        requests_total = registry.counter(
+            "generation_requests_total", "Message generation requests by where the text came from"
+        )
+        try:
+            text = self.disk.get(key) if self.disk is not None else None
+            if text is not None:
+                requests_total.inc(result="disk")
+            else:
+                if self.limiter is not None:
+                    self.limiter.acquire()
+                started = time.perf_counter()
+                text = self.client.complete(prompt, self.max_tokens)
+                registry.histogram(
+                    "generation_upstream_seconds", "LLM backend latency"
+                ).observe(time.perf_counter() - started, model=self.client.model)
+                requests_total.inc(result="upstream")
+                if self.disk is not None:
+                    self.disk.set(key, text)
+            # Cached before the in-flight entry goes; callers that find no
+            # entry look in the cache again under the lock, so none misses both
+            self.memory.set(key, text)
+            future.set_result(text)
+        except Exception as e:
+            requests_total.inc(result="error")
+            logger.warning(f"Message generation failed: {e}")
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def close(self) -> None:
+        """Stop the upstream worker pool, if any, after its queued calls."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
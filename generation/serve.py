@@ -0,0 +1,146 @@
+"""Production serving for the message web app.
+
+Flask's development server handles each connection on a new thread with
+no upper bound and runs the debugger. ``PooledWSGIServer`` serves a WSGI
+app from a fixed pool of ``workers`` threads instead. A connection is
+only accepted once a worker is free, so connections beyond that wait in
+the kernel's listen backlog rather than in an in-process queue. The ``MessageGenerator`` separately
+bounds upstream LLM calls (``GENERATION_MAX_CONCURRENCY``) and how long a
+request waits for one (``GENERATION_TIMEOUT``, answered with a 504), so a
+slow backend cannot hold every worker for long. Clients that stall while
+sending a request are dropped after ``request_timeout`` seconds.
+
+    LLM_BACKEND=stub python -m generation.serve --port 8000 --workers 32
+
+The app can also run under any WSGI server, e.g.
+``gunicorn -k gthread --threads 32 app:app``.
+"""
+
+import argparse
+import logging
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Tuple
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 32
+DEFAULT_REQUEST_TIMEOUT = 30.0
+
+
+class QuietHandler(WSGIRequestHandler):
+    """Request handler that logs through ``logging`` at DEBUG level."""
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug("%s - " + format, self.address_string(), *args)
+
+
+class PooledWSGIServer(WSGIServer):
+    """A WSGI server handling connections on a bounded thread pool."""
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        app: Callable,
+        workers: int = DEFAULT_WORKERS,
+        request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+        backlog: int = 1024,
+    ):
+        """
+        Bind the server.
+
+        Args:
+            address: Host and port (port 0 picks a free one)
+            app: WSGI application
+            workers: Requests handled at once
+            request_timeout: Seconds a client may take to send its request
+            backlog: Connections queued by the kernel while workers are busy
+        """
+        self.request_queue_size = backlog
+        handler = type("Handler", (QuietHandler,), {"timeout": request_timeout})
+        super().__init__(address, handler)
+        self.set_app(app)
+        self.workers = workers
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="http")
+        # One slot per worker, taken before accepting and freed after handling
+        self._slots = threading.BoundedSemaphore(workers)
+
+    @property
+    def url(self) -> str:
+        """Base URL of the server."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def get_request(self) -> Tuple[Any, Any]:
+        # Wait for a free worker before accepting, so the socket is never
+        # queued in the pool where ``request_timeout`` does not apply yet
+        self._slots.acquire()
+        try:
+            return super().get_request()
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def process_request(self, request: Any, client_address: Any) -> None:
+        try:
+            self._pool.submit(self._handle, request, client_address)
+        except RuntimeError:
+            # The pool is shut down
+            self._slots.release()
+            self.shutdown_request(request)
+
+    def _handle(self, request: Any, client_address: Any) -> None:
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._slots.release()
+
+    def server_close(self) -> None:
+        super().server_close()
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+
+def serve(
+    app: Callable,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    workers: int = DEFAULT_WORKERS,
+    request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+) -> None:
+    """Serve a WSGI app on a worker pool until interrupted."""
+    server = PooledWSGIServer((host, port), app, workers, request_timeout)
+    logger.info(f"Serving on {server.url} with {workers} workers")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entrypoint: ``python -m generation.serve [--port N] [--workers N]``."""
+    parser = argparse.ArgumentParser(description="Serve the message web app")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help="Requests handled at once")
+    parser.add_argument("--request-timeout", type=float, default=DEFAULT_REQUEST_TIMEOUT,
+                        help="Seconds a client may take to send its request")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(message)s")
+    from app import app
+
+    serve(app, args.host, args.port, args.workers, args.request_timeout)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,274 @@
+"""Precompiled message templates with an LLM fallback.
+
+Most outreach is formulaic, so messages are first rendered from templates
+chosen by segment: intent, decision maker role and funding stage. A
+template file looks like:
+
+    personalized:            # segments that always go to the LLM
+      - {intent: asking for referral, role: ceo}
+    templates:
+      - id: advice_cto_seed
+        intent: asking for advice
+        role: cto            # optional; omitted matches any role
+        stage: seed          # optional; omitted matches any stage
+        text: "Hi {first_name}, congrats on {company}'s {stage_name} round..."
+
+Templates are parsed once at load: their placeholders are checked against
+``FIELDS`` and stored as format strings, so rendering is one dict lookup
+per segment key and a ``str.format_map`` (a few microseconds). The most
+specific segment wins. Within a segment, the first template whose
+placeholders all have values is used, so a variant using ``{alumni}`` can
+precede a generic one. The LLM is called only for personalized segments
+and when no template renders.
+"""
+
+import logging
+import os
+import string
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple, Union
+
+import yaml
+
+from common.metrics import registry
+from generation.generator import MessageGenerator, build_prompt
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TEMPLATES = Path(__file__).resolve().parents[1] / "configs" / "dev" / "templates.yaml"
+
+# Placeholders a template may use
+FIELDS = frozenset({
+    "name", "first_name", "last_name", "title", "experience", "company",
+    "role", "stage", "stage_name", "intent", "alumni",
+})
+
+# Funding round type columns of collector records (see collector.predicates.FIELDS)
+ROUND_TYPE_COLUMNS = ("properties.last_funding_type", "last_funding_type")
+
+
+class Template(NamedTuple):
+    """A compiled template."""
+
+    id: str
+    text: str
+    fields: Tuple[str, ...]
+
+
+class Composed(NamedTuple):
+    """A message and how it was produced."""
+
+    text: str
+    source: str
+    reason: str
+    template: Optional[str] = None
+
+
+def _key(value: Any) -> Optional[str]:
+    """Normalize a segment value: "Series A" and "series-a" both become "series_a"."""
+    if not isinstance(value, str) or not value.strip():
+        return None
+    return "_".join(value.strip().lower().replace("-", " ").split())
+
+
+def segment_values(
+    company: Mapping[str, Any], decision_maker: Mapping[str, Any], intent: str
+) -> Dict[str, str]:
+    """
+    Build template values from a collector record and one of its decision makers.
+
+    Args:
+        company: Company record
+        decision_maker: Decision maker, as extracted (or a ``Contact`` dict)
+        intent: Message intent
+
+    Returns:
+        Values for ``FIELDS``; missing ones are empty strings
+    """
+    name = decision_maker.get("name") or decision_maker.get("full_name") or ""
+    name = " ".join(str(name).split())
+    first, _, last = name.partition(" ")
+    stage = next(
+        (company[c] for c in ROUND_TYPE_COLUMNS if isinstance(company.get(c), str)), ""
+    )
+    title = decision_maker.get("title") or ""
+    return {
+        "name": name,
+        "first_name": decision_maker.get("first_name") or first,
+        "last_name": decision_maker.get("last_name") or last,
+        "title": title,
+        "experience": title,
+        "company": (
+            decision_maker.get("company_name") or company.get("name")
+            or company.get("company_name") or ""
+        ),
+        "role": decision_maker.get("role") or "",
+        "stage": _key(stage) or "",
+        "stage_name": stage.replace("_", " ").title() if stage else "",
+        "intent": intent,
+        "alumni": "",
+    }
+
+
+def compile_template(template_id: str, text: str) -> Template:
+    """
+    Parse a template once.
+
+    Raises:
+        ValueError: If it uses an unknown placeholder or a format spec
+    """
+    fields = []
+    for _, field, spec, conversion in string.Formatter().parse(text):
+        if field is None:
+            continue
+        if field not in FIELDS or spec or conversion:
+            raise ValueError(f"Template {template_id}: unsupported placeholder {{{field}}}")
+        if field not in fields:
+            fields.append(field)
+    return Template(template_id, text, tuple(fields))
+
+
+class TemplateSet:
+    """Compiled templates and personalized segments, indexed by segment."""
+
+    def __init__(
+        self,
+        templates: Iterable[Mapping[str, Any]] = (),
+        personalized: Iterable[Mapping[str, Any]] = (),
+    ):
+        """
+        Compile templates.
+
+        Args:
+            templates: Entries with ``text``, ``intent`` and optional ``id``,
+                ``role`` and ``stage``
+            personalized: Segments (``intent`` with optional ``role`` and
+                ``stage``) that always go to the LLM
+        """
+        self.templates: Dict[Tuple, List[Template]] = {}
+        for i, entry in enumerate(templates):
+            segment = tuple(_key(entry.get(k)) for k in ("intent", "role", "stage"))
+            template = compile_template(str(entry.get("id") or f"template_{i}"), entry["text"])
+            self.templates.setdefault(segment, []).append(template)
+        self.personalized = {
+            tuple(_key(s.get(k)) for k in ("intent", "role", "stage")) for s in personalized
+        }
+
+    def __len__(self) -> int:
+        return sum(len(t) for t in self.templates.values())
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "TemplateSet":
+        """Load a template file."""
+        with open(path, encoding="utf-8") as f:
+            config = yaml.safe_load(f) or {}
+        templates = cls(config.get("templates") or [], config.get("personalized") or [])
+        logger.info(f"Loaded {len(templates)} message templates from {path}")
+        return templates
+
+    @classmethod
+    def from_env(cls) -> "TemplateSet":
+        """
+        Load ``MESSAGE_TEMPLATES`` (default ``configs/dev/templates.yaml``).
+
+        Set it to an empty string to send every message to the LLM.
+        """
+        path = os.environ.get("MESSAGE_TEMPLATES", str(DEFAULT_TEMPLATES))
+        if not path or not Path(path).exists():
+            return cls()
+        return cls.load(path)
+
+    @staticmethod
+    def _segments(values: Mapping[str, Any]) -> List[Tuple]:
+        """Segment keys of a message, most specific first."""
+        intent = _key(values.get("intent"))
+        role, stage = _key(values.get("role")), _key(values.get("stage"))
+        return [
+            (intent, role, stage), (intent, role, None), (intent, None, stage), (intent, None, None)
+        ]
+
+    def render(self, values: Mapping[str, Any]) -> Tuple[Optional[Template], Optional[str], str]:
+        """
+        Render the best matching template.
+
+        Args:
+            values: Template values (see ``segment_values``)
+
+        Returns:
+            The template and text, or None for both, and the reason:
+            ``template``, ``personalized``, ``no_template`` or ``missing_fields``
+        """
+        segments = self._segments(values)
+        if self.personalized and any(s in self.personalized for s in segments):
+            return None, None, "personalized"
+        reason = "no_template"
+        for segment in segments:
+            for template in self.templates.get(segment, ()):
+                if all(values.get(field) for field in template.fields):
+                    return template, template.text.format_map(values), "template"
+                reason = "missing_fields"
+        return None, None, reason
+
+
+class MessageComposer:
+    """Render messages from templates, falling back to the LLM."""
+
+    def __init__(self, generator: MessageGenerator, templates: Optional[TemplateSet] = None):
+        """
+        Initialize the composer.
+
+        Args:
+            generator: LLM generator for the fallback
+            templates: Templates (None sends everything to the LLM)
+        """
+        self.generator = generator
+        self.templates = templates or TemplateSet()
+
+    def compose(self, values: Mapping[str, Any]) -> Composed:
+        """
+        Produce one message.
+
+        Args:
+            values: Template values; the LLM prompt uses ``name``,
+                ``company``, ``experience``, ``intent``, ``alumni`` and ``age``
+
+        Returns:
+            The message with its source (``template`` or ``llm``)
+        """
+        template, text, reason = self.templates.render(values)
+        if template is not None:
+            composed = Composed(text, "template", reason, template.id)
+        else:
+            composed = Composed(self.generator.generate(build_prompt(values)), "llm", reason)
+        registry.counter(
+            "generation_messages_total", "Messages by source and routing reason"
+        ).inc(source=composed.source, reason=reason)
+        return composed
+
+
+class MixReport:
+    """Template vs. LLM counts of a batch of messages."""
+
+    def __init__(self):
+        self.sources: Counter = Counter()
+        self.reasons: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def add(self, composed: Composed) -> None:
+        """Count a message; safe to call from worker threads."""
+        with self._lock:
+            self.sources[composed.source] += 1
+            self.reasons[composed.reason] += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return counts per source, the template share and LLM reasons."""
+        total = sum(self.sources.values())
+        return {
+            "template": self.sources["template"],
+            "llm": self.sources["llm"],
+            "template_share": round(self.sources["template"] / total, 4) if total else 0.0,
+            "llm_reasons": {r: n for r, n in self.reasons.items() if r != "template"},
+        }
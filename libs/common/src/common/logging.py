@@ -1,46 +1,220 @@
 """Logging utilities for AutoOutreach."""
 
+import atexit
+import json
 import logging
 import logging.config
+import logging.handlers
 import os
+import queue
 import sys
+import threading
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
+
+from common.ratelimit import TokenBucket
+
+
+# Attributes every LogRecord has; anything else was passed via ``extra=``.
+_RESERVED_RECORD_ATTRS = frozenset(
+    vars(logging.LogRecord("", 0, "", 0, "", (), None)).keys()
+) | {"message", "asctime"}
+
+# Listener draining the log queue, if queue mode is active.
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Format log records as single-line JSON objects."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        """
+        Render a log record as JSON.
+
+        Args:
+            record: The log record to format
+
+        Returns:
+            JSON string with timestamp, level, logger, message and any extras
+        """
+        payload: Dict[str, Any] = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_RECORD_ATTRS and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Token-bucket rate limiter for repetitive log messages.
+
+    Records are bucketed by logger name and unformatted message, so hot loops
+    should log with lazy ``%s`` arguments rather than f-strings. Records at or
+    above ``max_level`` always pass. When a bucket recovers, the next record is
+    annotated with the number of messages that were dropped in between.
+    """
+
+    def __init__(
+        self,
+        rate: float = 1.0,
+        burst: int = 10,
+        max_level: int = logging.WARNING,
+    ):
+        """
+        Initialize the filter.
+
+        Args:
+            rate: Tokens refilled per second for each message bucket
+            burst: Maximum number of records emitted back-to-back per bucket
+            max_level: Records at or above this level are never rate limited
+        """
+        super().__init__()
+        self._buckets: Dict[Tuple[str, Any], TokenBucket] = {}
+        self._suppressed: Dict[Tuple[str, Any], int] = {}
+        self._lock = threading.Lock()
+        self.rate = rate
+        self.burst = burst
+        self.max_level = max_level
+
+    @property
+    def rate(self) -> float:
+        """Tokens refilled per second for each message bucket."""
+        return self._rate
+
+    @rate.setter
+    def rate(self, rate: float) -> None:
+        # Applies to the buckets already in use too
+        with self._lock:
+            self._rate = rate
+            for bucket in self._buckets.values():
+                bucket.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Return True if the record should be emitted."""
+        if record.levelno >= self.max_level:
+            return True
+
+        key = (record.name, record.msg)
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = TokenBucket(self.rate, self.burst)
+            if not bucket.try_acquire():
+                self._suppressed[key] = self._suppressed.get(key, 0) + 1
+                return False
+            suppressed = self._suppressed.pop(key, 0)
+
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+
+class SampleFilter(logging.Filter):
+    """Emit only every ``n``-th record per logger and message template."""
+
+    def __init__(self, every: int = 100, max_level: int = logging.WARNING):
+        """
+        Initialize the filter.
+
+        Args:
+            every: Emit one record out of every ``every``
+            max_level: Records at or above this level are never sampled
+        """
+        super().__init__()
+        self.every = max(1, every)
+        self.max_level = max_level
+        self._counts: Dict[Tuple[str, Any], int] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Return True if the record should be emitted."""
+        if record.levelno >= self.max_level:
+            return True
+
+        key = (record.name, record.msg)
+        with self._lock:
+            count = self._counts.get(key, 0)
+            self._counts[key] = count + 1
+        return count % self.every == 0
+
+
+class _SuppressedCountFormatter(logging.Formatter):
+    """Text formatter that appends the rate limiter's suppressed count."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        message = super().format(record)
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            message += f" ({suppressed} similar messages suppressed)"
+        return message
 
 
 def configure_logging(
     log_level: str = "INFO",
     log_file: Optional[str] = None,
     log_format: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    json_format: bool = False,
+    use_queue: bool = True,
+    rate_limit: Optional[float] = None,
+    rate_limit_burst: int = 10,
+    sample_every: Optional[int] = None,
 ) -> None:
     """
     Configure logging for the application.
-    
+
+    In queue mode (the default) the root logger only enqueues records, and a
+    background ``QueueListener`` thread performs the console and file writes.
+    The listener is stopped, and the queue drained, at interpreter exit or
+    when :func:`shutdown_logging` is called.
+
     Args:
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         log_file: Path to log file, if None logs only to console
         log_format: Format string for log messages
+        json_format: Emit one JSON object per line instead of ``log_format``
+        use_queue: Perform handler I/O on a background thread
+        rate_limit: If set, messages below WARNING are limited to this many
+            per second for each logger and message template
+        rate_limit_burst: Number of messages allowed back-to-back before the
+            rate limit applies
+        sample_every: If set, only one in this many messages below WARNING
+            is kept for each logger and message template
     """
+    global _listener
+
+    # Flush and stop any listener left over from a previous configuration.
+    shutdown_logging()
+
     handlers = {"console": {"class": "logging.StreamHandler", "stream": sys.stdout}}
-    
+
     if log_file:
         log_path = Path(log_file)
         log_path.parent.mkdir(parents=True, exist_ok=True)
-        
+
         handlers["file"] = {
             "class": "logging.FileHandler",
             "filename": str(log_path),
             "mode": "a",
         }
-    
+
     config = {
         "version": 1,
         "disable_existing_loggers": False,
         "formatters": {
             "standard": {
-                "format": log_format,
+                "()": _SuppressedCountFormatter,
+                "fmt": log_format,
                 "datefmt": "%Y-%m-%d %H:%M:%S",
             },
+            "json": {"()": JsonFormatter},
         },
         "handlers": handlers,
         "loggers": {
@@ -54,12 +228,60 @@ def configure_logging(
             "urllib3": {"level": "WARNING"},
         },
     }
-    
+
     # Update handler formatters
     for handler in handlers.keys():
-        handlers[handler]["formatter"] = "standard"
-    
+        handlers[handler]["formatter"] = "json" if json_format else "standard"
+
     logging.config.dictConfig(config)
-    
+
+    root = logging.getLogger()
+    filters = []
+    if sample_every is not None:
+        filters.append(SampleFilter(every=sample_every))
+    if rate_limit is not None:
+        filters.append(RateLimitFilter(rate=rate_limit, burst=rate_limit_burst))
+
+    if use_queue:
+        # Move the configured handlers behind a queue so callers never block
+        # on stream or file I/O.
+        io_handlers = list(root.handlers)
+        log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        for log_filter in filters:
+            queue_handler.addFilter(log_filter)
+        for handler in io_handlers:
+            root.removeHandler(handler)
+        root.addHandler(queue_handler)
+        _listener = logging.handlers.QueueListener(
+            log_queue, *io_handlers, respect_handler_level=True
+        )
+        _listener.start()
+    else:
+        for handler in root.handlers:
+            for log_filter in filters:
+                handler.addFilter(log_filter)
+
     logger = logging.getLogger(__name__)
-    logger.debug("Logging configured successfully") 
\ No newline at end of file
+    logger.debug("Logging configured successfully")
+
+
+def shutdown_logging() -> None:
+    """
+    Stop the background listener, flushing every queued record.
+
+    Safe to call more than once; registered to run at interpreter exit.
+    """
+    global _listener
+
+    if _listener is None:
+        return
+    listener, _listener = _listener, None
+    # stop() enqueues a sentinel and joins the thread, so every record queued
+    # before this call is written out first.
+    listener.stop()
+    for handler in listener.handlers:
+        handler.flush()
+
+
+atexit.register(shutdown_logging)
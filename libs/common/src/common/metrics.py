@@ -0,0 +1,320 @@
+"""In-process metrics with JSON and Prometheus textfile export."""
+
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Any
+
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+# Default histogram buckets, in seconds, for request and stage latencies
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Sequence[Tuple[str, str]] = ()) -> str:
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (
+        (k, v.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"'))
+        for k, v in pairs
+    )
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class _Metric:
+    """Base class for a named metric family with optional labels."""
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, description: str = ""):
+        self.name = name
+        self.description = description
+        self._lock = threading.Lock()
+        self._values: Dict[LabelKey, Any] = {}
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Return a JSON-serializable view of every label set."""
+        with self._lock:
+            return [
+                {"labels": dict(key), **self._snapshot_value(value)}
+                for key, value in self._values.items()
+            ]
+
+    def _snapshot_value(self, value: Any) -> Dict[str, Any]:
+        return {"value": value}
+
+    def prometheus_lines(self) -> List[str]:
+        """Render the metric in the Prometheus text exposition format."""
+        lines = []
+        if self.description:
+            lines.append(f"# HELP {self.name} {self.description}")
+        lines.append(f"# TYPE {self.name} {self.type_name}")
+        with self._lock:
+            for key, value in self._values.items():
+                lines.extend(self._prometheus_samples(key, value))
+        return lines
+
+    def _prometheus_samples(self, key: LabelKey, value: Any) -> List[str]:
+        return [f"{self.name}{_format_labels(key)} {_format_value(value)}"]
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    type_name = "counter"
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        """
+        Increment the counter.
+
+        Args:
+            amount: Amount to add (must be non-negative)
+            **labels: Label values identifying the series
+        """
+        if amount < 0:
+            raise ValueError("Counters can only be incremented")
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: Any) -> float:
+        """Return the current value for a label set."""
+        with self._lock:
+            return self._values.get(_label_key(labels), 0)
+
+
+class Gauge(_Metric):
+    """Value that can go up and down."""
+
+    type_name = "gauge"
+
+    def set(self, value: float, **labels: Any) -> None:
+        """Set the gauge for a label set."""
+        with self._lock:
+            self._values[_label_key(labels)] = value
+
+    def value(self, **labels: Any) -> Optional[float]:
+        """Return the current value for a label set."""
+        with self._lock:
+            return self._values.get(_label_key(labels))
+
+
+class Histogram(_Metric):
+    """Distribution of observations in cumulative buckets."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str = "",
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, description)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, **labels: Any) -> None:
+        """
+        Record an observation.
+
+        Args:
+            value: Observed value
+            **labels: Label values identifying the series
+        """
+        key = _label_key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {
+                    "counts": [0] * len(self.buckets),
+                    "count": 0,
+                    "sum": 0.0,
+                    "min": value,
+                    "max": value,
+                }
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state["counts"][i] += 1
+                    break
+            state["count"] += 1
+            state["sum"] += value
+            state["min"] = min(state["min"], value)
+            state["max"] = max(state["max"], value)
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        """Observe the wall-clock duration of the ``with`` block in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _snapshot_value(self, value: Dict[str, Any]) -> Dict[str, Any]:
+        count = value["count"]
+        return {
+            "count": count,
+            "sum": value["sum"],
+            "min": value["min"],
+            "max": value["max"],
+            "mean": value["sum"] / count if count else 0.0,
+            "p50": self._quantile(value, 0.5),
+            "p95": self._quantile(value, 0.95),
+        }
+
+    def _quantile(self, value: Dict[str, Any], q: float) -> float:
+        """Estimate a quantile as the upper bound of the bucket containing it."""
+        target = q * value["count"]
+        running = 0
+        for bound, count in zip(self.buckets, value["counts"]):
+            running += count
+            if running >= target:
+                return value["max"] if math.isinf(bound) else min(bound, value["max"])
+        return value["max"]
+
+    def _prometheus_samples(self, key: LabelKey, value: Dict[str, Any]) -> List[str]:
+        lines = []
+        running = 0
+        for bound, count in zip(self.buckets, value["counts"]):
+            running += count
+            le = (("le", _format_value(bound)),)
+            lines.append(f"{self.name}_bucket{_format_labels(key, le)} {running}")
+        lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(value['sum'])}")
+        lines.append(f"{self.name}_count{_format_labels(key)} {value['count']}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metrics for one process or run."""
+
+    def __init__(self, namespace: str = ""):
+        """
+        Initialize the registry.
+
+        Args:
+            namespace: Prefix added to every metric name (e.g. "collector")
+        """
+        self.namespace = namespace
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls: type, name: str, description: str, **kwargs: Any) -> Any:
+        full_name = f"{self.namespace}_{name}" if self.namespace else name
+        with self._lock:
+            metric = self._metrics.get(full_name)
+            if metric is None:
+                metric = self._metrics[full_name] = cls(full_name, description, **kwargs)
+            elif not isinstance(metric, cls):
+                raise TypeError(f"Metric {full_name} already registered as {metric.type_name}")
+            return metric
+
+    def counter(self, name: str, description: str = "") -> Counter:
+        """Return the counter ``name``, creating it on first use."""
+        return self._get_or_create(Counter, name, description)
+
+    def gauge(self, name: str, description: str = "") -> Gauge:
+        """Return the gauge ``name``, creating it on first use."""
+        return self._get_or_create(Gauge, name, description)
+
+    def histogram(
+        self,
+        name: str,
+        description: str = "",
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Return the histogram ``name``, creating it on first use."""
+        return self._get_or_create(Histogram, name, description, buckets=buckets)
+
+    def timer(self, name: str, description: str = "", **labels: Any):
+        """
+        Time a block into the histogram ``name`` (in seconds).
+
+        Example:
+            with registry.timer("stage_seconds", stage="filter"):
+                ...
+        """
+        return self.histogram(name, description).time(**labels)
+
+    def reset(self) -> None:
+        """Drop every registered metric (e.g. between daemon cycles)."""
+        with self._lock:
+            self._metrics.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a JSON-serializable view of every metric."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {
+            metric.name: {
+                "type": metric.type_name,
+                "description": metric.description,
+                "series": metric.snapshot(),
+            }
+            for metric in metrics
+        }
+
+    def to_prometheus(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.prometheus_lines())
+        return "\n".join(lines) + "\n"
+
+    def write_json_report(self, path: Path, **extra: Any) -> None:
+        """
+        Write a JSON report with the metric snapshot and any extra fields.
+
+        Args:
+            path: Destination file
+            **extra: Additional top-level fields (run metadata, status, ...)
+        """
+        report = dict(extra)
+        report["metrics"] = self.snapshot()
+        _atomic_write(Path(path), json.dumps(report, indent=2, default=str))
+
+    def write_prometheus_textfile(self, path: Path) -> None:
+        """
+        Write metrics for node_exporter's textfile collector.
+
+        The file is written to a temporary name and renamed into place so the
+        exporter never scrapes a partial file.
+        """
+        _atomic_write(Path(path), self.to_prometheus())
+
+
+def _atomic_write(path: Path, content: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(content)
+        # mkstemp creates 0600; exporters often run as another user
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+
+# Process-wide default registry, in the spirit of prometheus_client.REGISTRY.
+registry = MetricsRegistry()
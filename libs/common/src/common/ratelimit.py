@@ -0,0 +1,75 @@
+"""Token bucket rate limiting.
+
+A ``TokenBucket`` holds up to ``burst`` tokens and refills at ``rate``
+tokens per second. Callers either take a token only if one is available
+(``try_acquire``, for dropping work such as repetitive log records) or
+reserve one and wait for it (``acquire``, for pacing requests). A
+reservation may take the bucket into debt, so concurrent waiters get
+successive slots and are served in order.
+"""
+
+import threading
+import time
+
+
+class TokenBucket:
+    """A token bucket shared by every caller. Thread-safe."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Initialize a full bucket.
+
+        Args:
+            rate: Tokens refilled per second
+            burst: Tokens the bucket holds, i.e. calls allowed back-to-back
+                after an idle period
+        """
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> bool:
+        """
+        Take a token if one is available, without waiting.
+
+        Returns:
+            True if a token was taken
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    def reserve(self) -> float:
+        """
+        Take a token, going into debt if none is available.
+
+        Returns:
+            Seconds until the reserved token is due
+        """
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+    def acquire(self) -> float:
+        """
+        Wait for a token.
+
+        Returns:
+            Seconds waited
+        """
+        wait = self.reserve()
+        # Sleeping outside the lock lets other callers reserve later slots
+        if wait:
+            time.sleep(wait)
+        return wait
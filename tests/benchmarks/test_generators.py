@@ -0,0 +1,79 @@
+"""Tests for the benchmark data generators and regression check."""
+
+from datetime import date
+
+import pandas as pd
+
+from benchmarks import generators
+from benchmarks.__main__ import compare
+from collector.extractors import DecisionMakerExtractor
+from collector.sources.sec import _parse_idx_file
+
+
+def test_generators_are_deterministic():
+    """Test that the same seed always yields the same data."""
+    assert generators.generate_master_idx(100, seed=7) == generators.generate_master_idx(100, seed=7)
+    assert generators.generate_master_idx(100, seed=7) != generators.generate_master_idx(100, seed=8)
+    assert generators.generate_companies(20, seed=1) == generators.generate_companies(20, seed=1)
+    assert (generators.generate_crunchbase_page(2, 250, seed=3)
+            == generators.generate_crunchbase_page(2, 250, seed=3))
+
+
+def test_master_idx_round_trips_through_parser():
+    """Test that every generated line is readable by the SEC parser."""
+    content = generators.generate_master_idx(500, seed=1, index_date=date(2023, 2, 1))
+
+    filings = _parse_idx_file(content, generators.FORM_TYPES)
+
+    assert len(filings) == 500
+    assert all(f["filing_date"] == "20230201" for f in filings)
+    assert all(f["file_name"].endswith(".txt") for f in filings)
+
+
+def test_crunchbase_pages_cover_total_items():
+    """Test paging through a generated search result."""
+    pages = [generators.generate_crunchbase_page(p, 250) for p in (1, 2, 3, 4)]
+
+    assert [len(p["data"]["items"]) for p in pages] == [100, 100, 50, 0]
+    df = pd.json_normalize(pages[0]["data"]["items"])
+    assert "properties.identifier.value" in df.columns
+    assert "headquarters" in df.columns
+
+
+def test_generated_companies_yield_decision_makers():
+    """Test that generated companies exercise the extractor."""
+    extractor = DecisionMakerExtractor()
+    companies = generators.generate_companies(200, seed=5)
+
+    found = sum(1 for c in companies if extractor.extract_decision_makers(c))
+
+    assert 0 < found < len(companies)
+
+
+def test_compare_flags_regressions():
+    """Test that only drops beyond the thresholds are reported."""
+    baseline = {"a": {"items_per_second": 100.0, "peak_bytes": 1000},
+                "b": {"items_per_second": 100.0, "peak_bytes": 1000}}
+    results = {"a": {"items_per_second": 80.0, "peak_bytes": 1050, "unit": "rows"},
+               "b": {"items_per_second": 60.0, "peak_bytes": 1500, "unit": "rows"}}
+
+    regressions = compare(
+        results, baseline, threshold=0.25, memory_threshold=0.10, memory_floor=0
+    )
+
+    assert len(regressions) == 2
+    assert all(r.startswith("b:") for r in regressions)
+
+
+def test_compare_ignores_small_memory_growth():
+    """Test that peak-memory growth under the floor is noise, however large relatively."""
+    baseline = {"small": {"items_per_second": 100.0, "peak_bytes": 2561},
+                "large": {"items_per_second": 100.0, "peak_bytes": 8 * 2**20}}
+    results = {"small": {"items_per_second": 100.0, "peak_bytes": 2900, "unit": "rows"},
+               "large": {"items_per_second": 100.0, "peak_bytes": 10 * 2**20, "unit": "rows"}}
+
+    regressions = compare(results, baseline, threshold=0.25, memory_threshold=0.10)
+
+    assert regressions == [
+        "large: peak memory 10.0 MiB is 25% (+2.0 MiB) above baseline 8.0 MiB"
+    ]
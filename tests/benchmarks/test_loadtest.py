@@ -0,0 +1,45 @@
+"""Tests for the message app load test."""
+
+from benchmarks.loadtest import LoadResult, forms, run_local
+
+
+def test_forms_draw_from_distinct_pool():
+    """Test that ``distinct`` bounds the number of different submissions."""
+    submissions = forms(200, 10)
+
+    assert len(submissions) == 200
+    assert len({tuple(sorted(f.items())) for f in submissions}) <= 10
+    assert forms(50, 10, seed=1) == forms(50, 10, seed=1)
+
+
+def test_summary_percentiles():
+    """Test percentile and throughput arithmetic."""
+    result = LoadResult(latencies=[i / 1000 for i in range(1, 101)], seconds=2.0)
+    result.statuses[200] = 100
+
+    summary = result.summary()
+
+    assert summary["throughput"] == 50.0
+    assert summary["p50_ms"] == 51.0 and summary["p99_ms"] == 100.0
+    assert summary["statuses"] == {"200": 100}
+
+
+def test_summary_mixes_errors_and_status_codes():
+    """Test that connection errors and HTTP statuses are reported side by side."""
+    result = LoadResult(latencies=[0.1, 0.2, 0.3], seconds=1.0)
+    result.statuses.update({200: 1, "504": 1, "error": 1})
+
+    assert result.summary()["statuses"] == {"200": 1, "504": 1, "error": 1}
+
+
+def test_local_run_against_stub_llm():
+    """Test a small end-to-end run with bounded upstream calls."""
+    summary = run_local(
+        forms(60, 20), concurrency=8, latency="fixed:0.02", workers=8, llm_concurrency=2,
+    )
+
+    assert summary["requests"] == 60
+    assert summary["statuses"] == {"200": 60}
+    assert summary["upstream_calls"] <= 20
+    assert summary["peak_upstream_concurrency"] <= 2
+    assert summary["p50_ms"] <= summary["p95_ms"] <= summary["p99_ms"]
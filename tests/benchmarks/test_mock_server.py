@@ -0,0 +1,91 @@
+"""Tests for the mock Crunchbase/EDGAR server."""
+
+import random
+from datetime import datetime
+
+import pandas as pd
+import requests
+
+from benchmarks.mock_server import DataConfig, FaultConfig, MockServer, parse_latency
+from collector import predicates
+from collector.sources import crunchbase, sec
+
+
+def _config(server, **overrides):
+    config = {
+        "crunchbase_api_key": "test",
+        "collection": {"rate_limit_delay": 0, "max_retries": 5},
+        "sources": {"sec": {"target_forms": ["8-K", "4"]}},
+        "start_date": datetime(2023, 1, 6),  # Friday
+        "end_date": datetime(2023, 1, 9),    # Monday
+    }
+    for name, source in server.collector_config()["sources"].items():
+        config["sources"].setdefault(name, {}).update(source)
+    config.update(overrides)
+    return config
+
+
+def test_collectors_read_from_mock_server():
+    """Test both sources end to end against the mock server."""
+    data = DataConfig(crunchbase_items=250, daily_index_lines=200)
+    with MockServer(data=data) as server:
+        config = _config(server)
+        cb_df = crunchbase.collect(config)
+        sec_df = sec.collect(config)
+        stats = server.stats.to_dict()
+
+    assert len(cb_df) == 250
+    assert "description" in cb_df.columns
+    # Friday and Monday have indexes; the weekend days return 404
+    assert set(sec_df["filing_date"]) == {pd.Timestamp("2023-01-06"), pd.Timestamp("2023-01-09")}
+    assert stats["requests"] == {"crunchbase": 3, "sec_daily": 4}
+
+
+def test_filters_are_pushed_down_to_search():
+    """Test that pushed-down filters shrink the fetch but not the filtered result."""
+    data = DataConfig(crunchbase_items=500, daily_index_lines=10)
+    with MockServer(data=data) as server:
+        config = _config(server)
+        full = crunchbase.collect(config)
+        config["collection"]["min_funding_amount"] = 50_000_000
+        config["filters"] = {"round_types": ["seed", "series_a"]}
+        pushed = crunchbase.collect(config)
+
+    expected = predicates.apply_filter(full, predicates.fetch_filter(config))
+    assert 0 < len(pushed) < len(full)
+    assert sorted(pushed["uuid"]) == sorted(expected["uuid"])
+
+
+def test_fault_injection_is_retried():
+    """Test that injected 429s with Retry-After are retried by the collector."""
+    faults = FaultConfig(rate_limit_rate=0.3, retry_after=0, seed=1)
+    data = DataConfig(crunchbase_items=250, daily_index_lines=50)
+    with MockServer(faults=faults, data=data) as server:
+        cb_df = crunchbase.collect(_config(server))
+        stats = server.stats.to_dict()
+
+    assert len(cb_df) == 250
+    assert stats["faults"]["429"] > 0
+
+
+def test_truncated_bodies_raise_client_errors():
+    """Test that truncated bodies surface as request errors."""
+    with MockServer(faults=FaultConfig(truncate_rate=1.0)) as server:
+        try:
+            requests.get(f"{server.url}/api/v4/organizations/search?page=1")
+        except requests.exceptions.RequestException:
+            pass
+        else:
+            raise AssertionError("truncated body was read without error")
+        stats = requests.get(f"{server.url}/__stats").json()
+
+    assert stats["faults"] == {"truncated": 1}
+
+
+def test_parse_latency():
+    """Test latency distribution specs."""
+    rng = random.Random(0)
+    assert parse_latency("none")(rng) == 0.0
+    assert parse_latency("fixed:0.25")(rng) == 0.25
+    assert 0.1 <= parse_latency("uniform:0.1,0.2")(rng) <= 0.2
+    assert parse_latency("lognormal:-3,0.5")(rng) > 0
@@ -0,0 +1,167 @@
+"""Tests for single-pass evaluation of many campaigns."""
+
+import json
+
+import pandas as pd
+import pytest
+
+from collector import predicates
+from collector.campaigns import CampaignSet
+from collector.config import campaign_configs, validate_config
+from collector.pipeline import process_and_save
+from common.metrics import registry
+
+
+@pytest.fixture(autouse=True)
+def fresh_registry():
+    registry.reset()
+    yield
+    registry.reset()
+
+
+def _config(tmp_path=None):
+    config = {
+        "target_locations": ["Boston"],
+        "collection": {"min_funding_amount": 1_000_000},
+        "filters": {"round_types": ["seed", "series_a"]},
+        "decision_makers": {"target_roles": ["ceo", "cto"]},
+        "campaigns": {
+            "boston": {},
+            "austin-cto": {
+                "target_locations": ["Austin"],
+                "min_funding_amount": 100_000,
+                "target_roles": ["cto"],
+            },
+            "anywhere": {"target_locations": [], "filters": {"round_types": []}},
+        },
+    }
+    if tmp_path is not None:
+        config.update(
+            output_dir=tmp_path / "raw", interim_dir=tmp_path / "interim",
+            metrics={"enabled": False},
+        )
+    return config
+
+
+def _companies():
+    return pd.DataFrame({
+        "id": ["a", "b", "c", "d"],
+        "name": ["A", "B", "C", "D"],
+        "headquarters": ["Boston, MA", "Austin, TX", "Austin, TX", "Paris"],
+        "funding_total_usd": [5_000_000, 500_000, 5_000_000, 50_000],
+        "last_funding_type": ["seed", "series_a", "series_b", "seed"],
+        "people": [
+            [{"first_name": "Ann", "last_name": "Lee", "title": "CEO"}],
+            [{"first_name": "Bo", "last_name": "Ray", "title": "CTO"}],
+            [{"first_name": "Cy", "last_name": "Ng", "title": "CEO"}],
+            [],
+        ],
+    })
+
+
+def test_campaign_configs_inherit_and_override():
+    """Test that campaigns inherit top-level settings and override their own."""
+    configs = campaign_configs(_config())
+
+    assert list(configs) == ["boston", "austin-cto", "anywhere"]
+    assert configs["boston"]["target_locations"] == ["Boston"]
+    assert configs["austin-cto"]["collection"]["min_funding_amount"] == 100_000
+    assert configs["austin-cto"]["decision_makers"]["target_roles"] == ["cto"]
+    assert configs["anywhere"]["filters"] == {"round_types": []}
+    assert "campaigns" not in configs["boston"]
+    assert campaign_configs({}) == {}
+
+
+def test_tag_marks_every_matching_campaign():
+    """Test that each kept record lists the campaigns it matches."""
+    campaigns = CampaignSet.from_config(_config())
+
+    tagged = campaigns.tag(_companies(), "crunchbase")
+
+    assert dict(zip(tagged["id"], tagged["campaigns"])) == {
+        "a": ["boston", "anywhere"],
+        "b": ["austin-cto"],
+        "c": ["anywhere"],
+    }
+    assert list(CampaignSet.select(tagged, "anywhere")["id"]) == ["a", "c"]
+    counts = registry.counter("collector_campaign_records_total")
+    assert counts.value(campaign="boston", source="crunchbase") == 1
+
+
+def test_shared_terms_are_evaluated_once(monkeypatch):
+    """Test that a term common to several filters is evaluated once per pass."""
+    calls = []
+    original = predicates.Between.test
+
+    def counting_test(self, values):
+        calls.append(self)
+        return original(self, values)
+
+    monkeypatch.setattr(predicates.Between, "test", counting_test)
+    threshold = predicates.at_least("funding_amount", 1_000_000)
+    filters = {
+        f"campaign{i}": threshold & predicates.one_of("round_type", [f"r{i}"]) for i in range(12)
+    }
+
+    masks = predicates.evaluate_many(_companies(), filters)
+
+    assert len(masks) == 12
+    assert len(calls) == 1
+
+
+def test_campaign_outputs_are_written_per_campaign(tmp_path):
+    """Test that one run writes tagged outputs plus a slice per campaign."""
+    config = _config(tmp_path)
+
+    process_and_save(config, {"crunchbase": _companies()})
+
+    interim = tmp_path / "interim"
+    combined = json.loads((interim / "companies_with_decision_makers.json").read_text())
+    assert sorted(c["company"]["id"] for c in combined) == ["a", "b", "c"]
+
+    austin = json.loads(
+        (interim / "campaigns" / "austin-cto" / "companies_with_decision_makers.json").read_text()
+    )
+    assert [c["company"]["id"] for c in austin] == ["b"]
+    assert [dm["role"] for dm in austin[0]["decision_makers"]] == ["cto"]
+
+    boston_rows = pd.read_csv(interim / "campaigns" / "boston" / "filtered_crunchbase_data.csv")
+    assert list(boston_rows["id"]) == ["a"]
+
+
+def test_fetch_filter_pushes_only_what_every_campaign_shares():
+    """Test that campaign filters are combined so no campaign loses records."""
+    config = _config()
+    config["filters"] = {"round_types": ["seed"]}
+    config["campaigns"]["anywhere"] = {}
+
+    params = predicates.pushdown(config, "crunchbase")
+
+    assert params == {"last_funding_types": "seed"}
+
+
+def test_validate_campaigns():
+    """Test that campaign names must be usable as directory names."""
+    config = {
+        "sources": {"sec": {"enabled": True}, "crunchbase": {"enabled": False}},
+        "campaigns": {"ok_name": {}, "bad/name": {}, "locs": {"target_locations": "Boston"}},
+    }
+
+    problems = validate_config(config)
+
+    assert len(problems) == 2
+    assert any("bad/name" in p for p in problems)
+    assert any("campaigns.locs.target_locations" in p for p in problems)
+
+
+def test_campaign_names_cannot_escape_the_campaigns_dir():
+    """Test that "." and ".." are rejected as campaign names."""
+    config = {
+        "sources": {"sec": {"enabled": True}, "crunchbase": {"enabled": False}},
+        "campaigns": {"..": {}, ".": {}, ".hidden": {}, "v1.2-eu": {}},
+    }
+
+    problems = validate_config(config)
+
+    assert len(problems) == 3
+    assert not any("v1.2-eu" in p for p in problems)
@@ -0,0 +1,101 @@
+"""Tests for change data capture."""
+
+import numpy as np
+import pandas as pd
+
+from collector import pipeline, sources
+from collector.cdc import ChangeCapture, FingerprintIndex, hash_rows
+
+
+def _companies(**changes):
+    rows = [
+        {"uuid": "a", "name": "Acme", "people": [{"name": "Ann"}]},
+        {"uuid": "b", "name": "Globex", "people": []},
+    ]
+    for uuid, name in changes.items():
+        rows = [dict(r, name=name) if r["uuid"] == uuid else r for r in rows]
+    return pd.DataFrame(rows)
+
+
+def test_hash_rows_handles_lists_and_column_order():
+    """Test that list cells hash and column order does not matter."""
+    df = _companies()
+
+    first = hash_rows(df, ["uuid", "name", "people"])
+    second = hash_rows(df[["people", "name", "uuid"]], ["people", "uuid", "name"])
+
+    assert first.dtype == np.uint64
+    assert (first == second).all()
+
+
+def test_classify_new_changed_unchanged(tmp_path):
+    """Test classification against the previous run."""
+    cdc = ChangeCapture(tmp_path)
+    first = cdc.delta("crunchbase", _companies())
+    cdc.commit()
+
+    incoming = pd.concat(
+        [_companies(b="Globex Corp"), pd.DataFrame([{"uuid": "c", "name": "Initech", "people": []}])],
+        ignore_index=True,
+    )
+    second = cdc.delta("crunchbase", incoming)
+
+    assert first["change_type"].tolist() == ["new", "new"]
+    assert second[["uuid", "change_type"]].values.tolist() == [["b", "changed"], ["c", "new"]]
+
+
+def test_uncommitted_runs_are_not_remembered(tmp_path):
+    """Test that the index only advances on commit."""
+    cdc = ChangeCapture(tmp_path)
+    cdc.delta("crunchbase", _companies())
+
+    assert len(ChangeCapture(tmp_path).delta("crunchbase", _companies())) == 2
+
+
+def test_full_refresh_keeps_unchanged_records(tmp_path):
+    """Test that --full-refresh passes everything on."""
+    cdc = ChangeCapture(tmp_path)
+    cdc.delta("crunchbase", _companies())
+    cdc.commit()
+
+    refreshed = ChangeCapture(tmp_path, full_refresh=True).delta("crunchbase", _companies())
+
+    assert refreshed["change_type"].tolist() == ["unchanged", "unchanged"]
+
+
+def test_index_merge_updates_and_inserts(tmp_path):
+    """Test that commits keep the index sorted, unique and last-write-wins."""
+    index = FingerprintIndex(tmp_path / "src.fp.npy")
+    index.classify(np.array([5, 1, 3], dtype=np.uint64), np.array([50, 10, 30], dtype=np.uint32))
+    index.commit()
+    index.classify(np.array([3, 4, 4], dtype=np.uint64), np.array([31, 40, 41], dtype=np.uint32))
+    index.commit()
+
+    stored = index.load()
+    assert stored["id"].tolist() == [1, 3, 4, 5]
+    assert stored["content"].tolist() == [10, 31, 41, 50]
+
+
+def test_pipeline_writes_only_delta(tmp_path):
+    """Test that a second run only writes changed records to the interim outputs."""
+    data = {"df": _companies()}
+    sources.register_source("crunchbase", lambda config: data["df"])
+    try:
+        config = {
+            "sources": {"crunchbase": {}},
+            "crunchbase_api_key": "test",
+            "output_dir": tmp_path / "raw",
+            "interim_dir": tmp_path / "interim",
+            "cdc": {"enabled": True},
+        }
+        pipeline.run_pipeline(config, cdc=ChangeCapture.from_config(config))
+        data["df"] = _companies(a="Acme Labs")
+        pipeline.run_pipeline(config, cdc=ChangeCapture.from_config(config))
+    finally:
+        sources._registered.pop("crunchbase")
+        sources._loaded.pop("crunchbase", None)
+
+    raw = pd.read_csv(tmp_path / "raw" / "crunchbase_data.csv")
+    delta = pd.read_csv(tmp_path / "interim" / "filtered_crunchbase_data.csv")
+    assert len(raw) == 2
+    assert delta[["uuid", "name", "change_type"]].values.tolist() == [["a", "Acme Labs", "changed"]]
@@ -7,7 +7,7 @@ from pathlib import Path
 import pytest
 import yaml
 
-from collector.config import load_config
+from collector.config import load_config, validate_config
 
 
 def test_load_config_with_file():
@@ -38,4 +38,40 @@ def test_load_config_with_file():
 def test_load_config_file_not_found():
     """Test error handling when config file is not found."""
     with pytest.raises(FileNotFoundError):
-        load_config("nonexistent_file.yaml") 
\ No newline at end of file
+        load_config("nonexistent_file.yaml") 
+
+def test_validate_config_reports_problems():
+    """Test that config validation catches common mistakes."""
+    config = {
+        "sources": {
+            "crunchbase": {"enabled": True},
+            "sec": {"enabled": True, "target_forms": "10-K"},
+        },
+    }
+    problems = validate_config(config)
+
+    assert any("crunchbase_api_key" in p for p in problems)
+    assert any("target_forms" in p for p in problems)
+    assert validate_config({
+        "crunchbase_api_key": "key",
+        "sources": {"crunchbase": {"enabled": True}, "sec": {"enabled": False}},
+    }) == []
+    assert validate_config({"sources": {"sec": {"enabled": False}}}) == [
+        "No sources are enabled"
+    ]
+
+
+def test_validate_config_bulk_mode():
+    """Test that bulk mode needs an export path instead of an API key."""
+    config = {"sources": {"crunchbase": {"mode": "bulk"}, "sec": {"enabled": False}}}
+
+    assert validate_config(config) == ["sources.crunchbase.bulk_path is required in bulk mode"]
+    config["sources"]["crunchbase"]["bulk_path"] = "/data/export.tar.gz"
+    assert validate_config(config) == []
+
+
+def test_validate_config_postgres_batch_rows():
+    """Test that the Postgres batch size must be a positive integer."""
+    config = {"sources": {"sec": {}}, "postgres": {"enabled": True, "batch_rows": 0}}
+
+    assert validate_config(config) == ["postgres.batch_rows must be a positive integer"]
@@ -0,0 +1,97 @@
+"""Tests for contact name normalization and deduplication."""
+
+import pandas as pd
+
+from collector.contacts import canonical_name, canonical_parts, company_key, contact_id
+from collector.extractors import DecisionMakerExtractor
+from collector.pipeline import extract_decision_makers_from_dfs
+from common.metrics import registry
+from common.types import Contact
+
+
+def test_names_reduce_to_one_key():
+    """Test unicode folding, honorifics, suffixes, ordering and middle names."""
+    variants = [
+        "José García",
+        "jose garcia",
+        "Dr. José García",
+        "García, José",
+        "Mr. García, José A., Jr.",
+        "José  A.  García PhD",
+    ]
+
+    keys = {canonical_name(v).key for v in variants}
+
+    assert keys == {"jose|garcia"}
+    assert canonical_name("García, José").full == "José García"
+    assert canonical_name("jose garcia").full == "Jose Garcia"
+    assert canonical_name("Smith, John, Jr.").full == "John Smith"
+    assert canonical_name(" ") is None
+    assert canonical_name(float("nan")) is None
+
+
+def test_name_parts_never_leave_stray_spaces():
+    """Test first and last name fields with a part missing."""
+    assert canonical_parts("John", None).full == "John"
+    assert canonical_parts("", "Smith").full == "Smith"
+    assert canonical_parts("Ms. Jane", "Doe Jr.") == canonical_name("Jane Doe")
+    assert canonical_parts(None, None) is None
+
+
+def test_contact_ids_are_stable_across_sources():
+    """Test that one company's Crunchbase and SEC records share contact IDs."""
+    crunchbase = company_key({"name": "Acme, Inc."})
+    sec = company_key({"company_name": "ACME INC"})
+    name = canonical_name("Jane Doe")
+
+    assert crunchbase == sec == "acme"
+    assert contact_id(crunchbase, name) == contact_id(sec, canonical_name("DOE, JANE"))
+    assert contact_id(crunchbase, name) != contact_id("globex", name)
+    assert company_key({"id": "u1"}) == "id:u1"
+
+
+def test_extractor_merges_people_and_team():
+    """Test that a person listed in people and team is extracted once."""
+    registry.reset()
+    company = {
+        "id": "u1",
+        "name": "Acme",
+        "people": [
+            {"first_name": "Jane", "last_name": "Doe", "title": "CEO"},
+            {"first_name": "Bob", "last_name": "", "title": "CTO"},
+        ],
+        "team": [
+            {"name": "Dr. Jane Doe", "title": "Chief Executive Officer & Founder"},
+            {"name": "Carol Ng", "title": "VP Sales"},
+        ],
+    }
+
+    decision_makers = DecisionMakerExtractor().extract_decision_makers(company)
+
+    assert [dm["name"] for dm in decision_makers] == ["Jane Doe", "Bob", "Carol Ng"]
+    assert decision_makers[0]["title"] == "CEO"
+    assert len({dm["id"] for dm in decision_makers}) == 3
+    assert registry.counter("collector_contacts_duplicates_total").value(scope="company") == 1
+    contact = Contact(**{**decision_makers[0], "full_name": decision_makers[0]["name"]})
+    assert contact.id == decision_makers[0]["id"]
+
+
+def test_extraction_dedupes_across_companies():
+    """Test that a person under two records of one company is kept once."""
+    registry.reset()
+    crunchbase = pd.DataFrame([{
+        "id": "u1", "name": "Acme Inc",
+        "people": [{"first_name": "Jane", "last_name": "Doe", "title": "CEO"}],
+    }])
+    sec = pd.DataFrame([
+        {"id": "320193", "name": "ACME INC", "team": [
+            {"name": "DOE, JANE", "title": "CEO"}, {"name": "Bob Roe", "title": "CFO"},
+        ]},
+        {"id": "1", "name": "Globex", "team": [{"name": "Jane Doe", "title": "CEO"}]},
+    ])
+
+    extracted = extract_decision_makers_from_dfs([crunchbase, sec])
+
+    names = [[dm["name"] for dm in e["decision_makers"]] for e in extracted]
+    assert names == [["Jane Doe"], ["Bob Roe"], ["Jane Doe"]]
+    assert registry.counter("collector_contacts_duplicates_total").value(scope="run") == 1
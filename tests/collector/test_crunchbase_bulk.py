@@ -0,0 +1,89 @@
+"""Tests for Crunchbase bulk export ingestion."""
+
+import tarfile
+
+import pandas as pd
+import pytest
+
+from collector.sources import crunchbase, crunchbase_bulk
+
+
+ORGS = """uuid,name,permalink,short_description,homepage_url,city,region,country_code,total_funding_usd,employee_count,updated_at
+o1,Acme,acme,Rockets,https://acme.example.com,San Francisco,California,USA,5000000,c_00011_00050,2023-01-05 10:00:00
+o2,Globex,globex,Chemicals,,Boston,,USA,,c_00001_00010,2022-06-01 10:00:00
+o3,Initech,initech,Software,,Austin,Texas,USA,100,,2023-01-06 10:00:00
+"""
+PEOPLE = """uuid,first_name,last_name,featured_job_organization_uuid,featured_job_title
+p1,Ann,Lee,o1,CEO
+p2,Bob,Ray,o1,CTO
+p3,Cy,Ng,o2,Founder
+p4,Di,Ko,,Investor
+"""
+ROUNDS = """uuid,org_uuid,investment_type,announced_on,raised_amount_usd
+r1,o1,seed,2020-01-01,1000000
+r2,o1,series_a,2022-03-01,4000000
+r3,o3,angel,2021-05-05,100
+"""
+
+
+@pytest.fixture
+def export_dir(tmp_path):
+    for name, content in (("organizations", ORGS), ("people", PEOPLE), ("funding_rounds", ROUNDS)):
+        (tmp_path / f"{name}.csv").write_text(content)
+    return tmp_path
+
+
+def _by_uuid(df):
+    return df.set_index("uuid")
+
+
+@pytest.mark.parametrize("partitions", [1, 4])
+def test_join_people_and_latest_round(export_dir, partitions):
+    """Test that people and the latest funding round are joined by UUID."""
+    df = pd.concat(crunchbase_bulk.iter_batches(export_dir, partitions=partitions))
+    orgs = _by_uuid(df)
+
+    assert sorted(orgs.index) == ["o1", "o2", "o3"]
+    assert [p["first_name"] for p in orgs.loc["o1", "people"]] == ["Ann", "Bob"]
+    assert orgs.loc["o3", "people"] == []
+    assert orgs.loc["o1", "properties.last_funding_type"] == "series_a"
+    assert pd.isna(orgs.loc["o2", "properties.last_funding_type"])
+    assert orgs.loc["o1", "funding_total_usd"] == 5_000_000
+    assert orgs.loc["o2", "headquarters"] == "Boston, USA"
+    assert orgs.loc["o1", "description"] == "Rockets"
+
+
+def test_reads_tar_gz_archive(export_dir, tmp_path):
+    """Test that an archived export is read in one streaming pass."""
+    archive = tmp_path / "export.tar.gz"
+    with tarfile.open(archive, "w:gz") as tar:
+        for name in ("people", "funding_rounds", "organizations"):
+            tar.add(export_dir / f"{name}.csv", arcname=f"2023-01-07/{name}.csv")
+
+    df = pd.concat(crunchbase_bulk.iter_batches(archive, partitions=2))
+
+    assert len(df) == 3
+    assert "people" in df.columns
+
+
+def test_bulk_mode_through_crunchbase_collect(export_dir):
+    """Test that crunchbase.collect dispatches to the bulk reader without an API key."""
+    config = {
+        "sources": {"crunchbase": {
+            "mode": "bulk", "bulk_path": str(export_dir), "bulk": {"filter_updated": True},
+        }},
+        "start_date": pd.Timestamp("2023-01-01").to_pydatetime(),
+        "end_date": pd.Timestamp("2023-01-31").to_pydatetime(),
+    }
+
+    df = crunchbase.collect(config)
+
+    assert sorted(df["uuid"]) == ["o1", "o3"]
+
+
+def test_missing_organizations_file(tmp_path):
+    """Test that an export without organizations is rejected."""
+    (tmp_path / "people.csv").write_text(PEOPLE)
+
+    with pytest.raises(FileNotFoundError):
+        list(crunchbase_bulk.iter_batches(tmp_path))
@@ -0,0 +1,141 @@
+"""Tests for the collector daemon."""
+
+import threading
+from datetime import datetime
+
+import pytest
+
+from collector import daemon as daemon_module
+from collector.daemon import CollectorDaemon
+from collector.pipeline import CollectorState, LRUCache
+from collector.sources import sec
+from common.metrics import registry
+
+
+@pytest.fixture(autouse=True)
+def fresh_registry():
+    registry.reset()
+    yield
+    registry.reset()
+
+
+@pytest.fixture
+def config(tmp_path):
+    return {
+        "collection": {"max_days_per_run": 7},
+        "output_dir": tmp_path / "raw",
+        "interim_dir": tmp_path / "interim",
+        "metrics": {"enabled": False},
+    }
+
+
+def test_window_resumes_from_last_end_within_max_days(config):
+    """Test that cycle windows resume from the last run but stay bounded."""
+    daemon = CollectorDaemon(config, interval=60)
+    now = datetime(2023, 3, 10, 12)
+
+    assert daemon.window(now) == (datetime(2023, 3, 3, 12), now)
+
+    daemon.last_end = datetime(2023, 3, 10, 11)
+    assert daemon.window(now) == (datetime(2023, 3, 10, 11), now)
+
+    daemon.last_end = datetime(2023, 1, 1)
+    assert daemon.window(now)[0] == datetime(2023, 3, 3, 12)
+
+
+def test_cycles_reuse_state(config, monkeypatch):
+    """Test that every cycle is handed the same warm state."""
+    seen = []
+
+    def fake_run(cycle_config, profiler=None, state=None, **kwargs):
+        seen.append(state)
+        return {}
+
+    monkeypatch.setattr(daemon_module, "run_pipeline", fake_run)
+    daemon = CollectorDaemon(config, interval=0)
+    daemon.run(max_cycles=3)
+
+    assert daemon.cycles == 3
+    assert len(seen) == 3 and seen[0] is seen[1] is seen[2]
+    assert daemon.last_end is not None
+
+
+def test_overlapping_cycle_is_skipped(config, monkeypatch):
+    """Test that a cycle is skipped while another is still running."""
+    release = threading.Event()
+    entered = threading.Event()
+
+    def slow_run(cycle_config, profiler=None, state=None, **kwargs):
+        entered.set()
+        release.wait(5)
+        return {}
+
+    monkeypatch.setattr(daemon_module, "run_pipeline", slow_run)
+    daemon = CollectorDaemon(config, interval=60)
+    worker = threading.Thread(target=daemon.run_cycle)
+    worker.start()
+    entered.wait(5)
+
+    assert daemon.run_cycle() is False
+    release.set()
+    worker.join()
+    assert registry.counter("collector_daemon_cycles_skipped_total").value() == 1
+
+
+def test_stop_ends_loop_after_current_cycle(config, monkeypatch):
+    """Test that stop() (the SIGTERM handler) ends the loop."""
+    daemon = CollectorDaemon(config, interval=3600)
+
+    def run_then_stop(cycle_config, profiler=None, state=None, **kwargs):
+        daemon.stop()
+        return {}
+
+    monkeypatch.setattr(daemon_module, "run_pipeline", run_then_stop)
+    daemon.run()
+
+    assert daemon.cycles == 1
+
+
+def test_location_filter_is_reused_for_same_targets():
+    """Test that the warm location filter survives while targets are unchanged."""
+    state = CollectorState()
+    first = state.location_filter(["Boston"])
+
+    assert state.location_filter(["boston"]) is first
+    assert state.location_filter(["Austin"]) is not first
+
+
+def test_lru_cache_evicts_oldest():
+    """Test that the index cache stays within its size."""
+    cache = LRUCache(maxsize=2)
+    cache["a"] = 1
+    cache["b"] = 2
+    cache["a"]
+    cache["c"] = 3
+
+    assert list(cache) == ["a", "c"]
+
+
+def test_sec_index_cache_skips_refetch(monkeypatch):
+    """Test that cached daily indexes are not downloaded again."""
+    calls = []
+
+    class Response:
+        status_code = 200
+        text = "CIK|Company\n" + "-" * 20 + "\n" + (
+            f"{'1000':<12}{'ACME':<62}{'10-K':<12}{'20230103':<12}edgar/data/1000/a.txt\n"
+        )
+
+    def fake_get(url, source, **kwargs):
+        calls.append(url)
+        return Response()
+
+    monkeypatch.setattr(sec.http, "get", fake_get)
+    config = {"start_date": datetime(2023, 1, 3), "end_date": datetime(2023, 1, 3)}
+    cache = {}
+
+    first = sec.collect(config, cache=cache)
+    second = sec.collect(config, cache=cache)
+
+    assert len(calls) == 1
+    assert len(first) == len(second) == 1
@@ -0,0 +1,91 @@
+"""Tests for the pipeline DAG executor."""
+
+import threading
+import time
+
+import pytest
+
+from collector.dag import DagExecutor, Stage, topological_order
+
+
+def test_topological_order_respects_dependencies():
+    """Test that every stage comes after its dependencies."""
+    stages = [
+        Stage("extract", lambda r: None, ("filter",)),
+        Stage("filter", lambda r: None, ("fetch",)),
+        Stage("fetch", lambda r: None),
+    ]
+
+    assert topological_order(stages) == ["fetch", "filter", "extract"]
+
+
+def test_topological_order_rejects_cycles_and_unknown_deps():
+    """Test that malformed graphs are reported."""
+    with pytest.raises(ValueError, match="cycle"):
+        topological_order([Stage("a", lambda r: None, ("b",)), Stage("b", lambda r: None, ("a",))])
+    with pytest.raises(ValueError, match="unknown stage 'missing'"):
+        topological_order([Stage("a", lambda r: None, ("missing",))])
+
+
+def test_independent_stages_overlap():
+    """Test that independent stages run at the same time."""
+    barrier = threading.Barrier(2, timeout=5)
+
+    def fetch(inputs):
+        barrier.wait()  # Deadlocks (and times out) unless both run together
+        return 1
+
+    stages = [
+        Stage("fetch_a", fetch),
+        Stage("fetch_b", fetch),
+        Stage("merge", lambda r: r["fetch_a"] + r["fetch_b"], ("fetch_a", "fetch_b")),
+    ]
+    results = DagExecutor(stages, max_workers=2).run()
+
+    assert results["merge"] == 2
+
+
+def test_critical_path_follows_slowest_chain():
+    """Test that the summary names the chain that bounded the wall time."""
+    def sleep(seconds):
+        def run(inputs):
+            time.sleep(seconds)
+        return run
+
+    stages = [
+        Stage("fetch_fast", sleep(0.01)),
+        Stage("fetch_slow", sleep(0.15)),
+        Stage("write_fast", sleep(0.01), ("fetch_fast",)),
+        Stage("extract", sleep(0.02), ("fetch_fast", "fetch_slow")),
+    ]
+    executor = DagExecutor(stages, max_workers=4)
+    executor.run()
+    summary = executor.summary()
+
+    assert summary["critical_path"] == ["fetch_slow", "extract"]
+    assert summary["wall_seconds"] < summary["stage_seconds_total"]
+    assert summary["stages"]["fetch_slow"]["critical"]
+    assert "fetch_slow" in executor.format_summary()
+
+
+def test_failure_stops_downstream_stages():
+    """Test that a failed stage raises and its dependents never run."""
+    ran = []
+
+    def fail(inputs):
+        raise RuntimeError("boom")
+
+    stages = [
+        Stage("fetch", fail),
+        Stage("write", lambda r: ran.append("write"), ("fetch",)),
+    ]
+    with pytest.raises(RuntimeError, match="boom"):
+        DagExecutor(stages).run()
+    assert ran == []
+
+
+def test_supplied_results_satisfy_dependencies():
+    """Test that precomputed results stand in for their stages."""
+    stages = [Stage("double", lambda r: r["fetch"] * 2, ("fetch",))]
+
+    assert DagExecutor(stages).run({"fetch": 21})["double"] == 42
@@ -0,0 +1,46 @@
+"""Tests for frame memory accounting."""
+
+import logging
+
+import pandas as pd
+
+from collector.frames import MemoryBudget, concat_frames, format_memory, frame_memory, main
+from common.metrics import registry
+
+
+def test_concat_keeps_categoricals():
+    """Test that frames with different categories stay categorical when merged."""
+    first = pd.DataFrame({"form": pd.Categorical(["10-K", "S-1"]), "n": [1, 2]})
+    second = pd.DataFrame({"form": pd.Categorical(["8-K"]), "n": [3]})
+
+    merged = concat_frames([first, second])
+
+    assert isinstance(merged["form"].dtype, pd.CategoricalDtype)
+    assert list(merged["form"]) == ["10-K", "S-1", "8-K"]
+    assert concat_frames([]).empty
+
+
+def test_budget_warns_when_exceeded(caplog):
+    """Test that the budget records sizes and warns past its limit."""
+    registry.reset()
+    df = pd.DataFrame({"text": ["x" * 100] * 20_000})
+    budget = MemoryBudget(budget_mb=1)
+
+    with caplog.at_level(logging.WARNING, logger="collector.frames"):
+        size = budget.record("sec", df)
+
+    assert size == sum(frame_memory(df).values())
+    assert registry.gauge("collector_frame_bytes").value(source="sec") == size
+    assert "over the 1 MiB budget" in caplog.text
+    assert "text" in format_memory(df)
+    registry.reset()
+
+
+def test_cli_reports_files(tmp_path, capsys):
+    """Test the command line report and its budget exit code."""
+    path = tmp_path / "out.csv"
+    pd.DataFrame({"a": range(100)}).to_csv(path, index=False)
+
+    assert main([str(path)]) == 0
+    assert main([str(path), "--budget-mb", "0.000001"]) == 1
+    assert "on disk" in capsys.readouterr().out
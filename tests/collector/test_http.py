@@ -0,0 +1,96 @@
+"""Tests for the collector HTTP helpers."""
+
+import pytest
+import requests
+
+from collector import http
+from common.metrics import registry
+
+
+class FakeResponse:
+    def __init__(self, status_code, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+
+class FakeSession:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def get(self, url, **kwargs):
+        self.calls += 1
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    post = get
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    """Record backoff delays instead of sleeping."""
+    delays = []
+    monkeypatch.setattr(http.time, "sleep", delays.append)
+    registry.reset()
+    yield delays
+    registry.reset()
+
+
+def test_get_retries_and_honors_retry_after(no_sleep):
+    """Test that 429/5xx responses are retried using Retry-After."""
+    session = FakeSession([
+        FakeResponse(429, headers={"Retry-After": "3"}),
+        FakeResponse(503),
+        FakeResponse(200, content=b"x" * 10),
+    ])
+
+    response = http.get("http://example.test", "sec", session=session, max_retries=2)
+
+    assert response.status_code == 200
+    assert session.calls == 3
+    assert no_sleep == [3.0, 2.0]
+    assert registry.counter("collector_source_retries_total").value(source="sec") == 2
+    assert registry.counter("collector_source_bytes_total").value(source="sec") == 10
+    requests_total = registry.counter("collector_source_requests_total")
+    assert requests_total.value(source="sec", status=200) == 1
+    assert requests_total.value(source="sec", status=429) == 1
+
+
+def test_get_returns_last_error_response_when_retries_exhausted():
+    """Test that the final error response is returned, not raised."""
+    session = FakeSession([FakeResponse(500), FakeResponse(500)])
+
+    response = http.get("http://example.test", "sec", session=session, max_retries=1)
+
+    assert response.status_code == 500
+    assert session.calls == 2
+
+
+def test_get_does_not_retry_client_errors():
+    """Test that a 404 is returned immediately."""
+    session = FakeSession([FakeResponse(404)])
+
+    assert http.get("http://example.test", "sec", session=session).status_code == 404
+    assert session.calls == 1
+
+
+def test_get_raises_after_connection_errors():
+    """Test that connection errors propagate once retries are used up."""
+    error = requests.exceptions.ConnectionError("refused")
+    session = FakeSession([error, error])
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        http.get("http://example.test", "crunchbase", session=session, max_retries=1)
+
+
+def test_post_retries_like_get(no_sleep):
+    """Test that POST requests share the retry loop and metrics."""
+    session = FakeSession([FakeResponse(502), FakeResponse(200)])
+
+    response = http.post("http://example.test", "pdl", session=session, json={"requests": []})
+
+    assert response.status_code == 200 and session.calls == 2
+    assert registry.counter("collector_source_retries_total").value(source="pdl") == 1
@@ -0,0 +1,136 @@
+"""Tests for stage output memoization."""
+
+import os
+import time
+
+import pandas as pd
+import pytest
+
+from collector import memo as memo_module
+from collector import contacts, pipeline, sources
+from collector.memo import StageCache, code_version
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return StageCache(tmp_path / "cache", fetch_ttl=3600)
+
+
+def test_memoize_reuses_output_for_same_inputs(cache):
+    """Test that a stage runs once per distinct input."""
+    calls = []
+
+    def double(inputs):
+        calls.append(inputs["x"])
+        return inputs["x"] * 2
+
+    stage = cache.memoize("double", double, {"factor": 2}, "v1")
+
+    assert stage({"x": 2}) == 4
+    assert stage({"x": 2}) == 4
+    assert stage({"x": 3}) == 6
+    assert calls == [2, 3]
+
+
+def test_key_changes_with_config_and_code(cache):
+    """Test that config and code versions are part of the key."""
+    base = cache.key("filter", {"target_locations": ["Boston"]}, "v1", {"fetch": [1]})
+
+    assert base == cache.key("filter", {"target_locations": ["Boston"]}, "v1", {"fetch": [1]})
+    assert base != cache.key("filter", {"target_locations": ["Austin"]}, "v1", {"fetch": [1]})
+    assert base != cache.key("filter", {"target_locations": ["Boston"]}, "v2", {"fetch": [1]})
+    assert base != cache.key("filter", {"target_locations": ["Boston"]}, "v1", {"fetch": [2]})
+    assert code_version(code_version) != code_version(StageCache)
+
+
+def test_get_honors_max_age(cache):
+    """Test that expired entries are treated as missing."""
+    cache.put("k" * 64, "fetch_sec", [1, 2])
+
+    assert cache.get("k" * 64, max_age=60) == (True, [1, 2])
+    assert cache.get("k" * 64, max_age=-1) == (False, None)
+
+
+def test_gc_removes_old_then_least_recently_used(cache):
+    """Test cache garbage collection by age and size."""
+    for i, key in enumerate(("a" * 64, "b" * 64, "c" * 64)):
+        cache.put(key, "extract", list(range(100)))
+        data_path, _ = cache._paths(key)
+        os.utime(data_path, (time.time() - 1000 * (3 - i),) * 2)
+
+    assert cache.gc(max_age=2500) == 1
+    size = cache.entries()[0]["size_bytes"]
+    assert cache.gc(max_bytes=size) == 1
+    assert [e["key"] for e in cache.entries()] == ["c" * 64]
+
+
+def test_rerun_with_new_locations_reuses_fetch(tmp_path, cache):
+    """Test that changing target_locations only recomputes filter and later stages."""
+    fetches = []
+
+    def collect_demo(config):
+        fetches.append(config["start_date"])
+        return pd.DataFrame([
+            {"name": "Acme", "headquarters": "Boston, MA"},
+            {"name": "Globex", "headquarters": "Austin, TX"},
+        ])
+
+    sources.register_source("demo", collect_demo)
+    try:
+        config = {
+            "sources": {"demo": {}},
+            "start_date": "2023-01-01",
+            "target_locations": ["Boston"],
+            "output_dir": tmp_path / "raw",
+            "interim_dir": tmp_path / "interim",
+        }
+        pipeline.run_pipeline(config, memo=cache)
+        config["target_locations"] = ["Austin"]
+        pipeline.run_pipeline(config, memo=cache)
+    finally:
+        sources._registered.pop("demo")
+        sources._loaded.pop("demo", None)
+
+    assert len(fetches) == 1
+    filtered = pd.read_csv(tmp_path / "interim" / "filtered_demo_data.csv")
+    assert filtered["name"].tolist() == ["Globex"]
+    assert {e["stage"] for e in cache.entries()} == {"fetch_demo", "filter_demo", "extract"}
+
+
+def test_contacts_change_invalidates_extract(tmp_path, cache, monkeypatch):
+    """Test that editing contact normalization recomputes the extract stage."""
+    getsource = memo_module.inspect.getsource
+
+    def collect_demo(config):
+        return pd.DataFrame([{"name": "Acme", "headquarters": "Boston, MA"}])
+
+    sources.register_source("demo", collect_demo)
+    try:
+        config = {
+            "sources": {"demo": {}},
+            "output_dir": tmp_path / "raw",
+            "interim_dir": tmp_path / "interim",
+        }
+        pipeline.run_pipeline(config, memo=cache)
+        monkeypatch.setattr(
+            memo_module.inspect, "getsource",
+            lambda obj: getsource(obj) + ("# edited" if obj is contacts else ""),
+        )
+        pipeline.run_pipeline(config, memo=cache)
+    finally:
+        sources._registered.pop("demo")
+        sources._loaded.pop("demo", None)
+
+    stages = [e["stage"] for e in cache.entries()]
+    assert stages.count("fetch_demo") == 1
+    assert stages.count("extract") == 2
+
+
+def test_cli_list_and_gc(cache, capsys):
+    """Test the cache management commands."""
+    cache.put("d" * 64, "fetch_sec", [1])
+
+    assert memo_module.main(["--cache-dir", str(cache.cache_dir), "list"]) == 0
+    assert "fetch_sec" in capsys.readouterr().out
+    assert memo_module.main(["--cache-dir", str(cache.cache_dir), "gc", "--max-size-mb", "0"]) == 0
+    assert cache.entries() == []
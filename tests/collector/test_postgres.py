@@ -0,0 +1,163 @@
+"""Tests for the Postgres upsert sink."""
+
+from contextlib import contextmanager
+
+import pandas as pd
+
+from collector import sources
+from collector.cdc import ChangeCapture
+from collector.pipeline import run_pipeline
+from collector.storage.postgres import PostgresSink, company_row, contact_rows, upsert_sql
+
+
+class FakeCursor:
+    def __init__(self, log):
+        self.log = log
+        self.rowcount = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql):
+        self.log["sql"].append(sql)
+
+    @contextmanager
+    def copy(self, sql):
+        rows = []
+        self.log["copies"].append((sql, rows))
+
+        class Copy:
+            write_row = rows.append
+
+        yield Copy()
+        self.rowcount = len(rows)
+
+
+class FakeConnection:
+    def __init__(self, log):
+        self.log = log
+
+    @contextmanager
+    def transaction(self):
+        yield
+        self.log["commits"] += 1
+
+    def cursor(self):
+        return FakeCursor(self.log)
+
+
+class FakePool:
+    """Records the SQL, COPY rows and commits a real pool would send."""
+
+    def __init__(self):
+        self.log = {"sql": [], "copies": [], "commits": 0}
+        self.closed = False
+
+    @contextmanager
+    def connection(self):
+        yield FakeConnection(self.log)
+
+    def close(self):
+        self.closed = True
+
+
+def _extracted(n=3):
+    return [
+        {
+            "company": {
+                "uuid": f"u{i}",
+                "properties.identifier.value": f"Company {i}",
+                "properties.categories": [{"value": "Fintech"}],
+                "properties.num_employees_enum": "c_00011_00050",
+                "funding_total_usd": 1_000_000.0,
+                "headquarters": "Boston, MA",
+            },
+            "decision_makers": [
+                {"name": f"Ada  Lovelace{i}", "title": "CTO", "source": "company_api"},
+                {"name": " ", "title": "CEO"},
+            ],
+        }
+        for i in range(n)
+    ]
+
+
+def test_rows_map_onto_bootstrap_schema():
+    """Test that companies and contacts get stable IDs and typed columns."""
+    entry = _extracted(1)[0]
+
+    company = company_row(entry["company"])
+    contacts = contact_rows(company, entry["decision_makers"])
+
+    assert company["id"] == "crunchbase:u0"
+    assert company["industries"] == '["Fintech"]'
+    assert company["employee_count"] == 11
+    assert len(contacts) == 1
+    assert contacts[0]["first_name"] == "Ada"
+    assert contacts[0]["full_name"] == "Ada Lovelace0"
+    assert contacts[0]["id"] == contact_rows(company, [{"name": "ada lovelace0"}])[0]["id"]
+    assert company_row({"cik": 320193, "company_name": "APPLE INC"})["id"] == "sec:320193"
+
+
+def test_upsert_only_rewrites_changed_rows():
+    """Test that the merge statement is idempotent and keeps the last staged row."""
+    sql = upsert_sql("companies", ["id", "name"], "companies_staging")
+
+    assert "DISTINCT ON (id)" in sql and "ORDER BY id, seq DESC" in sql
+    assert "ON CONFLICT (id) DO UPDATE SET name = EXCLUDED.name" in sql
+    assert sql.endswith("WHERE companies.name IS DISTINCT FROM EXCLUDED.name")
+
+
+def test_upsert_keeps_enriched_columns():
+    """Test that a NULL in a kept column never overwrites a stored value."""
+    sql = upsert_sql("contacts", ["id", "email", "title"], "contacts_staging", keep=["email"])
+
+    assert "email = COALESCE(EXCLUDED.email, contacts.email)" in sql
+    assert "title = EXCLUDED.title" in sql
+    assert "(EXCLUDED.email IS NOT NULL AND contacts.email IS DISTINCT FROM EXCLUDED.email)" in sql
+
+
+def test_write_copies_in_batches():
+    """Test that rows are copied and upserted batch by batch, companies first."""
+    pool = FakePool()
+    sink = PostgresSink(pool, batch_rows=2)
+
+    counts = sink.write(_extracted(3))
+
+    assert counts == {"companies": 3, "contacts": 3}
+    assert pool.log["commits"] == 4
+    tables = [sql.split()[1] for sql, _ in pool.log["copies"]]
+    assert tables == ["companies_staging"] * 2 + ["contacts_staging"] * 2
+    first_row = pool.log["copies"][0][1][0]
+    assert first_row[:3] == (0, "crunchbase:u0", "Company 0")
+
+
+def test_pipeline_loads_cdc_delta(tmp_path):
+    """Test that reruns only send new or changed companies to the sink."""
+    frames = {"df": pd.DataFrame([e["company"] for e in _extracted(2)])}
+    frames["df"]["people"] = [[{"first_name": "Ada", "last_name": "L", "title": "CTO"}]] * 2
+    sources.register_source("crunchbase", lambda config: frames["df"])
+    pool = FakePool()
+    config = {
+        "sources": {"crunchbase": {}},
+        "output_dir": tmp_path / "raw",
+        "interim_dir": tmp_path / "interim",
+        "cdc": {"enabled": True},
+    }
+    try:
+        for _ in range(2):
+            run_pipeline(config, cdc=ChangeCapture.from_config(config), sink=PostgresSink(pool))
+    finally:
+        sources._registered.pop("crunchbase")
+        sources._loaded.pop("crunchbase", None)
+
+    company_copies = [rows for sql, rows in pool.log["copies"] if "companies" in sql]
+    assert [len(rows) for rows in company_copies] == [2]
+
+
+def test_disabled_sink_is_none():
+    """Test that no pool is opened unless postgres.enabled is set."""
+    assert PostgresSink.from_config({}) is None
+    assert PostgresSink.from_config({"postgres": {"enabled": False}}) is None
@@ -0,0 +1,127 @@
+"""Tests for the filter expression engine."""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from collector import predicates
+from collector.filters import LocationFilter
+from collector.predicates import EmployeeRange, at_least, dated, one_of
+
+
+def _companies():
+    return pd.DataFrame({
+        "uuid": ["a", "b", "c", "d"],
+        "funding_total_usd": [1_000_000, None, 250_000, 9_000_000],
+        "properties.last_funding_type": ["Seed", "series_a", "series_b", None],
+        "properties.last_funding_at": ["2023-01-05", "2021-06-01", "2023-02-01", None],
+        "properties.categories": [
+            [{"value": "Software"}, {"value": "FinTech"}], [], [{"value": "Gaming"}], None,
+        ],
+        "properties.num_employees_enum": [
+            "c_00011_00050", "c_00001_00010", "c_10001_max", None,
+        ],
+        "headquarters": ["Boston, MA", "Paris, France", "Austin, TX", None],
+    }, index=[10, 10, 11, 12])
+
+
+def test_field_predicates():
+    """Test each predicate kind against the Crunchbase column layout."""
+    df = _companies()
+
+    def ids(expr):
+        return list(predicates.apply_filter(df, expr)["uuid"])
+
+    assert ids(at_least("funding_amount", 500_000)) == ["a", "d"]
+    assert ids(one_of("round_type", ["seed", "Series_A"])) == ["a", "b"]
+    assert ids(dated("funding_date", datetime(2023, 1, 1))) == ["a", "c"]
+    assert ids(one_of("industry", ["fintech", "gaming"])) == ["a", "c"]
+    assert ids(EmployeeRange(low=20, high=100)) == ["a"]
+    assert ids(EmployeeRange(low=5000)) == ["c"]
+    location = predicates.InLocation(location_filter=LocationFilter(["Boston", "Austin"]))
+    assert ids(location) == ["a", "c"]
+
+
+def test_composition_and_inapplicable_fields():
+    """Test &, | and ~, and that filters on missing fields keep every row."""
+    df = _companies()
+    expr = (at_least("funding_amount", 500_000) | one_of("round_type", ["series_b"])) & ~one_of(
+        "industry", ["software"]
+    )
+
+    assert list(predicates.apply_filter(df, expr)["uuid"]) == ["c", "d"]
+
+    filings = pd.DataFrame({"form_type": ["10-K", "S-1"], "cik": ["1", "2"]})
+    assert len(predicates.apply_filter(filings, at_least("funding_amount", 1))) == 2
+    assert len(predicates.apply_filter(filings, ~one_of("industry", ["x"]))) == 2
+
+
+def test_comma_separated_values():
+    """Test that comma-separated category strings (bulk exports) are matched by item."""
+    values = pd.Series(["Software,SaaS", "Gaming", None])
+
+    assert list(one_of("industry", ["saas"]).test(values)) == [True, False, False]
+
+
+def test_arrow_batches_are_filtered_in_arrow():
+    """Test that Arrow input is filtered without converting unused columns."""
+    table = pa.table({
+        "uuid": ["a", "b", "c"],
+        "funding_total_usd": [1.0, 5.0, None],
+        "people": [[{"n": 1}], [], []],
+    })
+
+    result = predicates.apply_filter(table, at_least("funding_amount", 2))
+
+    assert isinstance(result, pa.Table)
+    assert result.column("uuid").to_pylist() == ["b"]
+
+
+def test_from_config_and_pushdown():
+    """Test the config filter and its pushdown to each source."""
+    config = {
+        "target_locations": ["Boston"],
+        "collection": {"min_funding_amount": 500_000},
+        "filters": {
+            "round_types": ["seed"],
+            "funded_within_days": 30,
+            "employee_count": {"min": 11, "max": 60},
+            "form_types": ["S-1"],
+        },
+        "end_date": datetime(2023, 2, 1),
+    }
+
+    expr = predicates.from_config(config)
+    assert [t.name for t in expr.terms()] == [
+        "funding_amount", "round_type", "funding_date", "employee_count", "form_type", "location",
+    ]
+    assert list(predicates.apply_filter(_companies(), expr)["uuid"]) == ["a"]
+
+    assert predicates.pushdown(config, "crunchbase") == {
+        "funding_total_min": 500_000,
+        "last_funding_types": "seed",
+        "last_funding_after": "2023-01-02",
+        "num_employees_enum": "c_00011_00050,c_00051_00100",
+    }
+    assert predicates.pushdown(config, "sec") == {"target_forms": ["S-1"]}
+    assert predicates.from_config({}) is None
+
+
+def test_conflicting_pushdowns_are_left_to_the_residual_filter():
+    """Test that two terms pushing the same parameter push neither."""
+    expr = one_of("round_type", ["seed"]) & one_of("round_type", ["series_a"])
+
+    assert expr.pushdown("crunchbase") == {}
+
+
+def test_location_mask_looks_up_each_value_once():
+    """Test that repeated locations hit the filter once per distinct value."""
+    location_filter = LocationFilter(["Boston"])
+    values = pd.Series(["Boston, MA", "Paris", None, "Boston, MA"] * 50)
+
+    mask = predicates.location_mask(values, location_filter)
+
+    assert mask.dtype == np.bool_ and mask.sum() == 100
+    assert location_filter.cache_misses == 2
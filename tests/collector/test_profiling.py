@@ -0,0 +1,67 @@
+"""Tests for the collector profiling module."""
+
+import cProfile
+import json
+import pstats
+
+from collector.profiling import Profiler, collapsed_stacks, compare_bundles
+
+
+def _leaf(n):
+    return sum(i * i for i in range(n))
+
+
+def _parent():
+    return _leaf(20000) + _leaf(40000)
+
+
+def test_collapsed_stacks_nest_callees_under_callers():
+    """Test that rebuilt stacks run from caller to callee."""
+    profile = cProfile.Profile()
+    profile.enable()
+    _parent()
+    profile.disable()
+
+    lines = collapsed_stacks(pstats.Stats(profile))
+
+    assert lines
+    for line in lines:
+        _, value = line.rsplit(" ", 1)
+        assert int(value) > 0
+    nested = [line for line in lines if "_parent" in line and "_leaf" in line]
+    assert nested
+    assert all(line.index("_parent") < line.index("_leaf") for line in nested)
+
+
+def test_profiler_writes_bundle(tmp_path):
+    """Test that each stage produces its files and a manifest entry."""
+    profiler = Profiler(tmp_path, run_id="run1")
+    with profiler.stage("extract"):
+        data = [bytearray(1024) for _ in range(100)]
+    bundle = profiler.finish()
+
+    assert bundle == tmp_path / "profiles" / "run1"
+    for suffix in ("pstats", "collapsed", "memory.txt"):
+        assert (bundle / f"extract.{suffix}").exists()
+
+    manifest = json.loads((bundle / "manifest.json").read_text())
+    stage = manifest["stages"]["extract"]
+    assert stage["memory_peak_bytes"] >= 100 * 1024
+    assert stage["wall_seconds"] >= 0
+    del data
+
+
+def test_compare_bundles(tmp_path):
+    """Test comparing stage summaries across two bundles."""
+    for name, wall in (("old", 2.0), ("new", 3.0)):
+        bundle = tmp_path / name
+        bundle.mkdir()
+        stages = {"fetch_sec": {"wall_seconds": wall, "cpu_seconds": 1.0,
+                                "memory_peak_bytes": 100}}
+        (bundle / "manifest.json").write_text(json.dumps({"stages": stages}))
+
+    rows = compare_bundles(tmp_path / "old", tmp_path / "new")
+
+    assert rows[0]["stage"] == "fetch_sec"
+    assert rows[0]["wall_seconds"]["change"] == 0.5
+    assert rows[0]["cpu_seconds"]["change"] == 0.0
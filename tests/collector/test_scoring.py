@@ -0,0 +1,121 @@
+"""Tests for lead scoring and top-K selection."""
+
+import json
+import random
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from collector.campaigns import CampaignSet
+from collector.config import validate_config
+from collector.pipeline import process_and_save
+from collector.scoring import LeadScorer, TopK, prioritize
+
+
+NOW = datetime(2023, 6, 1)
+
+
+def _entry(id, funding=None, funded_on=None, round_type=None, roles=(), campaigns=None):
+    company = {
+        "id": id,
+        "funding_total_usd": funding,
+        "properties.last_funding_at": funded_on,
+        "properties.last_funding_type": round_type,
+    }
+    if campaigns is not None:
+        company["campaigns"] = campaigns
+    return {"company": company, "decision_makers": [{"name": r, "role": r} for r in roles]}
+
+
+def test_components_follow_config():
+    """Test each score component and configured weights."""
+    scorer = LeadScorer(
+        weights={"funding": 1, "recency": 1, "round_type": 1, "roles": 1},
+        round_types={"Series_A": 0.8},
+        roles={"cto": 0.7, "ceo": 0.6},
+        half_life_days=30,
+        reference_date=NOW,
+    )
+
+    score, components = scorer.score(
+        _entry("a")["company"] | {
+            "funding_total_usd": 1e9,
+            "properties.last_funding_at": "2023-05-02",
+            "properties.last_funding_type": "series-a",
+        },
+        [{"role": "cto"}, {"role": "cto"}, {"role": "ceo"}],
+    )
+
+    assert components == {"funding": 1.0, "recency": 0.5, "round_type": 0.8, "roles": 1.0}
+    assert score == 3.3
+    assert scorer.score({}, [])[0] == 0
+
+
+def test_top_k_matches_full_sort():
+    """Test that the bounded heap keeps exactly the K best, ties in arrival order."""
+    rng = random.Random(7)
+    scores = [rng.choice([0.1, 0.2, 0.3]) + rng.random() / 10 for _ in range(2000)]
+    selection = TopK(25)
+
+    for i, score in enumerate(scores):
+        selection.push(score, i)
+
+    expected = sorted(range(len(scores)), key=lambda i: (-scores[i], i))[:25]
+    assert [item for _, item in selection.items()] == expected
+    assert selection.seen == 2000
+    assert selection.threshold() == scores[expected[-1]]
+
+
+def test_top_k_must_keep_something():
+    """Test that a selection of fewer than one item is rejected up front."""
+    with pytest.raises(ValueError, match="top_k"):
+        TopK(0)
+    problems = validate_config({
+        "sources": {"sec": {"enabled": True}},
+        "scoring": {"enabled": True, "top_k": 0},
+    })
+    assert "scoring.top_k must be a positive integer" in problems
+
+
+def test_prioritize_per_campaign():
+    """Test that campaigns rank their own members on their own roles."""
+    campaign_set = CampaignSet({
+        "eng": {"decision_makers": {"target_roles": ["cto"]}},
+        "all": {},
+    })
+    scorer = LeadScorer(weights={"funding": 0, "recency": 0, "round_type": 0, "roles": 1},
+                        roles={"cto": 0.6, "ceo": 0.4}, reference_date=NOW)
+    extracted = [
+        _entry("a", roles=["ceo", "cto"], campaigns=["eng", "all"]),
+        _entry("b", roles=["ceo"], campaigns=["eng", "all"]),
+        _entry("c", roles=["cto"], campaigns=["all"]),
+    ]
+
+    ranked = prioritize(iter(extracted), scorer, k=2, campaign_set=campaign_set)
+
+    assert [lead["company"]["id"] for lead in ranked[None]] == ["a", "c"]
+    assert [lead["company"]["id"] for lead in ranked["eng"]] == ["a"]
+    assert ranked["eng"][0]["score"] == 0.6
+    assert [lead["rank"] for lead in ranked["all"]] == [1, 2]
+
+
+def test_pipeline_writes_ranked_leads(tmp_path):
+    """Test that the score stage writes the top K leads."""
+    config = {
+        "output_dir": tmp_path / "raw",
+        "interim_dir": tmp_path / "interim",
+        "end_date": NOW,
+        "scoring": {"enabled": True, "top_k": 1},
+    }
+    companies = pd.DataFrame({
+        "id": ["small", "big"],
+        "name": ["Small", "Big"],
+        "funding_total_usd": [1e5, 5e7],
+        "people": [[{"first_name": "A", "last_name": "B", "title": "CEO"}]] * 2,
+    })
+
+    process_and_save(config, {"crunchbase": companies})
+
+    leads = json.loads((tmp_path / "interim" / "leads.json").read_text())
+    assert [(lead["rank"], lead["company"]["id"]) for lead in leads] == [(1, "big")]
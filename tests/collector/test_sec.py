@@ -0,0 +1,60 @@
+"""Tests for the SEC filings schema."""
+
+import pandas as pd
+
+from collector.sources import sec
+
+
+FILINGS = [
+    {"cik": "1000", "company_name": "ACME", "form_type": "10-K", "filing_date": "20230103",
+     "file_name": "edgar/data/1000/0000950170-23-000123.txt"},
+    {"cik": "2000", "company_name": "GLOBEX", "form_type": "S-1", "filing_date": "20230104",
+     "file_name": "edgar/data/2000/0001193125-23-000001.txt"},
+    {"cik": "1000", "company_name": "ACME", "form_type": "10-K", "filing_date": "20230105",
+     "file_name": "edgar/data/1000/0000950170-23-000124.txt"},
+]
+
+
+def test_to_frame_uses_compact_dtypes():
+    """Test that filings get categorical, datetime and integer columns."""
+    df = sec.to_frame(FILINGS)
+
+    assert list(df.columns) == sec.COLUMNS
+    assert df["cik"].dtype == "int64"
+    assert isinstance(df["form_type"].dtype, pd.CategoricalDtype)
+    assert isinstance(df["company_name"].dtype, pd.CategoricalDtype)
+    assert pd.api.types.is_datetime64_any_dtype(df["filing_date"])
+    assert df["filing_date"].iloc[0] == pd.Timestamp("2023-01-03")
+    assert df["accession"].iloc[0] == 95017023000123
+
+
+def test_file_urls_are_derived():
+    """Test that URLs are rebuilt from the CIK and accession number."""
+    urls = sec.file_urls(sec.to_frame(FILINGS))
+
+    assert list(urls) == [
+        f"https://www.sec.gov/Archives/{f['file_name']}" for f in FILINGS
+    ]
+
+
+def test_non_standard_file_names_are_kept():
+    """Test that unexpected file names fall back to a string column."""
+    filings = FILINGS + [dict(FILINGS[0], file_name="edgar/data/1000/odd-name.txt")]
+
+    df = sec.to_frame(filings)
+
+    assert "accession" not in df.columns
+    assert sec.file_urls(df).iloc[-1] == "https://www.sec.gov/Archives/edgar/data/1000/odd-name.txt"
+
+
+def test_typed_frame_is_much_smaller():
+    """Test that the schema takes several times less memory than object strings."""
+    filings = [
+        dict(f, file_name=f"edgar/data/{f['cik']}/0000950170-23-{i:06d}.txt")
+        for i, f in enumerate(FILINGS * 2000)
+    ]
+    untyped = pd.DataFrame(filings).astype(object)
+
+    typed = sec.to_frame(filings)
+
+    assert untyped.memory_usage(deep=True).sum() > 4 * typed.memory_usage(deep=True).sum()
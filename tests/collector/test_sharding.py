@@ -0,0 +1,161 @@
+"""Tests for the sharded collection work queue."""
+
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from collector import sharding
+from collector.sharding import WorkQueue, WorkUnit
+
+
+def _units():
+    return [
+        WorkUnit("sec", datetime(2023, 1, 2), datetime(2023, 1, 2)),
+        WorkUnit("sec", datetime(2023, 1, 3), datetime(2023, 1, 3)),
+    ]
+
+
+def test_add_units_is_idempotent(tmp_path):
+    """Test that re-planning does not duplicate units."""
+    queue = WorkQueue(tmp_path / "queue.db")
+
+    assert queue.add_units(_units()) == 2
+    assert queue.add_units(_units()) == 0
+    assert queue.counts() == {"pending": 2}
+
+
+def test_claim_leases_each_unit_once(tmp_path):
+    """Test that a leased unit is not handed to a second worker."""
+    queue = WorkQueue(tmp_path / "queue.db")
+    queue.add_units(_units())
+
+    first = queue.claim("a")
+    second = queue.claim("b")
+
+    assert {first.id, second.id} == {u.id for u in _units()}
+    assert queue.claim("c") is None
+    assert not queue.complete(first.id, "b", None)  # wrong owner
+    assert queue.complete(first.id, "a", None)
+    assert queue.counts() == {"done": 1, "leased": 1}
+
+
+def test_expired_lease_is_reclaimed(tmp_path):
+    """Test that a crashed worker's unit is re-leased after expiry."""
+    queue = WorkQueue(tmp_path / "queue.db", lease_seconds=-1)
+    queue.add_units(_units()[:1])
+
+    unit = queue.claim("crashed")
+    again = queue.claim("survivor")
+
+    assert again == unit
+    assert not queue.renew(unit.id, "crashed")
+
+
+def test_failed_units_are_retried_then_marked_failed(tmp_path):
+    """Test that failures re-queue a unit until attempts run out."""
+    queue = WorkQueue(tmp_path / "queue.db", max_attempts=2)
+    queue.add_units(_units()[:1])
+
+    unit = queue.claim("w")
+    queue.fail(unit.id, "w", "boom")
+    assert queue.counts() == {"pending": 1}
+
+    unit = queue.claim("w")
+    queue.fail(unit.id, "w", "boom again")
+    assert queue.counts() == {"failed": 1}
+    assert queue.failures()[0]["error"] == "boom again"
+
+
+def test_plan_units_windows():
+    """Test splitting the date range per source."""
+    config = {
+        "start_date": datetime(2023, 3, 30),
+        "end_date": datetime(2023, 4, 10),
+        "sharding": {"window_days": 7, "sec_unit": "quarter"},
+    }
+
+    units = sharding.plan_units(config, ["crunchbase", "sec"])
+    windows = [(u.source, u.start_date.day, u.end_date.day) for u in units]
+
+    assert windows == [
+        ("crunchbase", 30, 5), ("crunchbase", 6, 10),
+        ("sec", 30, 31), ("sec", 1, 10),
+    ]
+
+    config["sharding"]["sec_unit"] = "day"
+    assert len(sharding.plan_units(config, ["sec"])) == 12
+
+
+def test_bulk_export_is_one_unit_unless_filtered_by_date():
+    """Test that an unfiltered bulk export is not read once per window."""
+    config = {
+        "start_date": datetime(2023, 3, 1),
+        "end_date": datetime(2023, 3, 31),
+        "sources": {"crunchbase": {"mode": "bulk", "bulk_path": "export.tar.gz"}},
+    }
+
+    units = sharding.plan_units(config, ["crunchbase"])
+    assert [(u.start_date.day, u.end_date.day) for u in units] == [(1, 31)]
+
+    config["sources"]["crunchbase"]["bulk"] = {"filter_updated": True}
+    assert len(sharding.plan_units(config, ["crunchbase"])) == 5
+
+
+def test_merge_dedupes_records_seen_by_several_units(tmp_path):
+    """Test that an organization returned by two windows is merged once."""
+    config = {
+        "start_date": datetime(2023, 1, 1),
+        "end_date": datetime(2023, 1, 14),
+        "sharding": {"shard_dir": str(tmp_path / "shards"), "window_days": 7},
+    }
+    queue = WorkQueue(tmp_path / "queue.db")
+    queue.add_units(sharding.plan_units(config, ["crunchbase"]))
+
+    def collect(unit_config):
+        day = unit_config["start_date"].day
+        return pd.DataFrame({"uuid": ["a", f"only-{day}"], "seen": [day, day]})
+
+    sharding.run_worker(config, queue, {"crunchbase": collect}, owner="w1")
+    merged = sharding.merge(queue, ["crunchbase"])["crunchbase"]
+
+    assert sorted(merged["uuid"]) == ["a", "only-1", "only-8"]
+    assert merged.loc[merged["uuid"] == "a", "seen"].tolist() == [8]
+
+
+def test_worker_and_merge(tmp_path):
+    """Test processing all units and merging their outputs in order."""
+    config = {
+        "start_date": datetime(2023, 1, 2),
+        "end_date": datetime(2023, 1, 5),
+        "sharding": {"shard_dir": str(tmp_path / "shards")},
+    }
+    queue = WorkQueue(tmp_path / "queue.db", max_attempts=2)
+    queue.add_units(sharding.plan_units(config, ["sec"]))
+    calls = []
+
+    def collect(unit_config):
+        day = unit_config["start_date"].day
+        calls.append(day)
+        if day == 3 and calls.count(3) == 1:
+            raise ValueError("transient")
+        if day == 4:
+            return pd.DataFrame()
+        return pd.DataFrame({"day": [day]})
+
+    completed = sharding.run_worker(config, queue, {"sec": collect}, owner="w1")
+    merged = sharding.merge(queue, ["sec"])
+
+    assert completed == 4
+    assert calls.count(3) == 2
+    assert merged["sec"]["day"].tolist() == [2, 3, 5]
+
+
+def test_merge_refuses_unfinished_queue(tmp_path):
+    """Test that merging waits for every unit unless partial is allowed."""
+    queue = WorkQueue(tmp_path / "queue.db")
+    queue.add_units(_units())
+
+    with pytest.raises(RuntimeError):
+        sharding.merge(queue, ["sec"])
+    assert sharding.merge(queue, ["sec"], allow_partial=True)["sec"].empty
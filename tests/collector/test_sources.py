@@ -0,0 +1,76 @@
+"""Tests for the source plugin registry."""
+
+import subprocess
+import sys
+
+import pandas as pd
+import pytest
+
+from collector import sources
+from collector.pipeline import collect_sources
+
+
+@pytest.fixture
+def registry_state():
+    """Restore registrations made by a test."""
+    registered = dict(sources._registered)
+    loaded = dict(sources._loaded)
+    yield
+    sources._registered.clear()
+    sources._registered.update(registered)
+    sources._loaded.clear()
+    sources._loaded.update(loaded)
+
+
+def test_builtin_sources_are_available():
+    """Test that the shipped sources are known without importing them."""
+    assert {"crunchbase", "sec"} <= set(sources.available_sources())
+
+
+def test_enabled_sources_honors_enabled_flag():
+    """Test that disabled sources are left out, in config order."""
+    config = {"sources": {"sec": {"enabled": True}, "crunchbase": {"enabled": False}}}
+
+    assert sources.enabled_sources(config) == ["sec"]
+    assert sources.enabled_sources({}) == ["crunchbase", "sec"]
+
+
+def test_enabled_sources_rejects_unknown_source():
+    """Test that a typo in a source name is reported."""
+    with pytest.raises(ValueError, match="Unknown source 'secc'"):
+        sources.enabled_sources({"sources": {"secc": {}}})
+
+
+def test_collect_sources_runs_only_enabled_sources(registry_state):
+    """Test that the pipeline collects registered, enabled sources only."""
+    calls = []
+
+    def collect_demo(config):
+        calls.append("demo")
+        return pd.DataFrame([{"name": "Acme"}])
+
+    def collect_other(config):
+        calls.append("other")
+        return pd.DataFrame()
+
+    sources.register_source("demo", collect_demo)
+    sources.register_source("other", collect_other)
+    config = {"sources": {"demo": {}, "other": {"enabled": False}}}
+
+    data = collect_sources(config)
+
+    assert calls == ["demo"]
+    assert list(data) == ["demo"]
+
+
+def test_cli_startup_does_not_import_heavy_modules():
+    """Test that the CLI module imports neither pandas nor any source module."""
+    code = (
+        "import sys, collector.__main__; "
+        "print(sorted(m for m in ('pandas', 'requests', 'collector.sources.sec', "
+        "'collector.sources.crunchbase') if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "[]"
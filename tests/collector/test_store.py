@@ -0,0 +1,121 @@
+"""Tests for the local columnar store."""
+
+import pandas as pd
+import pytest
+
+from collector import sources
+from collector.pipeline import run_pipeline
+from collector.sources import sec
+from collector.contacts import normalize_name
+from collector.store import ColumnarStore, main, normalize_names
+from common.metrics import registry
+
+
+def _filings(days=20, per_day=50):
+    return sec.to_frame([
+        {
+            "cik": str(1000 + (d * per_day + i) % 300),
+            "company_name": f"Company {(d * per_day + i) % 300} Inc.",
+            "form_type": "10-K" if i % 2 else "S-1",
+            "filing_date": f"202301{d + 1:02d}",
+            "file_name": f"edgar/data/1/0000950170-23-{d * per_day + i:06d}.txt",
+        }
+        for d in range(days)
+        for i in range(per_day)
+    ])
+
+
+def _organizations():
+    return pd.DataFrame({
+        "uuid": ["a", "b", "c"],
+        "properties.identifier.value": ["Acme, Inc.", "Globex LLC", "Initech"],
+        "headquarters": ["Boston, MA, US", "Austin, TX, US", "Boston, MA, US"],
+        "properties.last_funding_at": ["2023-01-05", "2023-02-01", None],
+        "people": [[{"first_name": "Ada", "title": "CTO"}], [], []],
+    })
+
+
+@pytest.fixture
+def store(tmp_path):
+    registry.reset()
+    yield ColumnarStore(tmp_path / "store", row_group_rows=100)
+    registry.reset()
+
+
+def test_normalize_names():
+    """Test that punctuation, case and legal suffixes are ignored."""
+    names = pd.Series(["Acme, Inc.", "ACME INC", "Acme Corp Ltd", "Acme Labs", None])
+
+    assert normalize_names(names).tolist()[:4] == ["acme", "acme", "acme", "acme labs"]
+    assert [normalize_name(n) for n in names[:4]] == normalize_names(names).tolist()[:4]
+
+
+def test_point_lookup_reads_only_matching_row_groups(store):
+    """Test that a CIK lookup reads a few row groups and returns exact matches."""
+    filings = _filings()
+    store.write("sec", filings)
+
+    found = store.lookup("sec", cik=1007)
+
+    assert len(found) == (filings["cik"] == 1007).sum()
+    assert set(found["cik"]) == {1007}
+    row_groups = registry.counter("collector_store_row_groups_total")
+    assert row_groups.value(source="sec", result="read") < 5
+    assert row_groups.value(source="sec", result="skipped") >= 5
+
+
+def test_date_range_scan_uses_statistics(store):
+    """Test that a range scan only reads row groups overlapping the range."""
+    store.write("sec", _filings())
+
+    week = store.lookup("sec", start="2023-01-03", end="2023-01-09", columns=["cik", "form_type"])
+
+    assert len(week) == 7 * 50
+    assert list(week.columns) == ["cik", "form_type"]
+    assert registry.counter("collector_store_row_groups_total").value(
+        source="sec", result="read"
+    ) == 4
+
+
+def test_writes_merge_by_record_id(store):
+    """Test that rewriting a record replaces it instead of duplicating it."""
+    filings = _filings(days=2)
+    store.write("sec", filings)
+    changed = filings.iloc[:1].copy()
+    changed["form_type"] = "10-K/A"
+
+    total = store.write("sec", changed)
+
+    assert total == len(filings)
+    assert store.lookup("sec", cik=int(changed["cik"].iloc[0]))["form_type"].tolist().count("10-K/A") == 1
+
+
+def test_crunchbase_name_and_location_lookups(store):
+    """Test lookups by normalized name and location, combined with a date range."""
+    store.write("crunchbase", _organizations())
+
+    assert store.lookup("crunchbase", name="ACME inc")["uuid"].tolist() == ["a"]
+    assert sorted(store.lookup("crunchbase", location="boston")["uuid"]) == ["a", "c"]
+    assert store.lookup("crunchbase", location="Boston", end="2023-01-31")["uuid"].tolist() == ["a"]
+    assert store.lookup("crunchbase", company_id="zzz").empty
+    with pytest.raises(ValueError):
+        store.lookup("crunchbase", cik=1)
+
+
+def test_pipeline_fills_store_and_cli_reads_it(tmp_path, capsys):
+    """Test the write_store stage and the command line lookup."""
+    sources.register_source("crunchbase", lambda config: _organizations())
+    config = {
+        "sources": {"crunchbase": {}},
+        "output_dir": tmp_path / "raw",
+        "interim_dir": tmp_path / "interim",
+        "store": {"enabled": True, "dir": tmp_path / "store"},
+    }
+    try:
+        run_pipeline(config)
+    finally:
+        sources._registered.pop("crunchbase")
+        sources._loaded.pop("crunchbase", None)
+
+    assert main([str(tmp_path / "store"), "crunchbase", "--name", "globex"]) == 0
+    assert "Globex LLC" in capsys.readouterr().out
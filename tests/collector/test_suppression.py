@@ -0,0 +1,107 @@
+"""Tests for the suppression set."""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from collector.pipeline import process_and_save
+from collector.suppression import SuppressionSet, _hashes, main, normalize_domains
+from common.metrics import registry
+
+
+@pytest.fixture(autouse=True)
+def fresh_registry():
+    registry.reset()
+    yield
+    registry.reset()
+
+
+def _contacted():
+    return pd.DataFrame({
+        "company_name": ["Acme, Inc.", None, "Globex"],
+        "website": [None, "https://www.initech.com/about", None],
+        "full_name": [None, None, "Hank  Scorpio"],
+    })
+
+
+def _companies():
+    return pd.DataFrame({
+        "id": ["a", "b", "c", "d"],
+        "name": ["ACME INC", "Initech", "Globex Corporation", "Umbrella"],
+        "website": ["acme.io", "initech.com", "globex.com", "umbrella.com"],
+        "headquarters": ["Boston, MA"] * 4,
+        "people": [
+            [{"first_name": "Ada", "last_name": "L", "title": "CEO"}],
+            [{"first_name": "Bill", "last_name": "L", "title": "CEO"}],
+            [
+                {"first_name": "Hank", "last_name": "Scorpio", "title": "CEO"},
+                {"first_name": "Frank", "last_name": "Grimes", "title": "CTO"},
+            ],
+            [{"first_name": "Al", "last_name": "W", "title": "CEO"}],
+        ],
+    })
+
+
+def test_normalize_domains():
+    """Test that URLs reduce to bare hosts."""
+    urls = pd.Series(["https://www.Acme.io/x?y=1", "acme.io", "http://www2.acme.io:8080", ""])
+
+    assert normalize_domains(urls).tolist()[:3] == ["acme.io"] * 3
+    assert normalize_domains(urls).isna().tolist()[3]
+
+
+def test_bloom_false_positives_are_rejected():
+    """Test that every key is found and Bloom false positives are filtered out."""
+    keys = [f"n:company {i}" for i in range(5000)]
+    suppression = SuppressionSet.build(keys, error_rate=0.2)
+    others = [f"n:other {i}" for i in range(5000)]
+
+    assert suppression.contains(keys).all()
+    assert not suppression.contains(others).any()
+    assert suppression.bloom.contains(*_hashes(np.asarray(others, dtype=object))).sum() > 0
+    assert registry.counter("collector_suppression_bloom_false_positives_total").value() > 0
+
+
+def test_apply_drops_companies_and_people(tmp_path):
+    """Test that contacted companies are dropped and contacted people removed."""
+    SuppressionSet.from_frame(_contacted()).save(tmp_path / "set")
+    suppression = SuppressionSet.load(tmp_path / "set")
+
+    kept = suppression.apply(_companies(), "crunchbase")
+
+    assert kept["id"].tolist() == ["c", "d"]
+    assert [p["first_name"] for p in kept.iloc[0]["people"]] == ["Frank"]
+    suppressed = registry.counter("collector_suppressed_total")
+    assert suppressed.value(source="crunchbase", kind="company") == 2
+    assert suppressed.value(source="crunchbase", kind="contact") == 1
+
+
+def test_pipeline_suppresses_before_extraction(tmp_path):
+    """Test that suppressed records never reach the interim outputs."""
+    SuppressionSet.from_frame(_contacted()).save(tmp_path / "set")
+    config = {
+        "output_dir": tmp_path / "raw",
+        "interim_dir": tmp_path / "interim",
+        "suppression": {"enabled": True, "path": tmp_path / "set"},
+    }
+
+    process_and_save(config, {"crunchbase": _companies()})
+
+    extracted = json.loads((tmp_path / "interim" / "companies_with_decision_makers.json").read_text())
+    assert [c["company"]["id"] for c in extracted] == ["c", "d"]
+    raw = pd.read_csv(tmp_path / "raw" / "crunchbase_data.csv")
+    assert len(raw) == 4
+
+
+def test_cli_build_and_check(tmp_path, capsys):
+    """Test building from a CSV export and checking names."""
+    export = tmp_path / "contacted.csv"
+    _contacted().to_csv(export, index=False)
+
+    assert main(["build", "--from-file", str(export), "--out", str(tmp_path / "set")]) == 0
+    assert main(["check", str(tmp_path / "set"), "--name", "acme"]) == 1
+    assert main(["check", str(tmp_path / "set"), "--name", "Globex", "--person", "hank scorpio"]) == 1
+    assert main(["check", str(tmp_path / "set"), "--domain", "umbrella.com"]) == 0
+    assert "not suppressed" in capsys.readouterr().out
@@ -0,0 +1,104 @@
+"""Tests for the common logging module."""
+
+import json
+import logging
+import logging.handlers
+
+import pytest
+
+from common.logging import (
+    JsonFormatter,
+    RateLimitFilter,
+    SampleFilter,
+    configure_logging,
+    shutdown_logging,
+)
+
+
+def _record(msg, *args, level=logging.INFO, name="test"):
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+
+@pytest.fixture(autouse=True)
+def reset_logging():
+    """Restore the root logger after each test."""
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield
+    shutdown_logging()
+    root.handlers = handlers
+    root.setLevel(level)
+
+
+def test_json_formatter_includes_extras():
+    """Test that JSON output carries the message and extra fields."""
+    record = _record("fetched %d pages", 3)
+    record.source = "sec"
+
+    payload = json.loads(JsonFormatter().format(record))
+
+    assert payload["message"] == "fetched 3 pages"
+    assert payload["level"] == "INFO"
+    assert payload["source"] == "sec"
+
+
+def test_rate_limit_filter_drops_and_reports_suppressed():
+    """Test that the rate limiter caps bursts and counts dropped records."""
+    rate_filter = RateLimitFilter(rate=0.0, burst=2)
+
+    results = [rate_filter.filter(_record("page %d", i)) for i in range(5)]
+    assert results == [True, True, False, False, False]
+
+    # Warnings are never limited
+    assert rate_filter.filter(_record("page %d", 9, level=logging.WARNING))
+
+    # A different message template has its own bucket
+    assert rate_filter.filter(_record("day %s", "20230101"))
+
+    # Once tokens refill, the next record reports how many were dropped
+    rate_filter.rate = 1e9
+    record = _record("page %d", 6)
+    assert rate_filter.filter(record)
+    assert record.suppressed == 3
+
+
+def test_sample_filter_emits_every_nth():
+    """Test that the sampler keeps one record in every n."""
+    sample_filter = SampleFilter(every=3)
+
+    results = [sample_filter.filter(_record("row %d", i)) for i in range(7)]
+    assert results == [True, False, False, True, False, False, True]
+
+
+def test_queue_logging_flushes_on_shutdown(tmp_path):
+    """Test that queued records all reach the log file at shutdown."""
+    log_file = tmp_path / "collector.log"
+    configure_logging("INFO", log_file=str(log_file), json_format=True)
+
+    root = logging.getLogger()
+    assert isinstance(root.handlers[0], logging.handlers.QueueHandler)
+
+    logger = logging.getLogger("collector.test")
+    for i in range(100):
+        logger.info("record %d", i)
+    shutdown_logging()
+
+    lines = log_file.read_text().splitlines()
+    assert len(lines) == 100
+    assert json.loads(lines[-1])["message"] == "record 99"
+
+
+def test_configured_sampling_keeps_one_in_n(tmp_path):
+    """Test that sample_every wires the sampler into the logging config."""
+    log_file = tmp_path / "collector.log"
+    configure_logging("INFO", log_file=str(log_file), sample_every=10)
+
+    logger = logging.getLogger("collector.test")
+    for i in range(100):
+        logger.info("row %d", i)
+    logger.warning("kept")
+    shutdown_logging()
+
+    lines = log_file.read_text().splitlines()
+    assert len(lines) == 11
+    assert lines[-1].endswith("kept")
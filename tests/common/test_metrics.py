@@ -0,0 +1,75 @@
+"""Tests for the common metrics module."""
+
+import json
+
+import pytest
+
+from common.metrics import MetricsRegistry
+
+
+def test_counter_and_gauge_labels():
+    """Test that label sets are tracked as separate series."""
+    registry = MetricsRegistry(namespace="collector")
+    requests = registry.counter("requests_total", "Requests made")
+
+    requests.inc(source="sec")
+    requests.inc(2, source="sec")
+    requests.inc(source="crunchbase")
+
+    assert requests.value(source="sec") == 3
+    assert requests.value(source="crunchbase") == 1
+    assert registry.counter("requests_total") is requests
+
+    with pytest.raises(ValueError):
+        requests.inc(-1, source="sec")
+
+    registry.gauge("hit_ratio").set(0.75)
+    assert registry.gauge("hit_ratio").value() == 0.75
+
+
+def test_histogram_snapshot_and_prometheus_output():
+    """Test histogram summaries and the text exposition format."""
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 2.0):
+        latency.observe(value, stage="fetch")
+
+    series = registry.snapshot()["latency_seconds"]["series"][0]
+    assert series["labels"] == {"stage": "fetch"}
+    assert series["count"] == 4
+    assert series["sum"] == pytest.approx(3.05)
+    assert series["max"] == 2.0
+
+    text = registry.to_prometheus()
+    assert "# TYPE latency_seconds histogram" in text
+    assert 'latency_seconds_bucket{stage="fetch",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{stage="fetch",le="1.0"} 3' in text
+    assert 'latency_seconds_bucket{stage="fetch",le="+Inf"} 4' in text
+    assert 'latency_seconds_count{stage="fetch"} 4' in text
+
+
+def test_registry_rejects_type_conflicts():
+    """Test that a name cannot be reused for a different metric type."""
+    registry = MetricsRegistry()
+    registry.counter("rows")
+    with pytest.raises(TypeError):
+        registry.gauge("rows")
+
+
+def test_write_reports(tmp_path):
+    """Test writing the JSON report and the Prometheus textfile."""
+    registry = MetricsRegistry()
+    registry.counter("rows_total").inc(5)
+    with registry.timer("stage_seconds", stage="extract"):
+        pass
+
+    registry.write_json_report(tmp_path / "report.json", success=True)
+    registry.write_prometheus_textfile(tmp_path / "metrics.prom")
+
+    report = json.loads((tmp_path / "report.json").read_text())
+    assert report["success"] is True
+    assert report["metrics"]["rows_total"]["series"][0]["value"] == 5
+    assert report["metrics"]["stage_seconds"]["series"][0]["count"] == 1
+    assert "rows_total 5.0" in (tmp_path / "metrics.prom").read_text()
+    # Readable by a node_exporter running as another user
+    assert (tmp_path / "metrics.prom").stat().st_mode & 0o777 == 0o644
@@ -0,0 +1,38 @@
+"""Tests for the common token bucket."""
+
+import threading
+import time
+
+from common.ratelimit import TokenBucket
+
+
+def test_try_acquire_allows_a_burst_then_refills():
+    """Test that tokens run out after ``burst`` and come back at ``rate``."""
+    bucket = TokenBucket(rate=0.0, burst=2)
+
+    assert [bucket.try_acquire() for _ in range(3)] == [True, True, False]
+
+    bucket.rate = 1e9
+    assert bucket.try_acquire()
+
+
+def test_acquire_serves_concurrent_callers_in_successive_slots():
+    """Test that waiters reserve distinct slots instead of all waking at once."""
+    bucket = TokenBucket(rate=20, burst=1)
+    waits = []
+    lock = threading.Lock()
+
+    def take():
+        wait = bucket.acquire()
+        with lock:
+            waits.append(wait)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=take) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(round(w, 2) for w in waits)[0] == 0.0
+    assert time.perf_counter() - started >= 0.14
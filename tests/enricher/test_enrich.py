@@ -0,0 +1,148 @@
+"""Tests for the batched, cached enrichment stage."""
+
+import json
+
+from common.logging import shutdown_logging
+from common.metrics import registry
+from enricher.__main__ import main
+from enricher.budget import RateBudget
+from enricher.cache import LookupCache
+from enricher.enrich import Enricher, company_domain, contacts_from_extracted, normalize_domain
+from enricher.providers import StubProvider
+
+
+def _extracted(n=3):
+    return [
+        {
+            "company": {
+                "uuid": f"u{i}",
+                "properties.identifier.value": f"Company {i}",
+                "properties.website_url": f"https://www.company{i}.example.com/about",
+            },
+            "decision_makers": [
+                {"name": f"Ada Lovelace{i}", "title": "CTO", "source": "company_api"},
+                {"name": f"Grace Hopper{i}", "title": "CEO", "source": "company_api"},
+            ],
+        }
+        for i in range(n)
+    ]
+
+
+def test_domains_are_normalized():
+    """Test website URLs reduce to a bare host."""
+    assert normalize_domain("https://www.Acme.io/about?x=1") == "acme.io"
+    assert normalize_domain("acme.io:443") == "acme.io"
+    assert normalize_domain("not a url") is None
+    assert company_domain({"website_url": None, "homepage_url": "http://b.co"}) == "b.co"
+
+
+def test_lookups_are_batched_and_deduplicated():
+    """Test that people are looked up once, in provider-sized batches."""
+    registry.reset()
+    provider = StubProvider(batch_size=4, hit_rate=1.0)
+    extracted = _extracted(3)
+    # The same person again under another record of the company
+    extracted.append({**extracted[0], "decision_makers": [{"name": "ada lovelace0"}]})
+
+    enriched = Enricher([provider], concurrency=2).enrich(extracted)
+
+    assert provider.lookups == 6 and provider.requests == 2
+    ada = enriched[0]["decision_makers"][0]
+    assert ada["email"] == "ada.lovelace0@company0.example.com"
+    assert ada["enriched_by"] == "stub" and ada["linkedin_url"].startswith("https://")
+    assert enriched[3]["decision_makers"][0]["email"] == ada["email"]
+    assert "email" not in extracted[0]["decision_makers"][0]
+    contacts_total = registry.counter("enricher_contacts_total")
+    assert contacts_total.value(result="enriched") == 7
+
+
+def test_later_providers_only_see_misses():
+    """Test the priority order: a person reaches the next provider only without a match."""
+    first = StubProvider("pdl", hit_rate=0.5)
+    second = StubProvider("clearbit", hit_rate=1.0)
+
+    enriched = Enricher([first, second]).enrich(_extracted(10))
+
+    sources = [dm["enriched_by"] for entry in enriched for dm in entry["decision_makers"]]
+    assert first.lookups == 20
+    assert second.lookups == sources.count("clearbit") > 0
+    assert set(sources) == {"pdl", "clearbit"}
+
+
+def test_cache_means_never_paying_twice(tmp_path):
+    """Test that matches and misses are both reused by the next run."""
+    path = tmp_path / "lookups.sqlite"
+    provider = StubProvider(hit_rate=0.5)
+    first = Enricher([provider], cache=LookupCache(path)).enrich(_extracted(5))
+
+    rerun = StubProvider(hit_rate=0.5)
+    second = Enricher([rerun], cache=LookupCache(path)).enrich(_extracted(5))
+
+    assert provider.lookups == 10 and rerun.lookups == 0
+    assert first == second
+
+
+def test_request_cap_leaves_the_rest_for_the_next_run(tmp_path):
+    """Test that an exhausted budget stops requests without caching the leftovers."""
+    registry.reset()
+    path = tmp_path / "lookups.sqlite"
+    provider = StubProvider(batch_size=2, hit_rate=1.0)
+    budgets = {"stub": RateBudget(max_requests=2)}
+
+    Enricher([provider], budgets, LookupCache(path), concurrency=1).enrich(_extracted(5))
+    assert provider.requests == 2
+    lookups_total = registry.counter("enricher_lookups_total")
+    assert lookups_total.value(provider="stub", result="over_budget") == 6
+
+    rerun = StubProvider(batch_size=2, hit_rate=1.0)
+    Enricher([rerun], cache=LookupCache(path)).enrich(_extracted(5))
+    assert rerun.lookups == 6
+
+
+def test_failed_batches_are_not_cached(tmp_path):
+    """Test that a provider error skips the batch and leaves it uncached."""
+    class Flaky(StubProvider):
+        def lookup(self, batch, budget=None):
+            raise ConnectionError("boom")
+
+    path = tmp_path / "lookups.sqlite"
+    enriched = Enricher([Flaky()], cache=LookupCache(path)).enrich(_extracted(2))
+
+    assert not any(dm.get("email") for e in enriched for dm in e["decision_makers"])
+    assert LookupCache(path).get_many(["company0.example.com|ada|lovelace0"], ["stub"]) == {}
+
+
+def test_contact_rows_carry_enriched_fields():
+    """Test that enriched decision makers become valid Contact rows."""
+    enriched = Enricher([StubProvider(hit_rate=1.0)]).enrich(_extracted(1))
+
+    contacts = contacts_from_extracted(enriched)
+
+    assert [c.full_name for c in contacts] == ["Ada Lovelace0", "Grace Hopper0"]
+    assert contacts[0].email == "ada.lovelace0@company0.example.com"
+    assert contacts[0].company_id == "crunchbase:u0"
+
+
+def test_cli_runs_offline_with_stubs(tmp_path):
+    """Test the command line end to end with stand-in providers."""
+    source = tmp_path / "companies_with_decision_makers.json"
+    source.write_text(json.dumps(_extracted(2)))
+    config = tmp_path / "enricher.yaml"
+    config.write_text(
+        "providers:\n"
+        "  - name: pdl\n    requests_per_second: 100\n    burst: 5\n"
+        "  - name: clearbit\n"
+        f"cache:\n  path: {tmp_path / 'lookups.sqlite'}\n"
+    )
+    output = tmp_path / "contacts.json"
+
+    try:
+        code = main([
+            "--config", str(config), "--input", str(source), "--output", str(output), "--stub",
+        ])
+    finally:
+        shutdown_logging()
+
+    assert code == 0
+    rows = json.loads(output.read_text())
+    assert len(rows) == 4 and any(row["email"] for row in rows)
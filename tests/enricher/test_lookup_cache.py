@@ -0,0 +1,36 @@
+"""Tests for the persistent lookup cache."""
+
+from enricher.cache import LookupCache
+from enricher.providers import Match
+
+
+def test_matches_and_misses_survive_reopening(tmp_path):
+    """Test that both kinds of answer persist, per provider."""
+    path = tmp_path / "lookups.sqlite"
+    cache = LookupCache(path)
+    cache.put_many("pdl", {"a.io|ada|l": Match(email="ada@a.io"), "a.io|bob|r": None})
+    cache.close()
+
+    answers = LookupCache(path).get_many(["a.io|ada|l", "a.io|bob|r", "a.io|cy|z"], ["pdl"])
+
+    assert answers == {"a.io|ada|l": {"pdl": Match(email="ada@a.io")}, "a.io|bob|r": {"pdl": None}}
+    assert LookupCache(path).get_many(["a.io|ada|l"], ["clearbit"]) == {}
+
+
+def test_misses_expire_before_matches(tmp_path):
+    """Test the separate TTLs and pruning."""
+    path = tmp_path / "lookups.sqlite"
+    LookupCache(path).put_many("pdl", {"hit": Match(email="x@y.z"), "miss": None})
+
+    cache = LookupCache(path, positive_ttl=60, negative_ttl=-1)
+
+    assert set(cache.get_many(["hit", "miss"], ["pdl"])) == {"hit"}
+    assert cache.prune() == 1
+
+
+def test_large_key_sets_are_chunked(tmp_path):
+    """Test lookups beyond SQLite's bound parameter limit."""
+    cache = LookupCache(tmp_path / "lookups.sqlite")
+    cache.put_many("pdl", {f"k{i}": None for i in range(2500)})
+
+    assert len(cache.get_many([f"k{i}" for i in range(3000)], ["pdl"])) == 2500
@@ -0,0 +1,178 @@
+"""Tests for the enrichment providers and their budgets."""
+
+import time
+
+import pytest
+
+from enricher.budget import RateBudget
+from enricher.config import validate_config
+from enricher.providers import (
+    ClearbitProvider, Lookup, PeopleDataLabsProvider, Provider, StubProvider,
+    provider_from_config,
+)
+
+
+class FakeResponse:
+    def __init__(self, body, status_code=200):
+        self.body = body
+        self.status_code = status_code
+        self.content = b"{}"
+        self.headers = {}
+
+    def json(self):
+        return self.body
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeSession:
+    def __init__(self, body):
+        self.body = body
+        self.requests = []
+
+    def get(self, url, **kwargs):
+        self.requests.append(kwargs)
+        return FakeResponse(self.body)
+
+    post = get
+
+
+def _lookup(first, last, domain="acme.io"):
+    key = f"{domain}|{first.lower()}|{last.lower()}"
+    return Lookup(key, first, last, f"{first} {last}", domain)
+
+
+def test_pdl_bulk_request_maps_answers_by_key():
+    """Test one bulk request per batch, answers matched by metadata, only 404 a miss."""
+    batch = [_lookup("Ada", "Lovelace"), _lookup("Bob", "Roe"), _lookup("Cy", "Li")]
+    session = FakeSession([
+        {"metadata": {"key": batch[2].key}, "status": 429, "error": {"type": "rate_limit"}},
+        {"metadata": {"key": batch[1].key}, "status": 404, "error": {"type": "not_found"}},
+        {"metadata": {"key": batch[0].key}, "status": 200,
+         "data": {"emails": [{"address": "ada@acme.io"}],
+                  "linkedin_url": "linkedin.com/in/ada", "job_title": "CTO"}},
+    ])
+    provider = PeopleDataLabsProvider(api_key="k", session=session)
+
+    answers = provider.lookup(batch)
+
+    assert len(session.requests) == 1
+    assert len(session.requests[0]["json"]["requests"]) == 3
+    assert answers[batch[0].key].email == "ada@acme.io"
+    assert answers[batch[0].key].linkedin_url == "https://www.linkedin.com/in/ada"
+    assert answers[batch[1].key] is None
+    assert batch[2].key not in answers
+
+
+def test_clearbit_batches_by_domain_and_matches_names():
+    """Test one search per domain, matched back to lookups by canonical name."""
+    session = FakeSession({"results": [
+        {"name": {"fullName": "Dr. Ada Lovelace"}, "email": "ada@acme.io", "title": "CTO"},
+    ]})
+    provider = ClearbitProvider(api_key="k", session=session)
+    lookups = [_lookup("Ada", "Lovelace"), _lookup("Bob", "Roe", "b.co"), _lookup("Cy", "Li")]
+
+    batches = list(provider.batches(lookups))
+    answers = provider.lookup(batches[0])
+
+    domains = [[item.domain for item in batch] for batch in batches]
+    assert domains == [["acme.io", "acme.io"], ["b.co"]]
+    assert session.requests[0]["params"]["domain"] == "acme.io"
+    assert answers[lookups[0].key].email == "ada@acme.io"
+    assert answers[lookups[2].key] is None
+
+
+class PagedSession(FakeSession):
+    def get(self, url, **kwargs):
+        self.requests.append(kwargs)
+        params = kwargs["params"]
+        start = (params["page"] - 1) * params["page_size"]
+        return FakeResponse({"results": self.body[start:start + params["page_size"]]})
+
+
+def test_clearbit_pages_through_large_domains():
+    """Test that a domain with more people than a page is one batch, searched page by page."""
+    people = [{"name": {"fullName": f"Person{i} Staff"}} for i in range(5)]
+    people.append({"name": {"fullName": "Ada Lovelace"}, "email": "ada@acme.io"})
+    lookups = [_lookup("Ada", "Lovelace"), _lookup("Bob", "Roe")]
+    lookups += [_lookup(f"Person{i}", "Staff") for i in range(4)]
+
+    session = PagedSession(people)
+    provider = ClearbitProvider(api_key="k", batch_size=2, session=session)
+    batches = list(provider.batches(lookups))
+    answers = provider.lookup(batches[0])
+
+    assert len(batches) == 1 and len(batches[0]) == 6
+    assert [r["params"]["page"] for r in session.requests] == [1, 2, 3, 4]
+    assert answers[lookups[0].key].email == "ada@acme.io"
+    assert answers[lookups[1].key] is None
+    assert sum(answer is not None for answer in answers.values()) == 5
+
+    # Cut short by the page cap: people not seen yet are unanswered, not misses
+    session = PagedSession(people)
+    provider = ClearbitProvider(api_key="k", batch_size=2, max_pages=2, session=session)
+    answers = provider.lookup(batches[0])
+
+    assert len(session.requests) == 2
+    assert set(answers) == {lookups[i].key for i in (2, 3, 4, 5)}
+
+
+def test_clearbit_takes_a_budget_token_per_page():
+    """Test that later pages draw on the budget and a spent budget stops the search."""
+    people = [{"name": {"fullName": f"Person{i} Staff"}} for i in range(6)]
+    lookups = [_lookup(f"Person{i}", "Staff") for i in range(6)] + [_lookup("Bob", "Roe")]
+    session = PagedSession(people)
+    provider = ClearbitProvider(api_key="k", batch_size=2, session=session)
+    # The caller has taken the first page's token
+    budget = RateBudget(max_requests=2)
+    budget.acquire()
+
+    answers = provider.lookup(lookups, budget)
+
+    assert len(session.requests) == 2 and budget.exhausted
+    assert set(answers) == {lookups[i].key for i in range(4)}
+
+
+def test_provider_without_lookup_fails_when_built():
+    """Test that a provider missing ``lookup`` is rejected before its first batch."""
+    class Incomplete(Provider):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_stub_swaps_in_for_any_provider(monkeypatch):
+    """Test that stubs keep the provider's name and are deterministic."""
+    monkeypatch.setenv("ENRICHER_BACKEND", "stub")
+    provider = provider_from_config({"name": "pdl", "batch_size": 10})
+    batch = [_lookup(f"P{i}", "Q") for i in range(50)]
+
+    assert isinstance(provider, StubProvider) and provider.name == "pdl"
+    assert provider.lookup(batch) == provider.lookup(batch)
+    assert 0 < sum(m is not None for m in provider.lookup(batch).values()) < 50
+
+
+def test_rate_budget_paces_and_caps():
+    """Test the token bucket rate and the request cap."""
+    budget = RateBudget(rate=50, burst=2, max_requests=5)
+
+    started = time.perf_counter()
+    assert all(budget.acquire() for _ in range(5))
+    elapsed = time.perf_counter() - started
+
+    assert not budget.acquire() and budget.exhausted
+    assert 0.05 <= elapsed < 0.5
+
+
+def test_validate_config():
+    """Test provider config checks."""
+    assert validate_config({"providers": [{"name": "pdl"}, {"name": "stub"}]}) == []
+    problems = validate_config({"providers": [
+        {"name": "pdl", "batch_size": 0}, {"name": "nope"}, {"name": "pdl"},
+    ]})
+    assert len(problems) == 3
+    assert validate_config({"providers": [{"name": "pdl", "enabled": False}]}) == [
+        "No providers are enabled"
+    ]
@@ -0,0 +1,124 @@
+"""Tests for bulk message generation."""
+
+import json
+import time
+
+import app as webapp
+from generation import bulk
+from generation.bulk import completed_ids, jobs_from_extracted, run_bulk
+from generation.clients import StubClient
+from generation.generator import MessageGenerator, RateLimiter
+
+
+def _extracted(n=5):
+    return [
+        {
+            "company": {"name": f"Company {i}"},
+            "decision_makers": [
+                {"id": f"c{i}", "name": f"Person {i}", "title": "CEO",
+                 "company_name": f"Company {i}"},
+            ],
+        }
+        for i in range(n)
+    ]
+
+
+def test_jobs_use_contact_ids_and_dedupe():
+    """Test one job per decision maker, keyed by contact ID."""
+    extracted = _extracted(2) + [
+        {"company": {"name": "Company 0"}, "decision_makers": [
+            {"id": "c0", "name": "Person 0", "title": "CEO"},
+            {"name": "No Id", "title": "CTO"},
+            {"name": " ", "title": "CFO"},
+        ]},
+    ]
+
+    jobs = jobs_from_extracted(extracted, "asking for referral")
+
+    assert [j.name for j in jobs] == ["Person 0", "Person 1", "No Id"]
+    assert jobs[0].id == "c0"
+    assert "asking for referral message for Person 0, a CEO at Company 0" in jobs[0].prompt
+
+
+def test_run_resumes_and_keeps_completed_messages(tmp_path):
+    """Test incremental writes and skipping jobs already in the output."""
+    out = tmp_path / "messages.jsonl"
+    jobs = jobs_from_extracted(_extracted(5), "asking for advice")
+    # A previous run finished c0 and crashed while writing c1
+    out.write_text(json.dumps({"id": "c0", "message": "kept"}) + '\n{"id": "c1", "mess')
+    client = StubClient()
+
+    events = list(run_bulk(jobs, MessageGenerator(client), out, concurrency=3))
+
+    assert events[0]["event"] == "start" and events[0]["skipped"] == 1
+    assert events[-1]["event"] == "done" and events[-1]["done"] == 4
+    assert client.calls == 4
+    assert completed_ids(out) == {f"c{i}" for i in range(5)}
+    lines = [json.loads(line) for line in out.read_text().splitlines()[2:]]
+    assert all(line["message"].startswith("[stub") for line in lines)
+
+
+def test_failures_are_reported_and_retried(tmp_path):
+    """Test that a failed job is not written, so the next run retries it."""
+    class Flaky(StubClient):
+        def complete(self, prompt, max_tokens):
+            if "Person 1," in prompt and not getattr(self, "failed", False):
+                self.failed = True
+                raise RuntimeError("timeout")
+            return super().complete(prompt, max_tokens)
+
+    out = tmp_path / "messages.jsonl"
+    jobs = jobs_from_extracted(_extracted(3), "asking for advice")
+    generator = MessageGenerator(Flaky())
+
+    first = list(run_bulk(jobs, generator, out, concurrency=2))
+    second = list(run_bulk(jobs, generator, out, concurrency=2))
+
+    assert [e["id"] for e in first if e["event"] == "error"] == ["c1"]
+    assert first[-1]["failed"] == 1
+    assert second[-1]["skipped"] == 2 and second[-1]["done"] == 1
+
+
+def test_rate_limiter_spaces_calls():
+    """Test that the limiter allows a burst, then ``rate`` calls per second."""
+    limiter = RateLimiter(rate=50, burst=2)
+    started = time.perf_counter()
+    for _ in range(7):
+        limiter.acquire()
+
+    assert time.perf_counter() - started >= 0.09
+
+
+def test_bulk_endpoint_streams_events(tmp_path, monkeypatch):
+    """Test the SSE endpoint and the results download."""
+    monkeypatch.setattr(webapp, "BULK_OUTPUT_DIR", str(tmp_path))
+    webapp.app.extensions["generator"] = MessageGenerator(StubClient())
+    try:
+        with webapp.app.test_client() as http:
+            response = http.post("/bulk?concurrency=2", data=json.dumps(_extracted(3)))
+            body = response.get_data(as_text=True)
+            events = [
+                json.loads(line[6:]) for line in body.splitlines() if line.startswith("data: ")
+            ]
+            results = http.get(f"/bulk/{events[0]['run_id']}")
+            missing = http.get("/bulk/0123456789abcdef")
+            invalid = http.post("/bulk", data="not json")
+    finally:
+        webapp.app.extensions.pop("generator")
+
+    assert response.mimetype == "text/event-stream"
+    assert [e["event"] for e in events] == ["start", "message", "message", "message", "done"]
+    assert len(results.get_data(as_text=True).splitlines()) == 3
+    assert missing.status_code == 404
+    assert invalid.status_code == 400
+
+
+def test_cli_with_stub_backend(tmp_path, monkeypatch):
+    """Test the command line against the stub backend."""
+    monkeypatch.setenv("LLM_BACKEND", "stub")
+    source = tmp_path / "companies_with_decision_makers.json"
+    source.write_text(json.dumps(_extracted(4)))
+    out = tmp_path / "messages.jsonl"
+
+    assert bulk.main([str(source), "--out", str(out), "--concurrency", "2"]) == 0
+    assert len(completed_ids(out)) == 4
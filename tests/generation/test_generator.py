@@ -0,0 +1,155 @@
+"""Tests for cached, coalesced message generation."""
+
+import threading
+import time
+
+import pytest
+
+import app as webapp
+from common.metrics import registry
+from generation.cache import DiskCache, LRUCache
+from generation.clients import LLMClient, StubClient
+from generation.generator import MessageGenerator, build_prompt
+from generation.templates import TemplateSet
+
+
+FORM = {
+    "name": "Ada Lovelace",
+    "company": "Acme",
+    "experience": "CTO",
+    "alumni": "MIT",
+    "age": "36",
+    "intent": "asking for advice",
+}
+
+
+def test_lru_evicts_least_recently_used():
+    """Test LRU order and size bound."""
+    cache = LRUCache(2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1" and cache.get("c") == "3"
+    assert len(cache) == 2
+
+
+def test_disk_cache_expires(tmp_path):
+    """Test that disk entries survive a new instance and expire after the TTL."""
+    DiskCache(tmp_path, ttl=60).set("abc", "hello")
+
+    assert DiskCache(tmp_path, ttl=60).get("abc") == "hello"
+    assert DiskCache(tmp_path, ttl=-1).get("abc") is None
+    assert DiskCache(tmp_path, ttl=60).get("abc") is None
+
+
+def test_repeated_prompts_hit_the_caches(tmp_path):
+    """Test memory and disk hits and that model settings are part of the key."""
+    registry.reset()
+    client = StubClient()
+    prompt = build_prompt(FORM)
+
+    generator = MessageGenerator(client, disk=DiskCache(tmp_path))
+    first = generator.generate(prompt)
+    assert generator.generate(prompt) == first
+    restarted = MessageGenerator(client, disk=DiskCache(tmp_path))
+    assert restarted.generate(prompt) == first
+    MessageGenerator(client, disk=DiskCache(tmp_path), max_tokens=5).generate(prompt)
+
+    requests_total = registry.counter("generation_requests_total")
+    assert client.calls == 2
+    assert requests_total.value(result="memory") == 1
+    assert requests_total.value(result="disk") == 1
+    assert requests_total.value(result="upstream") == 2
+
+
+def test_concurrent_identical_requests_coalesce():
+    """Test that concurrent requests for one prompt make one upstream call."""
+    registry.reset()
+    client = StubClient(latency=0.2)
+    generator = MessageGenerator(client)
+    results = []
+
+    threads = [
+        threading.Thread(target=lambda: results.append(generator.generate("same prompt")))
+        for _ in range(8)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert client.calls == 1
+    assert len(set(results)) == 1 and len(results) == 8
+    assert time.perf_counter() - started < 1.0
+    assert registry.counter("generation_requests_total").value(result="coalesced") == 7
+
+
+def test_request_racing_a_finishing_leader_hits_memory():
+    """Test that a miss whose leader finishes before it takes the lock makes no second call."""
+    registry.reset()
+    client = StubClient()
+    generator = MessageGenerator(client)
+
+    class Stale(LRUCache):
+        raced = False
+
+        def get(self, key):
+            if not self.raced:
+                # Another request runs start to finish after this lookup missed
+                self.raced = True
+                generator.generate("prompt")
+                return None
+            return super().get(key)
+
+    generator.memory = Stale()
+
+    assert generator.generate("prompt").startswith("[stub")
+    assert client.calls == 1
+    assert registry.counter("generation_requests_total").value(result="memory") == 1
+
+
+def test_client_without_complete_fails_when_built():
+    """Test that a backend missing ``complete`` is rejected before its first request."""
+    class Incomplete(LLMClient):
+        model = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_failures_reach_waiters_and_are_not_cached():
+    """Test that an upstream error propagates and the next request retries."""
+    class Flaky(StubClient):
+        def complete(self, prompt, max_tokens):
+            if not self.calls:
+                self.calls += 1
+                raise RuntimeError("upstream down")
+            return super().complete(prompt, max_tokens)
+
+    generator = MessageGenerator(Flaky())
+
+    with pytest.raises(RuntimeError):
+        generator.generate("prompt")
+    assert generator.generate("prompt").startswith("[stub")
+
+
+def test_index_route_uses_generator():
+    """Test the form POST against the stub backend when no template applies."""
+    client = StubClient()
+    webapp.app.extensions["generator"] = MessageGenerator(client)
+    webapp.app.extensions["templates"] = TemplateSet()
+    try:
+        with webapp.app.test_client() as http:
+            response = http.post("/", data=FORM)
+            http.post("/", data=FORM)
+    finally:
+        webapp.app.extensions.pop("generator")
+        webapp.app.extensions.pop("templates")
+
+    assert response.status_code == 200
+    assert "Ada Lovelace" in response.get_data(as_text=True)
+    assert client.calls == 1
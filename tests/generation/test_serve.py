@@ -0,0 +1,132 @@
+"""Tests for bounded LLM concurrency, request timeouts and the pooled server."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+import app as webapp
+from common.metrics import registry
+from generation.clients import StubClient
+from generation.generator import GenerationTimeout, MessageGenerator
+from generation.serve import PooledWSGIServer
+from generation.templates import TemplateSet
+
+
+FORM = {
+    "name": "Ada Lovelace", "company": "Acme", "experience": "CTO", "alumni": "",
+    "age": "", "intent": "asking for advice",
+}
+
+
+def test_upstream_calls_are_bounded():
+    """Test that at most max_concurrency prompts reach the LLM at once."""
+    client = StubClient(latency=0.05)
+    generator = MessageGenerator(client, max_concurrency=3)
+
+    with ThreadPoolExecutor(max_workers=12) as pool:
+        results = list(pool.map(generator.generate, [f"prompt {i}" for i in range(12)]))
+    generator.close()
+
+    assert client.calls == 12 and len(set(results)) == 12
+    assert client.peak == 3
+
+
+def test_slow_upstream_times_out_and_still_fills_the_cache():
+    """Test that a waiting request gives up while the call completes for the next one."""
+    registry.reset()
+    client = StubClient(latency=0.3)
+    generator = MessageGenerator(client, max_concurrency=1, timeout=0.05)
+
+    with pytest.raises(GenerationTimeout):
+        generator.generate("slow prompt")
+    time.sleep(0.4)
+    text = generator.generate("slow prompt")
+    generator.close()
+
+    assert text.startswith("[stub") and client.calls == 1
+    assert registry.counter("generation_requests_total").value(result="timeout") == 1
+
+
+def test_form_answers_504_on_timeout():
+    """Test that the form route reports a timed out generation."""
+    generator = MessageGenerator(StubClient(latency=0.3), max_concurrency=1, timeout=0.05)
+    webapp.app.extensions["generator"] = generator
+    webapp.app.extensions["templates"] = TemplateSet()
+    try:
+        with webapp.app.test_client() as http:
+            response = http.post("/", data=FORM)
+    finally:
+        webapp.app.extensions.pop("generator")
+        webapp.app.extensions.pop("templates")
+        generator.close()
+
+    assert response.status_code == 504
+    assert "taking longer than usual" in response.get_data(as_text=True)
+
+
+def test_pooled_server_handles_requests_concurrently():
+    """Test that the worker pool serves slow requests in parallel."""
+    def slow_app(environ, start_response):
+        time.sleep(0.2)
+        start_response("200 OK", [("Content-Type", "text/plain")])
+        return [b"ok"]
+
+    server = PooledWSGIServer(("127.0.0.1", 0), slow_app, workers=8)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            bodies = list(pool.map(lambda _: requests.get(server.url, timeout=5).text, range(8)))
+        elapsed = time.perf_counter() - started
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert bodies == ["ok"] * 8
+    assert elapsed < 1.0
+
+
+def test_pooled_server_leaves_extra_connections_in_the_backlog():
+    """Test that busy workers stop the server accepting rather than queueing sockets."""
+    release = threading.Event()
+
+    def blocking_app(environ, start_response):
+        release.wait(5)
+        start_response("200 OK", [("Content-Type", "text/plain")])
+        return [b"ok"]
+
+    server = PooledWSGIServer(("127.0.0.1", 0), blocking_app, workers=1)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            futures = [pool.submit(requests.get, server.url, timeout=5) for _ in range(4)]
+            time.sleep(0.3)
+            queued = server._pool._work_queue.qsize()
+            release.set()
+            statuses = [future.result().status_code for future in futures]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert queued == 0
+    assert statuses == [200] * 4
+
+
+def test_generator_from_env_bounds_upstream_calls(monkeypatch):
+    """Test that the served generator has a timeout and a concurrency cap by default."""
+    monkeypatch.setenv("LLM_BACKEND", "stub")
+    monkeypatch.delenv("GENERATION_TIMEOUT", raising=False)
+    monkeypatch.delenv("GENERATION_MAX_CONCURRENCY", raising=False)
+
+    generator = MessageGenerator.from_env()
+    generator.close()
+    monkeypatch.setenv("GENERATION_TIMEOUT", "0")
+    unbounded = MessageGenerator.from_env()
+    unbounded.close()
+
+    assert generator.timeout == 30.0
+    assert generator._pool._max_workers == 16
+    assert unbounded.timeout is None
@@ -0,0 +1,122 @@
+"""Tests for template rendering and the LLM fallback."""
+
+import pytest
+
+import app as webapp
+from common.metrics import registry
+from generation.bulk import jobs_from_extracted, run_bulk
+from generation.clients import StubClient
+from generation.generator import MessageGenerator
+from generation.templates import (
+    DEFAULT_TEMPLATES, MessageComposer, MixReport, TemplateSet, compile_template, segment_values,
+)
+
+
+TEMPLATES = TemplateSet(
+    templates=[
+        {"id": "funded", "intent": "asking for advice",
+         "text": "Hi {first_name}, congrats on {company}'s {stage_name} round!"},
+        {"id": "generic", "intent": "Asking for Advice", "text": "Hi {first_name} at {company}."},
+        {"id": "cto", "intent": "asking for advice", "role": "cto",
+         "text": "Hi {first_name}, fellow engineer here."},
+        {"id": "cto_seed", "intent": "asking for advice", "role": "cto", "stage": "Seed",
+         "text": "Hi {first_name}, seed-stage CTO life!"},
+    ],
+    personalized=[{"intent": "asking for referral"}],
+)
+
+COMPANY = {"name": "Acme", "properties.last_funding_type": "series_a"}
+
+
+def _values(role="ceo", company=COMPANY, intent="asking for advice"):
+    dm = {"name": "Jane Doe", "first_name": "Jane", "title": "CEO", "role": role}
+    return segment_values(company, dm, intent)
+
+
+def test_most_specific_segment_wins():
+    """Test segment fallback from intent x role x stage to intent only."""
+    assert TEMPLATES.render(_values())[1] == "Hi Jane, congrats on Acme's Series A round!"
+    assert TEMPLATES.render(_values(role="cto"))[0].id == "cto"
+    seed = {**COMPANY, "properties.last_funding_type": "seed"}
+    assert TEMPLATES.render(_values(role="cto", company=seed))[0].id == "cto_seed"
+
+
+def test_templates_with_missing_values_fall_through():
+    """Test that a template needing an empty value yields to the next one."""
+    template, text, reason = TEMPLATES.render(_values(company={"name": "Acme"}))
+
+    assert template.id == "generic" and text == "Hi Jane at Acme."
+    assert TEMPLATES.render(_values(company={}))[2] == "missing_fields"
+    assert TEMPLATES.render(_values(intent="asking for opportunities"))[2] == "no_template"
+    assert TEMPLATES.render(_values(intent="asking for referral"))[2] == "personalized"
+
+
+def test_unknown_placeholders_are_rejected():
+    """Test that templates are validated when compiled."""
+    assert compile_template("t", "Hi {first_name} {first_name}").fields == ("first_name",)
+    with pytest.raises(ValueError):
+        compile_template("t", "Hi {salary}")
+    with pytest.raises(ValueError):
+        compile_template("t", "Hi {name!r}")
+
+
+def test_composer_falls_back_to_llm_and_reports_mix():
+    """Test the LLM fallback and the template vs. LLM mix."""
+    registry.reset()
+    client = StubClient()
+    composer = MessageComposer(MessageGenerator(client), TEMPLATES)
+    mix = MixReport()
+
+    for values in [_values(), _values(role="cto"), _values(intent="asking for referral")]:
+        mix.add(composer.compose(values))
+
+    assert client.calls == 1
+    assert mix.as_dict() == {
+        "template": 2, "llm": 1, "template_share": 0.6667, "llm_reasons": {"personalized": 1},
+    }
+    messages_total = registry.counter("generation_messages_total")
+    assert messages_total.value(source="llm", reason="personalized") == 1
+
+
+def test_bulk_run_reports_mix(tmp_path):
+    """Test that bulk results carry their source and the run its mix."""
+    extracted = [
+        {"company": COMPANY, "decision_makers": [
+            {"id": "a", "name": "Jane Doe", "title": "CEO", "role": "ceo"},
+            {"id": "b", "name": "Bob Roe", "title": "CTO", "role": "cto"},
+        ]},
+    ]
+    client = StubClient()
+    jobs = jobs_from_extracted(extracted, "asking for referral")
+    jobs += jobs_from_extracted(
+        [{**extracted[0], "decision_makers": [{"id": "c", "name": "Carol Ng", "role": "cfo"}]}],
+        "asking for advice",
+    )
+
+    events = list(run_bulk(jobs, MessageGenerator(client), tmp_path / "out.jsonl", 2, TEMPLATES))
+
+    assert events[-1]["mix"]["template"] == 1 and events[-1]["mix"]["llm"] == 2
+    sources = {e["id"]: e["source"] for e in events if e["event"] == "message"}
+    assert sources == {"a": "llm", "b": "llm", "c": "template"}
+
+
+def test_shipped_templates_compile_and_serve_the_form():
+    """Test the default template file and the form route's fast path."""
+    templates = TemplateSet.load(DEFAULT_TEMPLATES)
+    client = StubClient()
+    webapp.app.extensions["generator"] = MessageGenerator(client)
+    webapp.app.extensions["templates"] = templates
+    form = {
+        "name": "Ada Lovelace", "company": "Acme", "experience": "CTO", "alumni": "",
+        "age": "", "intent": "asking for advice",
+    }
+    try:
+        with webapp.app.test_client() as http:
+            response = http.post("/", data=form)
+    finally:
+        webapp.app.extensions.pop("generator")
+        webapp.app.extensions.pop("templates")
+
+    assert len(templates) > 0
+    assert "Hi Ada" in response.get_data(as_text=True)
+    assert client.calls == 0